@@ -0,0 +1,54 @@
+"""add processing jobs
+
+Revision ID: 5b6c7d8e9f0a
+Revises: 4a5b6c7d8e9f
+Create Date: 2026-02-10 09:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b6c7d8e9f0a"
+down_revision: Union[str, Sequence[str], None] = "4a5b6c7d8e9f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "processing_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("edition_id", sa.Integer(), sa.ForeignKey("editions.id"), nullable=False),
+        sa.Column("job_type", sa.String(30), nullable=False, server_default="process_edition"),
+        sa.Column("status", sa.String(20), nullable=False, server_default="QUEUED"),
+        sa.Column("priority", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="3"),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("lease_owner", sa.String(100), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_completed_page", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("payload", sa.JSON(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(op.f("ix_processing_jobs_id"), "processing_jobs", ["id"], unique=False)
+    op.create_index(op.f("ix_processing_jobs_edition_id"), "processing_jobs", ["edition_id"], unique=False)
+    op.create_index(op.f("ix_processing_jobs_status"), "processing_jobs", ["status"], unique=False)
+    op.create_index(op.f("ix_processing_jobs_priority"), "processing_jobs", ["priority"], unique=False)
+    op.create_index(op.f("ix_processing_jobs_lease_expires_at"), "processing_jobs", ["lease_expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_processing_jobs_lease_expires_at"), table_name="processing_jobs")
+    op.drop_index(op.f("ix_processing_jobs_priority"), table_name="processing_jobs")
+    op.drop_index(op.f("ix_processing_jobs_status"), table_name="processing_jobs")
+    op.drop_index(op.f("ix_processing_jobs_edition_id"), table_name="processing_jobs")
+    op.drop_index(op.f("ix_processing_jobs_id"), table_name="processing_jobs")
+    op.drop_table("processing_jobs")
@@ -0,0 +1,26 @@
+"""add page pipeline fingerprint
+
+Revision ID: 6c7d8e9f0a1b
+Revises: 5b6c7d8e9f0a
+Create Date: 2026-02-12 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6c7d8e9f0a1b"
+down_revision: Union[str, Sequence[str], None] = "5b6c7d8e9f0a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('pages', sa.Column('pipeline_fingerprint', sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('pages', 'pipeline_fingerprint')
@@ -0,0 +1,28 @@
+"""add page content hash
+
+Revision ID: 7d8e9f0a1b2c
+Revises: 6c7d8e9f0a1b
+Create Date: 2026-02-13 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7d8e9f0a1b2c"
+down_revision: Union[str, Sequence[str], None] = "6c7d8e9f0a1b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('pages', sa.Column('content_hash', sa.String(64), nullable=True))
+    op.create_index(op.f('ix_pages_content_hash'), 'pages', ['content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_pages_content_hash'), table_name='pages')
+    op.drop_column('pages', 'content_hash')
@@ -0,0 +1,32 @@
+"""add binary embeddings
+
+Revision ID: 8e9f0a1b2c3d
+Revises: 7d8e9f0a1b2c
+Create Date: 2026-02-16 09:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e9f0a1b2c3d"
+down_revision: Union[str, Sequence[str], None] = "7d8e9f0a1b2c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ("items", "story_groups"):
+        op.add_column(table, sa.Column("embedding", sa.LargeBinary(), nullable=True))
+        op.add_column(table, sa.Column("embedding_model", sa.String(200), nullable=True))
+        op.add_column(table, sa.Column("embedding_text_hash", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    for table in ("story_groups", "items"):
+        op.drop_column(table, "embedding_text_hash")
+        op.drop_column(table, "embedding_model")
+        op.drop_column(table, "embedding")
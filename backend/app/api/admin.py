@@ -13,6 +13,8 @@ from app.schemas import (
     UserUpdate,
 )
 from app.services.auth_service import create_user, get_user_by_email
+from app.services.model_registry import get_model_registry
+from app.services.ocr_cache import get_ocr_cache
 from app.utils.auth import get_password_hash
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
@@ -186,3 +188,28 @@ async def update_access_request(
             ) from e
 
     return AccessRequestResponse.model_validate(access_request)
+
+
+@router.get("/ocr-cache")
+async def get_ocr_cache_stats(_admin = Depends(get_admin_user)):
+    """OCR result cache hit rate and size, for sizing OCR_CACHE_MAX_MB (admin only)."""
+    return get_ocr_cache().stats()
+
+
+@router.delete("/ocr-cache")
+async def clear_ocr_cache(_admin = Depends(get_admin_user)):
+    """Drop every cached OCR result (admin only)."""
+    get_ocr_cache().clear()
+    return {"message": "OCR cache cleared"}
+
+
+@router.get("/models")
+async def get_model_stats(_admin = Depends(get_admin_user)):
+    """Warm models in this process with load times and memory growth (admin only)."""
+    return get_model_registry().stats()
+
+
+@router.delete("/models")
+async def evict_models(_admin = Depends(get_admin_user)):
+    """Unload every warm model; they reload on next use (admin only)."""
+    return {"evicted": get_model_registry().evict()}
@@ -18,11 +18,17 @@ from fastapi import (
 from sqlalchemy.orm import Session
 
 from app.api.auth import get_admin_user, get_reader_user
-from app.db.database import SessionLocal, get_db
-from app.models import Edition, Item, Page
+from app.db.database import get_db
+from app.models import Edition, Page
 from app.schemas import EditionResponse, EditionStatus, PageMetricsResponse, PageResponse
 from app.services.archive_service import archive_edition_now
-from app.services.processing_service import create_processing_service, reprocess_single_page
+from app.services.job_queue import (
+    PRIORITY_REPROCESS,
+    PRIORITY_UPLOAD,
+    enqueue_processing_job,
+    run_inline_jobs,
+)
+from app.services.processing_service import reprocess_single_page
 from app.settings import settings
 
 router = APIRouter()
@@ -31,15 +37,13 @@ logger = logging.getLogger(__name__)
 
 def run_processing_task(edition_id: int) -> None:
     """
-    Background task that creates its own database session.
-    This is needed because FastAPI's request-scoped session closes after the request.
+    Background task that drains this edition's queued job inside the API process.
+
+    Only scheduled when ``processing_inline_worker`` is enabled; otherwise jobs
+    are picked up by standalone workers (``python -m app.worker``). It opens
+    its own database session since the request-scoped one closes after the request.
     """
-    db = SessionLocal()
-    try:
-        processing_service = create_processing_service()
-        processing_service.process_edition(edition_id, db)
-    finally:
-        db.close()
+    run_inline_jobs(edition_id)
 
 
 def calculate_file_hash(file_content: bytes) -> str:
@@ -319,9 +323,12 @@ async def create_edition(
     ]
     db.add_all(pages)
     db.commit()
+
+    enqueue_processing_job(db, edition.id, priority=PRIORITY_UPLOAD)
     db.refresh(edition)
 
-    background_tasks.add_task(run_processing_task, edition.id)
+    if settings.processing_inline_worker:
+        background_tasks.add_task(run_processing_task, edition.id)
 
     return edition
 
@@ -483,27 +490,29 @@ async def reprocess_edition(
             detail="Local PDF missing. Restore or re-upload before reprocessing."
         )
 
-    db.query(Item).filter(Item.edition_id == edition_id).delete()
-    db.query(Page).filter(Page.edition_id == edition_id).delete()
-    db.commit()
-
     edition.status = EditionStatus.UPLOADED  # type: ignore
     edition.processed_pages = 0  # type: ignore
     edition.current_stage = "QUEUED"  # type: ignore
     edition.last_error = None  # type: ignore
     edition.processed_at = None  # type: ignore
 
-    total_pages = edition.total_pages or 0
-    pages = [
-        Page(edition_id=edition.id, page_number=page_number, status="PENDING")
-        for page_number in range(1, total_pages + 1)
-    ]
-    db.add_all(pages)
+    # Items stay until the job replaces them, so it can carry their embeddings
+    # over to items whose text comes back unchanged
+    pages = {page.page_number: page for page in db.query(Page).filter(Page.edition_id == edition_id)}
+    for page_number in range(1, (edition.total_pages or 0) + 1):
+        page = pages.get(page_number)
+        if page is None:
+            db.add(Page(edition_id=edition.id, page_number=page_number, status="PENDING"))
+        else:
+            page.status = "PENDING"
+            page.pipeline_fingerprint = None
     db.commit()
+
+    enqueue_processing_job(db, edition_id, priority=PRIORITY_REPROCESS)
     db.refresh(edition)
 
-    # Add background task to reprocess
-    background_tasks.add_task(run_processing_task, edition_id)
+    if settings.processing_inline_worker:
+        background_tasks.add_task(run_processing_task, edition_id)
 
     return edition
 
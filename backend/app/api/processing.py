@@ -2,37 +2,44 @@ from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.api.auth import get_admin_user
-from app.db.database import SessionLocal, get_db
-from app.models import Edition, ExtractionRun
+from app.db.database import get_db
+from app.models import Edition, ExtractionRun, ProcessingJob
 from app.schemas import EditionResponse, EditionStatus
-from app.services.processing_service import create_processing_service
+from app.services.commit_coalescer import read_progress
+from app.services.job_queue import (
+    PRIORITY_MANUAL,
+    enqueue_processing_job,
+    run_inline_jobs,
+)
+from app.settings import settings
 
 router = APIRouter()
 
 
-def run_processing_task(edition_id: int):
+def run_processing_task(edition_id: int) -> None:
     """
-    Background task that creates its own database session.
-    This is needed because FastAPI's request-scoped session closes after the request.
+    Background task that drains this edition's queued job inside the API process.
+
+    Only scheduled when ``processing_inline_worker`` is enabled; otherwise jobs
+    are picked up by standalone workers (``python -m app.worker``). It opens
+    its own database session since the request-scoped one closes after the request.
     """
-    # Create a new database session for the background task
-    db = SessionLocal()
-    try:
-        processing_service = create_processing_service()
-        processing_service.process_edition(edition_id, db)
-    finally:
-        db.close()
+    run_inline_jobs(edition_id)
 
 
 @router.post("/{edition_id}/process", response_model=EditionResponse)
 async def process_edition(
     edition_id: int,
     background_tasks: BackgroundTasks,
+    resume: bool = False,
     db: Session = Depends(get_db),
     _: None = Depends(get_admin_user)
 ):
     """
     Start processing an edition in the background.
+
+    With ``resume=true``, pages already finished under the current pipeline
+    version and settings are kept and processing continues from the rest.
     """
     edition = db.query(Edition).filter(Edition.id == edition_id).first()
     if not edition:
@@ -53,10 +60,14 @@ async def process_edition(
     edition.current_stage = "QUEUED"  # type: ignore
     edition.last_error = None  # type: ignore
     db.commit()
+
+    enqueue_processing_job(
+        db, edition_id, priority=PRIORITY_MANUAL, payload={"resume": True} if resume else None
+    )
     db.refresh(edition)
 
-    # Add background task with its own session
-    background_tasks.add_task(run_processing_task, edition_id)
+    if settings.processing_inline_worker:
+        background_tasks.add_task(run_processing_task, edition_id)
 
     return edition
 
@@ -81,6 +92,21 @@ async def get_processing_status(
         ExtractionRun.edition_id == edition_id
     ).order_by(ExtractionRun.started_at.desc()).limit(5).all()
 
+    processing_jobs = db.query(ProcessingJob).filter(
+        ProcessingJob.edition_id == edition_id
+    ).order_by(ProcessingJob.id.desc()).limit(5).all()
+
+    processed_pages = edition.processed_pages
+    current_stage = edition.current_stage
+    progress_updated_at = None
+    # Progress is committed in batches; the worker publishes live progress to a side channel
+    if edition.status == EditionStatus.PROCESSING:
+        progress = read_progress(edition_id)
+        if progress:
+            processed_pages = max(processed_pages or 0, progress.get("processed_pages") or 0)
+            current_stage = progress.get("current_stage") or current_stage
+            progress_updated_at = progress.get("updated_at")
+
     return {
         "edition": {
             "id": edition.id,
@@ -88,8 +114,9 @@ async def get_processing_status(
             "last_error": edition.last_error,
             "processed_at": edition.processed_at,
             "total_pages": edition.total_pages,
-            "processed_pages": edition.processed_pages,
-            "current_stage": edition.current_stage,
+            "processed_pages": processed_pages,
+            "current_stage": current_stage,
+            "progress_updated_at": progress_updated_at,
             "archive_status": edition.archive_status,
             "archived_at": edition.archived_at,
         },
@@ -107,5 +134,23 @@ async def get_processing_status(
                 "error_message": run.error_message,
             }
             for run in extraction_runs
-        ]
+        ],
+        "jobs": [
+            {
+                "id": job.id,
+                "status": job.status,
+                "priority": job.priority,
+                "attempts": job.attempts,
+                "max_attempts": job.max_attempts,
+                "lease_owner": job.lease_owner,
+                "lease_expires_at": job.lease_expires_at,
+                "last_completed_page": job.last_completed_page,
+                "error_message": job.error_message,
+                "created_at": job.created_at,
+                "finished_at": job.finished_at,
+            }
+            for job in processing_jobs
+        ],
+        # Per-stage wall/CPU time and peak RSS of the latest run
+        "timings": (extraction_runs[0].stats_json or {}).get("timings") if extraction_runs else None,
     }
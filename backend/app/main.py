@@ -1,4 +1,5 @@
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -25,6 +26,7 @@ from app.api import (
 )
 from app.db.database import Base, engine
 from app.settings import settings
+from app.worker import InlineWorker
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -93,6 +95,19 @@ tags_metadata = [
     },
 ]
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Without standalone workers, keep polling the job queue from the API process
+    inline_worker = None
+    if settings.processing_inline_worker and settings.processing_inline_poll:
+        inline_worker = InlineWorker()
+        inline_worker.start()
+    yield
+    if inline_worker:
+        inline_worker.stop()
+
+
 app = FastAPI(
     title="Newspaper PDF Intelligence API",
     description="""
@@ -125,6 +140,7 @@ For external integrations, use API keys generated via `/api/external/keys/genera
     version="1.0.0",
     debug=settings.debug,
     openapi_tags=tags_metadata,
+    lifespan=lifespan,
     contact={
         "name": "Newspaper Intelligence Support",
         "email": "support@example.com",
@@ -9,6 +9,7 @@ from sqlalchemy import (
     Float,
     ForeignKey,
     Integer,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
@@ -96,6 +97,7 @@ class Edition(Base):
     items = relationship("Item", back_populates="edition", cascade="all, delete-orphan")
     extraction_runs = relationship("ExtractionRun", back_populates="edition", cascade="all, delete-orphan")
     story_groups = relationship("StoryGroup", back_populates="edition", cascade="all, delete-orphan")
+    processing_jobs = relationship("ProcessingJob", back_populates="edition", cascade="all, delete-orphan")
 
 
 class Page(Base):
@@ -125,6 +127,10 @@ class Page(Base):
     layout_method = Column(String(20), nullable=True)  # 'ml' or 'heuristic'
     ocr_words_json = Column(JSON, nullable=True)  # Word-level OCR data with coordinates
 
+    # Checkpointing: pipeline version + settings hash the DONE output was produced with
+    pipeline_fingerprint = Column(String(64), nullable=True)
+    content_hash = Column(String(64), nullable=True, index=True)  # Stage cache key for the page content
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -153,6 +159,9 @@ class Item(Base):
     bbox_json = Column(JSON, nullable=True)
     blocks_json = Column(JSON, nullable=True)  # Block-level text blocks with type, bbox, reading_order
     embedding_json = Column(JSON, nullable=True)  # Text embeddings for semantic search
+    embedding = Column(LargeBinary, nullable=True)  # float32 vector (see services/embedding_store.py)
+    embedding_model = Column(String(200), nullable=True)  # Model that produced embedding
+    embedding_text_hash = Column(String(64), nullable=True)  # SHA-256 of the embedded text
 
     # Extracted entities
     extracted_entities_json = Column(JSON, nullable=True)
@@ -189,6 +198,9 @@ class StoryGroup(Base):
 
     # Semantic grouping enhancements
     embedding_json = Column(JSON, nullable=True)  # Story embeddings for semantic matching
+    embedding = Column(LargeBinary, nullable=True)  # float32 vector: normalized mean of the items'
+    embedding_model = Column(String(200), nullable=True)
+    embedding_text_hash = Column(String(64), nullable=True)
     grouping_method = Column(String(20), nullable=True)  # 'semantic' or 'heuristic'
     similarity_score = Column(Float, nullable=True)  # Semantic similarity score
 
@@ -235,6 +247,39 @@ class ExtractionRun(Base):
     edition = relationship("Edition", back_populates="extraction_runs")
 
 
+class ProcessingJob(Base):
+    """Durable queue entry for edition processing, claimed by workers under a lease."""
+    __tablename__ = "processing_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    edition_id = Column(Integer, ForeignKey("editions.id"), nullable=False, index=True)
+    job_type = Column(String(30), nullable=False, default="process_edition")
+
+    # Queue state
+    status = Column(String(20), nullable=False, default="QUEUED", index=True)  # QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED
+    priority = Column(Integer, nullable=False, default=0, index=True)  # Higher runs first
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    available_at = Column(DateTime(timezone=True), nullable=True)  # Retry backoff
+
+    # Lease held by the worker currently running the job
+    lease_owner = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True, index=True)
+
+    # Progress and results
+    last_completed_page = Column(Integer, nullable=False, default=0)
+    payload = Column(JSON, nullable=True)
+    error_message = Column(Text, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Relationships
+    edition = relationship("Edition", back_populates="processing_jobs")
+
+
 class SavedSearch(Base):
     __tablename__ = "saved_searches"
 
@@ -0,0 +1,110 @@
+"""
+Columnar storage and vectorized geometry for the blocks of a page.
+
+Blocks travel through extraction and layout analysis as dicts
+(``{'text', 'bbox', 'type', 'font_size', ...}``). BlockArray holds their
+boxes, text and font sizes as numpy columns so page-level heuristics can work
+on all blocks at once; the pairwise kernels below take (N, 4) / (M, 4)
+x0, y0, x1, y1 arrays and return (N, M) results.
+"""
+
+from collections.abc import Iterable, Sequence
+from typing import Self
+
+import numpy as np
+
+
+def as_boxes(boxes) -> np.ndarray:
+    """(N, 4) float64 array from an array or a sequence of bboxes."""
+    return np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+
+
+def box_areas(boxes) -> np.ndarray:
+    """Area of each box (0 for inverted boxes)."""
+    boxes = as_boxes(boxes)
+    return (boxes[:, 2:] - boxes[:, :2]).clip(0).prod(axis=1)
+
+
+def intersection_areas(boxes_a, boxes_b) -> np.ndarray:
+    """Pairwise intersection areas of two box arrays."""
+    boxes_a, boxes_b = as_boxes(boxes_a), as_boxes(boxes_b)
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:], boxes_b[None, :, 2:])
+    return np.clip(bottom_right - top_left, 0, None).prod(axis=2)
+
+
+def box_iou(boxes_a, boxes_b) -> np.ndarray:
+    """Pairwise IoU of two box arrays."""
+    intersection = intersection_areas(boxes_a, boxes_b)
+    union = box_areas(boxes_a)[:, None] + box_areas(boxes_b)[None, :] - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def union_boxes(boxes, groups: Sequence[int] | np.ndarray, group_count: int | None = None) -> np.ndarray:
+    """
+    Bounding box of each group of boxes: row ``g`` of the result encloses the
+    boxes with ``groups == g`` (NaN rows for empty groups).
+    """
+    boxes = as_boxes(boxes)
+    groups = np.asarray(groups, dtype=np.intp)
+    if group_count is None:
+        group_count = int(groups.max()) + 1 if len(groups) else 0
+    result = np.full((group_count, 4), np.nan)
+    result[:, :2] = np.inf
+    result[:, 2:] = -np.inf
+    np.minimum.at(result[:, 0], groups, boxes[:, 0])
+    np.minimum.at(result[:, 1], groups, boxes[:, 1])
+    np.maximum.at(result[:, 2], groups, boxes[:, 2])
+    np.maximum.at(result[:, 3], groups, boxes[:, 3])
+    result[~np.isfinite(result).all(axis=1)] = np.nan
+    return result
+
+
+class BlockArray:
+    """
+    The blocks of one page as columns.
+
+    ``boxes`` is (N, 4) float64 in the blocks' own coordinates and
+    ``font_size`` is NaN where unknown.
+    """
+
+    def __init__(self, boxes, texts: Sequence[str] | None = None, font_size=None):
+        self.boxes = as_boxes(boxes)
+        count = len(self.boxes)
+        self.texts = list(texts) if texts is not None else [""] * count
+        self.font_size = (
+            np.full(count, np.nan) if font_size is None else np.asarray(font_size, dtype=np.float64).reshape(count)
+        )
+
+    @classmethod
+    def from_dicts(cls, blocks: Iterable[dict]) -> Self:
+        """Columns from block dicts; a missing bbox is [0, 0, 0, 0] and a non-numeric font size unknown."""
+        blocks = list(blocks)
+        font_sizes = []
+        for block in blocks:
+            font_size = block.get("font_size")
+            font_sizes.append(float(font_size) if isinstance(font_size, int | float) else np.nan)
+        return cls(
+            [list(block.get("bbox") or [0, 0, 0, 0]) for block in blocks],
+            texts=[block.get("text", "") for block in blocks],
+            font_size=font_sizes,
+        )
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    @property
+    def y0(self) -> np.ndarray:
+        return self.boxes[:, 1]
+
+    @property
+    def y1(self) -> np.ndarray:
+        return self.boxes[:, 3]
+
+    def line_counts(self) -> np.ndarray:
+        return np.array([text.count("\n") + 1 for text in self.texts], dtype=np.int32).reshape(len(self))
+
+    def effective_font_sizes(self) -> np.ndarray:
+        """Font size, or box height per text line where the font size is unknown."""
+        approx = (self.y1 - self.y0) / self.line_counts()
+        return np.where(self.font_size > 0, self.font_size, approx)
@@ -14,24 +14,36 @@ Advantages of block-level OCR:
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from typing import TYPE_CHECKING, List, Optional
 
+from app.services import image_preprocess
+from app.services.model_registry import get_model_registry, model_lock
+from app.services.ocr_cache import get_ocr_cache
+from app.services.page_image import PageImage, as_array
+
 if TYPE_CHECKING:
     import numpy as np
-    from PIL import Image
+
+    from app.services.layout_detection_service import DetectedBlock
 
 logger = logging.getLogger(__name__)
 
 # Try to import PaddleOCR
 PADDLEOCR_AVAILABLE = False
 PaddleOCR = None
-np = None
 PILImage = None
 
 try:
-    from paddleocr import PaddleOCR as _PaddleOCR
     import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from paddleocr import PaddleOCR as _PaddleOCR
     from PIL import Image as PILImage
     PaddleOCR = _PaddleOCR
     PADDLEOCR_AVAILABLE = True
@@ -67,7 +79,11 @@ class BlockOCRService:
         prefer_paddle: bool = True,
         lang: str = 'en',
         use_gpu: bool = False,
-        confidence_threshold: float = 0.5
+        confidence_threshold: float = 0.5,
+        preprocess_profile: Optional[str] = None,
+        batch_mode: str = "lines",
+        rec_batch_size: int = 32,
+        workers: int = 0
     ):
         """
         Initialize the block OCR service.
@@ -77,11 +93,29 @@ class BlockOCRService:
             lang: Language code for OCR (default 'en')
             use_gpu: Use GPU for PaddleOCR (default False)
             confidence_threshold: Minimum confidence to keep words (default 0.5)
+            preprocess_profile: Preprocessing profile name applied to each crop
+                (see app.services.image_preprocess); None passes crops through raw
+            batch_mode: How batch_extract runs PaddleOCR: "lines" (detect
+                per block, recognise all lines of the page in batches; the
+                default), "page" (detect and recognise the whole page once,
+                assign lines to blocks) or "none" (each block on its own)
+            rec_batch_size: Line crops per recognition batch in "lines" mode
+            workers: Threads for Tesseract block OCR (0 = CPU count)
         """
         self.prefer_paddle = prefer_paddle
         self.lang = lang
         self.use_gpu = use_gpu
         self.confidence_threshold = confidence_threshold
+        self.preprocess_profile = (
+            image_preprocess.profile_from_settings(preprocess_profile) if preprocess_profile else None
+        )
+        if self.preprocess_profile is not None and self.preprocess_profile.deskew:
+            # Word boxes are read straight off the preprocessed crop or page, so it must not be rotated
+            self.preprocess_profile = replace(self.preprocess_profile, deskew=False)
+        self.batch_mode = batch_mode
+        self.rec_batch_size = max(1, rec_batch_size)
+        self.workers = workers
+        self._pool: ThreadPoolExecutor | None = None
         self._paddle = None
         self._tesseract = None
 
@@ -93,11 +127,15 @@ class BlockOCRService:
         # Initialize OCR engines
         if prefer_paddle and PADDLEOCR_AVAILABLE and PaddleOCR is not None:
             try:
-                self._paddle = PaddleOCR(
-                    use_angle_cls=True,
-                    lang=lang,
-                    use_gpu=use_gpu
+                # Shared across services and jobs; loaded once per process
+                paddle = get_model_registry().handle(
+                    "paddleocr",
+                    {"lang": lang, "use_gpu": use_gpu, "use_angle_cls": True},
+                    lambda: PaddleOCR(use_angle_cls=True, lang=lang, use_gpu=use_gpu),
                 )
+                paddle.load()
+                # Only keep the handle once the model loaded, so a failed load falls back to Tesseract
+                self._paddle = paddle
                 logger.info("PaddleOCR initialized successfully")
             except Exception as e:
                 logger.warning(f"PaddleOCR not available: {e}, will use Tesseract")
@@ -111,50 +149,79 @@ class BlockOCRService:
                 logger.warning(f"Tesseract also unavailable: {e}")
 
     def extract_block_text(
-        self, block: "DetectedBlock", full_image: "np.ndarray"
+        self, block: "DetectedBlock", full_image: "np.ndarray | PageImage"
     ) -> BlockOCRResult:
         """
         Extract text from a single block with word-level coordinates.
 
         Args:
             block: DetectedBlock with bbox to extract
-            full_image: Full page image as numpy array
+            full_image: Full page image as numpy array or PageImage
 
         Returns:
             BlockOCRResult with text, words, and confidence
         """
-        if not PADDLEOCR_AVAILABLE or np is None or PILImage is None:
+        if np is None or (self._paddle is None and self._tesseract is None):
             return self._extract_fallback()
 
         # Get image dimensions
+        full_image = as_array(full_image)
         img_height, img_width = full_image.shape[:2]
 
         # Crop block from full image
-        block_image = self._crop_block(full_image, block.bbox, img_width, img_height)
+        block_image = self._block_crop(full_image, block.bbox)
 
         # Try PaddleOCR first
         if self._paddle is not None:
             try:
-                return self._extract_with_paddle_impl(block_image, block.bbox, img_width, img_height)
+                with model_lock(self._paddle):
+                    return self._extract_with_paddle_impl(block_image, block.bbox, img_width, img_height)
             except Exception as e:
                 logger.warning(f"PaddleOCR extraction failed: {e}, using fallback")
+        elif self._tesseract is not None:
+            try:
+                return self._extract_with_tesseract_impl(block_image, block.bbox)
+            except Exception as e:
+                logger.warning(f"Tesseract block extraction failed: {e}, using fallback")
 
         # Fallback
         return self._extract_fallback()
 
     def batch_extract(
-        self, blocks: List["DetectedBlock"], image: "np.ndarray"
+        self, blocks: List["DetectedBlock"], image: "np.ndarray | PageImage"
     ) -> List[BlockOCRResult]:
         """
-        Extract text from multiple blocks in parallel.
+        Extract text from all blocks of a page.
+
+        With PaddleOCR, batch_mode "lines" (the default) detects lines per
+        block but recognises every line on the page in size-bucketed batches;
+        "page" runs detection and recognition once on the whole page and
+        assigns each line to the block containing its centre; "none" OCRs
+        blocks one at a time. Tesseract blocks run on a thread pool. A
+        batching error falls back to one block at a time.
 
         Args:
             blocks: List of DetectedBlock objects
-            image: Full page image
+            image: Full page image (numpy array or PageImage)
 
         Returns:
             List of BlockOCRResult in same order as input blocks
         """
+        if not blocks:
+            return []
+        if np is not None:
+            try:
+                if self._paddle is not None:
+                    with model_lock(self._paddle):
+                        if self.batch_mode == "page":
+                            return self._batch_page(blocks, image)
+                        if self.batch_mode == "lines":
+                            return self._batch_lines(blocks, image)
+                elif self._tesseract is not None:
+                    return self._batch_tesseract(blocks, image)
+            except Exception as e:
+                logger.warning(f"Batched block OCR failed: {e}, extracting blocks one at a time")
+
         results = []
         for block in blocks:
             try:
@@ -165,6 +232,195 @@ class BlockOCRService:
                 results.append(self._extract_fallback())
         return results
 
+    def _block_crop(self, page: "np.ndarray", bbox: List[float]) -> "np.ndarray":
+        """Crop a block and apply the block preprocessing profile, if any."""
+        height, width = page.shape[:2]
+        block_image = self._crop_block(page, bbox, width, height)
+        if self.preprocess_profile is not None and block_image.size:
+            block_image = image_preprocess.preprocess(block_image, self.preprocess_profile)
+        return block_image
+
+    def _batch_page(self, blocks: List["DetectedBlock"], image: "np.ndarray | PageImage") -> List[BlockOCRResult]:
+        """One PaddleOCR pass over the page; lines go to the smallest block containing their centre."""
+        page = as_array(image)
+        height, width = page.shape[:2]
+        if self.preprocess_profile is not None:
+            page = image_preprocess.preprocess(page, self.preprocess_profile)
+        lines = self._paddle_lines(page)
+
+        assigned: List[list] = [[] for _ in blocks]
+        if lines:
+            boxes = np.array([block.bbox for block in blocks], dtype=np.float64) * [width, height, width, height]
+            areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+            centres = np.array([np.mean(line[0], axis=0) for line in lines])
+            cx, cy = centres[:, :1], centres[:, 1:]
+            inside = (cx >= boxes[:, 0]) & (cx < boxes[:, 2]) & (cy >= boxes[:, 1]) & (cy < boxes[:, 3])
+            owners = np.where(inside, areas, np.inf).argmin(axis=1)
+            for line_index in np.flatnonzero(inside.any(axis=1)):
+                assigned[owners[line_index]].append(lines[line_index])
+
+        def to_page(box):
+            return [box[0] / width, box[1] / height, box[2] / width, box[3] / height]
+
+        return [self._result_from_lines(block_lines, to_page) for block_lines in assigned]
+
+    def _batch_lines(self, blocks: List["DetectedBlock"], image: "np.ndarray | PageImage") -> List[BlockOCRResult]:
+        """Detect lines per block, then recognise all line crops of the page in batches."""
+        page = as_array(image)
+        crops = [self._block_crop(page, block.bbox) for block in blocks]
+
+        line_images = []
+        line_owner = []
+        line_points = []
+        for index, crop in enumerate(crops):
+            if not crop.size:
+                continue
+            detected = self._paddle.ocr(crop, det=True, rec=False, cls=False)
+            for points in (detected[0] if detected and detected[0] else []):
+                xs = [float(point[0]) for point in points]
+                ys = [float(point[1]) for point in points]
+                line_image = crop[
+                    max(0, int(min(ys))):math.ceil(max(ys)), max(0, int(min(xs))):math.ceil(max(xs))
+                ]
+                if line_image.size:
+                    line_images.append(line_image)
+                    line_owner.append(index)
+                    line_points.append([[x, y] for x, y in zip(xs, ys, strict=True)])
+
+        # Bucket by aspect ratio so each batch pads its lines to similar widths
+        order = sorted(range(len(line_images)), key=lambda i: line_images[i].shape[1] / max(1, line_images[i].shape[0]))
+        recognised: list = [None] * len(line_images)
+        for start in range(0, len(order), self.rec_batch_size):
+            chunk = order[start:start + self.rec_batch_size]
+            for line_index, text_info in zip(chunk, self._recognize([line_images[i] for i in chunk]), strict=True):
+                recognised[line_index] = text_info
+
+        block_lines: List[list] = [[] for _ in blocks]
+        for line_index, owner in enumerate(line_owner):
+            block_lines[owner].append([line_points[line_index], list(recognised[line_index])])
+        return [
+            self._result_from_lines(lines, self._block_to_page(block.bbox, crop))
+            for block, lines, crop in zip(blocks, block_lines, crops, strict=True)
+        ]
+
+    def _recognize(self, images: List["np.ndarray"]) -> List[tuple]:
+        """
+        Angle classification and recognition on a batch of line crops:
+        [(text, confidence), ...].
+        """
+        images = [np.repeat(img[:, :, None], 3, axis=2) if img.ndim == 2 else img for img in images]
+        recognizer = getattr(self._paddle, "text_recognizer", None)
+        if recognizer is not None:
+            # Same as the per-block path (cls=True): flip upside-down lines before recognition
+            classifier = getattr(self._paddle, "text_classifier", None)
+            if classifier is not None:
+                images, _angles, _elapse = classifier(images)
+            rec_res, _elapse = recognizer(images)
+            return [(str(text), float(score)) for text, score in rec_res]
+        # PaddleOCR builds without the recognizer attribute: one call per line
+        results = []
+        for img in images:
+            rec = self._paddle.ocr(img, det=False, cls=True)
+            text, score = rec[0][0] if rec and rec[0] else ("", 0.0)
+            results.append((str(text), float(score)))
+        return results
+
+    def _batch_tesseract(self, blocks: List["DetectedBlock"], image: "np.ndarray | PageImage") -> List[BlockOCRResult]:
+        """
+        Tesseract blocks on a thread pool: pytesseract runs one tesseract process
+        per call and tesserocr releases the GIL, so threads use every core.
+        """
+        page = as_array(image)
+
+        def extract(block: "DetectedBlock") -> BlockOCRResult:
+            try:
+                return self._extract_with_tesseract_impl(self._block_crop(page, block.bbox), block.bbox)
+            except Exception as e:
+                logger.error(f"Failed to extract text from block {block.id}: {e}")
+                return self._extract_fallback()
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.workers or os.cpu_count() or 1, thread_name_prefix="block-ocr"
+            )
+        return list(self._pool.map(extract, blocks))
+
+    @staticmethod
+    def _block_to_page(block_bbox: List[float], block_image: "np.ndarray"):
+        """Map a box in block-crop pixels to normalized page coordinates."""
+        block_height, block_width = block_image.shape[:2]
+        block_width_norm = block_bbox[2] - block_bbox[0]
+        block_height_norm = block_bbox[3] - block_bbox[1]
+
+        def to_page(box):
+            return [
+                block_bbox[0] + (box[0] / max(1, block_width)) * block_width_norm,
+                block_bbox[1] + (box[1] / max(1, block_height)) * block_height_norm,
+                block_bbox[0] + (box[2] / max(1, block_width)) * block_width_norm,
+                block_bbox[1] + (box[3] / max(1, block_height)) * block_height_norm,
+            ]
+
+        return to_page
+
+    def _extract_with_tesseract_impl(self, block_image: "np.ndarray", block_bbox: List[float]) -> BlockOCRResult:
+        """
+        Extract text from one crop with Tesseract (a uniform block of text),
+        scaling word confidences to the 0-1 range PaddleOCR uses.
+        """
+        if not block_image.size:
+            return BlockOCRResult(text="", words=[], confidence=0.0, engine="tesseract")
+
+        ocr_result = self._tesseract.extract_text_with_boxes(
+            block_image, preprocess=self.preprocess_profile is None, psm=6, include_words=True
+        )
+        data = ocr_result.get("words") or {}
+        to_page = self._block_to_page(block_bbox, block_image)
+        words = []
+        for text, conf, left, top, width, height in zip(
+            data.get("text", []), data.get("conf", []), data.get("left", []),
+            data.get("top", []), data.get("width", []), data.get("height", []), strict=True,
+        ):
+            confidence = float(conf) / 100
+            if not text.strip() or confidence < self.confidence_threshold:
+                continue
+            words.append({
+                "text": text.strip(),
+                "bbox": to_page([left, top, left + width, top + height]),
+                "confidence": confidence,
+            })
+
+        return BlockOCRResult(
+            text="\n".join(line["text"] for line in ocr_result.get("text_blocks", [])),
+            words=words,
+            confidence=sum(word["confidence"] for word in words) / len(words) if words else 0.0,
+            engine="tesseract",
+        )
+
+    def _paddle_lines(self, block_image: "np.ndarray") -> list:
+        """
+        PaddleOCR lines for a crop as [corner points, (text, confidence)],
+        read through the persistent OCR cache.
+        """
+        cache = get_ocr_cache()
+        cache_key = None
+        if cache.enabled:
+            cache_key = cache.key(block_image, {"engine": "paddle-block", "lang": self.lang})
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached["lines"]
+
+        paddle_result = self._paddle.ocr(block_image, cls=True)
+        lines = []
+        if paddle_result and paddle_result[0]:
+            lines = [
+                [[[float(x), float(y)] for x, y in line[0]], [str(line[1][0]), float(line[1][1])]]
+                for line in paddle_result[0]
+                if line
+            ]
+        if cache_key:
+            cache.put(cache_key, {"lines": lines})
+        return lines
+
     def _extract_with_paddle_impl(
         self,
         block_image: "np.ndarray",
@@ -188,20 +444,25 @@ class BlockOCRService:
             raise RuntimeError("PaddleOCR not initialized")
 
         # Run PaddleOCR on the block
-        paddle_result = self._paddle.ocr(block_image, cls=True)
+        lines = self._paddle_lines(block_image)
 
-        if not paddle_result or not paddle_result[0]:
+        if not lines:
             logger.debug("PaddleOCR returned no results for block")
             return BlockOCRResult(text="", words=[], confidence=0.0, engine="paddle")
 
-        # Parse results
+        return self._result_from_lines(lines, self._block_to_page(block_bbox, block_image))
+
+    def _result_from_lines(self, lines: list, to_page) -> BlockOCRResult:
+        """
+        Build a BlockOCRResult from PaddleOCR lines ([corner points, (text,
+        confidence)]); ``to_page`` maps a pixel box to normalized page coords.
+        """
         words = []
         full_text_lines = []
         confidences = []
 
-        block_height, block_width = block_image.shape[:2]
-
-        for line_data in paddle_result[0]:
+        # Top-to-bottom reading order (page-mode lines arrive in page order)
+        for line_data in sorted(lines, key=lambda line: (min(pt[1] for pt in line[0]), min(pt[0] for pt in line[0]))):
             if not line_data:
                 continue
 
@@ -218,33 +479,10 @@ class BlockOCRService:
             if confidence < self.confidence_threshold:
                 continue
 
-            # Convert PaddleOCR bbox (4 corner points in block coords) to normalized page coords
-            # 1. Get bounding box in block image coordinates
+            # Convert PaddleOCR bbox (4 corner points in pixels) to normalized page coords
             x_coords = [pt[0] for pt in bbox_coords]
             y_coords = [pt[1] for pt in bbox_coords]
-            block_x0 = min(x_coords)
-            block_y0 = min(y_coords)
-            block_x1 = max(x_coords)
-            block_y1 = max(y_coords)
-
-            # 2. Convert from block coordinates to page coordinates
-            # block_bbox is [x0, y0, x1, y1] in normalized page coords
-            block_x0_norm = block_bbox[0]
-            block_y0_norm = block_bbox[1]
-            block_x1_norm = block_bbox[2]
-            block_y1_norm = block_bbox[3]
-
-            # Width and height of block in normalized coordinates
-            block_width_norm = block_x1_norm - block_x0_norm
-            block_height_norm = block_y1_norm - block_y0_norm
-
-            # Convert word bbox from block coords to page coords
-            word_x0 = block_x0_norm + (block_x0 / block_width) * block_width_norm
-            word_y0 = block_y0_norm + (block_y0 / block_height) * block_height_norm
-            word_x1 = block_x0_norm + (block_x1 / block_width) * block_width_norm
-            word_y1 = block_y0_norm + (block_y1 / block_height) * block_height_norm
-
-            bbox_normalized = [word_x0, word_y0, word_x1, word_y1]
+            bbox_normalized = to_page([min(x_coords), min(y_coords), max(x_coords), max(y_coords)])
 
             word_dict = {
                 "text": text,
@@ -290,13 +528,14 @@ class BlockOCRService:
 
 
     def _crop_block(
-        self, full_image: np.ndarray, bbox: List[float], page_width: float, page_height: float
+        self, full_image: np.ndarray | PageImage, bbox: List[float], page_width: float, page_height: float
     ) -> np.ndarray:
         """
         Crop a block from the full page image.
 
         Args:
-            full_image: Full page image
+            full_image: Full page image (numpy array or PageImage); the crop is
+                a view into it, not a copy
             bbox: Normalized bbox [x0, y0, x1, y1] in 0-1 range
             page_width: Page width in pixels
             page_height: Page height in pixels
@@ -322,7 +561,7 @@ class BlockOCRService:
         y0_px = max(0, min(y0_px, page_height - 1))
         y1_px = max(0, min(y1_px, page_height))
 
-        return full_image[y0_px:y1_px, x0_px:x1_px]
+        return as_array(full_image)[y0_px:y1_px, x0_px:x1_px]
 
     def cleanup(self):
         """Release OCR engine resources."""
@@ -332,4 +571,7 @@ class BlockOCRService:
             logger.info("PaddleOCR model cleaned up")
         if self._tesseract is not None:
             self._tesseract = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
         logger.info("Block OCR service cleaned up")
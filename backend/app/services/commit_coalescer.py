@@ -0,0 +1,154 @@
+"""
+Batched DB writes for edition processing.
+
+Processing used to commit after every stage change and every page. The
+CommitCoalescer keeps stage/progress updates and item inserts in memory and
+commits them together every ``processing_db_commit_interval`` pages or
+``processing_db_commit_seconds`` seconds, whichever comes first.
+
+Between commits, live progress is published to a small JSON file per edition
+(``<storage>/progress/edition_<id>.json``) which the status endpoint merges in.
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import UTC, datetime
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models import Edition, Item
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def progress_file_path(edition_id: int) -> str:
+    return os.path.join(settings.storage_path, "progress", f"edition_{edition_id}.json")
+
+
+def write_progress(edition_id: int, progress: dict) -> None:
+    """Atomically publish live progress for an edition."""
+    path = progress_file_path(edition_id)
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as progress_file:
+            json.dump(progress, progress_file)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Could not write progress for edition {edition_id}: {e}")
+
+
+def read_progress(edition_id: int) -> dict | None:
+    """Return live progress for an edition, or None if nothing is published."""
+    try:
+        with open(progress_file_path(edition_id), encoding="utf-8") as progress_file:
+            return json.load(progress_file)
+    except (OSError, ValueError):
+        return None
+
+
+def clear_progress(edition_id: int) -> None:
+    try:
+        os.remove(progress_file_path(edition_id))
+    except OSError:
+        pass
+
+
+class CommitCoalescer:
+    """Buffers per-page processing writes and commits them in batches."""
+
+    def __init__(
+        self,
+        db: Session,
+        edition: Edition,
+        interval_pages: int | None = None,
+        interval_seconds: float | None = None,
+    ):
+        self.db = db
+        self.edition = edition
+        self.edition_id = edition.id
+        self.interval_pages = max(
+            1, interval_pages if interval_pages is not None else settings.processing_db_commit_interval
+        )
+        self.interval_seconds = (
+            interval_seconds if interval_seconds is not None else settings.processing_db_commit_seconds
+        )
+        self.stage = edition.current_stage
+        self.processed_pages = edition.processed_pages or 0
+        self.total_pages = edition.total_pages or 0
+        self.commit_count = 0
+        self._item_rows: list[dict] = []
+        self._pending_pages = 0
+        self._last_commit = time.monotonic()
+
+    def set_stage(self, stage: str) -> None:
+        """Record the current stage; published immediately, committed with the next batch."""
+        if stage == self.stage:
+            return
+        self.stage = stage
+        self.edition.current_stage = stage  # type: ignore
+        self.publish()
+
+    def add_items(self, rows: list[dict]) -> None:
+        """Queue Item rows (column dicts) for a bulk insert at the next flush."""
+        self._item_rows.extend(rows)
+
+    def page_done(self, processed_pages: int) -> None:
+        """Mark a page as written; flushes when the page or time interval is reached."""
+        self.processed_pages = processed_pages
+        self.edition.processed_pages = processed_pages  # type: ignore
+        self.edition.pages_processed = processed_pages  # type: ignore
+        self._pending_pages += 1
+        self.publish()
+        if (
+            self._pending_pages >= self.interval_pages
+            or time.monotonic() - self._last_commit >= self.interval_seconds
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Insert queued items and commit all pending ORM changes in one transaction."""
+        if not self._pending_pages and not self._item_rows and not (self.db.dirty or self.db.new):
+            return
+        if self._item_rows:
+            self.db.execute(insert(Item), self._item_rows)
+            self._item_rows = []
+        self.db.commit()
+        self.commit_count += 1
+        self._pending_pages = 0
+        self._last_commit = time.monotonic()
+
+    def discard(self) -> None:
+        """Drop queued items and roll back everything written since the last commit."""
+        self._item_rows = []
+        self._pending_pages = 0
+        self.db.rollback()
+
+    def edition_status(self) -> str | None:
+        """
+        The edition's committed status (e.g. a cancel from the API), read
+        without autoflushing pending writes: a flush would open the write
+        transaction early and hold SQLite's lock until the next batch commit.
+        """
+        with self.db.no_autoflush:
+            status = self.db.query(Edition.status).filter(Edition.id == self.edition_id).scalar()
+        return str(status) if status is not None else None
+
+    def publish(self) -> None:
+        write_progress(
+            self.edition_id,
+            {
+                "current_stage": self.stage,
+                "processed_pages": self.processed_pages,
+                "total_pages": self.total_pages,
+                "updated_at": datetime.now(UTC).isoformat(),
+            },
+        )
+
+    def close(self) -> None:
+        """Drop the side-channel file once the DB holds the final state."""
+        clear_progress(self.edition_id)
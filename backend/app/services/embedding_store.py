@@ -0,0 +1,112 @@
+"""
+Persistent embeddings for items and story groups.
+
+Vectors are stored as little-endian float32 bytes in the ``embedding``
+column (1.5 KB for a 384-dim model, against ~8 KB as a JSON list), next to
+the model that produced them and a hash of the embedded text. A stored
+vector is reused only when both still match, so regrouping embeds only new
+or changed text. Reprocessing re-creates items; ``carry_over`` moves the
+vectors of the replaced items onto new items whose text is unchanged.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VECTOR_DTYPE = np.dtype("<f4")
+
+
+def pack_vector(vector) -> bytes:
+    return np.asarray(vector, dtype=VECTOR_DTYPE).reshape(-1).tobytes()
+
+
+def unpack_vector(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=VECTOR_DTYPE)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def carry_over(records: Sequence[Any], texts: Sequence[str], previous: Sequence[Any]) -> int:
+    """
+    Copy stored vectors from ``previous`` records (e.g. the items a reprocess
+    is replacing) onto ``records`` that have none, where the record's text
+    (one per record) hashes to the text a previous vector was made from.
+    Returns the number of vectors carried over.
+    """
+    by_hash = {old.embedding_text_hash: old for old in previous if old.embedding and old.embedding_text_hash}
+    carried = 0
+    if not by_hash:
+        return carried
+    for record, text in zip(records, texts, strict=True):
+        old = by_hash.get(text_hash(text))
+        if record.embedding or old is None:
+            continue
+        record.embedding = old.embedding
+        record.embedding_model = old.embedding_model
+        record.embedding_text_hash = old.embedding_text_hash
+        carried += 1
+    return carried
+
+
+class EmbeddingStore:
+    """
+    Reads and writes embeddings on records with ``embedding``,
+    ``embedding_model`` and ``embedding_text_hash`` attributes (Item,
+    StoryGroup). Changes are left on the records for the caller's session
+    to commit.
+    """
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def get(self, record: Any, text: str) -> np.ndarray | None:
+        """The stored vector, if it was made by this model from this text."""
+        if not record.embedding or record.embedding_model != self.model_name:
+            return None
+        if record.embedding_text_hash != text_hash(text):
+            return None
+        return unpack_vector(record.embedding)
+
+    def put(self, record: Any, text: str, vector) -> None:
+        record.embedding = pack_vector(vector)
+        record.embedding_model = self.model_name
+        record.embedding_text_hash = text_hash(text)
+
+    def embed(
+        self,
+        records: Sequence[Any],
+        texts: Sequence[str],
+        generate: Callable[[list[str]], list[np.ndarray | None]],
+    ) -> list[np.ndarray | None]:
+        """
+        Embeddings for ``texts`` (one per record), reading through the store:
+        only texts without a valid stored vector are passed to ``generate``
+        (in one call), and the new vectors are stored on their records.
+        """
+        embeddings: list[np.ndarray | None] = [self.get(record, text) for record, text in zip(records, texts, strict=True)]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None and texts[i].strip()]
+        if missing:
+            generated = generate([texts[i] for i in missing])
+            for i, vector in zip(missing, generated, strict=True):
+                if vector is not None:
+                    self.put(records[i], texts[i], vector)
+                    embeddings[i] = unpack_vector(records[i].embedding)
+        logger.debug(f"Embeddings: {len(records) - len(missing)} stored, {len(missing)} generated")
+        return embeddings
+
+    def put_mean(self, record: Any, text: str, vectors: Sequence[np.ndarray]) -> None:
+        """Store the normalized mean of ``vectors`` (e.g. a story group's items) on ``record``."""
+        if not vectors:
+            return
+        mean = np.mean(np.stack(vectors), axis=0)
+        norm = float(np.linalg.norm(mean))
+        self.put(record, text, mean / norm if norm else mean)
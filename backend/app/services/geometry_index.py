@@ -0,0 +1,91 @@
+"""
+Geometry indexes for page blocks.
+
+Column grouping (layout_analyzer, reading_order_service) and item assembly
+(layout_assembler) used to compare every block with every column or block,
+which is quadratic in blocks per page; word-level OCR output can produce
+thousands of boxes. These helpers give the same answers from a sorted sweep:
+``sweep_columns`` assigns x-extents to columns, ``BandIndex`` finds blocks
+whose top edge falls in a vertical band.
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+
+
+def sweep_columns(extents: Sequence[tuple[float, float]], x_overlap_threshold: float = 0.6) -> list[int]:
+    """
+    Greedy column assignment for x-extents ``(x0, x1)`` sorted by ``x0``.
+
+    Each extent joins the earliest-created column whose span it overlaps by at
+    least ``x_overlap_threshold`` (overlap divided by the narrower width),
+    widening that column, or else starts a new column. This is the result of
+    checking every column in turn; since extents arrive left to right, a
+    column whose right edge is at or left of the current ``x0`` can never
+    overlap again and is retired, so each extent is only checked against the
+    columns spanning its left edge.
+
+    Returns:
+        Column number (in creation order) for each extent
+    """
+    assignment: list[int] = []
+    spans: list[list[float]] = []
+    active: list[int] = []  # Columns still reachable by the sweep, in creation order
+    right_edges: list[tuple[float, int]] = []  # Heap of (right edge, column); stale after widening
+    retire = x_overlap_threshold > 0  # A zero threshold matches even disjoint columns
+
+    for x0, x1 in extents:
+        while retire and right_edges and right_edges[0][0] <= x0:
+            right, column = heapq.heappop(right_edges)
+            if right == spans[column][1]:
+                active.remove(column)
+
+        placed = None
+        for column in active:
+            col_x0, col_x1 = spans[column]
+            inter = min(x1, col_x1) - max(x0, col_x0)
+            if inter > 0:
+                width = min(x1 - x0, col_x1 - col_x0)
+                ratio = inter / width if width else 0.0
+            else:
+                ratio = 0.0
+            if ratio >= x_overlap_threshold:
+                placed = column
+                break
+
+        if placed is None:
+            placed = len(spans)
+            spans.append([x0, x1])
+            active.append(placed)
+            heapq.heappush(right_edges, (x1, placed))
+        else:
+            span = spans[placed]
+            span[0] = min(span[0], x0)
+            if x1 > span[1]:
+                span[1] = x1
+                heapq.heappush(right_edges, (x1, placed))
+        assignment.append(placed)
+
+    return assignment
+
+
+class BandIndex:
+    """Positions of items sorted by top edge, for vertical band queries."""
+
+    def __init__(self, tops: Sequence[float]):
+        self._order = sorted(range(len(tops)), key=tops.__getitem__)
+        self._tops = [tops[position] for position in self._order]
+
+    def between(self, y_min: float, y_max: float) -> list[int]:
+        """
+        Positions of items with ``y_min <= top <= y_max``, in top-edge order.
+
+        Callers re-check their exact condition on the result: the bounds are
+        widened by a rounding margin so ``top - y_bottom <= distance`` style
+        tests are never cut short.
+        """
+        margin = 1e-9 * max(1.0, abs(y_min), abs(y_max))
+        lo = bisect_left(self._tops, y_min - margin)
+        hi = bisect_right(self._tops, y_max + margin)
+        return self._order[lo:hi]
@@ -0,0 +1,304 @@
+"""
+Vectorized image preprocessing for OCR.
+
+Every step works on numpy arrays (grayscale uint8) and uses OpenCV when it
+is installed, falling back to pure numpy otherwise; nothing runs Python code
+per pixel. Steps are selected by a PreprocessProfile, either one of the named
+presets or the profile built from the ``ocr_preprocess_*`` settings.
+
+Used by OCRService for page OCR and by BlockOCRService for block crops.
+Deskewing rotates the pixels, so callers that read boxes off the result use
+``preprocess_with_skew`` and map the boxes back with ``unrotate_word_data``
+or ``rotate_points``.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+from app.settings import settings
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+try:
+    import cv2
+    OPENCV_AVAILABLE = True
+except ImportError:
+    cv2 = None
+    OPENCV_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PreprocessProfile:
+    """Which preprocessing steps to run, in pipeline order."""
+
+    autocontrast: bool = True
+    sharpen: str | None = "unsharp"  # "unsharp", "sharpen" or None
+    binarize: str | None = "adaptive"  # "adaptive", "global" or None
+    global_threshold: int = 170
+    despeckle: bool = False
+    deskew: bool = False
+    max_skew_degrees: float = 5.0
+
+
+PROFILES: dict[str, PreprocessProfile] = {
+    # Scanned newsprint: grey paper, bleed-through and slight rotation
+    "newsprint": PreprocessProfile(despeckle=True, deskew=True),
+    # Clean scans or born-digital rasters: contrast stretch only
+    "clean": PreprocessProfile(sharpen=None, binarize=None),
+    # Block crops for PaddleOCR / block OCR, which prefer grey over binary input
+    "block": PreprocessProfile(sharpen="sharpen", binarize=None),
+    "none": PreprocessProfile(autocontrast=False, sharpen=None, binarize=None),
+}
+
+
+def profile_from_settings(name: str | None = None) -> PreprocessProfile:
+    """
+    Resolve a profile by name; "default" (or None) mirrors the
+    ``ocr_preprocess_*`` settings.
+    """
+    name = name or settings.ocr_preprocess_profile
+    if name and name != "default":
+        if name not in PROFILES:
+            logger.warning(f"Unknown preprocess profile {name!r}, using default")
+        else:
+            return PROFILES[name]
+    profile = PreprocessProfile(
+        sharpen="unsharp" if settings.ocr_preprocess_unsharp else "sharpen",
+        binarize="adaptive" if settings.ocr_preprocess_adaptive and OPENCV_AVAILABLE else "global",
+        global_threshold=max(0, min(255, settings.ocr_preprocess_global_threshold)),
+        despeckle=settings.ocr_preprocess_despeckle,
+        deskew=settings.ocr_preprocess_deskew,
+    )
+    return profile
+
+
+def preprocess(image: np.ndarray, profile: PreprocessProfile | None = None) -> np.ndarray:
+    """
+    Run the profile's steps on an image array and return a new grayscale
+    uint8 array. The input (e.g. a read-only PageImage view) is never modified.
+    """
+    return preprocess_with_skew(image, profile)[0]
+
+
+def preprocess_with_skew(image: np.ndarray, profile: PreprocessProfile | None = None) -> tuple[np.ndarray, float]:
+    """Like ``preprocess``, also returning the rotation in degrees deskew applied (0.0 if none)."""
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy is required for OCR preprocessing")
+    profile = profile or profile_from_settings()
+
+    gray = to_grayscale(np.asarray(image))
+    if profile.autocontrast:
+        gray = autocontrast(gray)
+    if profile.sharpen == "unsharp":
+        gray = unsharp_mask(gray)
+    elif profile.sharpen == "sharpen":
+        gray = sharpen(gray)
+    if profile.binarize == "adaptive" and OPENCV_AVAILABLE:
+        gray = adaptive_threshold(gray)
+    elif profile.binarize:
+        gray = global_threshold(gray, profile.global_threshold)
+    if profile.despeckle:
+        gray = despeckle(gray)
+    angle = 0.0
+    if profile.deskew:
+        gray, angle = _deskew(gray, profile.max_skew_degrees)
+    if gray is image:
+        gray = gray.copy()
+    return gray, angle
+
+
+def to_grayscale(image: np.ndarray) -> np.ndarray:
+    """RGB(A) or grayscale array to 2-D uint8 grayscale (ITU-R 601 luma, as PIL uses)."""
+    if image.ndim == 2:
+        return image.astype(np.uint8, copy=False)
+    if image.shape[2] == 1:
+        return image[:, :, 0].astype(np.uint8, copy=False)
+    if OPENCV_AVAILABLE:
+        code = cv2.COLOR_RGBA2GRAY if image.shape[2] == 4 else cv2.COLOR_RGB2GRAY
+        return cv2.cvtColor(np.ascontiguousarray(image), code)
+    rgb = image[:, :, :3].astype(np.uint32)
+    return ((rgb[:, :, 0] * 299 + rgb[:, :, 1] * 587 + rgb[:, :, 2] * 114 + 500) // 1000).astype(np.uint8)
+
+
+def autocontrast(gray: np.ndarray) -> np.ndarray:
+    """Stretch the darkest/lightest values to 0/255 through a 256-entry lookup table."""
+    histogram = np.bincount(gray.ravel(), minlength=256)
+    present = np.flatnonzero(histogram)
+    if present.size == 0:
+        return gray
+    low, high = int(present[0]), int(present[-1])
+    if high <= low:
+        return gray
+    lut = np.clip((np.arange(256) - low) * (255.0 / (high - low)), 0, 255).astype(np.uint8)
+    return lut[gray]
+
+
+def _box_blur(gray: np.ndarray, radius: int) -> np.ndarray:
+    """Mean filter via integral image (numpy fallback for Gaussian blur)."""
+    size = 2 * radius + 1
+    padded = np.pad(gray.astype(np.float32), radius + 1, mode="edge")
+    integral = padded.cumsum(axis=0).cumsum(axis=1)
+    height, width = gray.shape
+    total = (
+        integral[size:size + height, size:size + width]
+        - integral[0:height, size:size + width]
+        - integral[size:size + height, 0:width]
+        + integral[0:height, 0:width]
+    )
+    return total / (size * size)
+
+
+def _blur(gray: np.ndarray, radius: int) -> np.ndarray:
+    if OPENCV_AVAILABLE:
+        return cv2.GaussianBlur(gray, (0, 0), radius).astype(np.float32)
+    return _box_blur(gray, radius)
+
+
+def unsharp_mask(gray: np.ndarray, radius: int = 2, percent: int = 150, threshold: int = 3) -> np.ndarray:
+    """Same parameters as PIL's UnsharpMask: boost detail where it differs from the blur by >= threshold."""
+    source = gray.astype(np.float32)
+    detail = source - _blur(gray, radius)
+    sharpened = np.where(np.abs(detail) >= threshold, source + detail * (percent / 100.0), source)
+    return np.clip(sharpened, 0, 255).astype(np.uint8)
+
+
+def sharpen(gray: np.ndarray) -> np.ndarray:
+    """PIL's SHARPEN kernel (centre 32, neighbours -2, scale 16)."""
+    source = gray.astype(np.float32)
+    if OPENCV_AVAILABLE:
+        kernel = np.full((3, 3), -2.0, dtype=np.float32)
+        kernel[1, 1] = 32.0
+        result = cv2.filter2D(source, -1, kernel / 16.0, borderType=cv2.BORDER_REPLICATE)
+    else:
+        neighbours = _box_blur(gray, 1) * 9 - source
+        result = (32 * source - 2 * neighbours) / 16.0
+    return np.clip(result, 0, 255).astype(np.uint8)
+
+
+def adaptive_threshold(gray: np.ndarray, block_size: int = 31, offset: int = 10) -> np.ndarray:
+    """Median-smoothed Gaussian adaptive threshold (requires OpenCV)."""
+    smoothed = cv2.medianBlur(gray, 3)
+    return cv2.adaptiveThreshold(
+        smoothed, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, block_size, offset
+    )
+
+
+def global_threshold(gray: np.ndarray, threshold: int) -> np.ndarray:
+    """Binary threshold: pixels above ``threshold`` become white."""
+    return np.where(gray > threshold, 255, 0).astype(np.uint8)
+
+
+def despeckle(gray: np.ndarray) -> np.ndarray:
+    """Remove isolated specks: 3x3 median with OpenCV, otherwise drop dark pixels with no dark neighbour."""
+    if OPENCV_AVAILABLE:
+        return cv2.medianBlur(gray, 3)
+    dark = np.pad(gray < 128, 1, mode="constant")
+    height, width = gray.shape
+    neighbours = np.zeros((height, width), dtype=np.uint8)
+    for dy in (0, 1, 2):
+        for dx in (0, 1, 2):
+            if dy == 1 and dx == 1:
+                continue
+            neighbours += dark[dy:dy + height, dx:dx + width]
+    result = gray.copy()
+    result[(gray < 128) & (neighbours == 0)] = 255
+    return result
+
+
+def estimate_skew(gray: np.ndarray, max_degrees: float = 5.0, step: float = 0.25, max_points: int = 200_000) -> float:
+    """
+    Estimate text skew in degrees from the projection profile of dark pixels.
+
+    Dark pixel coordinates are projected onto the y axis at each candidate
+    angle; text lines line up (and the profile is sharpest) at the true skew.
+    """
+    ys, xs = np.nonzero(gray < 128)
+    if ys.size < 100:
+        return 0.0
+    if ys.size > max_points:
+        pick = np.random.default_rng(0).choice(ys.size, max_points, replace=False)
+        ys, xs = ys[pick], xs[pick]
+    xs = xs.astype(np.float32)
+    ys = ys.astype(np.float32)
+
+    best_angle, best_score = 0.0, -1.0
+    for angle in np.arange(-max_degrees, max_degrees + step / 2, step):
+        theta = np.deg2rad(angle)
+        projected = np.round(ys * np.cos(theta) - xs * np.sin(theta)).astype(np.int64)
+        profile = np.bincount(projected - projected.min())
+        score = float(np.dot(profile, profile))
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+    return best_angle
+
+
+def deskew(gray: np.ndarray, max_degrees: float = 5.0) -> np.ndarray:
+    """Rotate the image to undo the estimated skew (white fill); no-op below 0.1 degrees."""
+    return _deskew(gray, max_degrees)[0]
+
+
+def _deskew(gray: np.ndarray, max_degrees: float) -> tuple[np.ndarray, float]:
+    angle = estimate_skew(gray, max_degrees)
+    if abs(angle) < 0.1:
+        return gray, 0.0
+    height, width = gray.shape
+    if OPENCV_AVAILABLE:
+        matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+        rotated = cv2.warpAffine(gray, matrix, (width, height), flags=cv2.INTER_LINEAR, borderValue=255)
+        return rotated, angle
+    from PIL import Image
+
+    return np.asarray(Image.fromarray(gray).rotate(angle, resample=Image.BILINEAR, fillcolor=255)), angle
+
+
+def rotate_points(points, angle: float, width: int, height: int) -> np.ndarray:
+    """
+    Rotate (x, y) pixel points by ``angle`` degrees about the image centre,
+    the same way ``deskew`` rotates pixels. ``rotate_points(p, -angle, ...)``
+    maps points found on a deskewed image back to the original.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    theta = np.deg2rad(angle)
+    cos, sin = np.cos(theta), np.sin(theta)
+    x = points[..., 0] - width / 2
+    y = points[..., 1] - height / 2
+    return np.stack([cos * x + sin * y + width / 2, -sin * x + cos * y + height / 2], axis=-1)
+
+
+def unrotate_word_data(data: dict, angle: float, width: int, height: int) -> dict:
+    """
+    Word rows (``image_to_data`` layout) read off an image deskewed by
+    ``angle``, with each box replaced by the bounding box of its corners
+    rotated back into the original image.
+    """
+    if not angle or not data.get("left"):
+        return data
+    left = np.asarray(data["left"], dtype=np.float64)
+    top = np.asarray(data["top"], dtype=np.float64)
+    right = left + np.asarray(data["width"], dtype=np.float64)
+    bottom = top + np.asarray(data["height"], dtype=np.float64)
+    corners = np.stack(
+        [np.stack([left, top], -1), np.stack([right, top], -1),
+         np.stack([right, bottom], -1), np.stack([left, bottom], -1)],
+        axis=1,
+    )
+    original = rotate_points(corners, -angle, width, height)
+    x0 = np.clip(np.floor(original[..., 0].min(axis=1)), 0, width)
+    y0 = np.clip(np.floor(original[..., 1].min(axis=1)), 0, height)
+    x1 = np.clip(np.ceil(original[..., 0].max(axis=1)), 0, width)
+    y1 = np.clip(np.ceil(original[..., 1].max(axis=1)), 0, height)
+    mapped = dict(data)
+    mapped["left"] = x0.astype(int).tolist()
+    mapped["top"] = y0.astype(int).tolist()
+    mapped["width"] = (x1 - x0).astype(int).tolist()
+    mapped["height"] = (y1 - y0).astype(int).tolist()
+    return mapped
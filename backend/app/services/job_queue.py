@@ -0,0 +1,369 @@
+"""
+Durable, DB-backed processing job queue.
+
+Jobs live in the ``processing_jobs`` table. Workers (``python -m app.worker``,
+or the API process itself when ``processing_inline_worker`` is on) claim the
+highest-priority runnable job with a conditional UPDATE and hold it under a
+lease that a heartbeat thread keeps renewing. A job whose lease expires (the
+worker crashed or was redeployed) becomes claimable again and resumes from
+the pages that were already committed.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session, aliased
+
+from app.db.database import SessionLocal
+from app.models import Edition, ProcessingJob
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPE_PROCESS_EDITION = "process_edition"
+
+# Job statuses
+JOB_QUEUED = "QUEUED"
+JOB_RUNNING = "RUNNING"
+JOB_SUCCEEDED = "SUCCEEDED"
+JOB_FAILED = "FAILED"
+JOB_CANCELLED = "CANCELLED"
+ACTIVE_JOB_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+# Priorities (higher runs first): fresh uploads ahead of manual runs ahead of bulk reprocessing
+PRIORITY_UPLOAD = 10
+PRIORITY_MANUAL = 5
+PRIORITY_REPROCESS = 0
+
+# Postgres advisory lock held while a worker claims a job
+CLAIM_LOCK_KEY = 7_310_001
+
+
+def _now() -> datetime:
+    return datetime.now(UTC)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_processing_job(
+    db: Session, edition_id: int, *, priority: int = PRIORITY_MANUAL, payload: dict | None = None
+) -> ProcessingJob:
+    """
+    Queue an edition for processing.
+
+    Idempotent: if the edition already has a queued or running job, that job is
+    returned (with its priority raised if needed) instead of adding another. An
+    explicit request also cancels any retry backoff on a queued job.
+    """
+    existing = (
+        db.query(ProcessingJob)
+        .filter(
+            ProcessingJob.edition_id == edition_id,
+            ProcessingJob.job_type == JOB_TYPE_PROCESS_EDITION,
+            ProcessingJob.status.in_(ACTIVE_JOB_STATUSES),
+        )
+        .order_by(ProcessingJob.id.desc())
+        .first()
+    )
+    if existing:
+        if priority > existing.priority:
+            existing.priority = priority
+        if existing.status == JOB_QUEUED:
+            existing.available_at = _now()
+            if payload:
+                existing.payload = {**(existing.payload or {}), **payload}
+        db.commit()
+        return existing
+
+    job = ProcessingJob(
+        edition_id=edition_id,
+        job_type=JOB_TYPE_PROCESS_EDITION,
+        status=JOB_QUEUED,
+        priority=priority,
+        attempts=0,
+        max_attempts=settings.processing_job_max_attempts,
+        available_at=_now(),
+        payload=payload,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    logger.info("Queued processing job %s for edition %s (priority %s)", job.id, edition_id, priority)
+    return job
+
+
+def claim_next_job(db: Session, worker_id: str, edition_id: int | None = None) -> ProcessingJob | None:
+    """
+    Claim the next runnable job for this worker, or return None.
+
+    Runnable means queued (and past its retry backoff) or running under an
+    expired lease. Respects ``processing_queue_concurrency`` across workers.
+    """
+    now = _now()
+    limit = max(1, settings.processing_queue_concurrency)
+    running = (
+        db.query(func.count(ProcessingJob.id))
+        .filter(ProcessingJob.status == JOB_RUNNING, ProcessingJob.lease_expires_at > now)
+        .scalar()
+    )
+    if running >= limit:
+        db.commit()
+        return None
+
+    runnable = or_(
+        and_(
+            ProcessingJob.status == JOB_QUEUED,
+            or_(ProcessingJob.available_at.is_(None), ProcessingJob.available_at <= now),
+        ),
+        and_(ProcessingJob.status == JOB_RUNNING, ProcessingJob.lease_expires_at <= now),
+    )
+    query = db.query(ProcessingJob).filter(runnable)
+    if edition_id is not None:
+        query = query.filter(ProcessingJob.edition_id == edition_id)
+    query = query.order_by(
+        ProcessingJob.priority.desc(), ProcessingJob.created_at.asc(), ProcessingJob.id.asc()
+    )
+    postgres = db.get_bind().dialect.name == "postgresql"
+    if postgres:
+        query = query.with_for_update(skip_locked=True)
+
+    # Re-counted inside the UPDATE, so two claimers cannot both take the last slot
+    live_jobs = aliased(ProcessingJob)
+    running_now = (
+        select(func.count(live_jobs.id))
+        .where(live_jobs.status == JOB_RUNNING, live_jobs.lease_expires_at > now)
+        .scalar_subquery()
+    )
+
+    for candidate in query.limit(10).all():
+        if candidate.status == JOB_RUNNING and candidate.attempts >= candidate.max_attempts:
+            # Lease expired on the final attempt: give up instead of crash-looping
+            candidate.status = JOB_FAILED
+            candidate.error_message = "Lease expired on final attempt"
+            candidate.finished_at = now
+            candidate.lease_owner = None
+            candidate.lease_expires_at = None
+            continue
+
+        if postgres:
+            # Serialize claims until commit so the running count above is current
+            db.execute(select(func.pg_advisory_xact_lock(CLAIM_LOCK_KEY)))
+        # Conditional update: only one worker can move the job from this exact
+        # state, and only while it is still runnable (a renewed lease is not)
+        result = db.execute(
+            update(ProcessingJob)
+            .where(
+                ProcessingJob.id == candidate.id,
+                ProcessingJob.status == candidate.status,
+                ProcessingJob.attempts == candidate.attempts,
+                runnable,
+                running_now < limit,
+            )
+            .values(
+                status=JOB_RUNNING,
+                lease_owner=worker_id,
+                lease_expires_at=now + timedelta(seconds=settings.processing_job_lease_seconds),
+                attempts=ProcessingJob.attempts + 1,
+                started_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        if result.rowcount == 1:
+            db.refresh(candidate)
+            logger.info(
+                "Worker %s claimed job %s (edition %s, attempt %s)",
+                worker_id, candidate.id, candidate.edition_id, candidate.attempts,
+            )
+            return candidate
+
+    db.commit()
+    return None
+
+
+def renew_lease(db: Session, job_id: int, worker_id: str) -> bool:
+    """Extend the lease and record progress. Returns False if the lease was lost."""
+    processed_pages = (
+        db.query(Edition.processed_pages)
+        .join(ProcessingJob, ProcessingJob.edition_id == Edition.id)
+        .filter(ProcessingJob.id == job_id)
+        .scalar()
+    )
+    result = db.execute(
+        update(ProcessingJob)
+        .where(
+            ProcessingJob.id == job_id,
+            ProcessingJob.lease_owner == worker_id,
+            ProcessingJob.status == JOB_RUNNING,
+        )
+        .values(
+            lease_expires_at=_now() + timedelta(seconds=settings.processing_job_lease_seconds),
+            last_completed_page=processed_pages or 0,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+class LeaseHeartbeat:
+    """
+    Background thread that renews a job lease while the job runs.
+
+    The lease counts as lost once another worker holds it, or once renewals
+    have failed (e.g. the database is unreachable) for longer than the lease
+    lasts, since another worker may have claimed the job by then.
+    """
+
+    def __init__(self, job_id: int, worker_id: str, session_factory=SessionLocal, interval: float | None = None):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.session_factory = session_factory
+        self.interval = interval or max(1.0, settings.processing_job_lease_seconds / 3)
+        self.lost = False
+        self._last_renewed = time.monotonic()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-{job_id}", daemon=True)
+
+    def start(self) -> None:
+        self._last_renewed = time.monotonic()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=self.interval)
+
+    def is_lost(self) -> bool:
+        """Whether the job must stop: the lease was taken over or has not been renewed in time."""
+        return self.lost or time.monotonic() - self._last_renewed >= settings.processing_job_lease_seconds
+
+    def renew(self) -> bool:
+        """Renew the lease once. Returns False once the lease is lost."""
+        db = None
+        try:
+            db = self.session_factory()
+            if renew_lease(db, self.job_id, self.worker_id):
+                self._last_renewed = time.monotonic()
+                return True
+            self.lost = True
+            logger.warning("Worker %s lost lease on job %s", self.worker_id, self.job_id)
+        except Exception as e:
+            logger.warning("Lease renewal failed for job %s: %s", self.job_id, e)
+            if not self.is_lost():
+                return True
+            self.lost = True
+            logger.warning("Worker %s could not renew the lease on job %s in time", self.worker_id, self.job_id)
+        finally:
+            if db is not None:
+                db.close()
+        return False
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if not self.renew():
+                return
+
+
+def complete_job(db: Session, job: ProcessingJob) -> None:
+    job.status = JOB_SUCCEEDED
+    job.finished_at = _now()
+    job.lease_owner = None
+    job.lease_expires_at = None
+    job.error_message = None
+    db.commit()
+
+
+def fail_job(db: Session, job: ProcessingJob, error: str | None, *, cancelled: bool = False) -> None:
+    """Record a failed attempt; requeue with backoff unless attempts are exhausted."""
+    job.lease_owner = None
+    job.lease_expires_at = None
+    job.error_message = (error or "Processing failed")[:500]
+    if cancelled:
+        job.status = JOB_CANCELLED
+        job.finished_at = _now()
+    elif job.attempts < job.max_attempts:
+        job.status = JOB_QUEUED
+        job.available_at = _now() + timedelta(
+            seconds=settings.processing_job_retry_backoff_seconds * job.attempts
+        )
+    else:
+        job.status = JOB_FAILED
+        job.finished_at = _now()
+    db.commit()
+
+
+def run_job(db: Session, job: ProcessingJob, worker_id: str, *, heartbeat: bool = True) -> bool:
+    """Run a claimed job to completion. Returns True if the edition processed successfully."""
+    from app.services.processing_service import get_processing_service
+
+    lease = LeaseHeartbeat(job.id, worker_id) if heartbeat else None
+    if lease:
+        lease.start()
+
+    error = None
+    try:
+        # A retry resumes from pages the previous attempt already committed
+        resume = job.attempts > 1 or bool((job.payload or {}).get("resume"))
+        success = get_processing_service().process_edition(
+            job.edition_id, db, resume=resume, should_abort=lease.is_lost if lease else None
+        )
+        if lease and lease.is_lost():
+            error = "Lease lost"
+    except Exception as e:
+        logger.exception("Job %s crashed", job.id)
+        db.rollback()
+        success = False
+        error = str(e)
+    finally:
+        if lease:
+            lease.stop()
+
+    try:
+        db.refresh(job)
+    except InvalidRequestError:
+        # Edition (and its jobs) were deleted while the job was running
+        logger.warning("Job %s disappeared while running", job.id)
+        return success
+    if job.lease_owner != worker_id:
+        # Another worker took over after our lease expired; leave the job to it
+        logger.warning("Job %s is now owned by %s; not recording result", job.id, job.lease_owner)
+        return success
+
+    edition = db.query(Edition).filter(Edition.id == job.edition_id).first()
+    job.last_completed_page = (edition.processed_pages if edition else 0) or 0
+    if success:
+        complete_job(db, job)
+    else:
+        cancelled = edition is not None and str(edition.status) == "CANCELLED"
+        fail_job(db, job, error or (edition.last_error if edition else "Edition not found"), cancelled=cancelled)
+    return success
+
+
+def run_next_job(
+    db: Session, worker_id: str, *, edition_id: int | None = None, heartbeat: bool = True
+) -> bool:
+    """Claim and run one job. Returns False when there was nothing to claim."""
+    job = claim_next_job(db, worker_id, edition_id=edition_id)
+    if job is None:
+        return False
+    run_job(db, job, worker_id, heartbeat=heartbeat)
+    return True
+
+
+def run_inline_jobs(edition_id: int) -> None:
+    """Drain queued work for an edition from inside the API process (BackgroundTasks)."""
+    db = SessionLocal()
+    try:
+        worker_id = f"inline-{default_worker_id()}"
+        while run_next_job(db, worker_id, edition_id=edition_id):
+            pass
+    finally:
+        db.close()
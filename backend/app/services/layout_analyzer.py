@@ -1,7 +1,12 @@
 import logging
 import re
 
+import numpy as np
+
+from .block_array import BlockArray, union_boxes
 from .classifieds_intelligence import create_classifieds_intelligence
+from .geometry_index import sweep_columns
+from .text_rules import Rule, RuleSet
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +16,14 @@ URL_RE = re.compile(r"(https?://|www\.)", re.IGNORECASE)
 PRICE_RE = re.compile(r"\b(KSH|KES|USD|EUR|GBP|SHS|SH)\b|\$\s?\d|€\s?\d", re.IGNORECASE)
 ACTION_RE = re.compile(r"\b(apply|send|call|contact|email|dial|sms|whatsapp)\b", re.IGNORECASE)
 
+# General advertisement indicators; a block needs at least two
+AD_INDICATORS = [
+    r'\bAD\b', r'\bADVERTISEMENT\b', r'\bPROMOTION\b', r'\bOFFER\b',
+    r'\bDISCOUNT\b', r'\bSALE\b', r'\bSPECIAL\b', r'\bLIMITED\b',
+    r'\bCALL\b.*\bNOW\b', r'\bCONTACT\b', r'\bPHONE\b', r'\bEMAIL\b',
+    r'\bWEBSITE\b', r'\bWWW\.', r'\b\.COM\b'
+]
+
 
 class LayoutAnalyzer:
     """Analyzes PDF layout to extract headlines, stories, and classifieds."""
@@ -42,6 +55,23 @@ class LayoutAnalyzer:
                 r'\bHOUSE\b', r'\bLAND\b', r'\bREAL ESTATE\b', r'\bRENT\b'
             ]
         }
+        self._compile_rules()
+
+    def _compile_rules(self) -> None:
+        """
+        Merge the classified patterns (matched case-insensitively) and the ad
+        indicators into one RuleSet over the upper-cased block text. Call again
+        after changing ``classified_patterns``.
+        """
+        self._subtype_order = list(self.classified_patterns)
+        self._block_rules = RuleSet(
+            [
+                Rule(subtype, pattern, re.IGNORECASE)
+                for subtype, patterns in self.classified_patterns.items()
+                for pattern in patterns
+            ]
+            + [Rule("AD", pattern) for pattern in AD_INDICATORS]
+        )
 
     def detect_headlines(self, text_blocks: list[dict]) -> list[dict]:
         """
@@ -51,23 +81,10 @@ class LayoutAnalyzer:
         """
         headlines = []
 
-        font_sizes = []
-        for block in text_blocks:
-            font_size = block.get("font_size")
-            if isinstance(font_size, (int, float)) and font_size > 0:
-                font_sizes.append(font_size)
-                continue
-            bbox = block.get("bbox") or [0, 0, 0, 0]
-            height = float(bbox[3]) - float(bbox[1])
-            line_count = max(1, block.get("text", "").count("\n") + 1)
-            approx_size = height / line_count if line_count else 0.0
-            if approx_size > 0:
-                font_sizes.append(approx_size)
-        median_font = 0.0
-        if font_sizes:
-            font_sizes.sort()
-            mid = len(font_sizes) // 2
-            median_font = font_sizes[mid] if len(font_sizes) % 2 else (font_sizes[mid - 1] + font_sizes[mid]) / 2
+        # Median font size over the page (box height per line where unknown)
+        font_sizes = BlockArray.from_dicts(text_blocks).effective_font_sizes()
+        font_sizes = font_sizes[font_sizes > 0]
+        median_font = float(np.median(font_sizes)) if len(font_sizes) else 0.0
 
         for i, block in enumerate(text_blocks):
             text = block['text'].strip()
@@ -94,7 +111,7 @@ class LayoutAnalyzer:
 
                 # Heuristic 4: Font-based (larger font is more likely a headline)
                 font_size = block.get('font_size')
-                if not isinstance(font_size, (int, float)) or font_size <= 0:
+                if not isinstance(font_size, int | float) or font_size <= 0:
                     height = bbox[3] - bbox[1]
                     line_count = max(1, text.count("\n") + 1)
                     font_size = height / line_count if line_count else 0
@@ -137,6 +154,25 @@ class LayoutAnalyzer:
 
         return headlines
 
+    def block_signals(self, text: str) -> dict:
+        """
+        Evaluate every classification rule against a text block at once.
+
+        Returns:
+            Dict with the classified subtypes hit (in priority order), the
+            number of ad indicators present, contact/price/action flags and
+            the word count
+        """
+        hits = self._block_rules.scan(text.upper())
+        return {
+            'subtypes': [subtype for subtype in self._subtype_order if subtype in hits],
+            'ad_score': hits.get('AD', 0),
+            'has_contact': bool(CONTACT_RE.search(text) or EMAIL_RE.search(text) or URL_RE.search(text)),
+            'has_price': bool(PRICE_RE.search(text)),
+            'has_action': bool(ACTION_RE.search(text)),
+            'word_count': len(text.split()),
+        }
+
     def classify_text_block(self, text: str) -> tuple[str, str | None]:
         """
         Classify a text block as STORY, AD, or CLASSIFIED with subtype.
@@ -144,47 +180,37 @@ class LayoutAnalyzer:
         Returns:
             Tuple of (item_type, subtype)
         """
-        text_upper = text.upper()
-        text_len = len(text)
-        word_count = len(text.split())
-        has_contact = bool(CONTACT_RE.search(text) or EMAIL_RE.search(text) or URL_RE.search(text))
-        has_price = bool(PRICE_RE.search(text))
-        has_action = bool(ACTION_RE.search(text))
-        sentence_count = len(re.findall(r"[.!?]", text))
+        signals = self.block_signals(text)
+        word_count = signals['word_count']
+        has_contact = signals['has_contact']
+        has_price = signals['has_price']
+        has_action = signals['has_action']
 
         def looks_like_story() -> bool:
-            if word_count >= 80 and sentence_count >= 3 and not (has_contact or has_price or has_action):
-                return True
+            if word_count >= 80 and not (has_contact or has_price or has_action):
+                sentence_count = text.count(".") + text.count("!") + text.count("?")
+                return sentence_count >= 3
             return False
 
-        # Check for classified patterns
-        for subtype, patterns in self.classified_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text_upper, re.IGNORECASE):
-                    if looks_like_story():
-                        return 'STORY', None
-                    if subtype == 'PROPERTY' and not (has_contact or has_price or has_action or word_count <= 40):
-                        return 'STORY', None
-                    if subtype == 'JOB' and not (has_contact or has_action or word_count <= 60):
-                        return 'STORY', None
-                    if subtype == 'NOTICE' and not (has_contact or word_count <= 60):
-                        return 'STORY', None
-                    if subtype in {'TENDER', 'AUCTION'} and not (has_contact or has_action or word_count <= 80):
-                        return 'STORY', None
-                    if word_count > 120 and not (has_contact or has_price or has_action):
-                        return 'STORY', None
-                    return 'CLASSIFIED', subtype
+        # Check for classified patterns (the first subtype in priority order wins)
+        if signals['subtypes']:
+            subtype = signals['subtypes'][0]
+            if looks_like_story():
+                return 'STORY', None
+            if subtype == 'PROPERTY' and not (has_contact or has_price or has_action or word_count <= 40):
+                return 'STORY', None
+            if subtype == 'JOB' and not (has_contact or has_action or word_count <= 60):
+                return 'STORY', None
+            if subtype == 'NOTICE' and not (has_contact or word_count <= 60):
+                return 'STORY', None
+            if subtype in {'TENDER', 'AUCTION'} and not (has_contact or has_action or word_count <= 80):
+                return 'STORY', None
+            if word_count > 120 and not (has_contact or has_price or has_action):
+                return 'STORY', None
+            return 'CLASSIFIED', subtype
 
         # Check for general advertisement indicators
-        ad_indicators = [
-            r'\bAD\b', r'\bADVERTISEMENT\b', r'\bPROMOTION\b', r'\bOFFER\b',
-            r'\bDISCOUNT\b', r'\bSALE\b', r'\bSPECIAL\b', r'\bLIMITED\b',
-            r'\bCALL\b.*\bNOW\b', r'\bCONTACT\b', r'\bPHONE\b', r'\bEMAIL\b',
-            r'\bWEBSITE\b', r'\bWWW\.', r'\b\.COM\b'
-        ]
-
-        ad_score = sum(1 for pattern in ad_indicators if re.search(pattern, text_upper))
-        if ad_score >= 2:  # Require at least 2 ad indicators
+        if signals['ad_score'] >= 2:  # Require at least 2 ad indicators
             if looks_like_story():
                 return 'STORY', None
             if word_count > 120 and not (has_contact or has_price):
@@ -335,24 +361,15 @@ class LayoutAnalyzer:
         return ordered
 
     def _assign_columns(self, text_blocks: list[dict], x_overlap_threshold: float = 0.6) -> list[tuple[float, list[dict]]]:
-        columns: list[list[dict]] = []
-        col_boxes: list[list[float]] = []
-        for block in sorted(text_blocks, key=lambda b: (float((b.get('bbox') or [0, 0, 0, 0])[0]), float((b.get('bbox') or [0, 0, 0, 0])[1]))):
-            bbox = list(block.get('bbox') or [0, 0, 0, 0])
-            placed = False
-            for idx, col_box in enumerate(col_boxes):
-                if self._x_overlap_ratio(bbox, col_box) >= x_overlap_threshold:
-                    columns[idx].append(block)
-                    col_boxes[idx] = self._bbox_union(col_box, bbox)
-                    block['column'] = idx
-                    placed = True
-                    break
-            if not placed:
-                block['column'] = len(columns)
-                columns.append([block])
-                col_boxes.append(bbox)
+        blocks = sorted(text_blocks, key=lambda b: (float((b.get('bbox') or [0, 0, 0, 0])[0]), float((b.get('bbox') or [0, 0, 0, 0])[1])))
+        bboxes = [list(block.get('bbox') or [0, 0, 0, 0]) for block in blocks]
+        assignment = sweep_columns([(float(bbox[0]), float(bbox[2])) for bbox in bboxes], x_overlap_threshold)
+        columns: list[list[dict]] = [[] for _ in range(max(assignment, default=-1) + 1)]
+        for block, idx in zip(blocks, assignment, strict=True):
+            columns[idx].append(block)
+        col_boxes = union_boxes(bboxes, assignment, len(columns))
         ordered_columns = sorted(
-            [(col_boxes[i][0], columns[i]) for i in range(len(columns))],
+            [(float(col_boxes[i, 0]), columns[i]) for i in range(len(columns))],
             key=lambda item: item[0],
         )
         for col_idx, (_, col_blocks) in enumerate(ordered_columns):
@@ -394,7 +411,7 @@ class LayoutAnalyzer:
 
     def _estimate_line_height(self, block: dict) -> float:
         font_size = block.get('font_size')
-        if isinstance(font_size, (int, float)) and font_size > 0:
+        if isinstance(font_size, int | float) and font_size > 0:
             return float(font_size)
         bbox = block.get('bbox') or [0, 0, 0, 0]
         height = float(bbox[3]) - float(bbox[1])
@@ -16,6 +16,8 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING, List, Optional
 
+from app.services.geometry_index import BandIndex
+
 if TYPE_CHECKING:
     from app.services.layout_detection_service import DetectedBlock
 
@@ -122,6 +124,8 @@ class LayoutAssembler:
 
         item_groups: List[ItemGroup] = []
         used_blocks = set()
+        # Blocks by top edge, for "what starts just below this block" lookups
+        band_index = BandIndex([b.bbox[1] for b in sorted_blocks])
 
         # Strategy 1: Group headlines with nearby body text
         for block in sorted_blocks:
@@ -129,7 +133,7 @@ class LayoutAssembler:
                 continue
 
             if block.type in ["HEADLINE", "SUBHEADLINE"]:
-                story_group = self._create_story_group(block, sorted_blocks, used_blocks)
+                story_group = self._create_story_group(block, sorted_blocks, used_blocks, band_index)
                 if story_group:
                     item_groups.append(story_group)
                     for b in story_group.blocks:
@@ -158,7 +162,7 @@ class LayoutAssembler:
 
                 # Try to find continuation blocks nearby
                 continuation = self._find_continuation_blocks(
-                    block, sorted_blocks, used_blocks
+                    block, sorted_blocks, used_blocks, band_index
                 )
                 for cont_block in continuation:
                     story_group.add_block(cont_block)
@@ -191,6 +195,7 @@ class LayoutAssembler:
         headline_block: "DetectedBlock",
         all_blocks: List["DetectedBlock"],
         used_blocks: set,
+        band_index: Optional[BandIndex] = None,
     ) -> Optional[ItemGroup]:
         """
         Create a story group starting from a headline block.
@@ -199,6 +204,7 @@ class LayoutAssembler:
             headline_block: Starting HEADLINE or SUBHEADLINE block
             all_blocks: All available blocks
             used_blocks: Set of already-used block IDs
+            band_index: Top-edge index over all_blocks (built if not given)
 
         Returns:
             ItemGroup with headline + body blocks, or None if no body found
@@ -210,8 +216,13 @@ class LayoutAssembler:
         headline_bbox = headline_block.bbox
         headline_y_bottom = headline_bbox[3]
 
-        # Look for body blocks below the headline
-        for block in all_blocks:
+        if band_index is None:
+            band_index = BandIndex([b.bbox[1] for b in all_blocks])
+
+        # Look for body blocks below the headline (only blocks starting in range can qualify)
+        candidates = band_index.between(headline_y_bottom, headline_y_bottom + self.headline_body_max_distance)
+        for position in sorted(candidates):
+            block = all_blocks[position]
             if block.id in used_blocks or block.id == headline_block.id:
                 continue
 
@@ -239,37 +250,58 @@ class LayoutAssembler:
         start_block: "DetectedBlock",
         all_blocks: List["DetectedBlock"],
         used_blocks: set,
+        band_index: Optional[BandIndex] = None,
     ) -> List["DetectedBlock"]:
         """
         Find continuation blocks near the start block.
 
+        Walks all_blocks in order, taking each block that starts just below
+        the last one taken. Rather than scanning every block, each step asks
+        the index for blocks starting in range and takes the earliest one in
+        list order after the previous pick.
+
         Args:
             start_block: Starting block
             all_blocks: All available blocks
             used_blocks: Set of already-used block IDs
+            band_index: Top-edge index over all_blocks (built if not given)
 
         Returns:
             List of continuation blocks
         """
+        if band_index is None:
+            band_index = BandIndex([b.bbox[1] for b in all_blocks])
+
         continuation = []
         current_bbox = start_block.bbox
+        last_position = -1
 
-        for block in all_blocks:
-            if block.id in used_blocks or block.id == start_block.id:
-                continue
-
-            if block.type not in ["BODY", "TEXT"]:
-                continue
-
-            # Check if block is near current position
-            block_y_top = block.bbox[1]
+        while True:
             current_y_bottom = current_bbox[3]
-            vertical_distance = block_y_top - current_y_bottom
-
-            if 0 <= vertical_distance <= self.proximity_threshold:
-                if self._has_horizontal_overlap(current_bbox, block.bbox):
-                    continuation.append(block)
-                    current_bbox = block.bbox  # Update for next iteration
+            next_position = None
+            for position in band_index.between(current_y_bottom, current_y_bottom + self.proximity_threshold):
+                if position <= last_position or (next_position is not None and position >= next_position):
+                    continue
+
+                block = all_blocks[position]
+                if block.id in used_blocks or block.id == start_block.id:
+                    continue
+
+                if block.type not in ["BODY", "TEXT"]:
+                    continue
+
+                # Check if block is near current position
+                vertical_distance = block.bbox[1] - current_y_bottom
+                if 0 <= vertical_distance <= self.proximity_threshold:
+                    if self._has_horizontal_overlap(current_bbox, block.bbox):
+                        next_position = position
+
+            if next_position is None:
+                break
+            block = all_blocks[next_position]
+            continuation.append(block)
+            current_bbox = block.bbox  # Update for next iteration
+            last_position = next_position
 
         return continuation
 
@@ -17,9 +17,15 @@ from __future__ import annotations
 
 import io
 import logging
+import os
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, List, Optional
 
+from app.services import layout_onnx
+from app.services.model_registry import get_model_registry, model_lock
+from app.services.page_image import PageImage
+
 if TYPE_CHECKING:
     import numpy as np
     from PIL import Image
@@ -34,9 +40,13 @@ PILImage = None
 
 try:
     import numpy as np
-    import layoutparser as lp
     from PIL import Image as PILImage
-    LAYOUTPARSER_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"Image dependencies not available: {e}")
+
+try:
+    import layoutparser as lp
+    LAYOUTPARSER_AVAILABLE = np is not None and PILImage is not None
 except ImportError as e:
     logger.warning(f"ML dependencies not available: {e}. Install with: pip install -r requirements-ml.txt")
 
@@ -94,31 +104,79 @@ class LayoutDetectionService:
         "List": "BODY",
         "Table": "TABLE",
         "Figure": "IMAGE",
+        # Labels of models trained with pipeline/scripts/train_detectron2.py
+        "headline": "HEADLINE",
+        "subhead": "SUBHEADLINE",
+        "byline": "BYLINE",
+        "body": "BODY",
+        "caption": "CAPTION",
+        "image": "IMAGE",
+        "ad": "AD",
+        "section": "SECTION_LABEL",
     }
 
-    def __init__(self, model_type: str = "auto", device: str = "cpu", confidence_threshold: float = 0.7):
+    def __init__(
+        self,
+        model_type: str = "auto",
+        device: str = "cpu",
+        confidence_threshold: float = 0.7,
+        onnx_model_path: Optional[str] = None,
+        onnx_threads: int = 0,
+    ):
         """
         Initialize the layout detection service.
 
         Args:
-            model_type: Model to use ('auto', 'layoutparser', 'heuristic')
+            model_type: Model to use ('auto', 'layoutparser', 'onnx', 'heuristic')
             device: Device for model inference ('cpu' or 'cuda')
             confidence_threshold: Minimum confidence for detections
+            onnx_model_path: Exported ONNX model; 'auto' prefers it over PyTorch when set
+            onnx_threads: ONNX Runtime intra-op threads (0 = runtime default)
         """
         self.model_type = model_type
         self.device = device
         self.confidence_threshold = confidence_threshold
         self._model = None
+        self.model_name = "PubLayNet"
 
         logger.info(
             f"Initializing LayoutDetectionService with model_type={model_type}, "
             f"device={device}, confidence={confidence_threshold}"
         )
 
+        use_onnx = (
+            model_type in ["auto", "onnx"]
+            and onnx_model_path is not None
+            and layout_onnx.ONNXRUNTIME_AVAILABLE
+            and np is not None
+        )
+        if model_type == "onnx" and not use_onnx:
+            logger.warning("ONNX layout model requested but onnxruntime or the model path is missing")
+
+        if use_onnx:
+            try:
+                self._model = get_model_registry().handle(
+                    "layout-onnx",
+                    {"path": onnx_model_path, "threads": onnx_threads},
+                    lambda: layout_onnx.OnnxLayoutModel(onnx_model_path, threads=onnx_threads),
+                )
+                self._model.load()
+                self.model_name = f"onnx:{os.path.basename(onnx_model_path)}"
+                logger.info(f"Successfully loaded ONNX layout model {onnx_model_path}")
+            except Exception as e:
+                logger.warning(f"Failed to load ONNX layout model: {e}")
+                self._model = None
+
         # Try to load ML model if requested
-        if model_type in ["auto", "layoutparser"] and LAYOUTPARSER_AVAILABLE:
+        if self._model is None and model_type in ["auto", "layoutparser"] and LAYOUTPARSER_AVAILABLE:
             try:
-                self._model = self._load_model()
+                # Shared across services and jobs; loaded once per process
+                self._model = get_model_registry().handle(
+                    "layoutparser",
+                    {"device": device, "confidence_threshold": confidence_threshold},
+                    self._load_model,
+                )
+                self._model.load()
                 logger.info(f"Successfully loaded LayoutParser model")
             except Exception as e:
                 logger.warning(f"Failed to load ML model: {e}, will use heuristic fallback")
@@ -128,13 +186,14 @@ class LayoutDetectionService:
                 logger.warning("LayoutParser requested but not available, using heuristic fallback")
 
     def detect_layout(
-        self, image_bytes: bytes, page_width: float, page_height: float
+        self, image_bytes: bytes | PageImage | np.ndarray, page_width: float, page_height: float
     ) -> LayoutResult:
         """
         Detect layout blocks in a page image.
 
         Args:
-            image_bytes: PNG/JPEG image bytes of the page
+            image_bytes: PNG/JPEG image bytes of the page, or a PageImage / RGB
+                numpy array, which is used as-is without decoding
             page_width: Page width in PDF points
             page_height: Page height in PDF points
 
@@ -142,30 +201,19 @@ class LayoutDetectionService:
             LayoutResult with detected blocks and metadata
         """
         # Convert image bytes to PIL Image and numpy array
-        if not LAYOUTPARSER_AVAILABLE or PILImage is None or np is None:
+        if not self._ml_dependencies_available():
             logger.warning("ML dependencies not available, cannot perform layout detection")
             return LayoutResult(blocks=[], method="fallback")
 
-        try:
-            pil_image = PILImage.open(io.BytesIO(image_bytes))
-            if pil_image.mode != 'RGB':
-                pil_image = pil_image.convert('RGB')
-            image_array = np.array(pil_image)
-        except Exception as e:
-            logger.error(f"Failed to load image: {e}")
+        image_array = self._to_array(image_bytes)
+        if image_array is None:
             return LayoutResult(blocks=[], method="fallback")
 
         # Try ML detection first
         if self._model is not None:
             try:
                 blocks = self._detect_ml(image_array, page_width, page_height)
-                avg_conf = sum(b.confidence for b in blocks) / len(blocks) if blocks else 0.0
-                return LayoutResult(
-                    blocks=blocks,
-                    method="ml",
-                    model_name="PubLayNet",
-                    avg_confidence=avg_conf
-                )
+                return self._ml_result(blocks)
             except Exception as e:
                 logger.warning(f"ML detection failed: {e}, falling back to heuristic")
 
@@ -173,6 +221,83 @@ class LayoutDetectionService:
         logger.info("Using heuristic layout detection")
         return LayoutResult(blocks=[], method="heuristic")
 
+    def detect_layout_batch(
+        self,
+        pages: Sequence[tuple[bytes | PageImage | np.ndarray, float, float]],
+        batch_size: int = 4,
+    ) -> List[LayoutResult]:
+        """
+        Detect layout blocks on several pages, running the detector on
+        ``batch_size`` pages at a time.
+
+        Args:
+            pages: (image, page_width, page_height) per page, as for detect_layout
+            batch_size: Pages per detector call; 2-8 keeps the backbone's
+                threads busy on CPU without holding too many rasters
+
+        Returns:
+            One LayoutResult per page, in order. A batch that fails is retried
+            page by page, so results match detect_layout's.
+        """
+        if not self._ml_dependencies_available() or self._model is None:
+            return [self.detect_layout(image, width, height) for image, width, height in pages]
+
+        arrays = [self._to_array(image) for image, _, _ in pages]
+        results: List[Optional[LayoutResult]] = [
+            LayoutResult(blocks=[], method="fallback") if array is None else None for array in arrays
+        ]
+        indices = [index for index, array in enumerate(arrays) if array is not None]
+        batch_size = max(1, batch_size)
+
+        for start in range(0, len(indices), batch_size):
+            chunk = indices[start:start + batch_size]
+            try:
+                layouts = self._detect_many([arrays[index] for index in chunk])
+            except Exception as e:
+                logger.warning(f"Batched layout detection failed: {e}, detecting page by page")
+                for index in chunk:
+                    _, width, height = pages[index]
+                    results[index] = self.detect_layout(arrays[index], width, height)
+                continue
+            for index, layout in zip(chunk, layouts, strict=True):
+                results[index] = self._ml_result(self._blocks_from_layout(layout, arrays[index]))
+
+        logger.info(f"Detected layout on {len(pages)} pages in batches of {batch_size}")
+        return results
+
+    @staticmethod
+    def _ml_dependencies_available() -> bool:
+        return (
+            PILImage is not None
+            and np is not None
+            and (LAYOUTPARSER_AVAILABLE or layout_onnx.ONNXRUNTIME_AVAILABLE)
+        )
+
+    @staticmethod
+    def _to_array(image_bytes: bytes | PageImage | np.ndarray) -> Optional["np.ndarray"]:
+        """RGB numpy array of a page image, or None if it cannot be decoded."""
+        try:
+            if isinstance(image_bytes, PageImage):
+                return image_bytes.array
+            if isinstance(image_bytes, np.ndarray):
+                return image_bytes
+            pil_image = PILImage.open(io.BytesIO(image_bytes))
+            if pil_image.mode != 'RGB':
+                pil_image = pil_image.convert('RGB')
+            return np.array(pil_image)
+        except Exception as e:
+            logger.error(f"Failed to load image: {e}")
+            return None
+
+    def _ml_result(self, blocks: List[DetectedBlock]) -> LayoutResult:
+        avg_conf = sum(b.confidence for b in blocks) / len(blocks) if blocks else 0.0
+        return LayoutResult(
+            blocks=blocks,
+            method="ml",
+            model_name=self.model_name,
+            avg_confidence=avg_conf
+        )
+
     def _detect_ml(self, image: "np.ndarray", page_width: float, page_height: float) -> List[DetectedBlock]:
         """
         Perform ML-based layout detection using LayoutParser.
@@ -188,10 +313,31 @@ class LayoutDetectionService:
         if self._model is None:
             raise RuntimeError("Model not loaded")
 
-        # Run detection
-        layout = self._model.detect(image)
+        # Run detection (the model is shared process-wide and not thread-safe)
+        with model_lock(self._model):
+            layout = self._model.detect(image)
+        blocks = self._blocks_from_layout(layout, image)
 
-        # Convert to our format
+        logger.info(f"Detected {len(blocks)} layout blocks using ML")
+        return blocks
+
+    def _detect_many(self, images: List["np.ndarray"]) -> list:
+        """
+        Run the model on several pages: one forward pass for a Detectron2
+        (LayoutParser) model, page by page for other backends.
+        """
+        if self._model is None:
+            raise RuntimeError("Model not loaded")
+        model = self._model.load()
+        with model_lock(self._model):
+            if len(images) > 1:
+                layouts = _detectron2_batch(model, images)
+                if layouts is not None:
+                    return layouts
+            return [model.detect(image) for image in images]
+
+    def _blocks_from_layout(self, layout, image: "np.ndarray") -> List[DetectedBlock]:
+        """Convert model output (pixel boxes) to normalized, confidence-filtered blocks."""
         blocks = []
         img_height, img_width = image.shape[:2]
 
@@ -228,7 +374,6 @@ class LayoutDetectionService:
             )
             blocks.append(block)
 
-        logger.info(f"Detected {len(blocks)} layout blocks using ML")
         return blocks
 
     def _load_model(self):
@@ -242,7 +387,6 @@ class LayoutDetectionService:
             raise ImportError("LayoutParser not available")
 
         # Try to use local model first, fallback to lp:// URL
-        import os
         local_config = "/home/mag.mstatilitechnologies.com/models/publaynet/detectron2_config.yaml"
         local_model = "/home/mag.mstatilitechnologies.com/models/publaynet/model_final_280758.pkl"
 
@@ -284,3 +428,29 @@ class LayoutDetectionService:
             del self._model
             self._model = None
             logger.info("Layout detection model cleaned up")
+
+
+def _detectron2_batch(model, images: List["np.ndarray"]) -> Optional[list]:
+    """
+    Batched forward pass through a LayoutParser Detectron2LayoutModel.
+
+    Mirrors detectron2's DefaultPredictor (input format, test-time resize)
+    for a list of images so the backbone runs them together. Returns None
+    when ``model`` is not a Detectron2 predictor wrapper.
+    """
+    predictor = getattr(model, "model", None)
+    if not all(hasattr(predictor, attribute) for attribute in ("aug", "model", "input_format")):
+        return None
+    import torch
+
+    inputs = []
+    for image in images:
+        if predictor.input_format == "RGB":
+            image = image[:, :, ::-1]
+        height, width = image.shape[:2]
+        resized = predictor.aug.get_transform(image).apply_image(image)
+        tensor = torch.as_tensor(resized.astype("float32").transpose(2, 0, 1))
+        inputs.append({"image": tensor, "height": height, "width": width})
+    with torch.no_grad():
+        outputs = predictor.model(inputs)
+    return [model.gather_output(output) for output in outputs]
@@ -0,0 +1,222 @@
+"""
+ONNX Runtime backend for layout detection.
+
+The Detectron2 / LayoutParser model (PubLayNet, or one trained with
+pipeline/scripts/train_detectron2.py) is exported once with
+pipeline/scripts/export_layout_onnx.py. The export writes ``<name>.onnx``, a
+``<name>.json`` sidecar (label map, input format, resize rule) and, with
+``--quantize``, a dynamically int8-quantized ``<name>.int8.onnx``.
+
+OnnxLayoutModel runs that graph on CPU and exposes the same ``detect(image)``
+interface as a LayoutParser model, so LayoutDetectionService handles both the
+same way. ``mean_average_precision`` is used by scripts/benchmark_layout.py
+to check that an exported or quantized model still finds the boxes the
+PyTorch model finds.
+"""
+
+import json
+import logging
+import os
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image
+
+from .block_array import box_iou
+
+logger = logging.getLogger(__name__)
+
+ONNXRUNTIME_AVAILABLE = False
+ort = None
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    logger.debug("onnxruntime not available; ONNX layout detection disabled")
+
+# Detectron2 test-time defaults (INPUT.MIN_SIZE_TEST / MAX_SIZE_TEST / FORMAT),
+# used when a sidecar does not record them
+DEFAULT_METADATA = {
+    "label_map": {"0": "Text", "1": "Title", "2": "List", "3": "Table", "4": "Figure"},
+    "input_format": "BGR",
+    "min_size": 800,
+    "max_size": 1333,
+    "input_name": "image",
+    "output_names": ["boxes", "classes", "scores"],
+}
+
+
+@dataclass
+class LayoutElement:
+    """One detection, shaped like a LayoutParser TextBlock for LayoutDetectionService."""
+
+    coordinates: tuple[float, float, float, float]
+    type: str
+    score: float
+
+
+def _stem(model_path: str) -> str:
+    for suffix in (".int8.onnx", ".onnx"):
+        if model_path.endswith(suffix):
+            return model_path[: -len(suffix)]
+    return model_path
+
+
+def quantized_path(model_path: str) -> str:
+    """Path of the int8 model the export script writes next to ``model_path``."""
+    return f"{_stem(model_path)}.int8.onnx"
+
+
+def metadata_path(model_path: str) -> str:
+    """Path of the JSON sidecar shared by the fp32 and int8 models."""
+    return f"{_stem(model_path)}.json"
+
+
+def resolve_model_path(model_path: str, quantized: bool) -> str:
+    """The model file to load for the configured precision."""
+    return quantized_path(model_path) if quantized else model_path
+
+
+def load_metadata(model_path: str) -> dict:
+    """Sidecar metadata for a model, falling back to Detectron2/PubLayNet defaults."""
+    metadata = dict(DEFAULT_METADATA)
+    path = metadata_path(model_path)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as sidecar:
+            metadata.update(json.load(sidecar))
+    else:
+        logger.warning(f"No sidecar {path} for {model_path}; assuming PubLayNet defaults")
+    return metadata
+
+
+def resized_shape(height: int, width: int, min_size: int, max_size: int) -> tuple[int, int]:
+    """Detectron2's ResizeShortestEdge: shortest side to ``min_size``, longest capped at ``max_size``."""
+    scale = min_size / min(height, width)
+    new_height, new_width = height * scale, width * scale
+    if max(new_height, new_width) > max_size:
+        scale = max_size / max(new_height, new_width)
+        new_height, new_width = new_height * scale, new_width * scale
+    return int(new_height + 0.5), int(new_width + 0.5)
+
+
+class OnnxLayoutModel:
+    """Exported layout detector run with ONNX Runtime on CPU."""
+
+    def __init__(self, model_path: str, threads: int = 0, session=None):
+        """
+        Args:
+            model_path: ``.onnx`` (or ``.int8.onnx``) file from the export script
+            threads: Intra-op threads; 0 lets ONNX Runtime decide
+            session: An already-built InferenceSession (skips loading ``model_path``)
+        """
+        self.model_path = model_path
+        self.metadata = load_metadata(model_path)
+        self.label_map = {int(key): str(value) for key, value in self.metadata["label_map"].items()}
+        if session is None:
+            if not ONNXRUNTIME_AVAILABLE:
+                raise ImportError("onnxruntime not available. Install with: pip install onnxruntime")
+            session = self._create_session(model_path, threads)
+        self.session = session
+
+    @staticmethod
+    def _create_session(model_path: str, threads: int):
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        session = ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+        logger.info(f"Loaded ONNX layout model {model_path}")
+        return session
+
+    def prepare(self, image: np.ndarray) -> np.ndarray:
+        """RGB uint8 page -> the float32 CHW tensor the exported graph expects (it normalizes itself)."""
+        height, width = image.shape[:2]
+        new_height, new_width = resized_shape(
+            height, width, self.metadata["min_size"], self.metadata["max_size"]
+        )
+        if (new_height, new_width) != (height, width):
+            image = np.asarray(Image.fromarray(image).resize((new_width, new_height), Image.BILINEAR))
+        if self.metadata["input_format"] == "BGR":
+            image = image[:, :, ::-1]
+        return np.ascontiguousarray(image.transpose(2, 0, 1), dtype=np.float32)
+
+    def detect(self, image: np.ndarray) -> list[LayoutElement]:
+        """Detect layout elements in an RGB page; boxes are in ``image`` pixels."""
+        tensor = self.prepare(image)
+        output_names = self.metadata["output_names"]
+        boxes, classes, scores = self.session.run(output_names, {self.metadata["input_name"]: tensor})
+
+        # The graph returns boxes in resized-tensor coordinates
+        scale = np.array(
+            [image.shape[1] / tensor.shape[2], image.shape[0] / tensor.shape[1]] * 2, dtype=np.float32
+        )
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4) * scale
+        return [
+            LayoutElement(
+                coordinates=tuple(float(value) for value in box),
+                type=self.label_map.get(int(label), str(int(label))),
+                score=float(score),
+            )
+            for box, label, score in zip(boxes, np.asarray(classes), np.asarray(scores), strict=True)
+        ]
+
+
+def _average_precision(matched: np.ndarray, scores: np.ndarray, positives: int) -> float:
+    """COCO-style 101-point interpolated AP from per-detection match flags."""
+    order = np.argsort(-scores, kind="stable")
+    true_positives = np.cumsum(matched[order])
+    false_positives = np.cumsum(~matched[order])
+    recall = true_positives / positives
+    precision = true_positives / np.maximum(true_positives + false_positives, 1)
+    # Precision envelope: best precision at any recall at least this high
+    precision = np.maximum.accumulate(precision[::-1])[::-1]
+    points = np.searchsorted(recall, np.linspace(0, 1, 101), side="left")
+    return float(np.where(points < len(precision), precision[np.minimum(points, len(precision) - 1)], 0).mean())
+
+
+def mean_average_precision(
+    predictions: Sequence[dict],
+    references: Sequence[dict],
+    iou_thresholds: Sequence[float] = (0.5,),
+) -> float:
+    """
+    Box mAP of ``predictions`` against ``references``, averaged over classes
+    present in the references and over ``iou_thresholds``.
+
+    Each item is one image: ``{"boxes": (N, 4), "labels": (N,), "scores": (N,)}``
+    (references need no scores). Detections are matched greedily by score to
+    the best-overlapping unmatched reference box of the same label.
+    """
+    classes = sorted({label for reference in references for label in reference["labels"]})
+    if not classes:
+        return 0.0
+
+    ap_values = []
+    for threshold in iou_thresholds:
+        for cls in classes:
+            matched, scores, positives = [], [], 0
+            for prediction, reference in zip(predictions, references, strict=True):
+                ref_boxes = np.asarray(reference["boxes"]).reshape(-1, 4)[np.asarray(reference["labels"]) == cls]
+                keep = np.asarray(prediction["labels"]) == cls
+                pred_boxes = np.asarray(prediction["boxes"]).reshape(-1, 4)[keep]
+                pred_scores = np.asarray(prediction["scores"], dtype=np.float64)[keep]
+                positives += len(ref_boxes)
+
+                ious = box_iou(pred_boxes, ref_boxes)
+                taken = np.zeros(len(ref_boxes), dtype=bool)
+                for index in np.argsort(-pred_scores, kind="stable"):
+                    candidates = np.where(taken, -1.0, ious[index]) if len(ref_boxes) else np.array([])
+                    best = int(candidates.argmax()) if len(candidates) else -1
+                    hit = best >= 0 and candidates[best] >= threshold
+                    if hit:
+                        taken[best] = True
+                    matched.append(hit)
+                    scores.append(pred_scores[index])
+            if positives:
+                ap_values.append(
+                    _average_precision(np.array(matched, dtype=bool), np.array(scores), positives)
+                    if matched else 0.0
+                )
+    return float(np.mean(ap_values)) if ap_values else 0.0
@@ -0,0 +1,242 @@
+"""
+Process-wide registry of warm ML models.
+
+PaddleOCR, the layout detector and the sentence-embedding model each take
+hundreds of MB and seconds to load. Services ask the registry for a
+ModelHandle instead of constructing models themselves; the registry loads
+each distinct (model name, load parameters) pair once and shares it,
+read-only, across every job and thread in the process.
+
+A handle resolves the model on each attribute access, so services never pin
+a model: with ``model_idle_timeout_seconds`` set, models unused for that long
+are dropped by a background reaper and transparently reloaded on next use.
+Load time and the resident-memory growth seen during each load are reported
+by ``stats()``. PaddleOCR and the layout models are not thread-safe, so
+callers run inference under ``model_lock(handle)``, one lock per shared model.
+"""
+
+import gc
+import logging
+import threading
+import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.services.pipeline_version import fingerprint
+from app.services.stage_timer import current_rss_mb
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ModelEntry:
+    """A loaded model and its bookkeeping."""
+
+    name: str
+    params: dict
+    model: Any = None
+    load_seconds: float = 0.0
+    rss_delta_mb: float | None = None
+    loaded_at: float = 0.0
+    last_used: float = 0.0
+    uses: int = 0
+    loads: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    # Held while the model runs; reentrant so a service can nest calls
+    use_lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+
+
+class ModelHandle:
+    """
+    Stand-in for a registry model: attribute access resolves the shared model
+    (loading it if it was never loaded or has been evicted) and forwards to it.
+    """
+
+    def __init__(self, registry: "ModelRegistry", name: str, params: dict, loader: Callable[[], Any]):
+        self._registry = registry
+        self._name = name
+        self._params = params
+        self._loader = loader
+
+    def load(self) -> Any:
+        """Return the shared model, loading it now if needed."""
+        return self._registry.get(self._name, self._params, self._loader)
+
+    def exclusive(self) -> AbstractContextManager:
+        """Lock shared by every handle to this model, for non-thread-safe inference."""
+        return self._registry.use_lock(self._name, self._params)
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self.load(), attribute)
+
+    def __repr__(self) -> str:
+        return f"ModelHandle({self._name!r}, {self._params!r})"
+
+
+class ModelRegistry:
+    """Loads each model once per process and evicts models left idle."""
+
+    def __init__(self, idle_timeout: float = 0.0):
+        self.idle_timeout = idle_timeout
+        self._entries: dict[str, ModelEntry] = {}
+        self._lock = threading.Lock()
+        self._reaper: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @staticmethod
+    def _key(name: str, params: dict) -> str:
+        return f"{name}:{fingerprint(params)}"
+
+    def handle(self, name: str, params: dict, loader: Callable[[], Any]) -> ModelHandle:
+        """A lazy handle to a model; nothing is loaded until it is used (or ``.load()`` is called)."""
+        return ModelHandle(self, name, params, loader)
+
+    def _entry(self, name: str, params: dict) -> ModelEntry:
+        key = self._key(name, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = ModelEntry(name=name, params=dict(params))
+                self._entries[key] = entry
+            return entry
+
+    def use_lock(self, name: str, params: dict) -> threading.RLock:
+        """The lock serializing calls into the model for (name, params), loaded or not."""
+        return self._entry(name, params).use_lock
+
+    def get(self, name: str, params: dict, loader: Callable[[], Any]) -> Any:
+        """
+        Return the shared model for (name, params), calling ``loader`` only if
+        it is not loaded. Concurrent first calls wait for a single load; a
+        loader error propagates and nothing is cached.
+        """
+        entry = self._entry(name, params)
+        with entry.lock:
+            if entry.model is None:
+                self._load(entry, loader)
+            entry.uses += 1
+            entry.last_used = time.monotonic()
+            model = entry.model
+        self._ensure_reaper()
+        return model
+
+    def _load(self, entry: ModelEntry, loader: Callable[[], Any]) -> None:
+        rss_before = current_rss_mb()
+        started = time.perf_counter()
+        model = loader()
+        if model is None:
+            raise RuntimeError(f"Loader for model {entry.name} returned None")
+        entry.load_seconds = round(time.perf_counter() - started, 3)
+        rss_after = current_rss_mb()
+        entry.rss_delta_mb = (
+            round(rss_after - rss_before, 1) if rss_before is not None and rss_after is not None else None
+        )
+        entry.model = model
+        entry.loaded_at = time.time()
+        entry.loads += 1
+        logger.info(
+            f"Loaded model {entry.name} in {entry.load_seconds:.2f}s "
+            f"(RSS +{entry.rss_delta_mb} MB)"
+        )
+
+    def evict(self, name: str | None = None) -> list[str]:
+        """Drop loaded models (all, or those with this name); handles reload them on next use."""
+        evicted = []
+        with self._lock:
+            entries = list(self._entries.values())
+        for entry in entries:
+            if name is not None and entry.name != name:
+                continue
+            with entry.lock:
+                if entry.model is not None:
+                    entry.model = None
+                    evicted.append(entry.name)
+        if evicted:
+            gc.collect()
+            logger.info(f"Evicted models: {', '.join(evicted)}")
+        return evicted
+
+    def evict_idle(self, now: float | None = None) -> list[str]:
+        """Drop models unused for longer than ``idle_timeout`` seconds."""
+        if self.idle_timeout <= 0:
+            return []
+        now = time.monotonic() if now is None else now
+        evicted = []
+        with self._lock:
+            entries = list(self._entries.values())
+        for entry in entries:
+            # Skip models being loaded or used right now rather than waiting on them
+            if not entry.lock.acquire(blocking=False):
+                continue
+            try:
+                if entry.model is not None and now - entry.last_used > self.idle_timeout:
+                    entry.model = None
+                    evicted.append(entry.name)
+            finally:
+                entry.lock.release()
+        if evicted:
+            gc.collect()
+            logger.info(f"Evicted idle models: {', '.join(evicted)}")
+        return evicted
+
+    def _ensure_reaper(self) -> None:
+        if self.idle_timeout <= 0 or (self._reaper is not None and self._reaper.is_alive()):
+            return
+        with self._lock:
+            if self._reaper is not None and self._reaper.is_alive():
+                return
+            interval = max(1.0, min(60.0, self.idle_timeout / 4))
+
+            def reap() -> None:
+                while not self._stop.wait(interval):
+                    self.evict_idle()
+
+            self._reaper = threading.Thread(target=reap, name="model-reaper", daemon=True)
+            self._reaper.start()
+
+    def stop(self) -> None:
+        """Stop the idle reaper thread."""
+        self._stop.set()
+
+    def stats(self) -> list[dict]:
+        """Per-model load time, memory growth at load, use counts and idle time."""
+        now = time.monotonic()
+        with self._lock:
+            entries = list(self._entries.values())
+        return [
+            {
+                "name": entry.name,
+                "params": entry.params,
+                "loaded": entry.model is not None,
+                "load_seconds": entry.load_seconds,
+                "rss_delta_mb": entry.rss_delta_mb,
+                "loads": entry.loads,
+                "uses": entry.uses,
+                "idle_seconds": round(now - entry.last_used, 1) if entry.last_used else None,
+            }
+            for entry in entries
+        ]
+
+
+def model_lock(model: Any) -> AbstractContextManager:
+    """``model.exclusive()`` for a registry handle; a no-op for anything else (e.g. a stand-in model)."""
+    if isinstance(model, ModelHandle):
+        return model.exclusive()
+    return nullcontext()
+
+
+_registry: ModelRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """The process-wide model registry (idle timeout follows settings)."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry(idle_timeout=settings.model_idle_timeout_seconds)
+        _registry.idle_timeout = settings.model_idle_timeout_seconds
+        return _registry
@@ -0,0 +1,202 @@
+"""
+Persistent cache of OCR results.
+
+Entries are keyed by a digest of the exact pixels handed to the OCR engine
+(a page raster or a block crop) plus every engine parameter that changes the
+output (engine, languages, PSM, preprocessing). The pixel digest already
+pins the render DPI, since a different DPI gives different pixels.
+Reprocessing an edition, re-OCRing one page from the UI and repeated
+experiments then skip identical Tesseract / PaddleOCR runs.
+
+Entries are JSON files under ``<storage_path>/ocr_cache``, written
+atomically. A hit refreshes the file's mtime, and once the directory grows
+past ``ocr_cache_max_mb`` the least recently used entries are evicted.
+Hit / miss counters are kept per process and exposed through ``stats()``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+
+from app.services.page_image import PageImage
+from app.services.pipeline_version import fingerprint
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# After an eviction the cache is trimmed to this fraction of its limit, so
+# the directory is not rescanned on every write near the limit
+EVICT_TO_FRACTION = 0.9
+
+
+def image_digest(image) -> str:
+    """Digest of the pixels (and their shape) of a PageImage, array, PIL image or encoded bytes."""
+    digest = hashlib.blake2b(digest_size=20)
+    if isinstance(image, PageImage):
+        digest.update(f"{image.shape}".encode())
+        digest.update(image.pixmap.samples_mv)
+    elif isinstance(image, bytes | bytearray | memoryview):
+        digest.update(b"encoded")
+        digest.update(image)
+    elif hasattr(image, "tobytes") and hasattr(image, "mode"):
+        digest.update(f"{image.mode}{image.size}".encode())
+        digest.update(image.tobytes())
+    else:
+        digest.update(f"{image.shape}{image.dtype}".encode())
+        digest.update(image.tobytes() if not image.flags["C_CONTIGUOUS"] else memoryview(image))
+    return digest.hexdigest()
+
+
+class OCRResultCache:
+    """Size-bounded, LRU-evicted JSON store for OCR results."""
+
+    def __init__(self, root: str | None = None, max_bytes: int = 512 * 1024 * 1024, enabled: bool = True):
+        self.root = root or os.path.join(settings.storage_path, "ocr_cache")
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._size: int | None = None  # Lazily measured on the first write
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def key(self, image, params: dict) -> str:
+        """Cache key for OCR of ``image`` with the given engine parameters."""
+        return fingerprint({"image": image_digest(image), **params})
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> dict | None:
+        """Return the cached result, or None on a miss."""
+        if not self.enabled:
+            return None
+        path = self.path_for(key)
+        try:
+            with open(path, encoding="utf-8") as cache_file:
+                value = json.load(cache_file)
+        except FileNotFoundError:
+            value = None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable OCR cache entry {key}: {e}")
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: dict) -> None:
+        """Store a result, evicting old entries when over the size limit. Failures are only logged."""
+        if not self.enabled:
+            return
+        path = self.path_for(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            payload = json.dumps(value).encode("utf-8")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as cache_file:
+                cache_file.write(payload)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write OCR cache entry {key}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            self.writes += 1
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += len(payload)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        """(mtime, size, path) of every entry."""
+        entries = []
+        for dirpath, _dirnames, filenames in os.walk(self.root):
+            for filename in filenames:
+                if not filename.endswith(".json"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until under EVICT_TO_FRACTION of the limit."""
+        entries = sorted(self._entries())
+        size = sum(entry_size for _, entry_size, _ in entries)
+        target = self.max_bytes * EVICT_TO_FRACTION
+        for _mtime, entry_size, path in entries:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entry_size
+            self.evictions += 1
+        self._size = size
+
+    def stats(self) -> dict:
+        """Hit-rate counters for this process plus the cache's current size on disk."""
+        entries = self._entries() if os.path.isdir(self.root) else []
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "entries": len(entries),
+                "size_bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+            self._size = 0
+            self.hits = self.misses = self.writes = self.evictions = 0
+
+
+_shared_cache: OCRResultCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_ocr_cache() -> OCRResultCache:
+    """
+    Process-wide OCR cache, so hit counters add up across services. Rebuilt
+    if the cache settings change.
+    """
+    global _shared_cache
+    root = settings.ocr_cache_dir or os.path.join(settings.storage_path, "ocr_cache")
+    max_bytes = settings.ocr_cache_max_mb * 1024 * 1024
+    with _shared_cache_lock:
+        cache = _shared_cache
+        if cache is None or (cache.root, cache.max_bytes, cache.enabled) != (
+            root, max_bytes, settings.ocr_cache_enabled
+        ):
+            cache = OCRResultCache(root=root, max_bytes=max_bytes, enabled=settings.ocr_cache_enabled)
+            _shared_cache = cache
+        return cache
@@ -1,16 +1,31 @@
 import logging
-
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+
+from app.services import image_preprocess, ocr_tiling
+from app.services.model_registry import ModelHandle, get_model_registry, model_lock
+from app.services.ocr_cache import get_ocr_cache
+from app.services.page_image import PageImage, as_array
 from app.settings import settings
 
 try:
     import io
     import pytesseract
-    from PIL import Image, ImageFilter, ImageOps
+    from PIL import Image, ImageOps
     TESSERACT_AVAILABLE = True
 except ImportError:
     TESSERACT_AVAILABLE = False
     logging.warning("Tesseract OCR not available. Install with: pip install pytesseract pillow")
 
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    tesserocr = None
+    TESSEROCR_AVAILABLE = False
+
 try:
     from paddleocr import PaddleOCR
     PADDLE_AVAILABLE = True
@@ -19,13 +34,9 @@ except ImportError:
     PADDLE_AVAILABLE = False
 
 try:
-    import cv2
     import numpy as np
-    OPENCV_AVAILABLE = True
 except ImportError:
-    cv2 = None
     np = None
-    OPENCV_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -41,10 +52,17 @@ class OCRService:
             languages: Tesseract language codes (e.g., "eng", "eng+fra")
         """
         self.languages = languages
+        self.engine = self._select_engine(settings.ocr_engine)
+        # One warm tesserocr handle per thread (handles are not thread-safe)
+        self._thread_state = threading.local()
+        self._tile_pool: ThreadPoolExecutor | None = None
         self.available = TESSERACT_AVAILABLE
 
         if not self.available:
             logger.warning("OCR functionality disabled - Tesseract not installed")
+        elif self.engine == "tesserocr":
+            # No tesseract binary needed: libtesseract is linked in-process
+            logger.info(f"Tesseract OCR available in-process via tesserocr, languages: {languages}")
         else:
             if settings.tesseract_cmd:
                 pytesseract.pytesseract.tesseract_cmd = settings.tesseract_cmd
@@ -56,16 +74,94 @@ class OCRService:
                 logger.error(f"Tesseract OCR not properly configured: {e}")
                 self.available = False
 
-        self._paddle: PaddleOCR | None = None
+        self._paddle: ModelHandle | None = None
         if settings.ocr_fallback_enabled and not PADDLE_AVAILABLE:
             logger.warning("PaddleOCR fallback enabled but paddleocr is not installed")
 
-    def extract_text_from_image(self, image_bytes: bytes) -> str:
+    @staticmethod
+    def _select_engine(requested: str) -> str:
+        """Resolve the configured Tesseract backend: pytesseract, tesserocr or auto."""
+        requested = (requested or "pytesseract").lower()
+        if requested in ("tesserocr", "auto"):
+            if TESSEROCR_AVAILABLE:
+                return "tesserocr"
+            if requested == "tesserocr":
+                logger.warning("ocr_engine=tesserocr but tesserocr is not installed; using pytesseract")
+        return "pytesseract"
+
+    def _tess_api(self, psm: int):
+        """Return this thread's tesserocr handle, loading the language model on first use."""
+        api = getattr(self._thread_state, "api", None)
+        if api is None:
+            api = tesserocr.PyTessBaseAPI(lang=self.languages)
+            self._thread_state.api = api
+        api.SetPageSegMode(psm)
+        return api
+
+    def _set_tess_image(self, api, image) -> None:
+        """Hand pixels (PIL image or uint8 array) to tesseract as a raw buffer, with no temp file or encode."""
+        if np is not None and isinstance(image, np.ndarray):
+            pixels = np.ascontiguousarray(image, dtype=np.uint8)
+            height, width = pixels.shape[:2]
+            bytes_per_pixel = 1 if pixels.ndim == 2 else pixels.shape[2]
+        else:
+            if image.mode not in ("L", "RGB"):
+                image = image.convert("RGB")
+            pixels = image.tobytes()
+            width, height = image.size
+            bytes_per_pixel = 1 if image.mode == "L" else 3
+        api.SetImageBytes(bytes(pixels), width, height, bytes_per_pixel, width * bytes_per_pixel)
+
+    def _image_to_data_tesserocr(self, image, psm: int) -> dict:
+        """
+        Run the warm tesserocr handle and return words in pytesseract's
+        ``image_to_data`` dict layout, including the empty rows that mark
+        block / paragraph / line boundaries.
+        """
+        api = self._tess_api(psm)
+        self._set_tess_image(api, image)
+        api.Recognize()
+
+        data = {"text": [], "conf": [], "left": [], "top": [], "width": [], "height": []}
+
+        def add_row(text: str, conf: float, box: tuple[int, int, int, int] | None) -> None:
+            x1, y1, x2, y2 = box or (0, 0, 0, 0)
+            data["text"].append(text)
+            data["conf"].append(conf)
+            data["left"].append(x1)
+            data["top"].append(y1)
+            data["width"].append(x2 - x1)
+            data["height"].append(y2 - y1)
+
+        word_level = tesserocr.RIL.WORD
+        iterator = api.GetIterator()
+        if iterator is not None:
+            for word in tesserocr.iterate_level(iterator, word_level):
+                text = word.GetUTF8Text(word_level)
+                if text is None:
+                    continue
+                if word.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                    add_row("", -1, None)
+                add_row(text, word.Confidence(word_level), word.BoundingBox(word_level))
+        api.Clear()
+        return data
+
+    def _load_image(self, image) -> "Image.Image":
+        """Open PNG bytes, or wrap a PageImage / numpy array without decoding."""
+        if isinstance(image, PageImage):
+            return image.to_pil()
+        if isinstance(image, bytes | bytearray | memoryview):
+            return Image.open(io.BytesIO(image))
+        if isinstance(image, Image.Image):
+            return image
+        return Image.fromarray(image)
+
+    def extract_text_from_image(self, image_bytes) -> str:
         """
         Extract text from image bytes using OCR.
 
         Args:
-            image_bytes: PNG image bytes
+            image_bytes: PNG image bytes, PageImage, or numpy array
 
         Returns:
             Extracted text string
@@ -74,11 +170,16 @@ class OCRService:
             raise RuntimeError("OCR not available - Tesseract not installed or configured")
 
         try:
-            # Open image from bytes
-            image = Image.open(io.BytesIO(image_bytes))
+            image = self._load_image(image_bytes)
 
             # Extract text using Tesseract
-            text = pytesseract.image_to_string(image, lang=self.languages)
+            if self.engine == "tesserocr":
+                api = self._tess_api(settings.ocr_psm)
+                self._set_tess_image(api, image)
+                text = api.GetUTF8Text()
+                api.Clear()
+            else:
+                text = pytesseract.image_to_string(image, lang=self.languages)
 
             return text.strip()
 
@@ -86,44 +187,138 @@ class OCRService:
             logger.error(f"Error extracting text with OCR: {e}")
             raise
 
-    def _preprocess_image(self, image: Image.Image) -> Image.Image:
-        image = ImageOps.grayscale(image)
-        image = ImageOps.autocontrast(image)
-        if settings.ocr_preprocess_unsharp:
-            image = image.filter(ImageFilter.UnsharpMask(radius=2, percent=150, threshold=3))
-        else:
-            image = image.filter(ImageFilter.SHARPEN)
+    def _preprocess_image(self, image) -> "Image.Image":
+        """
+        Run the configured preprocessing profile (see app.services.image_preprocess)
+        on a PIL image, PageImage or array, and return a grayscale PIL image.
+        """
+        return self._preprocess_image_with_skew(image)[0]
+
+    def _preprocess_image_with_skew(self, image) -> tuple["Image.Image", float]:
+        """``_preprocess_image`` plus the deskew rotation in degrees, to map boxes back."""
+        if not image_preprocess.NUMPY_AVAILABLE:
+            image = ImageOps.autocontrast(ImageOps.grayscale(self._load_image(image)))
+            threshold = max(0, min(255, settings.ocr_preprocess_global_threshold))
+            return image.point([255 if value > threshold else 0 for value in range(256)]), 0.0
+        if isinstance(image, bytes | bytearray | memoryview):
+            image = self._load_image(image)
+        pixels, skew = image_preprocess.preprocess_with_skew(as_array(image))
+        return Image.fromarray(pixels), skew
+
+    def _image_to_data(self, image, psm: int) -> dict:
+        """Word rows in pytesseract ``image_to_data`` layout, from the configured engine."""
+        if self.engine == "tesserocr":
+            return self._image_to_data_tesserocr(image, psm)
+        return pytesseract.image_to_data(
+            image,
+            lang=self.languages,
+            config=f"--psm {psm}",
+            output_type=pytesseract.Output.DICT,
+        )
+
+    def _tile_executor(self) -> ThreadPoolExecutor:
+        """Threads for strip OCR; kept for the service's lifetime so tesserocr handles stay warm."""
+        if self._tile_pool is None:
+            workers = settings.ocr_tile_workers or os.cpu_count() or 1
+            self._tile_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr-tile")
+        return self._tile_pool
+
+    def _image_to_data_tiled(self, image, psm: int) -> dict:
+        """
+        OCR the page as overlapping column strips in parallel (see
+        app.services.ocr_tiling) and stitch the words back into page coordinates.
+        """
+        pixels = np.asarray(image)
+        strips = ocr_tiling.plan_column_strips(
+            image_preprocess.to_grayscale(pixels),
+            max_strips=settings.ocr_tile_max_strips,
+            overlap=settings.ocr_tile_overlap_px,
+            min_strip_width=settings.ocr_tile_min_width,
+        )
+        if len(strips) < 2:
+            return self._image_to_data(image, psm)
+        futures = [
+            self._tile_executor().submit(self._image_to_data, pixels[:, strip.x0:strip.x1], psm)
+            for strip in strips
+        ]
+        return ocr_tiling.stitch_strip_data(strips, [future.result() for future in futures])
+
+    @staticmethod
+    def _blocks_from_data(data: dict, conf_threshold: int) -> tuple[list[dict], list[int]]:
+        """Group word rows into line blocks above the confidence threshold; also return all word confidences."""
+        text_blocks = []
+        current_text = ""
+        current_bbox = None
+
+        conf_values = []
+        for i in range(len(data["text"])):
+            text = data["text"][i].strip()
+            if not text:
+                if current_text:
+                    # Save the current text block
+                    if current_bbox:
+                        text_blocks.append({
+                            'text': current_text.strip(),
+                            'bbox': current_bbox,
+                            'type': 'ocr_text'
+                        })
+                    current_text = ""
+                    current_bbox = None
+                continue
+
+            conf = int(float(data["conf"][i]))
+            if conf >= 0:
+                conf_values.append(conf)
+            if conf > conf_threshold:  # Only include text with confidence > threshold
+                x, y, w, h = data["left"][i], data["top"][i], data["width"][i], data["height"][i]
+
+                if not current_text:
+                    current_text = text
+                    current_bbox = [x, y, x + w, y + h]
+                else:
+                    # Extend bounding box
+                    current_bbox[2] = max(current_bbox[2], x + w)
+                    current_bbox[3] = max(current_bbox[3], y + h)
+                    current_text += " " + text
+            else:
+                # Low confidence text - start new block
+                if current_text:
+                    text_blocks.append({
+                        'text': current_text.strip(),
+                        'bbox': current_bbox,
+                        'type': 'ocr_text'
+                    })
+                    current_text = ""
+                    current_bbox = None
 
-        if settings.ocr_preprocess_adaptive and OPENCV_AVAILABLE:
-            img = np.array(image)
-            img = cv2.medianBlur(img, 3)
-            img = cv2.adaptiveThreshold(
-                img,
-                255,
-                cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                cv2.THRESH_BINARY,
-                31,
-                10,
-            )
-            return Image.fromarray(img)
+        # Add the last text block if any
+        if current_text and current_bbox:
+            text_blocks.append({
+                'text': current_text.strip(),
+                'bbox': current_bbox,
+                'type': 'ocr_text'
+            })
 
-        threshold = max(0, min(255, settings.ocr_preprocess_global_threshold))
-        image = image.point(lambda p: 255 if p > threshold else 0)
-        return image
+        return text_blocks, conf_values
 
     def extract_text_with_boxes(
         self,
-        image_bytes: bytes,
+        image_bytes,
         *,
         preprocess: bool = True,
         psm: int = 3,
         conf_threshold: int = 30,
+        tiled: bool = False,
+        include_words: bool = False,
     ) -> dict:
         """
         Extract text with bounding box information.
 
         Args:
-            image_bytes: PNG image bytes
+            image_bytes: PNG image bytes, PageImage, or numpy array
+            tiled: OCR wide pages as parallel column strips (needs numpy)
+            include_words: Also return the raw word rows (``image_to_data``
+                layout, every confidence) under "words", e.g. for region retries
 
         Returns:
             Dictionary with extracted text and position information
@@ -132,87 +327,37 @@ class OCRService:
             raise RuntimeError("OCR not available - Tesseract not installed or configured")
 
         try:
-            # Open image from bytes
-            image = Image.open(io.BytesIO(image_bytes))
-            if preprocess:
-                image = self._preprocess_image(image)
-
-            # Get detailed OCR data with bounding boxes
-            config = f"--psm {psm}"
-            data = pytesseract.image_to_data(
-                image,
-                lang=self.languages,
-                config=config,
-                output_type=pytesseract.Output.DICT,
-            )
-
-            # Process the data to extract text blocks
-            text_blocks = []
-            current_text = ""
-            current_bbox = None
-
-            conf_values = []
-            for i in range(len(data["text"])):
-                text = data["text"][i].strip()
-                if not text:
-                    if current_text:
-                        # Save the current text block
-                        if current_bbox:
-                            text_blocks.append({
-                                'text': current_text.strip(),
-                                'bbox': current_bbox,
-                                'type': 'ocr_text'
-                            })
-                        current_text = ""
-                        current_bbox = None
-                    continue
-
-                conf = int(data["conf"][i])
-                if conf >= 0:
-                    conf_values.append(conf)
-                if conf > conf_threshold:  # Only include text with confidence > threshold
-                    x, y, w, h = data["left"][i], data["top"][i], data["width"][i], data["height"][i]
-
-                    if not current_text:
-                        current_text = text
-                        current_bbox = [x, y, x + w, y + h]
-                    else:
-                        # Extend bounding box
-                        current_bbox[2] = max(current_bbox[2], x + w)
-                        current_bbox[3] = max(current_bbox[3], y + h)
-                        current_text += " " + text
+            cache = get_ocr_cache()
+            cache_key = None
+            data = None
+            if cache.enabled:
+                cache_key = cache.key(
+                    image_bytes, self._cache_params(self.engine, psm=psm, preprocess=preprocess, tiled=tiled)
+                )
+                cached = cache.get(cache_key)
+                data = cached["words"] if cached else None
+
+            if data is None:
+                skew = 0.0
+                if preprocess:
+                    image, skew = self._preprocess_image_with_skew(image_bytes)
                 else:
-                    # Low confidence text - start new block
-                    if current_text:
-                        text_blocks.append({
-                            'text': current_text.strip(),
-                            'bbox': current_bbox,
-                            'type': 'ocr_text'
-                        })
-                        current_text = ""
-                        current_bbox = None
-
-            # Add the last text block if any
-            if current_text and current_bbox:
-                text_blocks.append({
-                    'text': current_text.strip(),
-                    'bbox': current_bbox,
-                    'type': 'ocr_text'
-                })
-
-            # Combine all text for simple extraction
-            full_text = " ".join([block["text"] for block in text_blocks])
-            avg_conf = round(sum(conf_values) / len(conf_values), 2) if conf_values else None
+                    image = self._load_image(image_bytes)
 
-            return {
-                "text": full_text,
-                "text_blocks": text_blocks,
-                "avg_confidence": avg_conf,
-                "word_count": len(full_text.split()),
-                "psm": psm,
-                "preprocess": preprocess,
-                "engine": "tesseract",
-            }
+                if tiled and image_preprocess.NUMPY_AVAILABLE:
+                    data = self._image_to_data_tiled(image, psm)
+                else:
+                    data = self._image_to_data(image, psm)
+                if skew:
+                    # Boxes come off the deskewed image; report them in the caller's frame
+                    data = image_preprocess.unrotate_word_data(data, skew, image.width, image.height)
+                if cache_key:
+                    cache.put(cache_key, {"words": data})
+
+            result = result_from_data(data, psm=psm, preprocess=preprocess, conf_threshold=conf_threshold)
+            if include_words:
+                result["words"] = data
+            return result
 
         except Exception as e:
             logger.error(f"Error extracting OCR text with boxes: {e}")
@@ -227,6 +372,19 @@ class OCRService:
                 "engine": "tesseract",
             }
 
+    def _cache_params(self, engine: str, **params) -> dict:
+        """Everything besides the pixels that changes OCR output, for the OCR cache key."""
+        values = {"engine": engine, "languages": self.languages, **params}
+        if params.get("preprocess"):
+            values["preprocess"] = asdict(image_preprocess.profile_from_settings())
+            if values["preprocess"]["deskew"]:
+                values["box_frame"] = "input"  # Entries from before boxes were mapped back were rotated
+        if params.get("tiled"):
+            values["tiled"] = [
+                settings.ocr_tile_max_strips, settings.ocr_tile_min_width, settings.ocr_tile_overlap_px
+            ]
+        return values
+
     def is_available(self) -> bool:
         """Check if OCR service is available."""
         return self.available
@@ -235,8 +393,16 @@ class OCRService:
         if not settings.ocr_fallback_enabled or not PADDLE_AVAILABLE:
             return None
         if self._paddle is None:
+            lang = settings.ocr_fallback_lang
             try:
-                self._paddle = PaddleOCR(use_angle_cls=True, lang=settings.ocr_fallback_lang)
+                paddle = get_model_registry().handle(
+                    "paddleocr",
+                    {"lang": lang, "use_angle_cls": True},
+                    lambda: PaddleOCR(use_angle_cls=True, lang=lang),
+                )
+                paddle.load()
+                # Only keep the handle once the model loaded; a failed load retries next call
+                self._paddle = paddle
             except Exception as e:
                 logger.error(f"Failed to initialize PaddleOCR: {e}")
                 return None
@@ -244,7 +410,7 @@ class OCRService:
 
     def extract_text_with_boxes_fallback(
         self,
-        image_bytes: bytes,
+        image_bytes,
         *,
         preprocess: bool = True,
     ) -> dict:
@@ -252,14 +418,27 @@ class OCRService:
         if paddle is None:
             raise RuntimeError("PaddleOCR not available")
 
+        cache = get_ocr_cache()
+        cache_key = None
+        if cache.enabled:
+            cache_key = cache.key(
+                image_bytes, self._cache_params("paddle", lang=settings.ocr_fallback_lang, preprocess=preprocess)
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         try:
-            image = Image.open(io.BytesIO(image_bytes))
+            skew = 0.0
             if preprocess:
-                image = self._preprocess_image(image)
+                image, skew = self._preprocess_image_with_skew(image_bytes)
+            else:
+                image = self._load_image(image_bytes)
             image = image.convert("RGB")
             img = np.array(image)
 
-            result = paddle.ocr(img, cls=True)
+            with model_lock(paddle):
+                result = paddle.ocr(img, cls=True)
             text_blocks = []
             conf_values = []
             for line in result or []:
@@ -267,19 +446,21 @@ class OCRService:
                     continue
                 box, (text, conf) = line
                 if text:
+                    if skew:
+                        box = image_preprocess.rotate_points(box, -skew, image.width, image.height)
                     xs = [point[0] for point in box]
                     ys = [point[1] for point in box]
                     text_blocks.append({
                         "text": text,
-                        "bbox": [min(xs), min(ys), max(xs), max(ys)],
+                        "bbox": [float(min(xs)), float(min(ys)), float(max(xs)), float(max(ys))],
                         "type": "ocr_text",
                     })
-                    conf_values.append(conf)
+                    conf_values.append(float(conf))
 
             full_text = " ".join([block["text"] for block in text_blocks])
             avg_conf = round(sum(conf_values) / len(conf_values), 4) if conf_values else None
 
-            return {
+            result = {
                 "text": full_text,
                 "text_blocks": text_blocks,
                 "avg_confidence": avg_conf,
@@ -288,11 +469,33 @@ class OCRService:
                 "preprocess": preprocess,
                 "engine": "paddle",
             }
+            if cache_key:
+                cache.put(cache_key, result)
+            return result
         except Exception as e:
             logger.error(f"Error extracting text with PaddleOCR: {e}")
             raise
 
 
+def result_from_data(data: dict, *, psm: int, preprocess: bool, conf_threshold: int = 30) -> dict:
+    """Build the extract_text_with_boxes result from ``image_to_data`` word rows."""
+    text_blocks, conf_values = OCRService._blocks_from_data(data, conf_threshold)
+
+    # Combine all text for simple extraction
+    full_text = " ".join([block["text"] for block in text_blocks])
+    avg_conf = round(sum(conf_values) / len(conf_values), 2) if conf_values else None
+
+    return {
+        "text": full_text,
+        "text_blocks": text_blocks,
+        "avg_confidence": avg_conf,
+        "word_count": len(full_text.split()),
+        "psm": psm,
+        "preprocess": preprocess,
+        "engine": "tesseract",
+    }
+
+
 def create_ocr_service(languages: str = "eng") -> OCRService:
     """Factory function to create OCR service instance."""
     return OCRService(languages)
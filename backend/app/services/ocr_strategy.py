@@ -0,0 +1,146 @@
+"""
+Region-level planning for low-confidence OCR retries.
+
+A whole-page retry re-reads every word even when only a few areas of the page
+came out badly. The planner groups low-confidence words into padded regions
+so only those areas are re-rendered and re-read; a region's new words replace
+the old ones only when they score higher. Pages where the weak regions cover
+most of the page are still retried as a whole.
+
+Word data uses pytesseract's ``image_to_data`` layout (see
+app.services.ocr_tiling.DATA_FIELDS) in page pixels at the OCR DPI.
+"""
+
+from __future__ import annotations
+
+from app.services.ocr_tiling import DATA_FIELDS
+
+BOUNDARY_ROW = ("", -1, 0, 0, 0, 0)
+
+
+def _rows(data: dict):
+    return zip(*(data[field] for field in DATA_FIELDS), strict=True)
+
+
+def _centre_in(left: int, top: int, width: int, height: int, region: list[int]) -> bool:
+    cx, cy = left + width / 2, top + height / 2
+    return region[0] <= cx < region[2] and region[1] <= cy < region[3]
+
+
+def weak_word_boxes(data: dict, threshold: float) -> list[list[int]]:
+    """Boxes of recognised words whose confidence is below ``threshold``."""
+    return [
+        [left, top, left + width, top + height]
+        for text, conf, left, top, width, height in _rows(data)
+        if text.strip() and 0 <= float(conf) < threshold
+    ]
+
+
+def merge_boxes(boxes: list[list[int]], pad: int, width: int, height: int) -> list[list[int]]:
+    """Pad boxes (clipped to the page) and merge overlapping ones into disjoint regions."""
+    regions = [
+        [max(0, x0 - pad), max(0, y0 - pad), min(width, x1 + pad), min(height, y1 + pad)]
+        for x0, y0, x1, y1 in boxes
+    ]
+    changed = True
+    while changed:
+        changed = False
+        merged: list[list[int]] = []
+        for box in sorted(regions, key=lambda b: (b[1], b[0])):
+            for region in merged:
+                if box[0] < region[2] and region[0] < box[2] and box[1] < region[3] and region[1] < box[3]:
+                    region[:] = [
+                        min(region[0], box[0]), min(region[1], box[1]),
+                        max(region[2], box[2]), max(region[3], box[3]),
+                    ]
+                    changed = True
+                    break
+            else:
+                merged.append(list(box))
+        regions = merged
+    return regions
+
+
+def coverage(regions: list[list[int]], width: int, height: int) -> float:
+    """Fraction of the page area covered by disjoint regions."""
+    if width <= 0 or height <= 0:
+        return 0.0
+    return sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in regions) / (width * height)
+
+
+def plan_region_retry(
+    data: dict, width: int, height: int, *, threshold: float, pad: int, max_coverage: float
+) -> list[list[int]] | None:
+    """
+    Regions to re-OCR, largest first. Returns [] when no word is weak and
+    None when the regions cover more than ``max_coverage`` of the page, in
+    which case a whole-page retry is cheaper and more accurate.
+    """
+    regions = merge_boxes(weak_word_boxes(data, threshold), pad, width, height)
+    if coverage(regions, width, height) > max_coverage:
+        return None
+    return sorted(regions, key=lambda r: (r[2] - r[0]) * (r[3] - r[1]), reverse=True)
+
+
+def region_confidence(data: dict, region: list[int]) -> float | None:
+    """Mean confidence of the words centred in a region."""
+    confs = [
+        float(conf)
+        for text, conf, left, top, width, height in _rows(data)
+        if text.strip() and float(conf) >= 0 and _centre_in(left, top, width, height, region)
+    ]
+    return sum(confs) / len(confs) if confs else None
+
+
+def to_page_rows(region_data: dict, region: list[int], scale: float) -> dict:
+    """
+    Map words read from a region crop (rendered ``scale`` times larger) back
+    to page pixels. Words touching the crop border are dropped: they are cut
+    off, and the page pass already has them whole.
+    """
+    crop_width = (region[2] - region[0]) * scale
+    crop_height = (region[3] - region[1]) * scale
+    mapped = {field: [] for field in DATA_FIELDS}
+    for text, conf, left, top, width, height in _rows(region_data):
+        if text.strip() and (
+            left <= 1 or top <= 1 or left + width >= crop_width - 1 or top + height >= crop_height - 1
+        ):
+            continue
+        row = (
+            text,
+            conf,
+            region[0] + round(left / scale),
+            region[1] + round(top / scale),
+            round(width / scale),
+            round(height / scale),
+        )
+        for field, value in zip(DATA_FIELDS, row, strict=True):
+            mapped[field].append(value)
+    return mapped
+
+
+def splice_region(data: dict, region: list[int], replacement: dict) -> dict:
+    """Replace the words centred in a region with ``replacement`` rows, in place of the first one."""
+    spliced = {field: [] for field in DATA_FIELDS}
+
+    def append(row) -> None:
+        for field, value in zip(DATA_FIELDS, row, strict=True):
+            spliced[field].append(value)
+
+    inserted = False
+    for row in _rows(data):
+        text, _conf, left, top, width, height = row
+        if text.strip() and _centre_in(left, top, width, height, region):
+            if not inserted:
+                append(BOUNDARY_ROW)
+                for new_row in _rows(replacement):
+                    append(new_row)
+                append(BOUNDARY_ROW)
+                inserted = True
+            continue
+        append(row)
+    if not inserted:
+        append(BOUNDARY_ROW)
+        for new_row in _rows(replacement):
+            append(new_row)
+    return spliced
@@ -0,0 +1,105 @@
+"""
+Page image handoff between rendering and the OCR / layout stages.
+
+PageImage wraps a rendered fitz.Pixmap and exposes its sample buffer as a
+numpy array (via the buffer protocol) or a PIL image without copying or
+re-encoding the pixels. The wrapper holds a reference to the pixmap, so the
+views stay valid for as long as the PageImage is alive.
+"""
+
+from __future__ import annotations
+
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+import fitz  # PyMuPDF
+
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL import Image
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+try:
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+
+_PIL_MODES = {1: "L", 3: "RGB", 4: "RGBA"}
+
+
+class PageImage:
+    """Read-only, zero-copy view of a rendered page raster."""
+
+    def __init__(self, pixmap: fitz.Pixmap):
+        self.pixmap = pixmap
+
+    @property
+    def width(self) -> int:
+        return self.pixmap.width
+
+    @property
+    def height(self) -> int:
+        return self.pixmap.height
+
+    @property
+    def channels(self) -> int:
+        return self.pixmap.n
+
+    @property
+    def shape(self) -> tuple[int, int, int]:
+        return (self.height, self.width, self.channels)
+
+    @cached_property
+    def array(self) -> np.ndarray:
+        """Pixel data as a read-only (height, width, channels) uint8 array sharing the pixmap buffer."""
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required for array access to page images")
+        pix = self.pixmap
+        buffer = np.frombuffer(pix.samples_mv, dtype=np.uint8)
+        row_bytes = pix.width * pix.n
+        if pix.stride == row_bytes:
+            array = buffer.reshape(pix.height, pix.width, pix.n)
+        else:
+            array = buffer.reshape(pix.height, pix.stride)[:, :row_bytes].reshape(
+                pix.height, pix.width, pix.n
+            )
+        # Stages share this raster, so nobody may modify it in place
+        array.flags.writeable = False
+        return array
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or np.dtype(dtype) == self.array.dtype:
+            return self.array
+        return self.array.astype(dtype)
+
+    def to_pil(self) -> Image.Image:
+        """Return a PIL image backed by the pixmap buffer (no decode)."""
+        if PILImage is None:
+            raise RuntimeError("Pillow is required to convert page images")
+        pix = self.pixmap
+        mode = _PIL_MODES.get(pix.n)
+        if mode is None:
+            raise ValueError(f"Unsupported pixmap channel count: {pix.n}")
+        return PILImage.frombuffer(
+            mode, (pix.width, pix.height), pix.samples_mv, "raw", mode, pix.stride, 1
+        )
+
+    def to_png(self) -> bytes:
+        """Encode as PNG (for callers that still need bytes)."""
+        return self.pixmap.tobytes("png")
+
+    def save(self, path: str) -> None:
+        self.pixmap.save(path)
+
+
+def as_array(image: PageImage | np.ndarray) -> np.ndarray:
+    """Return a numpy view of a PageImage, or pass an existing array through."""
+    if isinstance(image, PageImage):
+        return image.array
+    return image
@@ -1,15 +1,131 @@
+import hashlib
 import logging
+from contextlib import AbstractContextManager, nullcontext
 
 import fitz  # PyMuPDF
 
+from app.services.block_array import box_areas, intersection_areas
+from app.services.ocr_strategy import coverage, merge_boxes
+from app.services.page_image import PageImage
+
 logger = logging.getLogger(__name__)
 
+# An image region whose area is at least this much native text is a background
+# behind vector text, not a scan to OCR
+HYBRID_TEXT_COVERED_FRACTION = 0.5
+# Padding (PDF points) when merging neighbouring image regions
+HYBRID_REGION_PAD_PT = 2.0
+
+
+class PageRenderCache:
+    """
+    Rasterises one PDF page and shares the result between extraction, OCR
+    and layout detection.
+
+    Only the highest-resolution pixmap requested so far is kept; lower DPI or
+    width requests are downsampled from it, and those views are cached by
+    pixel size. A higher-resolution request re-renders the page and drops the
+    views, and ``release()`` frees everything once the page is done.
+    """
+
+    def __init__(self, doc: fitz.Document, page_num: int, lock: AbstractContextManager | None = None):
+        self.doc = doc
+        self.page_num = page_num
+        # Guards document access when several threads share one fitz.Document
+        self._lock = lock or nullcontext()
+        with self._lock:
+            self._page_width = doc[page_num].rect.width
+        self._pixmap: fitz.Pixmap | None = None
+        self._scale = 0.0
+        self._views: dict[tuple[int, int], fitz.Pixmap] = {}
+        self.render_count = 0
+
+    def scale_for(self, dpi: int = 150, target_width: int | None = None) -> float:
+        """Return the render scale for a DPI or target pixel width (width wins)."""
+        if target_width is not None:
+            return target_width / self._page_width
+        return dpi / 72
+
+    def reserve(self, dpi: int = 150, target_width: int | None = None) -> None:
+        """Make sure the cached raster is at least this resolution."""
+        scale = self.scale_for(dpi, target_width)
+        if self._pixmap is not None and self._scale >= scale - 1e-6:
+            return
+
+        with self._lock:
+            page = self.doc[self.page_num]
+            self._pixmap = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+        self._scale = scale
+        self._views.clear()
+        self.render_count += 1
+        logger.debug(
+            f"Page {self.page_num + 1}: Rendered at scale {scale:.2f}x "
+            f"({self._pixmap.width}x{self._pixmap.height}px)"
+        )
+
+    def get_pixmap(self, dpi: int = 150, target_width: int | None = None) -> fitz.Pixmap:
+        """Return a pixmap at the requested resolution, downsampling the cached raster."""
+        self.reserve(dpi, target_width)
+        scale = self.scale_for(dpi, target_width)
+        if abs(self._scale - scale) < 1e-6:
+            return self._pixmap
+
+        ratio = scale / self._scale
+        size = (
+            max(1, round(self._pixmap.width * ratio)),
+            max(1, round(self._pixmap.height * ratio)),
+        )
+        view = self._views.get(size)
+        if view is None:
+            view = fitz.Pixmap(self._pixmap, size[0], size[1], None)
+            self._views[size] = view
+        return view
+
+    def get_image(self, dpi: int = 150, target_width: int | None = None) -> PageImage:
+        """Return the page raster for OCR or layout detection as a zero-copy PageImage."""
+        return PageImage(self.get_pixmap(dpi, target_width))
+
+    def get_clip_image(self, clip: tuple[float, float, float, float], dpi: int) -> PageImage:
+        """
+        Render just one area of the page (in PDF points) at a DPI. Not cached:
+        meant for small regions, e.g. re-OCR of low-confidence words.
+        """
+        scale = dpi / 72
+        with self._lock:
+            page = self.doc[self.page_num]
+            pixmap = page.get_pixmap(matrix=fitz.Matrix(scale, scale), clip=fitz.Rect(*clip), alpha=False)
+        return PageImage(pixmap)
+
+    def get_png(self, dpi: int = 150, target_width: int | None = None) -> bytes:
+        """Return the page raster as PNG bytes."""
+        return self.get_pixmap(dpi, target_width).tobytes("png")
+
+    def save_png(self, path: str, dpi: int = 150, target_width: int | None = None) -> None:
+        """Write the page raster to disk as PNG."""
+        self.get_pixmap(dpi, target_width).save(path)
+
+    def release(self) -> None:
+        """Drop cached rasters once the page is done."""
+        self._pixmap = None
+        self._scale = 0.0
+        self._views.clear()
+
 
 class PDFProcessor:
     """Handles PDF text extraction and page analysis."""
 
-    def __init__(self, min_chars_for_native_text: int = 200):
+    def __init__(
+        self,
+        min_chars_for_native_text: int = 200,
+        hybrid_ocr: bool = False,
+        hybrid_min_region_pt: float = 48.0,
+        hybrid_max_coverage: float = 0.6,
+    ):
         self.min_chars_for_native_text = min_chars_for_native_text
+        # Hybrid mode: keep native text and OCR only the raster image regions
+        self.hybrid_ocr = hybrid_ocr
+        self.hybrid_min_region_pt = hybrid_min_region_pt
+        self.hybrid_max_coverage = hybrid_max_coverage
 
     def extract_page_text(self, doc: fitz.Document, page_num: int) -> tuple[str, bool]:
         """
@@ -73,32 +189,14 @@ class PDFProcessor:
         Phase 2 Enhancement:
             Supports high-DPI rendering via either DPI or target_width parameter.
             For layout detection, use target_width=2500-3500 for best results.
+
+        Note:
+            Opens the PDF on every call. The processing pipeline uses
+            PageRenderCache instead so each page is rasterised once.
         """
         try:
             doc = fitz.open(file_path)
-            page = doc[page_num]
-
-            # Calculate scale matrix
-            if target_width is not None:
-                # Use target width to calculate scale
-                page_width = page.rect.width
-                scale = target_width / page_width
-                mat = fitz.Matrix(scale, scale)
-                logger.debug(
-                    f"Page {page_num + 1}: Rendering at target width {target_width}px "
-                    f"(scale: {scale:.2f}x)"
-                )
-            else:
-                # Use DPI to calculate scale
-                mat = fitz.Matrix(dpi / 72, dpi / 72)  # Convert DPI to scale matrix
-                logger.debug(f"Page {page_num + 1}: Rendering at {dpi} DPI")
-
-            # Create pixmap with calculated scale
-            pix = page.get_pixmap(matrix=mat)
-
-            # Convert to PNG bytes
-            img_bytes = pix.tobytes("png")
-
+            img_bytes = PageRenderCache(doc, page_num).get_png(dpi, target_width)
             doc.close()
             return img_bytes
 
@@ -106,6 +204,29 @@ class PDFProcessor:
             logger.error(f"Error rendering page {page_num + 1} as image: {e}")
             raise
 
+    def page_content_hash(self, doc: fitz.Document, page_num: int) -> str:
+        """
+        Hash everything that determines a page's output: its content stream,
+        geometry and the image / form / font objects it draws.
+
+        Identical pages hash identically across uploads, so cached stage
+        results survive a reprocess or a re-upload of the same PDF.
+        """
+        page = doc[page_num]
+        digest = hashlib.sha256()
+        digest.update(repr((tuple(page.rect), page.rotation)).encode())
+        digest.update(page.read_contents())
+
+        # Scanned pages share a trivial content stream; the image data is what differs
+        stream_xrefs = {image[0] for image in page.get_images(full=True)}
+        stream_xrefs.update(xobject[0] for xobject in page.get_xobjects())
+        for xref in sorted(x for x in stream_xrefs if x > 0):
+            digest.update(doc.xref_stream_raw(xref) or b"")
+        for font in page.get_fonts(full=True):
+            if font[0] > 0:
+                digest.update(doc.xref_object(font[0], compressed=True).encode())
+        return digest.hexdigest()
+
     def get_page_count(self, file_path: str) -> int:
         """Get the number of pages in a PDF."""
         try:
@@ -117,6 +238,36 @@ class PDFProcessor:
             logger.error(f"Error getting page count for {file_path}: {e}")
             raise
 
+    def find_ocr_regions(self, page: fitz.Page, text_blocks: list[dict]) -> list[list[float]] | None:
+        """
+        Raster image areas of a page that need OCR, in PDF points, merged where
+        they overlap. Images smaller than ``hybrid_min_region_pt`` on a side
+        and images mostly covered by native text are skipped.
+
+        Returns None when the images cover more than ``hybrid_max_coverage`` of
+        the page (a scanned page): OCR of the whole page is the better choice.
+        """
+        width, height = page.rect.width, page.rect.height
+        boxes = []
+        for info in page.get_image_info():
+            box = fitz.Rect(info["bbox"]) & page.rect
+            if box.is_empty or min(box.width, box.height) < self.hybrid_min_region_pt:
+                continue
+            boxes.append([box.x0, box.y0, box.x1, box.y1])
+
+        candidates = merge_boxes(boxes, HYBRID_REGION_PAD_PT, width, height)
+        # Native text area inside each candidate, all pairs at once
+        text_areas = intersection_areas(candidates, [block["bbox"] for block in text_blocks]).sum(axis=1)
+        regions = [
+            region
+            for region, area, text_area in zip(candidates, box_areas(candidates), text_areas, strict=True)
+            if text_area < area * HYBRID_TEXT_COVERED_FRACTION
+        ]
+
+        if coverage(regions, width, height) > self.hybrid_max_coverage:
+            return None
+        return regions
+
     def get_page_data(self, doc: fitz.Document, page_num: int) -> dict:
         """Extract text blocks and metadata for a single page."""
         text, needs_ocr = self.extract_page_text(doc, page_num)
@@ -132,37 +283,57 @@ class PDFProcessor:
             'text_blocks': []
         }
 
-        if not needs_ocr:
-            try:
-                blocks = page.get_text("dict")["blocks"]
-                for block in blocks:
-                    if "lines" in block:
-                        block_text = ""
-                        max_font_size = 0.0
-                        font_names = set()
-                        for line in block["lines"]:
-                            line_text = ""
-                            for span in line["spans"]:
-                                line_text += span["text"]
-                                max_font_size = max(max_font_size, span.get("size", 0.0))
-                                if "font" in span:
-                                    font_names.add(span["font"])
-                            block_text += line_text + "\n"
-
-                        if block_text.strip():
-                            page_info['text_blocks'].append({
-                                'text': block_text.strip(),
-                                'bbox': block['bbox'],
-                                'type': 'text',
-                                'font_size': max_font_size,
-                                'fonts': list(font_names)
-                            })
-            except Exception as e:
-                logger.warning(f"Error extracting text blocks from page {page_num + 1}: {e}")
+        if not needs_ocr or self.hybrid_ocr:
+            text_blocks = self._native_text_blocks(page, page_num)
+            if self.hybrid_ocr:
+                # Mixed page: native text plus OCR of its image regions only
+                regions = self.find_ocr_regions(page, text_blocks)
+                if regions:
+                    page_info['needs_ocr'] = False
+                    page_info['ocr_regions'] = regions
+                    logger.info(f"Page {page_num + 1}: Hybrid extraction, {len(regions)} image regions to OCR")
+            if not page_info['needs_ocr']:
+                page_info['text_blocks'] = text_blocks
 
         return page_info
 
+    def _native_text_blocks(self, page: fitz.Page, page_num: int) -> list[dict]:
+        """Native text blocks with bbox (PDF points), max font size and font names."""
+        text_blocks = []
+        try:
+            blocks = page.get_text("dict")["blocks"]
+            for block in blocks:
+                if "lines" in block:
+                    block_text = ""
+                    max_font_size = 0.0
+                    font_names = set()
+                    for line in block["lines"]:
+                        line_text = ""
+                        for span in line["spans"]:
+                            line_text += span["text"]
+                            max_font_size = max(max_font_size, span.get("size", 0.0))
+                            if "font" in span:
+                                font_names.add(span["font"])
+                        block_text += line_text + "\n"
+
+                    if block_text.strip():
+                        text_blocks.append({
+                            'text': block_text.strip(),
+                            'bbox': block['bbox'],
+                            'type': 'text',
+                            'font_size': max_font_size,
+                            'fonts': list(font_names)
+                        })
+        except Exception as e:
+            logger.warning(f"Error extracting text blocks from page {page_num + 1}: {e}")
+        return text_blocks
+
 
-def create_pdf_processor(min_chars_for_native_text: int = 200) -> PDFProcessor:
+def create_pdf_processor(
+    min_chars_for_native_text: int = 200,
+    hybrid_ocr: bool = False,
+    hybrid_min_region_pt: float = 48.0,
+    hybrid_max_coverage: float = 0.6,
+) -> PDFProcessor:
     """Factory function to create PDFProcessor instance."""
-    return PDFProcessor(min_chars_for_native_text)
+    return PDFProcessor(min_chars_for_native_text, hybrid_ocr, hybrid_min_region_pt, hybrid_max_coverage)
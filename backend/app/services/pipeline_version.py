@@ -0,0 +1,115 @@
+"""
+Pipeline version and settings fingerprint.
+
+A page's output is only reusable (e.g. when resuming an interrupted run) if it
+was produced by the same pipeline code and the same extraction settings. Bump
+PIPELINE_VERSION whenever a change alters per-page output.
+"""
+
+import hashlib
+import json
+
+from app.settings import settings
+
+PIPELINE_VERSION = "1.2"
+
+# Settings each cached page stage depends on (see app.services.stage_cache).
+OCR_STAGE_SETTINGS = (
+    "ocr_engine",
+    "ocr_languages",
+    "ocr_image_dpi",
+    "ocr_preprocess",
+    "ocr_preprocess_unsharp",
+    "ocr_preprocess_adaptive",
+    "ocr_preprocess_global_threshold",
+    "ocr_preprocess_profile",
+    "ocr_preprocess_despeckle",
+    "ocr_preprocess_deskew",
+    "ocr_confidence_threshold",
+    "ocr_psm",
+    "ocr_tiled_enabled",
+    "ocr_tile_max_strips",
+    "ocr_tile_min_width",
+    "ocr_tile_overlap_px",
+    "ocr_retry_enabled",
+    "ocr_retry_dpi",
+    "ocr_retry_psm",
+    "ocr_retry_strategy",
+    "ocr_region_retry_padding_px",
+    "ocr_region_retry_max_coverage",
+    "ocr_region_retry_max_regions",
+    "ocr_region_retry_psm",
+    "ocr_hybrid_enabled",
+    "ocr_hybrid_min_region_pt",
+    "ocr_hybrid_max_coverage",
+    "ocr_fallback_enabled",
+    "ocr_fallback_lang",
+)
+LAYOUT_STAGE_SETTINGS = (
+    "layout_detection_dpi",
+    "layout_detection_width",
+    "layout_detection_method",
+    "layout_model_path",
+    "layout_onnx_model_path",
+    "layout_onnx_quantized",
+    "layout_confidence_threshold",
+    "block_ocr_enabled",
+    "block_ocr_engine",
+    "block_ocr_lang",
+    "block_ocr_confidence_threshold",
+    "block_ocr_preprocess_profile",
+    "block_ocr_batch_mode",
+)
+ANALYSIS_STAGE_SETTINGS = (
+    "min_chars_for_native_text",
+    "ocr_enabled",
+    "advanced_layout_enabled",
+    "reading_order_enabled",
+)
+STAGE_SETTINGS = {
+    "ocr": OCR_STAGE_SETTINGS,
+    "layout": LAYOUT_STAGE_SETTINGS,
+    "analysis": ANALYSIS_STAGE_SETTINGS,
+}
+
+# Bump a stage version when its code changes output. Heuristic layout analysis
+# is part of the final "analysis" stage, so PIPELINE_VERSION covers it.
+STAGE_VERSIONS = {
+    "ocr": "4",
+    "layout": "3",
+    "analysis": PIPELINE_VERSION,
+}
+
+# Settings that change what the per-page stages produce. Post-pass settings
+# (classification, story grouping) are deliberately excluded: those passes
+# rerun over the whole edition anyway.
+PAGE_PIPELINE_SETTINGS = ANALYSIS_STAGE_SETTINGS + OCR_STAGE_SETTINGS + LAYOUT_STAGE_SETTINGS
+
+
+def fingerprint(values: dict) -> str:
+    """Stable short hash of a JSON-serialisable dict."""
+    payload = json.dumps(values, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def pipeline_fingerprint() -> str:
+    """Fingerprint of the pipeline version plus every setting that affects page output."""
+    values = {name: getattr(settings, name, None) for name in PAGE_PIPELINE_SETTINGS}
+    values["pipeline_version"] = PIPELINE_VERSION
+    return fingerprint(values)
+
+
+def stage_fingerprint(
+    stage: str, content_hash: str, upstream: tuple[str, ...] = (), extra: dict | None = None
+) -> str:
+    """
+    Cache key for one page stage: the page content, the stage's settings and
+    version, plus the keys of the stages it consumes (so changes cascade).
+    """
+    values = {name: getattr(settings, name, None) for name in STAGE_SETTINGS[stage]}
+    values.update(extra or {})
+    values["stage"] = stage
+    values["stage_version"] = STAGE_VERSIONS[stage]
+    values["content_hash"] = content_hash
+    values["upstream"] = list(upstream)
+    return fingerprint(values)
@@ -1,5 +1,14 @@
 import logging
+import multiprocessing
 import os
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 
 import fitz
@@ -9,25 +18,78 @@ from app.models import Edition, ExtractionRun, Item, Page
 from app.schemas import EditionStatus
 from app.services.block_ocr_service import BlockOCRService
 from app.services.category_classifier import CategoryClassifier
-from app.services.layout_assembler import LayoutAssembler
+from app.services.commit_coalescer import CommitCoalescer, clear_progress
+from app.services.embedding_store import carry_over
 from app.services.layout_analyzer import create_layout_analyzer
-from app.services.layout_detection_service import LayoutDetectionService
-from app.services.ocr_service import create_ocr_service
-from app.services.pdf_processor import create_pdf_processor
+from app.services.layout_assembler import LayoutAssembler
+from app.services.layout_detection_service import LayoutDetectionService, LayoutResult
+from app.services import layout_onnx, ocr_strategy
+from app.services.ocr_service import create_ocr_service, result_from_data
+from app.services.pdf_processor import PageRenderCache, create_pdf_processor
+from app.services.pipeline_version import (
+    PIPELINE_VERSION,
+    fingerprint,
+    pipeline_fingerprint,
+    stage_fingerprint,
+)
 from app.services.reading_order_service import ReadingOrderService
-from app.services.story_grouping import persist_story_groups
+from app.services.stage_cache import CACHED_STAGES, create_stage_cache
+from app.services.stage_timer import StageTimer, peak_rss_mb
+from app.services.story_grouping import embedding_text, persist_story_groups
 from app.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Page columns a page result may carry back to the writer
+PAGE_RESULT_FIELDS = (
+    "extracted_text",
+    "bbox_json",
+    "char_count",
+    "ocr_used",
+    "image_path",
+    "high_res_image_path",
+    "render_dpi",
+    "render_width_px",
+    "layout_method",
+    "layout_model_used",
+    "layout_confidence",
+    "ocr_words_json",
+    "content_hash",
+)
+
+# Page fields produced by layout detection, block OCR and story assembly (cached together)
+LAYOUT_STAGE_FIELDS = ("layout_model_used", "layout_method", "layout_confidence", "ocr_words_json")
+
+
+@dataclass
+class PreparedPage:
+    """Output of the render step: native text, cache lookups and the page raster."""
+
+    page_index: int
+    page_data: dict
+    needs_page_ocr: bool
+    content_hash: str
+    stage_keys: dict[str, str]
+    render_cache: PageRenderCache
+    cached: dict[str, dict | None] = field(default_factory=dict)
+    timer: StageTimer = field(default_factory=StageTimer)
+    layout_result: LayoutResult | None = None  # Set when detected in a batch with other pages
+    needs_region_ocr: bool = False  # Hybrid page: OCR only page_data["ocr_regions"]
+
 
 class ProcessingService:
     """Main service for processing PDF editions."""
 
     def __init__(self):
-        self.pdf_processor = create_pdf_processor(settings.min_chars_for_native_text)
+        self.pdf_processor = create_pdf_processor(
+            settings.min_chars_for_native_text,
+            hybrid_ocr=settings.ocr_hybrid_enabled and settings.ocr_enabled,
+            hybrid_min_region_pt=settings.ocr_hybrid_min_region_pt,
+            hybrid_max_coverage=settings.ocr_hybrid_max_coverage,
+        )
         self.ocr_service = create_ocr_service(settings.ocr_languages) if settings.ocr_enabled else None
         self.layout_analyzer = create_layout_analyzer()
+        self.stage_cache = create_stage_cache()
 
         # Phase 2: Initialize reading order service
         self.reading_order = (
@@ -42,6 +104,14 @@ class ProcessingService:
                     model_type=settings.layout_detection_method,
                     device=settings.layout_model_device,
                     confidence_threshold=settings.layout_confidence_threshold,
+                    onnx_model_path=(
+                        layout_onnx.resolve_model_path(
+                            settings.layout_onnx_model_path, settings.layout_onnx_quantized
+                        )
+                        if settings.layout_onnx_model_path
+                        else None
+                    ),
+                    onnx_threads=settings.layout_onnx_threads,
                 )
                 logger.info("Layout detection service initialized")
             except Exception as e:
@@ -57,6 +127,10 @@ class ProcessingService:
                     lang=settings.block_ocr_lang if hasattr(settings, 'block_ocr_lang') else 'en',
                     use_gpu=(settings.layout_model_device == "cuda"),
                     confidence_threshold=getattr(settings, 'block_ocr_confidence_threshold', 0.5),
+                    preprocess_profile=settings.block_ocr_preprocess_profile,
+                    batch_mode=settings.block_ocr_batch_mode,
+                    rec_batch_size=settings.block_ocr_rec_batch_size,
+                    workers=settings.block_ocr_workers,
                 )
                 logger.info("Block OCR service initialized")
             except Exception as e:
@@ -73,13 +147,1018 @@ class ProcessingService:
                 logger.warning(f"Failed to initialize layout assembler: {e}")
                 self.layout_assembler = None
 
-    def process_edition(self, edition_id: int, db: Session) -> bool:
+    def process_page(
+        self,
+        doc: fitz.Document,
+        edition_id: int,
+        page_index: int,
+        set_stage: Callable[[str], None] | None = None,
+        prepared: PreparedPage | None = None,
+        use_cache: bool = True,
+    ) -> dict:
+        """
+        Run every extraction stage for a single page without touching the database.
+
+        Args:
+            doc: Open PDF document
+            edition_id: Edition the page belongs to (used for image file names)
+            page_index: 0-based page index
+            set_stage: Optional callback invoked with the current stage name
+            prepared: Output of prepare_page if the page was already rendered
+                ahead (pipelined mode); prepared here otherwise
+            use_cache: Reuse cached stage output (fresh output is stored either way)
+
+        Returns:
+            Page result dictionary with page fields, extracted items and OCR stats
+        """
+        page_number = page_index + 1
+        fields: dict = {}
+        cached_stages: list[str] = []
+        result = {
+            "page_number": page_number,
+            "status": "DONE",
+            "error_message": None,
+            "fields": fields,
+            "items": [],
+            "used_ocr": False,
+            "ocr_avg_confidence": None,
+            "used_fallback_ocr": False,
+            "cached_stages": cached_stages,
+        }
+        # Cleared when a stage degrades (e.g. falls back after an error) so it is not cached
+        cacheable = True
+
+        timer = prepared.timer if prepared is not None else StageTimer()
+
+        def stage(name: str) -> None:
+            timer.start(name)
+            if set_stage is not None:
+                set_stage(name)
+
+        render_cache = None
+        try:
+            # ========== STAGE 2: EXTRACT (EXISTING) ==========
+            # Native extraction runs first so later stages know the page size.
+            if prepared is None:
+                stage("EXTRACT")
+                prepared = self.prepare_page(
+                    doc, edition_id, page_index, timer=timer, use_cache=use_cache
+                )
+            # One raster per page, shared by layout detection, block OCR and page OCR
+            render_cache = prepared.render_cache
+            page_data = prepared.page_data
+            needs_page_ocr = prepared.needs_page_ocr
+            layout_active = bool(settings.advanced_layout_enabled and self.layout_detector)
+            fields["content_hash"] = prepared.content_hash
+            ocr_key = prepared.stage_keys["ocr"]
+            layout_key = prepared.stage_keys["layout"]
+            analysis_key = prepared.stage_keys["analysis"]
+
+            cached_analysis = prepared.cached.get("analysis")
+            if cached_analysis is not None:
+                self._restore_cached_page(result, cached_analysis, render_cache, edition_id)
+                cached_stages.append("analysis")
+                return result
+
+            cached_layout = prepared.cached.get("layout")
+            cached_ocr = prepared.cached.get("ocr")
+
+            # ========== STAGE 1: HIGH-DPI RENDERING (Phase 2) ==========
+            high_res_image_path = None
+            if settings.advanced_layout_enabled:
+                stage("RENDER")
+
+                # Render at high DPI or target width for layout detection
+                render_dpi, target_width = _layout_render_size()
+
+                # Store high-res image (skipped when layout is cached and the file is still there)
+                high_res_image_path = _page_image_path(edition_id, page_number, "_hires")
+                if cached_layout is None or not os.path.exists(high_res_image_path):
+                    render_cache.save_png(high_res_image_path, dpi=render_dpi, target_width=target_width)
+
+                # Store metadata
+                fields["high_res_image_path"] = high_res_image_path
+                fields["render_dpi"] = render_dpi if target_width is None else None
+                fields["render_width_px"] = target_width
+                fields["layout_method"] = "heuristic"  # Will be updated to "ml" in Phase 3
+
+                logger.info(
+                    f"Page {page_number}: Rendered at "
+                    f"{f'{render_dpi} DPI' if target_width is None else f'{target_width}px width'}"
+                )
+
+            # ========== STAGE 1.5: LAYOUT DETECTION (Phase 3) ==========
+            detected_blocks = None
+            assembled_items = None
+            if cached_layout is not None:
+                # Detection, block OCR and assembly are reused as one unit
+                fields.update(cached_layout["fields"])
+                assembled_items = cached_layout["assembled_items"]
+                cached_stages.append("layout")
+            elif layout_active and high_res_image_path:
+                stage("LAYOUT_DETECT")
+
+                try:
+                    # Run ML-based layout detection on the in-memory high-res raster
+                    # (unless it already ran in a batch with neighbouring pages)
+                    layout_result = prepared.layout_result or self.layout_detector.detect_layout(
+                        render_cache.get_image(dpi=render_dpi, target_width=target_width),
+                        page_data.get("width", 0),
+                        page_data.get("height", 0),
+                    )
+
+                    detected_blocks = layout_result.blocks
+                    fields["layout_model_used"] = layout_result.model_name
+                    fields["layout_method"] = layout_result.method
+                    fields["layout_confidence"] = layout_result.avg_confidence
+
+                    logger.info(
+                        f"Page {page_number}: Detected {len(detected_blocks)} blocks "
+                        f"using {layout_result.method} (confidence: {layout_result.avg_confidence or 0.0:.2f})"
+                    )
+                except Exception as e:
+                    logger.warning(f"Layout detection failed for page {page_number}: {e}")
+                    detected_blocks = None
+                    cacheable = False
+                    fields["layout_method"] = "heuristic"
+
+            # ========== STAGE 4: BLOCK-LEVEL OCR (Phase 4) ==========
+            if (
+                settings.advanced_layout_enabled
+                and settings.block_ocr_enabled
+                and self.block_ocr
+                and detected_blocks
+                and high_res_image_path
+            ):
+                stage("BLOCK_OCR")
+
+                try:
+                    # Reuse the high-res raster rendered for layout detection
+                    high_res_array = render_cache.get_image(dpi=render_dpi, target_width=target_width)
+
+                    # Run block-level OCR on detected blocks
+                    ocr_results = self.block_ocr.batch_extract(detected_blocks, high_res_array)
+
+                    # Update blocks with OCR text and words
+                    for block, ocr_result in zip(detected_blocks, ocr_results):
+                        block.text = ocr_result.text
+                        block.words = ocr_result.words
+
+                    # Store OCR words in page.ocr_words_json
+                    # Format: [{"text": "...", "bbox": [...], "confidence": 0.95, "block_id": 123}, ...]
+                    all_words = []
+                    for block in detected_blocks:
+                        for word in block.words:
+                            all_words.append({
+                                "text": word["text"],
+                                "bbox": word["bbox"],
+                                "confidence": word["confidence"],
+                                "block_id": block.id,
+                            })
+
+                    fields["ocr_words_json"] = all_words
+
+                    # Calculate stats
+                    total_confidence = sum(w["confidence"] for w in all_words)
+                    avg_conf = total_confidence / len(all_words) if all_words else 0.0
+
+                    logger.info(
+                        f"Page {page_number}: Block OCR extracted {len(all_words)} words "
+                        f"from {len(detected_blocks)} blocks (avg conf: {avg_conf:.2f})"
+                    )
+
+                except Exception as e:
+                    logger.warning(f"Block OCR failed for page {page_number}: {e}")
+                    fields["ocr_words_json"] = None
+                    cacheable = False
+
+            # ========== STAGE 5: STORY ASSEMBLY (Phase 5) ==========
+            if (
+                settings.advanced_layout_enabled
+                and self.layout_assembler
+                and detected_blocks
+            ):
+                stage("STORY_ASSEMBLY")
+
+                try:
+                    # Assemble detected blocks into Items
+                    item_groups = self.layout_assembler.assemble_items(detected_blocks)
+
+                    # Convert ItemGroups to extracted_items format
+                    assembled_items = []
+                    for group in item_groups:
+                        group_dict = group.to_dict()
+
+                        # Create item data compatible with existing format
+                        item_data = {
+                            "item_type": group_dict["item_type"],
+                            "subtype": group_dict.get("item_subtype"),
+                            "title": None,  # No title extraction yet
+                            "text": group_dict["text"],
+                            "bbox_json": {
+                                "bbox": group_dict["bbox"],
+                                "blocks": group_dict["blocks"],  # NEW: structured blocks
+                            },
+                            "blocks_json": group_dict["blocks"],  # NEW: Phase 5 field
+                            "structured_data": None,
+                            "contact_info_json": None,
+                            "price_info_json": None,
+                            "date_info_json": None,
+                            "location_info_json": None,
+                            "classification_details_json": None,
+                        }
+                        assembled_items.append(item_data)
+
+                    logger.info(
+                        f"Page {page_number}: Assembled {len(assembled_items)} items "
+                        f"from {len(detected_blocks)} blocks"
+                    )
+
+                except Exception as e:
+                    logger.warning(f"Story assembly failed for page {page_number}: {e}")
+                    assembled_items = None
+                    cacheable = False
+
+            if layout_active and cached_layout is None and detected_blocks is not None and cacheable:
+                self.stage_cache.put("layout", layout_key, {
+                    "fields": {name: fields.get(name) for name in LAYOUT_STAGE_FIELDS},
+                    "assembled_items": assembled_items,
+                })
+
+            used_ocr = False
+            image_path = None
+
+            if needs_page_ocr:
+                stage("OCR")
+
+                if cached_ocr is not None:
+                    ocr_result = cached_ocr["ocr_result"]
+                    ocr_dpi = cached_ocr["ocr_dpi"]
+                    result["used_fallback_ocr"] = cached_ocr["used_fallback_ocr"]
+                    cached_stages.append("ocr")
+                else:
+                    ocr_result, ocr_dpi, ocr_complete = self._run_page_ocr(
+                        render_cache, page_number, result, timer
+                    )
+                    cacheable = cacheable and ocr_complete
+                    if ocr_complete:
+                        self.stage_cache.put("ocr", ocr_key, {
+                            "ocr_result": ocr_result,
+                            "ocr_dpi": ocr_dpi,
+                            "used_fallback_ocr": result["used_fallback_ocr"],
+                        })
+
+                image_path = _page_image_path(edition_id, page_number)
+                if cached_ocr is None or not os.path.exists(image_path):
+                    render_cache.save_png(image_path, dpi=ocr_dpi)
+
+                page_data["extracted_text"] = ocr_result["text"]
+                page_data["text_blocks"].extend(ocr_result["text_blocks"])
+                page_data["ocr_meta"] = {
+                    "avg_confidence": ocr_result.get("avg_confidence"),
+                    "word_count": ocr_result.get("word_count"),
+                    "psm": ocr_result.get("psm"),
+                    "preprocess": ocr_result.get("preprocess"),
+                    "engine": ocr_result.get("engine"),
+                    "retry": ocr_result.get("retry"),
+                }
+                used_ocr = True
+            elif prepared.needs_region_ocr:
+                stage("OCR")
+                ocr_dpi = settings.ocr_image_dpi
+
+                if cached_ocr is not None:
+                    ocr_result = cached_ocr["ocr_result"]
+                    cached_stages.append("ocr")
+                else:
+                    ocr_result = self._run_region_ocr(render_cache, page_data["ocr_regions"], page_data)
+                    self.stage_cache.put("ocr", ocr_key, {
+                        "ocr_result": ocr_result,
+                        "ocr_dpi": ocr_dpi,
+                        "used_fallback_ocr": False,
+                    })
+
+                # Native text stays as extracted; region text follows it, top to bottom
+                if ocr_result["text"]:
+                    native_text = (page_data.get("extracted_text") or "").rstrip()
+                    page_data["extracted_text"] = (
+                        f"{native_text}\n\n{ocr_result['text']}" if native_text else ocr_result["text"]
+                    )
+                page_data["text_blocks"].extend(ocr_result["text_blocks"])
+                page_data["ocr_meta"] = {
+                    "avg_confidence": ocr_result.get("avg_confidence"),
+                    "word_count": ocr_result.get("word_count"),
+                    "psm": ocr_result.get("psm"),
+                    "preprocess": ocr_result.get("preprocess"),
+                    "engine": ocr_result.get("engine"),
+                    "mode": "regions",
+                    "regions": ocr_result.get("regions"),
+                    "pixel_fraction": ocr_result.get("pixel_fraction"),
+                }
+                used_ocr = True
+
+            stage("LAYOUT")
+
+            # Use assembled items from ML pipeline if available
+            if assembled_items is not None:
+                page_data["extracted_items"] = assembled_items
+                logger.debug(
+                    f"Page {page_number}: Using {len(assembled_items)} assembled items from ML pipeline"
+                )
+            else:
+                # Fallback to existing heuristic layout analyzer
+                try:
+                    page_data = self.layout_analyzer.analyze_page(page_data)
+                except Exception as e:
+                    logger.error(f"Layout analysis failed for page {page_number}: {e}")
+                    page_data["extracted_items"] = []
+                    cacheable = False
+
+            # ========== STAGE 3: READING ORDER (Phase 2) ==========
+            if settings.reading_order_enabled and self.reading_order:
+                timer.start("READING_ORDER")
+                try:
+                    text_blocks = page_data.get("text_blocks", [])
+                    if text_blocks:
+                        # Assign reading order to text blocks
+                        ordered_blocks = self.reading_order.assign_reading_order(
+                            text_blocks, page_data.get("width", 0)
+                        )
+                        page_data["text_blocks"] = ordered_blocks
+                        logger.debug(
+                            f"Page {page_number}: Assigned reading order to {len(ordered_blocks)} blocks"
+                        )
+                except Exception as e:
+                    logger.warning(f"Reading order assignment failed for page {page_number}: {e}")
+                    cacheable = False
+
+            fields["extracted_text"] = page_data.get("extracted_text")
+            fields["bbox_json"] = {
+                "text_blocks": page_data.get("text_blocks", []),
+                "ocr_meta": page_data.get("ocr_meta"),
+            }
+            fields["char_count"] = len(page_data.get("extracted_text") or "")
+            fields["ocr_used"] = used_ocr
+            if image_path:
+                fields["image_path"] = image_path
+
+            result["items"] = page_data.get("extracted_items", [])
+            result["used_ocr"] = used_ocr
+            if used_ocr:
+                avg_conf = (page_data.get("ocr_meta") or {}).get("avg_confidence")
+                if isinstance(avg_conf, int | float):
+                    result["ocr_avg_confidence"] = float(avg_conf)
+
+            if cacheable:
+                self.stage_cache.put("analysis", analysis_key, {
+                    "fields": dict(fields),
+                    "items": result["items"],
+                    "used_ocr": used_ocr,
+                    "ocr_avg_confidence": result["ocr_avg_confidence"],
+                    "used_fallback_ocr": result["used_fallback_ocr"],
+                    "ocr_dpi": ocr_dpi if used_ocr else None,
+                })
+        except Exception as e:
+            logger.error(f"Page processing failed for page {page_number}: {e}")
+            result["status"] = "FAILED"
+            result["error_message"] = str(e)[:500]
+        finally:
+            if render_cache is not None:
+                render_cache.release()
+            result["timings"] = timer.to_dict()
+
+        return result
+
+    def prepare_page(
+        self,
+        doc: fitz.Document,
+        edition_id: int,
+        page_index: int,
+        doc_lock: AbstractContextManager | None = None,
+        timer: StageTimer | None = None,
+        use_cache: bool = True,
+    ) -> PreparedPage:
+        """
+        Extract native text, look up cached stages and render the page raster.
+
+        This is the only step that reads the PDF document (later stages work
+        on the raster), so it can run ahead of OCR on a separate thread. Pass
+        ``doc_lock`` when other threads share the document.
+        """
+        timer = timer or StageTimer()
+        timer.start("EXTRACT")
+        lock = doc_lock or nullcontext()
+        with lock:
+            page_data = self.pdf_processor.get_page_data(doc, page_index)
+            content_hash = self.pdf_processor.page_content_hash(doc, page_index)
+        render_cache = PageRenderCache(doc, page_index, lock=doc_lock)
+
+        needs_page_ocr = bool(
+            page_data.get("needs_ocr") and self.ocr_service and self.ocr_service.is_available()
+        )
+        needs_region_ocr = bool(
+            page_data.get("ocr_regions") and self.ocr_service and self.ocr_service.is_available()
+        )
+        layout_active = bool(settings.advanced_layout_enabled and self.layout_detector)
+
+        # Stage cache keys chain: analysis depends on whichever of OCR / layout ran
+        ocr_key = stage_fingerprint("ocr", content_hash)
+        layout_key = stage_fingerprint(
+            "layout", content_hash, extra={"block_ocr": self.block_ocr is not None}
+        )
+        analysis_key = stage_fingerprint(
+            "analysis",
+            content_hash,
+            upstream=(
+                ocr_key if needs_page_ocr or needs_region_ocr else "",
+                layout_key if layout_active else "",
+            ),
+        )
+        prepared = PreparedPage(
+            page_index=page_index,
+            page_data=page_data,
+            needs_page_ocr=needs_page_ocr,
+            needs_region_ocr=needs_region_ocr,
+            content_hash=content_hash,
+            stage_keys={"ocr": ocr_key, "layout": layout_key, "analysis": analysis_key},
+            render_cache=render_cache,
+            timer=timer,
+        )
+        if use_cache:
+            prepared.cached["analysis"] = self.stage_cache.get("analysis", analysis_key)
+            if prepared.cached["analysis"] is not None:
+                # Nothing to render unless a page image has gone missing (done lazily)
+                timer.stop()
+                return prepared
+            if layout_active:
+                prepared.cached["layout"] = self.stage_cache.get("layout", layout_key)
+            if needs_page_ocr or needs_region_ocr:
+                prepared.cached["ocr"] = self.stage_cache.get("ocr", ocr_key)
+
+        # Rasterise once at the largest resolution any uncached stage will need
+        sizes = []
+        if settings.advanced_layout_enabled and (
+            prepared.cached.get("layout") is None
+            or not os.path.exists(_page_image_path(edition_id, page_index + 1, "_hires"))
+        ):
+            sizes.append(_layout_render_size())
+        if needs_page_ocr and prepared.cached.get("ocr") is None:
+            sizes.append((settings.ocr_image_dpi, None))
+        if sizes:
+            timer.start("RENDER")
+            render_cache.reserve(*max(sizes, key=lambda size: render_cache.scale_for(*size)))
+        timer.stop()
+        return prepared
+
+    def _restore_cached_page(
+        self, result: dict, cached: dict, render_cache: PageRenderCache, edition_id: int
+    ) -> None:
+        """Fill a page result from a cached analysis entry, re-rendering page images if missing."""
+        fields = result["fields"]
+        content_hash = fields.get("content_hash")
+        fields.update(cached["fields"])
+        fields["content_hash"] = content_hash
+        page_number = result["page_number"]
+
+        # Image files are per edition; the cache entry may come from another upload
+        if fields.get("high_res_image_path"):
+            path = _page_image_path(edition_id, page_number, "_hires")
+            if not os.path.exists(path):
+                render_cache.save_png(
+                    path,
+                    dpi=fields.get("render_dpi") or settings.layout_detection_dpi,
+                    target_width=fields.get("render_width_px"),
+                )
+            fields["high_res_image_path"] = path
+        if fields.get("image_path"):
+            path = _page_image_path(edition_id, page_number)
+            if not os.path.exists(path):
+                render_cache.save_png(path, dpi=cached.get("ocr_dpi") or settings.ocr_image_dpi)
+            fields["image_path"] = path
+
+        result["items"] = cached["items"]
+        result["used_ocr"] = cached["used_ocr"]
+        result["ocr_avg_confidence"] = cached["ocr_avg_confidence"]
+        result["used_fallback_ocr"] = cached["used_fallback_ocr"]
+
+    def _run_page_ocr(
+        self, render_cache: PageRenderCache, page_number: int, result: dict, timer: StageTimer
+    ) -> tuple[dict, int, bool]:
+        """
+        Full-page OCR with the low-confidence retry (of the weak regions only, or
+        of the whole page when they cover most of it) and optional fallback engine.
+
+        Returns (ocr_result, dpi used, complete); complete is False if a stage
+        errored and the result should not be cached.
+        """
+        complete = True
+        ocr_dpi = settings.ocr_image_dpi
+        image_bytes = render_cache.get_image(dpi=ocr_dpi)
+
+        def _score(candidate: dict) -> tuple[float, int]:
+            conf = candidate.get("avg_confidence")
+            conf_score = conf if conf is not None else -1.0
+            return (conf_score, candidate.get("word_count", 0))
+
+        region_retry = settings.ocr_retry_enabled and settings.ocr_retry_strategy == "regions"
+        ocr_result = self.ocr_service.extract_text_with_boxes(
+            image_bytes,
+            preprocess=settings.ocr_preprocess,
+            psm=settings.ocr_psm,
+            tiled=settings.ocr_tiled_enabled,
+            include_words=region_retry,
+        )
+        words = ocr_result.pop("words", None)
+
+        if settings.ocr_retry_enabled:
+            avg_conf = ocr_result.get("avg_confidence")
+            if avg_conf is None or avg_conf < settings.ocr_confidence_threshold:
+                timer.start("OCR_RETRY")
+                regions = None
+                if words is not None:
+                    regions = ocr_strategy.plan_region_retry(
+                        words,
+                        image_bytes.width,
+                        image_bytes.height,
+                        threshold=settings.ocr_confidence_threshold,
+                        pad=settings.ocr_region_retry_padding_px,
+                        max_coverage=settings.ocr_region_retry_max_coverage,
+                    )
+                if regions and len(regions) <= settings.ocr_region_retry_max_regions:
+                    ocr_result = self._retry_regions(render_cache, ocr_result, words, regions, ocr_dpi)
+                else:
+                    retry_bytes = render_cache.get_image(dpi=settings.ocr_retry_dpi)
+                    retry_result = self.ocr_service.extract_text_with_boxes(
+                        retry_bytes,
+                        preprocess=settings.ocr_preprocess,
+                        psm=settings.ocr_retry_psm,
+                        tiled=settings.ocr_tiled_enabled,
+                    )
+
+                    improved = _score(retry_result) > _score(ocr_result)
+                    if improved:
+                        ocr_dpi = settings.ocr_retry_dpi
+                        image_bytes = retry_bytes
+                        ocr_result = retry_result
+                    ocr_result["retry"] = {"strategy": "page", "improved": improved}
+
+        if settings.ocr_fallback_enabled:
+            avg_conf = ocr_result.get("avg_confidence")
+            if avg_conf is None or avg_conf < settings.ocr_confidence_threshold:
+                timer.start("OCR_FALLBACK")
+                try:
+                    fallback_result = self.ocr_service.extract_text_with_boxes_fallback(
+                        image_bytes,
+                        preprocess=settings.ocr_preprocess,
+                    )
+                    if _score(fallback_result) > _score(ocr_result):
+                        ocr_result = fallback_result
+                        result["used_fallback_ocr"] = True
+                except Exception as e:
+                    logger.warning(f"Fallback OCR failed for page {page_number}: {e}")
+                    complete = False
+
+        return ocr_result, ocr_dpi, complete
+
+    def _run_region_ocr(self, render_cache: PageRenderCache, regions: list[list[float]], page_data: dict) -> dict:
+        """
+        OCR just the raster image regions of a hybrid page (PDF points), each
+        rendered on its own at the OCR DPI, with text blocks mapped back to
+        points so they sit alongside the native text blocks.
+        """
+        dpi = settings.ocr_image_dpi
+        to_points = 72 / dpi
+        text_blocks: list[dict] = []
+        texts: list[str] = []
+        conf_sum = 0.0
+        conf_words = 0
+        word_count = 0
+        engine = "tesseract"
+        for region in sorted(regions, key=lambda box: (box[1], box[0])):
+            crop = render_cache.get_clip_image(tuple(region), dpi=dpi)
+            region_result = self.ocr_service.extract_text_with_boxes(
+                crop, preprocess=settings.ocr_preprocess, psm=settings.ocr_psm
+            )
+            for block in region_result["text_blocks"]:
+                x0, y0, x1, y1 = block["bbox"]
+                text_blocks.append({
+                    **block,
+                    "bbox": [
+                        region[0] + x0 * to_points,
+                        region[1] + y0 * to_points,
+                        region[0] + x1 * to_points,
+                        region[1] + y1 * to_points,
+                    ],
+                })
+            if region_result["text"]:
+                texts.append(region_result["text"])
+            engine = region_result.get("engine", engine)
+            words = region_result.get("word_count") or 0
+            word_count += words
+            if region_result.get("avg_confidence") is not None and words:
+                conf_sum += region_result["avg_confidence"] * words
+                conf_words += words
+
+        page_area = page_data.get("width", 0) * page_data.get("height", 0)
+        region_area = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in regions)
+        return {
+            "text": "\n\n".join(texts),
+            "text_blocks": text_blocks,
+            "avg_confidence": round(conf_sum / conf_words, 2) if conf_words else None,
+            "word_count": word_count,
+            "psm": settings.ocr_psm,
+            "preprocess": settings.ocr_preprocess,
+            "engine": engine,
+            "regions": len(regions),
+            # Share of the page's pixels sent to OCR
+            "pixel_fraction": round(region_area / page_area, 4) if page_area else None,
+        }
+
+    def _retry_regions(
+        self,
+        render_cache: PageRenderCache,
+        ocr_result: dict,
+        words: dict,
+        regions: list[list[int]],
+        ocr_dpi: int,
+    ) -> dict:
+        """
+        Re-OCR only the low-confidence regions, rendered at the retry DPI, and
+        splice each region's words back in where they beat the first pass.
+        """
+        scale = settings.ocr_retry_dpi / ocr_dpi
+        replaced = 0
+        for region in regions:
+            clip = tuple(value * 72 / ocr_dpi for value in region)
+            crop = render_cache.get_clip_image(clip, dpi=settings.ocr_retry_dpi)
+            region_result = self.ocr_service.extract_text_with_boxes(
+                crop,
+                preprocess=settings.ocr_preprocess,
+                psm=settings.ocr_region_retry_psm,
+                include_words=True,
+            )
+            if not region_result.get("words"):
+                continue
+            new_rows = ocr_strategy.to_page_rows(region_result["words"], region, scale)
+            old_conf = ocr_strategy.region_confidence(words, region)
+            new_conf = ocr_strategy.region_confidence(new_rows, region)
+            if new_conf is not None and (old_conf is None or new_conf > old_conf):
+                words = ocr_strategy.splice_region(words, region, new_rows)
+                replaced += 1
+
+        if replaced:
+            ocr_result = result_from_data(
+                words, psm=ocr_result["psm"], preprocess=ocr_result["preprocess"]
+            )
+        ocr_result["retry"] = {"strategy": "regions", "regions": len(regions), "replaced": replaced}
+        return ocr_result
+
+    def _iter_page_results(
+        self,
+        doc: fitz.Document,
+        pdf_path: str,
+        edition_id: int,
+        page_indices: list[int],
+        on_page_start: Callable[[int], None],
+        set_stage: Callable[[str], None],
+    ) -> Iterator[tuple[int, dict]]:
+        """Yield (page_index, page result) in page order, fanning out to workers if enabled."""
+        max_workers = max(1, int(settings.processing_max_workers or 1))
+        if max_workers == 1 and settings.processing_pipeline_threads > 1 and len(page_indices) > 1:
+            yield from self._iter_pipelined_results(
+                doc, edition_id, page_indices, on_page_start, set_stage
+            )
+            return
+        if max_workers == 1 or len(page_indices) < 2:
+            batch_size = self._layout_batch_size()
+            for start in range(0, len(page_indices), batch_size):
+                chunk = page_indices[start:start + batch_size]
+                if len(chunk) == 1:
+                    on_page_start(chunk[0])
+                    yield chunk[0], self.process_page(doc, edition_id, chunk[0], set_stage)
+                    continue
+
+                # Render the chunk, then detect layout on all of its pages in one call
+                set_stage("EXTRACT")
+                prepared_pages: list[tuple[int, PreparedPage | None, Exception | None]] = []
+                for page_index in chunk:
+                    on_page_start(page_index)
+                    try:
+                        prepared_pages.append((page_index, self.prepare_page(doc, edition_id, page_index), None))
+                    except Exception as e:
+                        logger.error(f"Rendering failed for page {page_index + 1}: {e}")
+                        prepared_pages.append((page_index, None, e))
+                set_stage("LAYOUT_DETECT")
+                self._detect_layout_batch([prepared for _, prepared, _ in prepared_pages if prepared])
+                for page_index, prepared, error in prepared_pages:
+                    if error is not None:
+                        yield page_index, _failed_page_result(page_index, error)
+                    else:
+                        yield page_index, self.process_page(
+                            doc, edition_id, page_index, set_stage, prepared=prepared
+                        )
+            return
+
+        max_workers = min(max_workers, len(page_indices))
+        # Spawned workers share nothing with this process (DB connections, threads),
+        # so hand them the live settings explicitly.
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_page_worker,
+            initargs=(pdf_path, settings.model_dump()),
+        )
+        pending: deque[tuple[int, Future]] = deque()
+        queued = deque(page_indices)
+        try:
+            set_stage("EXTRACT")
+            while queued or pending:
+                # Keep a bounded window in flight so results can be written in order
+                while queued and len(pending) < max_workers * 2:
+                    next_index = queued.popleft()
+                    on_page_start(next_index)
+                    pending.append((
+                        next_index,
+                        executor.submit(_process_page_in_worker, edition_id, next_index),
+                    ))
+
+                page_index, future = pending.popleft()
+                try:
+                    page_result = future.result()
+                except Exception as e:
+                    logger.error(f"Page worker failed for page {page_index + 1}: {e}")
+                    page_result = _failed_page_result(page_index, e)
+                yield page_index, page_result
+        finally:
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _layout_batch_size(self) -> int:
+        """Pages to detect layout on together (1 when layout detection is off)."""
+        if not (settings.advanced_layout_enabled and self.layout_detector):
+            return 1
+        return max(1, int(settings.layout_batch_size or 1))
+
+    def _detect_layout_batch(self, prepared_pages: list[PreparedPage]) -> None:
+        """
+        Detect layout on the prepared pages that still need it in one batched
+        call, leaving each result on its PreparedPage for process_page. The
+        batch's time is split evenly over the pages' LAYOUT_DETECT stage.
+        """
+        pending = [
+            prepared for prepared in prepared_pages
+            if prepared.cached.get("analysis") is None and prepared.cached.get("layout") is None
+        ]
+        if len(pending) < 2 or not (settings.advanced_layout_enabled and self.layout_detector):
+            return
+
+        render_dpi, target_width = _layout_render_size()
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            results = self.layout_detector.detect_layout_batch(
+                [
+                    (
+                        prepared.render_cache.get_image(dpi=render_dpi, target_width=target_width),
+                        prepared.page_data.get("width", 0),
+                        prepared.page_data.get("height", 0),
+                    )
+                    for prepared in pending
+                ],
+                batch_size=len(pending),
+            )
+        except Exception as e:
+            logger.warning(f"Batched layout detection failed: {e}, detecting page by page")
+            return
+
+        wall_s = (time.perf_counter() - wall_start) / len(pending)
+        cpu_s = (time.thread_time() - cpu_start) / len(pending)
+        for prepared, layout_result in zip(pending, results, strict=True):
+            prepared.layout_result = layout_result
+            prepared.timer.add("LAYOUT_DETECT", wall_s, cpu_s)
+
+    def _iter_pipelined_results(
+        self,
+        doc: fitz.Document,
+        edition_id: int,
+        page_indices: list[int],
+        on_page_start: Callable[[int], None],
+        set_stage: Callable[[str], None],
+    ) -> Iterator[tuple[int, dict]]:
+        """
+        Overlap rendering, OCR and writing inside one process.
+
+        A renderer thread prepares pages (the only document access, under a
+        lock), running layout detection on up to ``layout_batch_size`` queued
+        pages at a time, up to ``processing_render_ahead`` pages ahead of a pool of
+        ``processing_pipeline_threads`` OCR threads, which run the remaining
+        stages. The caller writes results in page order. Tesseract runs as a
+        subprocess, so OCR overlaps with rendering and with Python-side
+        analysis. Bounded queues keep at most threads + render_ahead pages in
+        memory.
+        """
+        threads = min(max(1, settings.processing_pipeline_threads), len(page_indices))
+        render_ahead = max(1, settings.processing_render_ahead)
+        batch_size = self._layout_batch_size()
+        doc_lock = threading.Lock()
+        stop = threading.Event()
+        todo: queue.Queue = queue.Queue()
+        rendered: queue.Queue = queue.Queue(maxsize=render_ahead)
+        results: dict[int, dict] = {}
+        results_ready = threading.Condition()
+        worker_errors: list[BaseException] = []
+
+        def put(target: queue.Queue, item) -> bool:
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(source: queue.Queue):
+            while not stop.is_set():
+                try:
+                    return source.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return None
+
+        def render_loop() -> None:
+            finished = False
+            while not finished:
+                page_index = get(todo)
+                if page_index is None:
+                    break
+                # Take whatever else is already queued, up to a layout batch
+                chunk = [page_index]
+                while len(chunk) < batch_size:
+                    try:
+                        next_index = todo.get_nowait()
+                    except queue.Empty:
+                        break
+                    if next_index is None:
+                        finished = True
+                        break
+                    chunk.append(next_index)
+
+                items = []
+                for page_index in chunk:
+                    try:
+                        items.append((page_index, self.prepare_page(doc, edition_id, page_index, doc_lock), None))
+                    except Exception as e:
+                        logger.error(f"Rendering failed for page {page_index + 1}: {e}")
+                        items.append((page_index, None, e))
+                self._detect_layout_batch([prepared for _, prepared, _ in items if prepared])
+                for item in items:
+                    if not put(rendered, item):
+                        return
+            for _ in range(threads):
+                put(rendered, None)
+
+        def ocr_loop() -> None:
+            while True:
+                item = get(rendered)
+                if item is None:
+                    return
+                page_index, prepared, error = item
+                if error is None:
+                    try:
+                        page_result = self.process_page(doc, edition_id, page_index, prepared=prepared)
+                    except Exception as e:
+                        error = e
+                if error is not None:
+                    page_result = _failed_page_result(page_index, error)
+                with results_ready:
+                    results[page_index] = page_result
+                    results_ready.notify_all()
+
+        def guarded(loop: Callable[[], None]) -> Callable[[], None]:
+            # Page errors become failed page results; anything escaping a loop
+            # stops the pipeline and is re-raised by the consumer below
+            def run() -> None:
+                try:
+                    loop()
+                except BaseException as e:
+                    logger.exception(f"Page pipeline thread {threading.current_thread().name} crashed")
+                    with results_ready:
+                        worker_errors.append(e)
+                        results_ready.notify_all()
+
+            return run
+
+        workers = [threading.Thread(target=guarded(render_loop), name="page-render", daemon=True)]
+        workers.extend(
+            threading.Thread(target=guarded(ocr_loop), name=f"page-ocr-{n}", daemon=True)
+            for n in range(threads)
+        )
+        for worker in workers:
+            worker.start()
+
+        queued = deque(page_indices)
+        in_flight: deque[int] = deque()
+        try:
+            set_stage("EXTRACT")
+            while queued or in_flight:
+                # Backpressure: only a bounded window of pages is rendered or in OCR at once
+                while queued and len(in_flight) < threads + render_ahead:
+                    next_index = queued.popleft()
+                    on_page_start(next_index)
+                    todo.put(next_index)
+                    in_flight.append(next_index)
+                    if not queued:
+                        todo.put(None)
+
+                page_index = in_flight.popleft()
+                with results_ready:
+                    while page_index not in results:
+                        if worker_errors:
+                            raise RuntimeError(
+                                f"Page pipeline failed before page {page_index + 1}: {worker_errors[0]}"
+                            ) from worker_errors[0]
+                        if not any(worker.is_alive() for worker in workers[1:]):
+                            raise RuntimeError(f"Page pipeline stopped before page {page_index + 1}")
+                        results_ready.wait(timeout=1.0)
+                    page_result = results.pop(page_index)
+                yield page_index, page_result
+        finally:
+            stop.set()
+            for worker in workers:
+                worker.join()
+
+    def _write_page_result(
+        self,
+        coalescer: CommitCoalescer,
+        edition_id: int,
+        page: Page,
+        page_id: int,
+        result: dict,
+        fingerprint: str,
+    ) -> int:
+        """Apply a page result to its Page row and queue its Items. Returns items queued."""
+        page.status = result["status"]
+        page.error_message = result["error_message"]
+        if result["status"] != "DONE":
+            page.pipeline_fingerprint = None
+            return 0
+
+        # Checkpoint: a resumed run may reuse this page only under the same fingerprint
+        page.pipeline_fingerprint = fingerprint
+
+        for field_name, value in result["fields"].items():
+            if field_name in PAGE_RESULT_FIELDS:
+                setattr(page, field_name, value)
+
+        page_number = result["page_number"]
+        coalescer.add_items([
+            {
+                "edition_id": edition_id,
+                "page_id": page_id,
+                "page_number": page_number,
+                "item_type": item_data["item_type"],
+                "subtype": item_data.get("subtype"),
+                "title": item_data.get("title"),
+                "text": item_data.get("text"),
+                "bbox_json": item_data.get("bbox_json"),
+                "blocks_json": item_data.get("blocks_json"),  # NEW: Phase 5 field
+                "structured_data": item_data.get("structured_data"),
+                "contact_info_json": item_data.get("contact_info_json"),
+                "price_info_json": item_data.get("price_info_json"),
+                "date_info_json": item_data.get("date_info_json"),
+                "location_info_json": item_data.get("location_info_json"),
+                "classification_details_json": item_data.get("classification_details_json"),
+            }
+            for item_data in result["items"]
+        ])
+        return len(result["items"])
+
+    def process_edition(
+        self,
+        edition_id: int,
+        db: Session,
+        resume: bool = False,
+        should_abort: Callable[[], bool] | None = None,
+    ) -> bool:
         """
         Process a PDF edition page-by-page.
 
+        Pages are processed serially, or fanned out to a process pool when
+        ``processing_max_workers`` is greater than 1. Results are always
+        written back in page order, and committed in batches by a
+        CommitCoalescer (live progress is published to a side-channel file).
+
         Args:
             edition_id: ID of the edition to process
             db: Database session
+            resume: Keep pages already DONE under the current pipeline
+                fingerprint (and their items) and only process the remaining
+                pages, e.g. when a queued job is retried. Classification and
+                story grouping still run once over the whole edition.
+            should_abort: Polled wherever a cancel is checked (e.g. a queue
+                job's lost lease). When it returns True the run stops and
+                rolls back its uncommitted writes, leaving the edition to
+                whoever owns it now.
 
         Returns:
             True if processing succeeded, False otherwise
@@ -98,7 +1177,7 @@ class ProcessingService:
 
         extraction_run = ExtractionRun(
             edition_id=edition_id,
-            version="1.0",
+            version=PIPELINE_VERSION,
             success=False,
             status="RUNNING",
         )
@@ -132,398 +1211,168 @@ class ProcessingService:
             edition.num_pages = total_pages  # type: ignore
             edition.pages_processed = 0  # type: ignore
             edition.processed_pages = 0  # type: ignore
+
+            # Load (or create) every page row up front so the loop never needs to query for them
+            pages_by_number = {
+                page.page_number: page
+                for page in db.query(Page).filter(Page.edition_id == edition_id).all()
+            }
+            for page_number in range(1, total_pages + 1):
+                if page_number not in pages_by_number:
+                    page = Page(edition_id=edition_id, page_number=page_number)
+                    db.add(page)
+                    pages_by_number[page_number] = page
+            db.flush()
+            page_ids = {number: page.id for number, page in pages_by_number.items()}
+
+            fingerprint = pipeline_fingerprint()
+            done_pages: set[int] = set()
+            existing_items = 0
+            if resume:
+                done_pages = {
+                    number for number, page in pages_by_number.items()
+                    if page.status == "DONE"
+                    and page.pipeline_fingerprint == fingerprint
+                    and number <= total_pages
+                }
+            # Drop output from every page being redone (all of them unless resuming),
+            # keeping the vectors for items that come back with unchanged text
+            stale_items = db.query(Item).filter(
+                Item.edition_id == edition_id, Item.page_number.notin_(done_pages)
+            )
+            previous_vectors = (
+                stale_items.filter(Item.embedding.isnot(None))
+                .with_entities(Item.embedding, Item.embedding_model, Item.embedding_text_hash)
+                .all()
+            )
+            stale_items.delete(synchronize_session=False)
+            if done_pages:
+                existing_items = db.query(Item).filter(Item.edition_id == edition_id).count()
+                logger.info(f"Resuming edition {edition_id}: {len(done_pages)} pages already done")
+                append_log(f"Resuming with {len(done_pages)}/{total_pages} pages already done")
+            page_indices = [i for i in range(total_pages) if i + 1 not in done_pages]
+            edition.pages_processed = len(done_pages)  # type: ignore
+            edition.processed_pages = len(done_pages)  # type: ignore
             db.commit()
 
             stats = {
                 "total_pages": total_pages,
-                "processed_pages": 0,
+                "processed_pages": len(done_pages),
                 "pages_with_ocr": 0,
-                "total_items": 0,
+                "total_items": existing_items,
                 "ocr_avg_confidence": None,
                 "ocr_low_conf_pages": 0,
                 "pages_with_fallback_ocr": 0,
+                "max_workers": max(1, int(settings.processing_max_workers or 1)),
+                "pipeline_threads": max(1, int(settings.processing_pipeline_threads or 1)),
+                "resumed_pages": len(done_pages),
+                "pipeline_fingerprint": fingerprint,
+                "stage_cache_hits": {cached_stage: 0 for cached_stage in CACHED_STAGES},
             }
             extraction_run.stats_json = dict(stats)
             db.commit()
 
-            total_items = 0
+            total_items = existing_items
             pages_with_ocr = 0
-            processed_pages = 0
+            processed_pages = len(done_pages)
             any_failed = False
             ocr_conf_sum = 0.0
             ocr_conf_pages = 0
             ocr_low_conf_pages = 0
             pages_with_fallback_ocr = 0
+            stage_cache_hits = dict(stats["stage_cache_hits"])
+            # Page stages are merged in from each page result; INDEX and post-passes are timed here
+            edition_timer = StageTimer()
+            page_timings: list[dict] = []
 
-            for page_index in range(total_pages):
-                db.refresh(edition)
-                if str(edition.status) == "CANCELLED":
-                    append_log("Processing cancelled")
-                    doc.close()
-                    extraction_run.status = "FAILED"
-                    extraction_run.error_message = "Cancelled"
-                    extraction_run.completed_at = datetime.now(UTC)
-                    db.commit()
-                    return False
-
-                page_number = page_index + 1
-                page = db.query(Page).filter(Page.edition_id == edition_id, Page.page_number == page_number).first()
-                if not page:
-                    page = Page(edition_id=edition_id, page_number=page_number)
-                    db.add(page)
-                    db.flush()
-
-                page.status = "PROCESSING"
-                db.commit()
-
-                try:
-                    # ========== STAGE 1: HIGH-DPI RENDERING (Phase 2) ==========
-                    high_res_image_path = None
-                    if settings.advanced_layout_enabled:
-                        edition.current_stage = "RENDER"  # type: ignore
-                        db.commit()
-
-                        # Render at high DPI or target width for layout detection
-                        render_dpi = settings.layout_detection_dpi
-                        target_width = settings.layout_detection_width if settings.layout_detection_width > 0 else None
-
-                        high_res_bytes = self.pdf_processor.get_page_image(
-                            pdf_path,
-                            page_index,
-                            dpi=render_dpi,
-                            target_width=target_width,
-                        )
-
-                        # Store high-res image
-                        pages_dir = os.path.join(settings.storage_path, "pages")
-                        os.makedirs(pages_dir, exist_ok=True)
-                        high_res_image_path = os.path.join(
-                            pages_dir, f"{edition_id}_{page_number}_hires.png"
-                        )
-                        with open(high_res_image_path, "wb") as f:
-                            f.write(high_res_bytes)
-
-                        # Store metadata
-                        page.high_res_image_path = high_res_image_path
-                        page.render_dpi = render_dpi if target_width is None else None
-                        page.render_width_px = target_width
-                        page.layout_method = "heuristic"  # Will be updated to "ml" in Phase 3
-
-                        logger.info(
-                            f"Page {page_number}: Rendered at "
-                            f"{f'{render_dpi} DPI' if target_width is None else f'{target_width}px width'}"
-                        )
+            coalescer = CommitCoalescer(db, edition)
 
-                    # ========== STAGE 1.5: LAYOUT DETECTION (Phase 3) ==========
-                    detected_blocks = None
-                    if settings.advanced_layout_enabled and self.layout_detector and high_res_image_path:
-                        edition.current_stage = "LAYOUT_DETECT"  # type: ignore
-                        db.commit()
+            def on_page_start(page_index: int) -> None:
+                pages_by_number[page_index + 1].status = "PROCESSING"
 
-                        try:
-                            # Run ML-based layout detection on high-res image
-                            with open(high_res_image_path, "rb") as f:
-                                high_res_bytes_for_detection = f.read()
-
-                            layout_result = self.layout_detector.detect_layout(
-                                high_res_bytes_for_detection,
-                                page_data.get("width", 0),
-                                page_data.get("height", 0),
-                            )
-
-                            detected_blocks = layout_result.blocks
-                            page.layout_model_used = layout_result.model_name
-                            page.layout_method = layout_result.method
-                            page.layout_confidence = layout_result.avg_confidence
-
-                            logger.info(
-                                f"Page {page_number}: Detected {len(detected_blocks)} blocks "
-                                f"using {layout_result.method} (confidence: {layout_result.avg_confidence:.2f})"
-                            )
-                        except Exception as e:
-                            logger.warning(f"Layout detection failed for page {page_number}: {e}")
-                            detected_blocks = None
-                            page.layout_method = "heuristic"
-
-                    # ========== STAGE 4: BLOCK-LEVEL OCR (Phase 4) ==========
-                    if (
-                        settings.advanced_layout_enabled
-                        and settings.block_ocr_enabled
-                        and self.block_ocr
-                        and detected_blocks
-                        and high_res_image_path
-                    ):
-                        edition.current_stage = "BLOCK_OCR"  # type: ignore
-                        db.commit()
-
-                        try:
-                            # Load high-res image as numpy array
-                            import numpy as np
-                            from PIL import Image as PILImage
-
-                            with PILImage.open(high_res_image_path) as img:
-                                if img.mode != 'RGB':
-                                    img = img.convert('RGB')
-                                high_res_array = np.array(img)
-
-                            # Run block-level OCR on detected blocks
-                            ocr_results = self.block_ocr.batch_extract(detected_blocks, high_res_array)
-
-                            # Update blocks with OCR text and words
-                            for block, ocr_result in zip(detected_blocks, ocr_results):
-                                block.text = ocr_result.text
-                                block.words = ocr_result.words
-
-                            # Store OCR words in page.ocr_words_json
-                            # Format: [{"text": "...", "bbox": [...], "confidence": 0.95, "block_id": 123}, ...]
-                            all_words = []
-                            for block in detected_blocks:
-                                for word in block.words:
-                                    all_words.append({
-                                        "text": word["text"],
-                                        "bbox": word["bbox"],
-                                        "confidence": word["confidence"],
-                                        "block_id": block.id,
-                                    })
-
-                            page.ocr_words_json = all_words
-
-                            # Calculate stats
-                            total_confidence = sum(w["confidence"] for w in all_words)
-                            avg_conf = total_confidence / len(all_words) if all_words else 0.0
-
-                            logger.info(
-                                f"Page {page_number}: Block OCR extracted {len(all_words)} words "
-                                f"from {len(detected_blocks)} blocks (avg conf: {avg_conf:.2f})"
-                            )
-
-                        except Exception as e:
-                            logger.warning(f"Block OCR failed for page {page_number}: {e}")
-                            page.ocr_words_json = None
-
-                    # ========== STAGE 5: STORY ASSEMBLY (Phase 5) ==========
-                    assembled_items = None
-                    if (
-                        settings.advanced_layout_enabled
-                        and self.layout_assembler
-                        and detected_blocks
-                    ):
-                        edition.current_stage = "STORY_ASSEMBLY"  # type: ignore
-                        db.commit()
+            page_results = self._iter_page_results(
+                doc, pdf_path, edition_id, page_indices, on_page_start, coalescer.set_stage
+            )
+            def abandon() -> bool:
+                if should_abort is None or not should_abort():
+                    return False
+                logger.warning(f"Abandoning edition {edition_id}: processing is no longer ours")
+                if not doc.is_closed:
+                    doc.close()
+                coalescer.discard()
+                return True
 
-                        try:
-                            # Assemble detected blocks into Items
-                            item_groups = self.layout_assembler.assemble_items(detected_blocks)
-
-                            # Convert ItemGroups to extracted_items format
-                            assembled_items = []
-                            for group in item_groups:
-                                group_dict = group.to_dict()
-
-                                # Create item data compatible with existing format
-                                item_data = {
-                                    "item_type": group_dict["item_type"],
-                                    "subtype": group_dict.get("item_subtype"),
-                                    "title": None,  # No title extraction yet
-                                    "text": group_dict["text"],
-                                    "bbox_json": {
-                                        "bbox": group_dict["bbox"],
-                                        "blocks": group_dict["blocks"],  # NEW: structured blocks
-                                    },
-                                    "blocks_json": group_dict["blocks"],  # NEW: Phase 5 field
-                                    "structured_data": None,
-                                    "contact_info_json": None,
-                                    "price_info_json": None,
-                                    "date_info_json": None,
-                                    "location_info_json": None,
-                                    "classification_details_json": None,
-                                }
-                                assembled_items.append(item_data)
-
-                            logger.info(
-                                f"Page {page_number}: Assembled {len(assembled_items)} items "
-                                f"from {len(detected_blocks)} blocks"
-                            )
-
-                        except Exception as e:
-                            logger.warning(f"Story assembly failed for page {page_number}: {e}")
-                            assembled_items = None
-
-                    # ========== STAGE 2: EXTRACT (EXISTING) ==========
-                    edition.current_stage = "EXTRACT"  # type: ignore
-                    db.commit()
-
-                    page_data = self.pdf_processor.get_page_data(doc, page_index)
-                    used_ocr = False
-                    image_path = None
-
-                    if page_data.get("needs_ocr") and self.ocr_service and self.ocr_service.is_available():
-                        edition.current_stage = "OCR"  # type: ignore
+            try:
+                for page_index, page_result in page_results:
+                    if abandon():
+                        return False
+                    if coalescer.edition_status() == "CANCELLED":
+                        append_log("Processing cancelled")
+                        doc.close()
+                        coalescer.flush()
+                        coalescer.close()
+                        extraction_run.status = "FAILED"
+                        extraction_run.error_message = "Cancelled"
+                        extraction_run.completed_at = datetime.now(UTC)
                         db.commit()
+                        return False
 
-                        image_bytes = self.pdf_processor.get_page_image(
-                            pdf_path, page_index, dpi=settings.ocr_image_dpi
-                        )
-                        def _score(result: dict) -> tuple[float, int]:
-                            conf = result.get("avg_confidence")
-                            conf_score = conf if conf is not None else -1.0
-                            return (conf_score, result.get("word_count", 0))
-
-                        ocr_result = self.ocr_service.extract_text_with_boxes(
-                            image_bytes,
-                            preprocess=settings.ocr_preprocess,
-                            psm=settings.ocr_psm,
-                        )
+                    page_number = page_index + 1
+                    page = pages_by_number[page_number]
 
-                        if settings.ocr_retry_enabled:
-                            avg_conf = ocr_result.get("avg_confidence")
-                            if avg_conf is None or avg_conf < settings.ocr_confidence_threshold:
-                                retry_bytes = self.pdf_processor.get_page_image(
-                                    pdf_path, page_index, dpi=settings.ocr_retry_dpi
-                                )
-                                retry_result = self.ocr_service.extract_text_with_boxes(
-                                    retry_bytes,
-                                    preprocess=settings.ocr_preprocess,
-                                    psm=settings.ocr_retry_psm,
-                                )
-
-                                if _score(retry_result) > _score(ocr_result):
-                                    image_bytes = retry_bytes
-                                    ocr_result = retry_result
-
-                        if settings.ocr_fallback_enabled:
-                            avg_conf = ocr_result.get("avg_confidence")
-                            if avg_conf is None or avg_conf < settings.ocr_confidence_threshold:
-                                try:
-                                    fallback_result = self.ocr_service.extract_text_with_boxes_fallback(
-                                        image_bytes,
-                                        preprocess=settings.ocr_preprocess,
-                                    )
-                                    if _score(fallback_result) > _score(ocr_result):
-                                        ocr_result = fallback_result
-                                        pages_with_fallback_ocr += 1
-                                except Exception as e:
-                                    logger.warning(f"Fallback OCR failed for page {page_number}: {e}")
-
-                        pages_dir = os.path.join(settings.storage_path, "pages")
-                        os.makedirs(pages_dir, exist_ok=True)
-                        image_path = os.path.join(pages_dir, f"{edition_id}_{page_number}.png")
-                        with open(image_path, "wb") as f:
-                            f.write(image_bytes)
-
-                        page_data["extracted_text"] = ocr_result["text"]
-                        page_data["text_blocks"].extend(ocr_result["text_blocks"])
-                        page_data["ocr_meta"] = {
-                            "avg_confidence": ocr_result.get("avg_confidence"),
-                            "word_count": ocr_result.get("word_count"),
-                            "psm": ocr_result.get("psm"),
-                            "preprocess": ocr_result.get("preprocess"),
-                            "engine": ocr_result.get("engine"),
-                        }
-                        used_ocr = True
-
-                    edition.current_stage = "LAYOUT"  # type: ignore
-                    db.commit()
-
-                    # Use assembled items from ML pipeline if available
-                    if assembled_items is not None:
-                        page_data["extracted_items"] = assembled_items
-                        logger.debug(
-                            f"Page {page_number}: Using {len(assembled_items)} assembled items from ML pipeline"
-                        )
-                    else:
-                        # Fallback to existing heuristic layout analyzer
-                        try:
-                            page_data = self.layout_analyzer.analyze_page(page_data)
-                        except Exception as e:
-                            logger.error(f"Layout analysis failed for page {page_number}: {e}")
-                            page_data["extracted_items"] = []
-
-                    # ========== STAGE 3: READING ORDER (Phase 2) ==========
-                    if settings.reading_order_enabled and self.reading_order:
-                        try:
-                            text_blocks = page_data.get("text_blocks", [])
-                            if text_blocks:
-                                # Assign reading order to text blocks
-                                ordered_blocks = self.reading_order.assign_reading_order(
-                                    text_blocks, page_data.get("width", 0)
-                                )
-                                page_data["text_blocks"] = ordered_blocks
-                                logger.debug(
-                                    f"Page {page_number}: Assigned reading order to {len(ordered_blocks)} blocks"
-                                )
-                        except Exception as e:
-                            logger.warning(f"Reading order assignment failed for page {page_number}: {e}")
-
-                    edition.current_stage = "INDEX"  # type: ignore
-                    db.commit()
-
-                    page.extracted_text = page_data.get("extracted_text")
-                    page.bbox_json = {
-                        "text_blocks": page_data.get("text_blocks", []),
-                        "ocr_meta": page_data.get("ocr_meta"),
-                    }
-                    page.char_count = len(page_data.get("extracted_text") or "")
-                    page.ocr_used = used_ocr
-                    if image_path:
-                        page.image_path = image_path
-
-                    extracted_items = page_data.get("extracted_items", [])
-                    for item_data in extracted_items:
-                        item = Item(
-                            edition_id=edition_id,
-                            page_id=page.id,
-                            page_number=page_number,
-                            item_type=item_data["item_type"],
-                            subtype=item_data.get("subtype"),
-                            title=item_data.get("title"),
-                            text=item_data.get("text"),
-                            bbox_json=item_data.get("bbox_json"),
-                            blocks_json=item_data.get("blocks_json"),  # NEW: Phase 5 field
-                            structured_data=item_data.get("structured_data"),
-                            contact_info_json=item_data.get("contact_info_json"),
-                            price_info_json=item_data.get("price_info_json"),
-                            date_info_json=item_data.get("date_info_json"),
-                            location_info_json=item_data.get("location_info_json"),
-                            classification_details_json=item_data.get("classification_details_json"),
-                        )
-                        db.add(item)
-                        total_items += 1
+                    coalescer.set_stage("INDEX")
+                    edition_timer.start("INDEX")
+                    total_items += self._write_page_result(
+                        coalescer, edition_id, page, page_ids[page_number], page_result, fingerprint
+                    )
 
-                    if used_ocr:
+                    if page_result["status"] != "DONE":
+                        any_failed = True
+                    elif page_result["used_ocr"]:
                         pages_with_ocr += 1
-                        avg_conf = (page_data.get("ocr_meta") or {}).get("avg_confidence")
-                        if isinstance(avg_conf, (int, float)):
+                        avg_conf = page_result.get("ocr_avg_confidence")
+                        if isinstance(avg_conf, int | float):
                             ocr_conf_sum += float(avg_conf)
                             ocr_conf_pages += 1
                             if avg_conf < settings.ocr_confidence_threshold:
                                 ocr_low_conf_pages += 1
-
-                    page.status = "DONE"
-                    page.error_message = None
-                except Exception as e:
-                    logger.error(f"Page processing failed for page {page_number}: {e}")
-                    page.status = "FAILED"
-                    page.error_message = str(e)[:500]
-                    any_failed = True
-
-                processed_pages += 1
-                edition.processed_pages = processed_pages  # type: ignore
-                edition.pages_processed = processed_pages  # type: ignore
-
-                stats["processed_pages"] = processed_pages
-                stats["pages_with_ocr"] = pages_with_ocr
-                stats["total_items"] = total_items
-                stats["ocr_low_conf_pages"] = ocr_low_conf_pages
-                stats["pages_with_fallback_ocr"] = pages_with_fallback_ocr
-                if ocr_conf_pages:
-                    stats["ocr_avg_confidence"] = round(ocr_conf_sum / ocr_conf_pages, 2)
-                extraction_run.stats_json = dict(stats)
-
-                db.commit()
-                append_log(f"Page {page_number}/{total_pages} processed")
-
+                    if page_result.get("used_fallback_ocr"):
+                        pages_with_fallback_ocr += 1
+                    for cached_stage in page_result.get("cached_stages") or []:
+                        stage_cache_hits[cached_stage] += 1
+                    page_timing = page_result.get("timings")
+                    if page_timing:
+                        edition_timer.merge(page_timing)
+                        page_timings.append({
+                            "page_number": page_number,
+                            "wall_s": page_timing["wall_s"],
+                            "cpu_s": page_timing["cpu_s"],
+                            "peak_rss_mb": page_timing["peak_rss_mb"],
+                        })
+
+                    processed_pages += 1
+
+                    stats["processed_pages"] = processed_pages
+                    stats["pages_with_ocr"] = pages_with_ocr
+                    stats["total_items"] = total_items
+                    stats["ocr_low_conf_pages"] = ocr_low_conf_pages
+                    stats["pages_with_fallback_ocr"] = pages_with_fallback_ocr
+                    stats["stage_cache_hits"] = dict(stage_cache_hits)
+                    if ocr_conf_pages:
+                        stats["ocr_avg_confidence"] = round(ocr_conf_sum / ocr_conf_pages, 2)
+                    stats["timings"] = _timings_summary(edition_timer, page_timings)
+                    extraction_run.stats_json = dict(stats)
+
+                    coalescer.page_done(processed_pages)
+                    edition_timer.stop()
+                    append_log(f"Page {page_number}/{total_pages} processed")
+            finally:
+                page_results.close()
+
+            if abandon():
+                return False
             doc.close()
+            coalescer.flush()
 
             if any_failed and processed_pages == 0:
                 raise RuntimeError("All pages failed")
@@ -548,8 +1397,16 @@ class ProcessingService:
             })
             extraction_run.stats_json = dict(stats)
 
+            if previous_vectors:
+                new_items = (
+                    db.query(Item).filter(Item.edition_id == edition_id, Item.embedding.is_(None)).all()
+                )
+                carried = carry_over(new_items, [embedding_text(item) for item in new_items], previous_vectors)
+                logger.info(f"Carried over {carried} stored embeddings from replaced items")
+
             try:
                 logger.info("Running category classification...")
+                edition_timer.start("CLASSIFY")
                 category_classifier = CategoryClassifier(db)
                 all_items = db.query(Item).filter(Item.edition_id == edition_id).all()
 
@@ -566,15 +1423,26 @@ class ProcessingService:
             except Exception as e:
                 logger.warning(f"Category classification failed: {e}")
 
+            edition_timer.stop()
+
             if settings.story_grouping_enabled:
+                edition_timer.start("STORY_GROUPING")
                 try:
                     grouped_count = persist_story_groups(db, edition_id)
                     logger.info("Persisted %s story groups", grouped_count)
                 except Exception as e:
                     logger.warning(f"Story grouping failed: {e}")
+                edition_timer.stop()
+
+            stats["db_commit_batches"] = coalescer.commit_count
+            stats["timings"] = _timings_summary(edition_timer, page_timings)
+            extraction_run.stats_json = dict(stats)
 
+            if abandon():
+                return False
             append_log("Processing completed")
             db.commit()
+            coalescer.close()
             return True
 
         except Exception as e:
@@ -587,17 +1455,98 @@ class ProcessingService:
             extraction_run.finished_at = datetime.now(UTC)
             extraction_run.completed_at = datetime.now(UTC)
             db.commit()
+            clear_progress(edition_id)
             append_log(f"Processing failed: {e}")
             return False
 
 
+# Per-process state for page workers started by ProcessingService._iter_page_results
+_worker_service: ProcessingService | None = None
+_worker_doc: fitz.Document | None = None
+
+
+def _init_page_worker(pdf_path: str, settings_values: dict) -> None:
+    """Process pool initializer: apply parent settings, open the PDF and warm services once."""
+    global _worker_service, _worker_doc
+    for name, value in settings_values.items():
+        setattr(settings, name, value)
+    _worker_service = ProcessingService()
+    _worker_doc = fitz.open(pdf_path)
+
+
+def _process_page_in_worker(edition_id: int, page_index: int) -> dict:
+    if _worker_service is None or _worker_doc is None:
+        raise RuntimeError("Page worker not initialized")
+    return _worker_service.process_page(_worker_doc, edition_id, page_index)
+
+
+def _timings_summary(timer: StageTimer, page_timings: list[dict]) -> dict:
+    """Edition timing stats: per-stage totals (summed across pages) plus per-page totals."""
+    summary = timer.to_dict()
+    summary["pages"] = list(page_timings)
+    summary["process_peak_rss_mb"] = peak_rss_mb()  # Lifetime high-water mark, for reference
+    return summary
+
+
+def _failed_page_result(page_index: int, error: Exception) -> dict:
+    return {
+        "page_number": page_index + 1,
+        "status": "FAILED",
+        "error_message": str(error)[:500],
+        "fields": {},
+        "items": [],
+        "used_ocr": False,
+        "ocr_avg_confidence": None,
+        "used_fallback_ocr": False,
+    }
+
+
+def _layout_render_size() -> tuple[int, int | None]:
+    """(dpi, target width) used to render pages for layout detection; width wins if set."""
+    target_width = settings.layout_detection_width if settings.layout_detection_width > 0 else None
+    return settings.layout_detection_dpi, target_width
+
+
+def _page_image_path(edition_id: int, page_number: int, suffix: str = "") -> str:
+    pages_dir = os.path.join(settings.storage_path, "pages")
+    os.makedirs(pages_dir, exist_ok=True)
+    return os.path.join(pages_dir, f"{edition_id}_{page_number}{suffix}.png")
+
+
 def create_processing_service() -> ProcessingService:
     return ProcessingService()
 
 
+# Warm service shared by jobs and single-page requests in this process
+_shared_service: ProcessingService | None = None
+_shared_service_key: str | None = None
+_shared_service_lock = threading.Lock()
+
+
+def get_processing_service() -> ProcessingService:
+    """
+    Return the process-wide ProcessingService, loading OCR and layout models once.
+
+    The instance is rebuilt when settings that affect page output (or the
+    model device) change, so configuration changes apply without a restart.
+    """
+    global _shared_service, _shared_service_key
+    key = fingerprint({"pipeline": pipeline_fingerprint(), "device": settings.layout_model_device})
+    with _shared_service_lock:
+        if _shared_service is None or _shared_service_key != key:
+            _shared_service = ProcessingService()
+            _shared_service_key = key
+        return _shared_service
+
+
 def reprocess_single_page(edition_id: int, page_number: int, db: Session) -> bool:
     """
-    Reprocess a single page for an edition (OCR + layout + items).
+    Reprocess a single page for an edition.
+
+    Runs the same stage graph as process_edition (OCR with retry / fallback,
+    layout detection, block OCR, assembly, reading order) on the shared warm
+    service, ignoring cached stage output, then replaces the page's items and
+    classifies them.
     """
     edition = db.query(Edition).filter(Edition.id == edition_id).first()
     if not edition:
@@ -613,17 +1562,15 @@ def reprocess_single_page(edition_id: int, page_number: int, db: Session) -> boo
         logger.error("Invalid page number %s", page_number)
         return False
 
-    processing_service = ProcessingService()
+    processing_service = get_processing_service()
+    doc = None
 
     try:
         doc = fitz.open(pdf_path)
         if page_number > len(doc):
             logger.error("Page number %s out of range", page_number)
-            doc.close()
             return False
 
-        page_index = page_number - 1
-
         page = (
             db.query(Page)
             .filter(Page.edition_id == edition_id, Page.page_number == page_number)
@@ -637,117 +1584,40 @@ def reprocess_single_page(edition_id: int, page_number: int, db: Session) -> boo
         page.status = "PROCESSING"
         db.commit()
 
-        page_data = processing_service.pdf_processor.get_page_data(doc, page_index)
-        used_ocr = False
-        image_path = None
-
-        if page_data.get("needs_ocr") and processing_service.ocr_service and processing_service.ocr_service.is_available():
-            image_bytes = processing_service.pdf_processor.get_page_image(
-                pdf_path, page_index, dpi=settings.ocr_image_dpi
-            )
-
-            def _score(result: dict) -> tuple[float, int]:
-                conf = result.get("avg_confidence")
-                conf_score = conf if conf is not None else -1.0
-                return (conf_score, result.get("word_count", 0))
-
-            ocr_result = processing_service.ocr_service.extract_text_with_boxes(
-                image_bytes,
-                preprocess=settings.ocr_preprocess,
-                psm=settings.ocr_psm,
-            )
-
-            if settings.ocr_retry_enabled:
-                avg_conf = ocr_result.get("avg_confidence")
-                if avg_conf is None or avg_conf < settings.ocr_confidence_threshold:
-                    retry_bytes = processing_service.pdf_processor.get_page_image(
-                        pdf_path, page_index, dpi=settings.ocr_retry_dpi
-                    )
-                    retry_result = processing_service.ocr_service.extract_text_with_boxes(
-                        retry_bytes,
-                        preprocess=settings.ocr_preprocess,
-                        psm=settings.ocr_retry_psm,
-                    )
-                    if _score(retry_result) > _score(ocr_result):
-                        image_bytes = retry_bytes
-                        ocr_result = retry_result
-
-            if settings.ocr_fallback_enabled:
-                avg_conf = ocr_result.get("avg_confidence")
-                if avg_conf is None or avg_conf < settings.ocr_confidence_threshold:
-                    try:
-                        fallback_result = processing_service.ocr_service.extract_text_with_boxes_fallback(
-                            image_bytes,
-                            preprocess=settings.ocr_preprocess,
-                        )
-                        if _score(fallback_result) > _score(ocr_result):
-                            ocr_result = fallback_result
-                    except Exception as e:
-                        logger.warning("Fallback OCR failed for page %s: %s", page_number, e)
-
-            pages_dir = os.path.join(settings.storage_path, "pages")
-            os.makedirs(pages_dir, exist_ok=True)
-            image_path = os.path.join(pages_dir, f"{edition_id}_{page_number}.png")
-            with open(image_path, "wb") as f:
-                f.write(image_bytes)
-
-            page_data["extracted_text"] = ocr_result["text"]
-            page_data["text_blocks"].extend(ocr_result["text_blocks"])
-            page_data["ocr_meta"] = {
-                "avg_confidence": ocr_result.get("avg_confidence"),
-                "word_count": ocr_result.get("word_count"),
-                "psm": ocr_result.get("psm"),
-                "preprocess": ocr_result.get("preprocess"),
-                "engine": ocr_result.get("engine"),
-            }
-            used_ocr = True
+        page_result = processing_service.process_page(
+            doc, edition_id, page_number - 1, use_cache=False
+        )
+        if page_result["status"] != "DONE":
+            raise RuntimeError(page_result["error_message"] or "Page processing failed")
+
+        old_items = db.query(Item).filter(Item.edition_id == edition_id, Item.page_number == page_number)
+        previous_vectors = (
+            old_items.filter(Item.embedding.isnot(None))
+            .with_entities(Item.embedding, Item.embedding_model, Item.embedding_text_hash)
+            .all()
+        )
+        old_items.delete()
+        coalescer = CommitCoalescer(db, edition)
+        processing_service._write_page_result(
+            coalescer, edition_id, page, page.id, page_result, pipeline_fingerprint()
+        )
+        coalescer.flush()
 
+        page_items = db.query(Item).filter(Item.page_id == page.id).all()
+        carry_over(page_items, [embedding_text(item) for item in page_items], previous_vectors)
         try:
-            page_data = processing_service.layout_analyzer.analyze_page(page_data)
+            if page_items:
+                CategoryClassifier(db).batch_classify_items(
+                    page_items, confidence_threshold=30, clear_existing=True
+                )
         except Exception as e:
-            logger.error("Layout analysis failed for page %s: %s", page_number, e)
-            page_data["extracted_items"] = []
+            logger.warning("Category classification failed for page %s: %s", page_number, e)
 
-        db.query(Item).filter(Item.edition_id == edition_id, Item.page_number == page_number).delete()
         db.commit()
-
-        page.extracted_text = page_data.get("extracted_text")
-        page.bbox_json = {
-            "text_blocks": page_data.get("text_blocks", []),
-            "ocr_meta": page_data.get("ocr_meta"),
-        }
-        page.char_count = len(page_data.get("extracted_text") or "")
-        page.ocr_used = used_ocr
-        if image_path:
-            page.image_path = image_path
-
-        extracted_items = page_data.get("extracted_items", [])
-        for item_data in extracted_items:
-            item = Item(
-                edition_id=edition_id,
-                page_id=page.id,
-                page_number=page_number,
-                item_type=item_data["item_type"],
-                subtype=item_data.get("subtype"),
-                title=item_data.get("title"),
-                text=item_data.get("text"),
-                bbox_json=item_data.get("bbox_json"),
-                structured_data=item_data.get("structured_data"),
-                contact_info_json=item_data.get("contact_info_json"),
-                price_info_json=item_data.get("price_info_json"),
-                date_info_json=item_data.get("date_info_json"),
-                location_info_json=item_data.get("location_info_json"),
-                classification_details_json=item_data.get("classification_details_json"),
-            )
-            db.add(item)
-
-        page.status = "DONE"
-        page.error_message = None
-        db.commit()
-        doc.close()
         return True
     except Exception as e:
         logger.error("Page reprocess failed for edition %s page %s: %s", edition_id, page_number, e)
+        db.rollback()
         page = (
             db.query(Page)
             .filter(Page.edition_id == edition_id, Page.page_number == page_number)
@@ -758,3 +1628,6 @@ def reprocess_single_page(edition_id: int, page_number: int, db: Session) -> boo
             page.error_message = str(e)[:500]
             db.commit()
         return False
+    finally:
+        if doc is not None:
+            doc.close()
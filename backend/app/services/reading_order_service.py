@@ -15,6 +15,9 @@ Key challenges in newspaper reading order:
 import logging
 from typing import Any, List
 
+from app.services.block_array import union_boxes
+from app.services.geometry_index import sweep_columns
+
 logger = logging.getLogger(__name__)
 
 
@@ -93,84 +96,27 @@ class ReadingOrderService:
         if not blocks:
             return []
 
-        columns: List[List[dict]] = []
-        col_boxes: List[List[float]] = []
-
         # Sort blocks by x-position first, then y-position
         sorted_blocks = sorted(
             blocks, key=lambda b: (b['bbox'][0], b['bbox'][1])
         )
 
-        for block in sorted_blocks:
-            bbox = block['bbox']
-            placed = False
-
-            # Try to place block in existing column
-            for idx, col_box in enumerate(col_boxes):
-                if self._x_overlap_ratio(bbox, col_box) >= self.x_overlap_threshold:
-                    columns[idx].append(block)
-                    # Expand column bounding box
-                    col_boxes[idx] = self._bbox_union(col_box, bbox)
-                    placed = True
-                    break
-
-            # Create new column if block doesn't fit in existing ones
-            if not placed:
-                columns.append([block])
-                col_boxes.append(bbox[:])  # Copy bbox
-
-        # Sort columns by x-position (left to right)
+        # Each block joins the first column it overlaps enough (sweep over x-extents)
+        assignment = sweep_columns(
+            [(block['bbox'][0], block['bbox'][2]) for block in sorted_blocks],
+            self.x_overlap_threshold,
+        )
+
+        columns: List[List[dict]] = [[] for _ in range(max(assignment) + 1)]
+        for block, idx in zip(sorted_blocks, assignment, strict=True):
+            columns[idx].append(block)
+
+        # Column bounding boxes, then sort columns by x-position (left to right)
+        col_boxes = union_boxes([block['bbox'] for block in sorted_blocks], assignment, len(columns))
         ordered_columns = sorted(
-            [(col_boxes[i][0], columns[i]) for i in range(len(columns))],
+            [(float(col_boxes[i, 0]), columns[i]) for i in range(len(columns))],
             key=lambda item: item[0],
         )
 
         logger.debug(f"Detected {len(ordered_columns)} columns")
         return ordered_columns
-
-    def _x_overlap_ratio(self, bbox1: List[float], bbox2: List[float]) -> float:
-        """
-        Calculate horizontal overlap ratio between two bboxes.
-
-        Args:
-            bbox1: [x0, y0, x1, y1]
-            bbox2: [x0, y0, x1, y1]
-
-        Returns:
-            Overlap ratio (0-1)
-        """
-        x1_min, _, x1_max, _ = bbox1
-        x2_min, _, x2_max, _ = bbox2
-
-        # Calculate overlap
-        overlap_start = max(x1_min, x2_min)
-        overlap_end = min(x1_max, x2_max)
-        overlap = max(0, overlap_end - overlap_start)
-
-        # Calculate minimum width
-        width1 = x1_max - x1_min
-        width2 = x2_max - x2_min
-        min_width = min(width1, width2)
-
-        if min_width == 0:
-            return 0.0
-
-        return overlap / min_width
-
-    def _bbox_union(self, bbox1: List[float], bbox2: List[float]) -> List[float]:
-        """
-        Calculate the union of two bounding boxes.
-
-        Args:
-            bbox1: [x0, y0, x1, y1]
-            bbox2: [x0, y0, x1, y1]
-
-        Returns:
-            Union bbox [x0, y0, x1, y1]
-        """
-        return [
-            min(bbox1[0], bbox2[0]),  # x0
-            min(bbox1[1], bbox2[1]),  # y0
-            max(bbox1[2], bbox2[2]),  # x1
-            max(bbox1[3], bbox2[3]),  # y1
-        ]
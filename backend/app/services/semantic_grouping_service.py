@@ -19,13 +19,20 @@ Hybrid approach combines:
 from __future__ import annotations
 
 import logging
+from types import SimpleNamespace
 from typing import TYPE_CHECKING, List, Optional, Tuple
 
+from app.services.embedding_store import EmbeddingStore
+from app.services.model_registry import ModelHandle, get_model_registry
+
 if TYPE_CHECKING:
     import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Item dict keys holding a stored embedding (the EmbeddingStore record fields)
+EMBEDDING_KEYS = ("embedding", "embedding_model", "embedding_text_hash")
+
 # Try to import sentence-transformers
 SENTENCE_TRANSFORMERS_AVAILABLE = False
 SentenceTransformer = None
@@ -61,6 +68,7 @@ class SemanticGroupingService:
         semantic_weight: float = 0.4,
         token_weight: float = 0.3,
         explicit_ref_weight: float = 0.3,
+        batch_size: int = 32,
     ):
         """
         Initialize the semantic grouping service.
@@ -71,13 +79,15 @@ class SemanticGroupingService:
             semantic_weight: Weight for semantic similarity (default: 0.4)
             token_weight: Weight for token overlap (default: 0.3)
             explicit_ref_weight: Weight for explicit references (default: 0.3)
+            batch_size: Texts per model call in generate_embeddings (default: 32)
         """
         self.model_name = model_name
         self.device = device
         self.semantic_weight = semantic_weight
         self.token_weight = token_weight
         self.explicit_ref_weight = explicit_ref_weight
-        self._model: Optional["SentenceTransformer"] = None
+        self.batch_size = max(1, batch_size)
+        self._model: Optional[ModelHandle] = None
 
         logger.info(
             f"Initializing SemanticGroupingService with model={model_name}, "
@@ -87,7 +97,13 @@ class SemanticGroupingService:
         # Initialize embedding model if available
         if SENTENCE_TRANSFORMERS_AVAILABLE and SentenceTransformer is not None:
             try:
-                self._model = SentenceTransformer(model_name, device=device)
+                # Shared across services and jobs; loaded once per process
+                self._model = get_model_registry().handle(
+                    "sentence-transformer",
+                    {"model_name": model_name, "device": device},
+                    lambda: SentenceTransformer(model_name, device=device),
+                )
+                self._model.load()
                 logger.info(f"Loaded BGE model: {model_name}")
             except Exception as e:
                 logger.warning(f"Failed to load BGE model: {e}, semantic grouping unavailable")
@@ -120,6 +136,44 @@ class SemanticGroupingService:
             logger.warning(f"Failed to generate embedding: {e}")
             return None
 
+    def generate_embeddings(
+        self, texts: List[str], batch_size: Optional[int] = None
+    ) -> List[Optional["np.ndarray"]]:
+        """
+        Generate embedding vectors for many texts, batching model calls.
+
+        Texts are bucketed by length (longest first) so each batch pads to
+        similar lengths. A batch that fails is retried text by text.
+
+        Args:
+            texts: Texts to embed
+            batch_size: Texts per model call (default: the service's batch_size)
+
+        Returns:
+            One embedding per text, in input order (None for blank texts or if unavailable)
+        """
+        embeddings: List[Optional["np.ndarray"]] = [None] * len(texts)
+        if not self.is_available():
+            return embeddings
+
+        batch_size = max(1, batch_size or self.batch_size)
+        order = sorted((i for i, text in enumerate(texts) if text.strip()), key=lambda i: -len(texts[i]))
+        for start in range(0, len(order), batch_size):
+            batch = order[start : start + batch_size]
+            try:
+                vectors = self._model.encode(
+                    [texts[i] for i in batch], batch_size=len(batch), normalize_embeddings=True
+                )
+            except Exception as e:
+                logger.warning(f"Failed to generate embeddings for a batch of {len(batch)}: {e}")
+                for i in batch:
+                    embeddings[i] = self.generate_embedding(texts[i])
+                continue
+            for i, vector in zip(batch, vectors, strict=True):
+                embeddings[i] = vector
+
+        return embeddings
+
     def semantic_similarity(self, embedding1: Optional["np.ndarray"], embedding2: Optional["np.ndarray"]) -> float:
         """
         Calculate cosine similarity between two embeddings.
@@ -151,6 +205,11 @@ class SemanticGroupingService:
         """
         Group stories using hybrid semantic + heuristic approach.
 
+        Embeddings are read through an EmbeddingStore: a vector already in an
+        item's 'embedding', 'embedding_model' and 'embedding_text_hash' keys
+        (e.g. copied from its Item row) is reused if it matches, and new
+        vectors are written back to those keys for the caller to persist.
+
         Args:
             items: List of item dictionaries with 'id', 'text', 'page_number' keys
             similarity_threshold: Minimum hybrid score to group items (default: 0.65)
@@ -166,17 +225,18 @@ class SemanticGroupingService:
         if not items:
             return []
 
-        # Generate embeddings for all items (if available)
+        # Generate embeddings for all items (if available), batched
         item_embeddings = {}
         if self.is_available():
-            for item in items:
-                text = item.get("text", "")
-                if text:
-                    # Generate embedding for the start of the story
-                    start_text = self._prepare_text_for_embedding(text, mode="start")
-                    embedding = self.generate_embedding(start_text)
-                    if embedding is not None:
-                        item_embeddings[item["id"]] = embedding
+            embedded = [item for item in items if item.get("text", "")]
+            # Embed the start of each story
+            start_texts = [self._prepare_text_for_embedding(item["text"], mode="start") for item in embedded]
+            records = [SimpleNamespace(**{key: item.get(key) for key in EMBEDDING_KEYS}) for item in embedded]
+            embeddings = EmbeddingStore(self.model_name).embed(records, start_texts, self.generate_embeddings)
+            for item, record, embedding in zip(embedded, records, embeddings, strict=True):
+                if embedding is not None:
+                    item_embeddings[item["id"]] = embedding
+                    item.update(vars(record))
 
         # Build similarity graph
         groups = []
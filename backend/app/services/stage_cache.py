@@ -0,0 +1,152 @@
+"""
+On-disk cache of per-page stage outputs.
+
+Each entry is keyed by a stage fingerprint (see
+``pipeline_version.stage_fingerprint``): the page's content hash, the settings
+and code version of that stage, and the keys of the stages feeding it. When
+an edition is reprocessed, stages whose inputs did not change are read back
+from here instead of being recomputed, so e.g. a layout heuristic change
+reruns analysis but not OCR.
+
+Entries are small JSON files, written atomically so concurrent page workers
+can share one cache directory. A hit refreshes the file's mtime; once the
+directory grows past ``stage_cache_max_mb`` the least recently used entries
+are evicted, and entries unused for ``stage_cache_max_age_days`` are dropped
+whenever the directory is scanned.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CACHED_STAGES = ("ocr", "layout", "analysis")
+
+# After an eviction the cache is trimmed to this fraction of its limit, so
+# the directory is not rescanned on every write near the limit
+EVICT_TO_FRACTION = 0.9
+
+
+class StageCache:
+    """Content-addressed, size-bounded JSON store for page stage results."""
+
+    def __init__(
+        self,
+        root: str | None = None,
+        enabled: bool = True,
+        max_bytes: int = 1024 * 1024 * 1024,
+        max_age_seconds: float | None = None,
+    ):
+        self.root = root or os.path.join(settings.storage_path, "stage_cache")
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds or None
+        self._lock = threading.Lock()
+        self._size: int | None = None  # Lazily measured (and expired entries pruned) on the first write
+        self.evictions = 0
+
+    def path_for(self, stage: str, key: str) -> str:
+        return os.path.join(self.root, stage, key[:2], f"{key}.json")
+
+    def get(self, stage: str, key: str) -> dict | None:
+        """Return the cached output for a stage key, or None on a miss."""
+        if not self.enabled:
+            return None
+        path = self.path_for(stage, key)
+        try:
+            with open(path, encoding="utf-8") as cache_file:
+                value = json.load(cache_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable stage cache entry {stage}/{key}: {e}")
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return value
+
+    def put(self, stage: str, key: str, value: dict) -> None:
+        """Store a stage output. Failures are logged and otherwise ignored."""
+        if not self.enabled:
+            return
+        path = self.path_for(stage, key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            payload = json.dumps(value).encode("utf-8")
+            with open(tmp_path, "wb") as cache_file:
+                cache_file.write(payload)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write stage cache entry {stage}/{key}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._prune()
+            else:
+                self._size += len(payload)
+            if self._size > self.max_bytes:
+                self._size = self._prune(target=self.max_bytes * EVICT_TO_FRACTION)
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        """(mtime, size, path) of every entry."""
+        entries = []
+        for dirpath, _dirnames, filenames in os.walk(self.root):
+            for filename in filenames:
+                if not filename.endswith(".json"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _prune(self, target: float | None = None) -> int:
+        """
+        Delete entries older than the age limit, then least recently used ones
+        until the cache is at most ``target`` bytes. Returns the size left.
+        """
+        entries = sorted(self._entries())
+        size = sum(entry_size for _, entry_size, _ in entries)
+        cutoff = time.time() - self.max_age_seconds if self.max_age_seconds else None
+        for mtime, entry_size, path in entries:
+            expired = cutoff is not None and mtime < cutoff
+            if not expired and (target is None or size <= target):
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entry_size
+            self.evictions += 1
+        return size
+
+    def clear(self, stage: str | None = None) -> None:
+        """Drop all entries, or only those of one stage."""
+        with self._lock:
+            shutil.rmtree(os.path.join(self.root, stage) if stage else self.root, ignore_errors=True)
+            self._size = None
+
+
+def create_stage_cache() -> StageCache:
+    return StageCache(
+        root=settings.stage_cache_dir,
+        enabled=settings.stage_cache_enabled,
+        max_bytes=settings.stage_cache_max_mb * 1024 * 1024,
+        max_age_seconds=settings.stage_cache_max_age_days * 86400,
+    )
@@ -0,0 +1,158 @@
+"""
+Lightweight per-stage instrumentation for edition processing.
+
+StageTimer records wall time, CPU time (of the calling thread) and memory
+for named stages. Memory is the process's current RSS sampled at each stage
+boundary: per stage, the highest sample (``peak_rss_mb``) and the largest
+growth over one run of the stage (``max_rss_delta_mb``). Page stages are
+timed inside process_page and merged into an edition-level timer whose
+summary is stored in ``ExtractionRun.stats_json["timings"]``.
+
+CPU time excludes child processes, so tesseract's own CPU shows up as wall
+time in the OCR stages rather than as CPU.
+"""
+
+import os
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    resource = None
+    RESOURCE_AVAILABLE = False
+
+
+def current_rss_mb() -> float | None:
+    """Current resident set size of this process in MB (Linux), or None."""
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size over the process lifetime in MB, or None if unavailable."""
+    if not RESOURCE_AVAILABLE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def _max(current: float | None, value: float | None) -> float | None:
+    if value is None:
+        return current
+    return value if current is None else max(current, value)
+
+
+class StageTimer:
+    """Accumulates wall time, CPU time and RSS samples per named stage."""
+
+    def __init__(self):
+        self.stages: dict[str, dict] = {}
+        self.peak_rss_mb: float | None = None  # Highest RSS sampled at any stage boundary
+        self._current: str | None = None
+        self._wall_start = 0.0
+        self._cpu_start = 0.0
+        self._rss_start: float | None = None
+
+    def start(self, name: str) -> None:
+        """End the running stage (if any) and start timing ``name``."""
+        if name == self._current:
+            return
+        self.stop()
+        self._current = name
+        self._rss_start = current_rss_mb()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+
+    def stop(self) -> None:
+        """End the running stage."""
+        if self._current is None:
+            return
+        wall_s = time.perf_counter() - self._wall_start
+        cpu_s = time.thread_time() - self._cpu_start
+        rss_end = current_rss_mb()
+        rss_delta = (
+            round(rss_end - self._rss_start, 1) if rss_end is not None and self._rss_start is not None else None
+        )
+        self.add(
+            self._current, wall_s, cpu_s, rss_mb=_max(self._rss_start, rss_end), rss_delta_mb=rss_delta
+        )
+        self._current = None
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """Time a block as one stage."""
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop()
+
+    def add(
+        self,
+        name: str,
+        wall_s: float,
+        cpu_s: float,
+        count: int = 1,
+        max_wall_s: float | None = None,
+        rss_mb: float | None = None,
+        rss_delta_mb: float | None = None,
+    ) -> None:
+        entry = self.stages.setdefault(
+            name,
+            {"count": 0, "wall_s": 0.0, "cpu_s": 0.0, "max_wall_s": 0.0, "peak_rss_mb": None, "max_rss_delta_mb": None},
+        )
+        entry["count"] += count
+        entry["wall_s"] += wall_s
+        entry["cpu_s"] += cpu_s
+        entry["max_wall_s"] = max(entry["max_wall_s"], max_wall_s if max_wall_s is not None else wall_s)
+        entry["peak_rss_mb"] = _max(entry["peak_rss_mb"], rss_mb)
+        entry["max_rss_delta_mb"] = _max(entry["max_rss_delta_mb"], rss_delta_mb)
+        self.peak_rss_mb = _max(self.peak_rss_mb, rss_mb)
+
+    def merge(self, timings: dict | None) -> None:
+        """Fold in another timer's to_dict() output (e.g. from a page or a worker process)."""
+        if not timings:
+            return
+        for name, entry in (timings.get("stages") or {}).items():
+            self.add(
+                name,
+                entry["wall_s"],
+                entry["cpu_s"],
+                entry.get("count", 1),
+                entry.get("max_wall_s"),
+                rss_mb=entry.get("peak_rss_mb"),
+                rss_delta_mb=entry.get("max_rss_delta_mb"),
+            )
+        self.peak_rss_mb = _max(self.peak_rss_mb, timings.get("peak_rss_mb"))
+
+    def total(self, key: str = "wall_s") -> float:
+        return sum(entry[key] for entry in self.stages.values())
+
+    def to_dict(self) -> dict:
+        self.stop()
+        return {
+            "stages": {
+                name: {
+                    "count": entry["count"],
+                    "wall_s": round(entry["wall_s"], 4),
+                    "cpu_s": round(entry["cpu_s"], 4),
+                    "max_wall_s": round(entry["max_wall_s"], 4),
+                    "peak_rss_mb": entry["peak_rss_mb"],
+                    "max_rss_delta_mb": entry["max_rss_delta_mb"],
+                }
+                for name, entry in self.stages.items()
+            },
+            "wall_s": round(self.total("wall_s"), 4),
+            "cpu_s": round(self.total("cpu_s"), 4),
+            "peak_rss_mb": self.peak_rss_mb,
+        }
@@ -9,6 +9,7 @@ from typing import Optional
 from sqlalchemy.orm import Session
 
 from app.models import Item, StoryGroup, StoryGroupItem
+from app.services.embedding_store import EmbeddingStore
 from app.services.semantic_grouping_service import SemanticGroupingService
 from app.settings import settings
 
@@ -225,6 +226,11 @@ def _named_entity_overlap(a: Item, b: Item) -> float | None:
     return len(a_set & b_set) / len(a_set | b_set)
 
 
+def embedding_text(item: Item) -> str:
+    """The text an item's stored embedding is made from."""
+    return item.text or ""
+
+
 def build_story_groups(
     items: list[Item],
     semantic_service: Optional[SemanticGroupingService] = None,
@@ -253,9 +259,14 @@ def build_story_groups(
     embeddings_cache = {}
     if semantic_service and semantic_service.is_available():
         logger.info(f"Generating embeddings for {len(story_items)} stories...")
-        for item in story_items:
-            if item.text:
-                embeddings_cache[item.id] = semantic_service.generate_embedding(item.text)
+        # One batched pass over the edition, reusing vectors stored on the items;
+        # items without text embed to None
+        store = EmbeddingStore(semantic_service.model_name)
+        embeddings = store.embed(
+            story_items, [embedding_text(item) for item in story_items], semantic_service.generate_embeddings
+        )
+        for item, embedding in zip(story_items, embeddings, strict=True):
+            embeddings_cache[item.id] = embedding
         logger.info(f"Generated {len(embeddings_cache)} embeddings")
 
     for item in story_items:
@@ -349,6 +360,7 @@ def persist_story_groups(db: Session, edition_id: int) -> int:
                 semantic_weight=settings.semantic_weight,
                 token_weight=settings.token_weight,
                 explicit_ref_weight=settings.explicit_ref_weight,
+                batch_size=settings.semantic_batch_size,
             )
             if semantic_service.is_available():
                 logger.info("Using semantic grouping with BGE embeddings")
@@ -378,6 +390,11 @@ def persist_story_groups(db: Session, edition_id: int) -> int:
             excerpt=group.excerpt,
             full_text=group.full_text,
         )
+        if semantic_service:
+            # Group vector: normalized mean of its items' stored vectors
+            store = EmbeddingStore(semantic_service.model_name)
+            vectors = [vector for item in group.items if (vector := store.get(item, embedding_text(item))) is not None]
+            store.put_mean(story_group, group.full_text or "", vectors)
         db.add(story_group)
         db.flush()
 
@@ -0,0 +1,92 @@
+"""
+Compiled rule sets for testing a text block against many regex rules at once.
+
+Most block-classification rules are whole-word keywords (``\\bTENDER\\b``,
+``\\bREAL ESTATE\\b``). A RuleSet indexes those by word, so a block is
+tokenized once and every keyword rule is resolved with set lookups; phrases
+are confirmed with their own regex only when all their words occur. Other
+rules (``\\bCALL\\b.*\\bNOW\\b``, phone numbers) are precompiled and searched
+directly. Either way a rule counts as matched exactly when ``re.search``
+with the rule's pattern and flags would find it.
+"""
+
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+# \bWORD\b or \bSOME WORDS\b with ASCII letters/digits and single spaces
+_KEYWORD_RE = re.compile(r"\\b([A-Za-z0-9]+(?: [A-Za-z0-9]+)*)\\b")
+_WORD_RE = re.compile(r"\w+")
+
+# Characters re.IGNORECASE treats as equal to an ASCII letter, mapped to it
+# (plain ASCII lower case plus the Unicode special cases sre folds).
+_IGNORECASE_ASCII = str.maketrans(
+    {**{chr(code): chr(code - 32) for code in range(ord("a"), ord("z") + 1)},
+     "ı": "I", "İ": "I", "ſ": "S", "K": "K"}
+)
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A regex contributing to the signal ``name`` (several rules may share a name)."""
+
+    name: str
+    pattern: str
+    flags: int = 0
+
+
+class RuleSet:
+    """Named regex rules compiled for a single tokenization per text."""
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.rules = tuple(rules)
+        self._regexes = [re.compile(rule.pattern, rule.flags) for rule in self.rules]
+        # word -> [(rule index, phrase words)] for exact and case-folded matching
+        self._exact: dict[str, list[tuple[int, tuple[str, ...]]]] = {}
+        self._folded: dict[str, list[tuple[int, tuple[str, ...]]]] = {}
+        self._residual: list[int] = []
+
+        for index, rule in enumerate(self.rules):
+            keyword = _KEYWORD_RE.fullmatch(rule.pattern)
+            if keyword is None or rule.flags & ~re.IGNORECASE:
+                self._residual.append(index)
+                continue
+            words = tuple(keyword.group(1).split(" "))
+            if rule.flags & re.IGNORECASE:
+                words = tuple(word.upper() for word in words)
+                target = self._folded
+            else:
+                target = self._exact
+            for word in set(words):
+                target.setdefault(word, []).append((index, words))
+
+    def scan(self, text: str) -> dict[str, int]:
+        """Number of distinct rules matching ``text``, per signal name (unmatched names omitted)."""
+        matched: set[int] = set()
+        tokens = set(_WORD_RE.findall(text))
+        self._match_keywords(self._exact, tokens, text, matched)
+        if self._folded:
+            if text.isascii():
+                folded = tokens if text == text.upper() else {token.upper() for token in tokens}
+            else:
+                folded = {token.translate(_IGNORECASE_ASCII) for token in tokens}
+            self._match_keywords(self._folded, folded, text, matched)
+        for index in self._residual:
+            if self._regexes[index].search(text):
+                matched.add(index)
+
+        counts: dict[str, int] = {}
+        for index in matched:
+            name = self.rules[index].name
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+
+    def _match_keywords(self, index_by_word, tokens, text, matched) -> None:
+        for word in tokens & index_by_word.keys():
+            for index, words in index_by_word[word]:
+                if index in matched:
+                    continue
+                if len(words) == 1:
+                    matched.add(index)
+                elif tokens.issuperset(words) and self._regexes[index].search(text):
+                    matched.add(index)
@@ -12,6 +12,7 @@ class Settings(BaseSettings):
         env_file=(".env", os.path.join(_backend_root, ".env")),
         case_sensitive=False,
         extra="ignore",
+        protected_namespaces=("settings_",),  # Allow model_* fields (model_idle_timeout_seconds)
     )
 
     # Database
@@ -24,7 +25,17 @@ class Settings(BaseSettings):
     max_pdf_size: str = "50MB"
     min_chars_for_native_text: int = 200
     processing_max_workers: int = 1  # Default single-page processing
-    processing_db_commit_interval: int = 5
+    processing_db_commit_interval: int = 5  # Commit progress/items every N pages
+    processing_db_commit_seconds: float = 10.0  # ...or at least this often
+    processing_pipeline_threads: int = 1  # >1 overlaps render / OCR / DB writes in one process
+    processing_render_ahead: int = 2  # Pages the renderer thread may keep ready ahead of OCR
+    stage_cache_enabled: bool = True  # Reuse per-page stage output keyed by content hash + settings
+    stage_cache_dir: str | None = None  # Defaults to <storage_path>/stage_cache
+    stage_cache_max_mb: int = 1024  # Least recently used entries are evicted above this
+    stage_cache_max_age_days: int = 30  # Entries unused this long are pruned (0 = no age limit)
+    ocr_cache_enabled: bool = True  # Reuse OCR results for identical pixels + engine parameters
+    ocr_cache_dir: str | None = None  # Defaults to <storage_path>/ocr_cache
+    ocr_cache_max_mb: int = 512  # Least recently used entries are evicted above this
     ocr_image_dpi: int = 250
     ocr_enabled: bool = True
     ocr_languages: str = "eng"
@@ -32,14 +43,34 @@ class Settings(BaseSettings):
     ocr_preprocess_unsharp: bool = True
     ocr_preprocess_adaptive: bool = True
     ocr_preprocess_global_threshold: int = 170
+    ocr_preprocess_profile: str = "default"  # default (the flags above), newsprint, clean, block, none
+    ocr_preprocess_despeckle: bool = False
+    ocr_preprocess_deskew: bool = False
     ocr_confidence_threshold: int = 55
     ocr_retry_enabled: bool = True
     ocr_retry_dpi: int = 350
     ocr_psm: int = 3
     ocr_retry_psm: int = 4
+    ocr_retry_strategy: str = "regions"  # regions (re-OCR only low-confidence areas) or page
+    ocr_region_retry_padding_px: int = 12  # Padding around weak words, in OCR-DPI pixels
+    ocr_region_retry_max_coverage: float = 0.5  # Above this page fraction, retry the whole page
+    ocr_region_retry_max_regions: int = 40  # More regions than this: retry the whole page
+    ocr_region_retry_psm: int = 6
+    ocr_hybrid_enabled: bool = False  # Mixed pages: keep native text, OCR only raster image regions
+    ocr_hybrid_min_region_pt: float = 48  # Skip images smaller than this on a side (PDF points)
+    ocr_hybrid_max_coverage: float = 0.6  # Images covering more of the page: OCR the whole page
     ocr_fallback_enabled: bool = False
     ocr_fallback_lang: str = "en"
     tesseract_cmd: str | None = None
+    ocr_engine: str = "pytesseract"  # pytesseract (subprocess), tesserocr (in-process), auto
+    ocr_tiled_enabled: bool = False  # OCR wide pages as overlapping column strips in parallel
+    ocr_tile_max_strips: int = 4
+    ocr_tile_min_width: int = 1200  # Min strip width in pixels; narrower pages get fewer strips
+    ocr_tile_overlap_px: int = 64  # Overlap either side of a cut; must exceed half the widest word
+    ocr_tile_workers: int = 0  # Strip OCR threads (0 = CPU count)
+
+    # Warm model registry (PaddleOCR, layout, embedding models)
+    model_idle_timeout_seconds: float = 0  # Unload models unused this long (0 = keep for process lifetime)
 
     # Story grouping
     story_grouping_enabled: bool = True
@@ -55,19 +86,27 @@ class Settings(BaseSettings):
     # High-DPI page rendering
     layout_detection_dpi: int = 300  # 300-450 DPI recommended for layout detection
     layout_detection_width: int = 2500  # Alternative to DPI - target width in pixels
-    layout_detection_method: str = "auto"  # auto, detectron2, layoutparser, heuristic
+    layout_detection_method: str = "auto"  # auto, detectron2, layoutparser, onnx, heuristic
 
     # Layout detection model configuration
     layout_model_device: str = "cpu"  # cpu or cuda
     layout_model_path: str | None = None  # Custom model path if needed
     layout_model_name: str = "lp://PubLayNet/faster_rcnn_R_50_FPN_3x/config"
     layout_confidence_threshold: float = 0.7  # Min confidence for block detection
+    layout_batch_size: int = 4  # Pages per layout detector call (2-8 suits CPU backbones)
+    layout_onnx_model_path: str | None = None  # Exported by pipeline/scripts/export_layout_onnx.py
+    layout_onnx_quantized: bool = False  # Use the int8 model written next to it (<name>.int8.onnx)
+    layout_onnx_threads: int = 0  # ONNX Runtime intra-op threads (0 = runtime default)
 
     # Block-level OCR settings
     block_ocr_enabled: bool = True
     block_ocr_engine: str = "paddle"  # paddle, tesseract, auto
     block_ocr_lang: str = "en"  # OCR language code
     block_ocr_confidence_threshold: float = 0.5  # Min confidence for word detection
+    block_ocr_preprocess_profile: str | None = None  # Preprocess block crops (e.g. "block"); None = raw crop
+    block_ocr_batch_mode: str = "lines"  # lines (batched recognition), page (one PaddleOCR pass per page), none (per block)
+    block_ocr_rec_batch_size: int = 32  # Line crops per recognition batch in "lines" mode
+    block_ocr_workers: int = 0  # Threads for Tesseract block OCR (0 = CPU count)
 
     # Reading order detection
     reading_order_enabled: bool = True
@@ -78,6 +117,7 @@ class Settings(BaseSettings):
     semantic_model_device: str = "cpu"  # cpu or cuda
     semantic_similarity_threshold: float = 0.65  # Min similarity for story continuation
     semantic_embedding_dim: int = 384  # Embedding dimension (384 for bge-small)
+    semantic_batch_size: int = 32  # Stories per embedding model call
 
     # Hybrid story grouping weights
     semantic_weight: float = 0.4  # Weight for semantic similarity
@@ -96,6 +136,15 @@ class Settings(BaseSettings):
     onedrive_folder_path: str | None = None
     onedrive_token_file: str | None = None
 
+    # Processing job queue (workers run via `python -m app.worker`)
+    processing_inline_worker: bool = True  # Also drain the queue from the API process (dev/single host)
+    processing_inline_poll: bool = True  # With the inline worker, also poll for retries and expired leases
+    processing_queue_concurrency: int = 2  # Max jobs running at once across all workers
+    processing_job_lease_seconds: int = 300
+    processing_job_max_attempts: int = 3
+    processing_job_retry_backoff_seconds: int = 60
+    processing_worker_poll_seconds: float = 5.0
+
     # Logs
     processing_log_dir: str = "./storage/logs"
 
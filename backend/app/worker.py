@@ -0,0 +1,117 @@
+"""
+Standalone processing worker.
+
+Claims jobs from the processing queue and runs them until stopped:
+
+    python -m app.worker            # run forever
+    python -m app.worker --once     # drain runnable jobs, then exit
+
+Run as many worker processes (on as many hosts) as needed; they coordinate
+through job leases in the database. Set PROCESSING_INLINE_WORKER=false on the
+API when dedicated workers are running; otherwise the API runs an
+InlineWorker thread that picks up retries, jobs held back by the concurrency
+limit and jobs whose lease expired.
+"""
+
+import argparse
+import logging
+import signal
+import threading
+
+from app.db.database import SessionLocal
+from app.services.job_queue import default_worker_id, run_next_job
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def run_worker(worker_id: str, *, once: bool = False, poll_seconds: float | None = None,
+               stop_event: threading.Event | None = None) -> int:
+    """Claim and run jobs until stopped. Returns the number of jobs run."""
+    stop_event = stop_event or threading.Event()
+    poll_seconds = poll_seconds if poll_seconds is not None else settings.processing_worker_poll_seconds
+    jobs_run = 0
+
+    logger.info("Worker %s started", worker_id)
+    while not stop_event.is_set():
+        db = SessionLocal()
+        try:
+            ran = run_next_job(db, worker_id)
+        except Exception as e:
+            logger.exception("Worker %s failed to run a job: %s", worker_id, e)
+            ran = False
+        finally:
+            db.close()
+
+        if ran:
+            jobs_run += 1
+            continue
+        if once:
+            break
+        stop_event.wait(poll_seconds)
+
+    logger.info("Worker %s stopped after %s jobs", worker_id, jobs_run)
+    return jobs_run
+
+
+class InlineWorker:
+    """
+    Runs ``run_worker`` on a daemon thread of the API process.
+
+    Upload and process requests only drain the jobs that are claimable at that
+    moment; this keeps polling so retries after backoff, jobs blocked by
+    ``processing_queue_concurrency`` and jobs left behind by a crashed worker
+    are run without a standalone worker.
+    """
+
+    def __init__(self, worker_id: str | None = None, poll_seconds: float | None = None):
+        self.worker_id = worker_id or f"inline-poller-{default_worker_id()}"
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="inline-worker", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Stop polling; a job still running keeps its lease and is resumed if the process exits."""
+        self._stop.set()
+        self._thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        run_worker(self.worker_id, poll_seconds=self.poll_seconds, stop_event=self._stop)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the edition processing worker")
+    parser.add_argument("--worker-id", default=None, help="Lease owner name (default: host:pid)")
+    parser.add_argument("--once", action="store_true", help="Exit when no runnable jobs remain")
+    parser.add_argument("--poll-seconds", type=float, default=None, help="Idle poll interval")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level.upper(), logging.INFO),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    stop_event = threading.Event()
+
+    def _request_stop(signum, _frame):
+        # Finish the current job; its lease lets another worker resume if we get killed anyway
+        logger.info("Received signal %s, stopping after current job", signum)
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+
+    run_worker(
+        args.worker_id or default_worker_id(),
+        once=args.once,
+        poll_seconds=args.poll_seconds,
+        stop_event=stop_event,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
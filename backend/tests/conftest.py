@@ -7,6 +7,7 @@ from sqlalchemy.pool import StaticPool
 from app.db.database import Base, get_db
 from app.main import app
 from app.models import User, UserRole
+from app.settings import settings
 
 # Use an in-memory SQLite database for all tests for speed and simplicity
 # StaticPool is required for in-memory DB shared across threads
@@ -39,6 +40,17 @@ def db():
     transaction.rollback()
     connection.close()
 
+@pytest.fixture(autouse=True)
+def no_inline_poller(monkeypatch):
+    """Keep the app's lifespan from polling the real job queue during tests."""
+    monkeypatch.setattr(settings, "processing_inline_poll", False)
+
+@pytest.fixture(autouse=True)
+def isolate_stage_cache(tmp_path, monkeypatch):
+    """Give each test its own page stage and OCR caches so results never leak between tests."""
+    monkeypatch.setattr(settings, "stage_cache_dir", str(tmp_path / "stage_cache"))
+    monkeypatch.setattr(settings, "ocr_cache_dir", str(tmp_path / "ocr_cache"))
+
 @pytest.fixture(autouse=True)
 def override_get_db(db):
     """Override the get_db dependency for all tests in the session."""
@@ -0,0 +1,63 @@
+import random
+
+import numpy as np
+
+from app.services.block_array import (
+    BlockArray,
+    box_iou,
+    intersection_areas,
+    union_boxes,
+)
+from app.services.layout_analyzer import LayoutAnalyzer
+
+
+def test_from_dicts_fills_missing_columns():
+    blocks = [
+        {'text': 'HEADLINE', 'bbox': [10, 20, 300, 60], 'type': 'text', 'font_size': 24.0},
+        {'text': 'body\nmore body', 'bbox': (10, 70, 300, 110), 'type': 'ocr_text'},
+        {'text': 'caption', 'font_size': 'large'},
+        {'bbox': [0, 0, 5, 5], 'font_size': 0.0},
+    ]
+    array = BlockArray.from_dicts(blocks)
+
+    assert len(array) == 4
+    assert array.boxes.shape == (4, 4) and array.boxes.dtype == np.float64
+    np.testing.assert_array_equal(array.boxes[2], [0, 0, 0, 0])
+    assert array.texts[3] == ''
+    assert array.line_counts().tolist() == [1, 2, 1, 1]
+    np.testing.assert_allclose(array.effective_font_sizes(), [24.0, 20.0, 0.0, 5.0])
+
+
+def test_pairwise_kernels_match_scalar_geometry():
+    rng = random.Random(4)
+    boxes = []
+    for _ in range(40):
+        x0, y0 = rng.choice([0.0, 10.0, 25.5]), rng.uniform(0, 100)
+        boxes.append([x0, y0, x0 + rng.choice([0.0, 8.0, 30.0, -2.0]), y0 + rng.choice([0.0, 5.0, 12.0])])
+
+    areas = intersection_areas(boxes, boxes)
+    for i, a in enumerate(boxes):
+        for j, b in enumerate(boxes):
+            width = max(0.0, min(a[2], b[2]) - max(a[0], b[0]))
+            height = max(0.0, min(a[3], b[3]) - max(a[1], b[1]))
+            assert areas[i, j] == width * height
+
+    iou = box_iou([[0, 0, 10, 10]], [[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30], [0, 0, 0, 0]])
+    np.testing.assert_allclose(iou, [[1.0, 1 / 3, 0.0, 0.0]])
+
+
+def test_union_boxes_by_group():
+    boxes = [[0, 0, 1, 1], [2, 2, 3, 3], [5, 5, 6, 6]]
+    unions = union_boxes(boxes, [0, 0, 2], group_count=4)
+    np.testing.assert_array_equal(unions[[0, 2]], [[0, 0, 3, 3], [5, 5, 6, 6]])
+    assert np.isnan(unions[[1, 3]]).all()
+
+
+def test_headline_median_font_ignores_unsized_empty_blocks():
+    analyzer = LayoutAnalyzer()
+    blocks = [{'text': 'body text here', 'bbox': [0, 100 + 20 * i, 200, 110 + 20 * i], 'font_size': 10} for i in range(5)]
+    blocks.append({'text': 'Budget Passes Senate', 'bbox': [0, 400, 300, 440], 'font_size': 14})
+    blocks.append({'text': '', 'bbox': [0, 0, 0, 0]})
+    # Median of the sized blocks is 10, so 14pt clears max(14, 10 * 1.4)
+    headlines = analyzer.detect_headlines(blocks)
+    assert [h['text'] for h in headlines] == ['Budget Passes Senate']
@@ -0,0 +1,167 @@
+import numpy as np
+
+from app.services import block_ocr_service, ocr_service
+from app.services.block_ocr_service import BlockOCRService
+from app.services.layout_detection_service import DetectedBlock
+from app.services.ocr_service import OCRService
+from app.settings import settings
+
+
+def _blocks():
+    return [
+        DetectedBlock(id=1, type="HEADLINE", bbox=[0.0, 0.0, 1.0, 0.2], confidence=0.9),
+        DetectedBlock(id=2, type="BODY", bbox=[0.0, 0.2, 0.5, 1.0], confidence=0.9),
+        DetectedBlock(id=3, type="BODY", bbox=[0.5, 0.2, 1.0, 1.0], confidence=0.9),
+    ]
+
+
+class _FakePaddle:
+    """Stands in for PaddleOCR: fixed page lines, and one detected line per crop."""
+
+    def __init__(self):
+        self.ocr_calls = []
+        self.rec_batches = []
+        self.cls_batches = []
+
+    def ocr(self, image, det=True, rec=True, cls=True):
+        self.ocr_calls.append((image.shape, det, rec))
+        if det and not rec:
+            return [[[[2, 2], [30, 2], [30, 10], [2, 10]], [[2, 14], [30, 14], [30, 22], [2, 22]]]]
+        return [[
+            [[[10, 5], [190, 5], [190, 30], [10, 30]], ("Budget passes", 0.95)],
+            [[[10, 60], [90, 60], [90, 80], [10, 80]], ("Left column", 0.9)],
+            [[[110, 60], [190, 60], [190, 80], [110, 80]], ("Right column", 0.9)],
+            [[[110, 100], [190, 100], [190, 120], [110, 120]], ("faint", 0.1)],
+        ]]
+
+    def text_recognizer(self, images):
+        self.rec_batches.append(len(images))
+        return [(f"line{image.shape[0]}", 0.9) for image in images], 0.0
+
+    def text_classifier(self, images):
+        self.cls_batches.append(len(images))
+        return images, [("0", 0.99)] * len(images), 0.0
+
+
+def _service(batch_mode, rec_batch_size=32):
+    service = BlockOCRService(prefer_paddle=False, batch_mode=batch_mode, rec_batch_size=rec_batch_size)
+    service._tesseract = None
+    service._paddle = _FakePaddle()
+    return service
+
+
+def test_page_mode_runs_paddle_once_and_assigns_lines_to_blocks():
+    service = _service("page")
+    page = np.full((200, 200, 3), 255, dtype=np.uint8)
+
+    results = service.batch_extract(_blocks(), page)
+
+    assert len(service._paddle.ocr_calls) == 1
+    assert [result.text for result in results] == ["Budget passes", "Left column", "Right column"]
+    left_word = results[1].words[0]
+    assert left_word["bbox"] == [0.05, 0.3, 0.45, 0.4]
+    assert results[2].confidence == 0.9
+
+
+def test_lines_mode_batches_recognition_across_blocks():
+    service = _service("lines", rec_batch_size=4)
+    page = np.full((200, 200, 3), 255, dtype=np.uint8)
+
+    results = service.batch_extract(_blocks(), page)
+
+    assert [call[1:] for call in service._paddle.ocr_calls] == [(True, False)] * 3
+    assert service._paddle.rec_batches == [4, 2]
+    assert service._paddle.cls_batches == [4, 2]
+    assert all(result.text == "line8\nline8" for result in results)
+    assert len(results[0].words) == 2
+
+
+def test_default_mode_batches_recognition():
+    service = _service(BlockOCRService(prefer_paddle=False).batch_mode)
+    page = np.full((200, 200, 3), 255, dtype=np.uint8)
+
+    service.batch_extract(_blocks(), page)
+
+    assert [call[1:] for call in service._paddle.ocr_calls] == [(True, False)] * 3
+    assert service._paddle.rec_batches == [6]
+
+
+def test_none_mode_ocrs_each_block_on_its_own():
+    service = _service("none")
+    # Distinct pixels per column, so no block is served from the OCR cache
+    page = np.repeat(np.tile(np.arange(200, dtype=np.uint8), (200, 1))[:, :, None], 3, axis=2)
+
+    results = service.batch_extract(_blocks(), page)
+
+    assert [call[1:] for call in service._paddle.ocr_calls] == [(True, True)] * 3
+    assert service._paddle.rec_batches == []
+    assert all(result.engine == "paddle" for result in results)
+
+
+class _FakeTesseract:
+    def __init__(self):
+        self.calls = 0
+
+    def extract_text_with_boxes(self, image, preprocess=True, psm=3, include_words=False):
+        self.calls += 1
+        return {
+            "text_blocks": [{"text": "Court ruling"}],
+            "words": {"text": ["", "Court", "ruling", "x"], "conf": [-1, 91, 87, 12],
+                      "left": [0, 0, 40, 80], "top": [0, 0, 0, 0],
+                      "width": [0, 30, 30, 5], "height": [0, 10, 10, 10]},
+        }
+
+
+def test_tesseract_blocks_run_on_pool():
+    service = BlockOCRService(prefer_paddle=False, workers=2)
+    service._paddle = None
+    service._tesseract = _FakeTesseract()
+    page = np.full((200, 200, 3), 255, dtype=np.uint8)
+
+    results = service.batch_extract(_blocks(), page)
+
+    assert service._tesseract.calls == 3
+    assert all(result.engine == "tesseract" for result in results)
+    assert [word["text"] for word in results[0].words] == ["Court", "ruling"]
+    assert results[0].words[0]["confidence"] == 0.91
+    assert results[0].text == "Court ruling"
+
+
+def test_cleanup_shuts_down_the_tesseract_pool():
+    service = BlockOCRService(prefer_paddle=False, workers=2)
+    service._paddle = None
+    service._tesseract = _FakeTesseract()
+    service.batch_extract(_blocks(), np.full((200, 200, 3), 255, dtype=np.uint8))
+    pool = service._pool
+
+    service.cleanup()
+
+    assert service._pool is None
+    assert pool._shutdown
+
+
+def test_block_profile_never_deskews_crops():
+    # Word boxes are read straight off the preprocessed crop, so it must stay unrotated
+    service = BlockOCRService(prefer_paddle=False, preprocess_profile="newsprint")
+    assert service.preprocess_profile.deskew is False
+    assert service.preprocess_profile.despeckle is True
+
+
+def _broken_paddle(**kwargs):
+    raise RuntimeError("model download failed")
+
+
+def test_failed_paddle_load_falls_back_to_tesseract(monkeypatch):
+    monkeypatch.setattr(block_ocr_service, "PADDLEOCR_AVAILABLE", True)
+    monkeypatch.setattr(block_ocr_service, "PaddleOCR", _broken_paddle)
+    service = BlockOCRService(prefer_paddle=True, lang="broken-block")
+    assert service._paddle is None
+    assert service._tesseract is not None
+
+    monkeypatch.setattr(ocr_service, "PADDLE_AVAILABLE", True)
+    monkeypatch.setattr(ocr_service, "PaddleOCR", _broken_paddle)
+    monkeypatch.setattr(settings, "ocr_fallback_enabled", True)
+    monkeypatch.setattr(settings, "ocr_fallback_lang", "broken-page")
+    ocr = OCRService()
+    assert ocr._get_paddle() is None
+    assert ocr._paddle is None
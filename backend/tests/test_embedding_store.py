@@ -0,0 +1,137 @@
+from datetime import datetime
+
+import numpy as np
+
+from app.models import Edition, Item, StoryGroup
+from app.services import semantic_grouping_service, story_grouping
+from app.services.embedding_store import (
+    EmbeddingStore,
+    carry_over,
+    pack_vector,
+    unpack_vector,
+)
+from app.services.semantic_grouping_service import SemanticGroupingService
+from app.settings import settings
+
+
+class _Encoder:
+    def __init__(self):
+        self.texts = []
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=False):
+        self.texts.extend(texts)
+        vectors = np.array([[len(text), 1.0, 0.0] for text in texts])
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _generate(encoder):
+    def generate(texts):
+        return list(encoder.encode(texts))
+    return generate
+
+
+def test_vectors_round_trip_as_float32_bytes():
+    vector = np.linspace(-1, 1, 384)
+    blob = pack_vector(vector)
+    assert len(blob) == 384 * 4
+    np.testing.assert_allclose(unpack_vector(blob), vector, rtol=1e-6)
+
+
+def test_embed_reads_through_until_text_or_model_changes():
+    encoder = _Encoder()
+    items = [Item(id=1, text="first story"), Item(id=2, text="second story here"), Item(id=3, text="")]
+    texts = [item.text for item in items]
+    store = EmbeddingStore("bge-small")
+
+    first = store.embed(items, texts, _generate(encoder))
+    assert encoder.texts == ["first story", "second story here"]
+    assert first[2] is None and items[2].embedding is None
+    assert items[0].embedding_model == "bge-small" and len(items[0].embedding_text_hash) == 64
+
+    again = store.embed(items, texts, _generate(encoder))
+    assert encoder.texts == ["first story", "second story here"]
+    np.testing.assert_array_equal(again[1], first[1])
+
+    items[0].text = "first story, corrected"
+    store.embed(items, [item.text for item in items], _generate(encoder))
+    assert encoder.texts[2:] == ["first story, corrected"]
+
+    EmbeddingStore("bge-base").embed(items, [item.text for item in items], _generate(encoder))
+    assert encoder.texts[3:] == ["first story, corrected", "second story here"]
+
+
+def test_carry_over_moves_vectors_to_items_with_unchanged_text():
+    encoder = _Encoder()
+    old = [Item(text="same story"), Item(text="old wording")]
+    EmbeddingStore("bge-small").embed(old, [item.text for item in old], _generate(encoder))
+
+    new = [Item(text="same story"), Item(text="new wording")]
+    assert carry_over(new, [item.text for item in new], old) == 1
+    assert new[0].embedding == old[0].embedding and new[0].embedding_model == "bge-small"
+    assert new[1].embedding is None
+
+    store = EmbeddingStore("bge-small")
+    store.embed(new, [item.text for item in new], _generate(encoder))
+    assert encoder.texts == ["same story", "old wording", "new wording"]
+
+
+def test_group_stories_enhanced_reads_through_the_store(monkeypatch):
+    monkeypatch.setattr(semantic_grouping_service, "np", np)
+    encoder = _Encoder()
+    service = SemanticGroupingService(model_name="bge-small")
+    service._model = encoder
+    items = [
+        {"id": 1, "text": "County budget approved", "page_number": 1},
+        {"id": 2, "text": "County budget approved", "page_number": 2},
+    ]
+
+    assert service.group_stories_enhanced(items) == [[1, 2]]
+    assert len(encoder.texts) == 2
+    assert all(item["embedding_model"] == "bge-small" for item in items)
+
+    # Vectors written back to the dicts are reused on the next call
+    assert service.group_stories_enhanced(items) == [[1, 2]]
+    assert len(encoder.texts) == 2
+
+
+def test_persist_story_groups_stores_item_and_group_vectors(db, monkeypatch):
+    encoder = _Encoder()
+
+    def service(**kwargs):
+        semantic = SemanticGroupingService(**kwargs)
+        semantic._model = encoder
+        return semantic
+
+    monkeypatch.setattr(settings, "semantic_grouping_enabled", True)
+    monkeypatch.setattr(story_grouping, "SemanticGroupingService", service)
+
+    edition = Edition(
+        newspaper_name="Store Times",
+        edition_date=datetime(2024, 3, 1),
+        file_hash="hash_embedding_store",
+        file_path="store.pdf",
+        total_pages=2,
+        processed_pages=2,
+        status="READY",
+    )
+    db.add(edition)
+    db.flush()
+    text = "County budget approved for new roads. Continued on page 2"
+    db.add_all([
+        Item(edition_id=edition.id, page_number=1, item_type="STORY", title="Budget", text=text),
+        Item(edition_id=edition.id, page_number=2, item_type="STORY", title="Budget",
+             text="Continued from page 1. The county budget funds roads."),
+    ])
+    db.commit()
+
+    assert story_grouping.persist_story_groups(db, edition.id) == 1
+    assert len(encoder.texts) == 2
+    items = db.query(Item).filter(Item.edition_id == edition.id).all()
+    assert all(len(item.embedding) == 3 * 4 for item in items)
+    group = db.query(StoryGroup).filter(StoryGroup.edition_id == edition.id).one()
+    assert group.embedding_model == settings.semantic_model_name
+    assert abs(np.linalg.norm(unpack_vector(group.embedding)) - 1) < 1e-6
+
+    # Regrouping reuses the stored vectors
+    story_grouping.persist_story_groups(db, edition.id)
+    assert len(encoder.texts) == 2
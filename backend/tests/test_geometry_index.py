@@ -0,0 +1,147 @@
+import random
+
+from app.services.geometry_index import BandIndex, sweep_columns
+from app.services.layout_analyzer import LayoutAnalyzer
+from app.services.layout_assembler import LayoutAssembler
+from app.services.layout_detection_service import DetectedBlock
+from app.services.reading_order_service import ReadingOrderService
+
+
+def _ratio(a, b):
+    inter = max(0.0, min(a[1], b[1]) - max(a[0], b[0]))
+    if inter == 0:
+        return 0.0
+    width = min(a[1] - a[0], b[1] - b[0])
+    return inter / width if width else 0.0
+
+
+def _greedy_columns(extents, threshold):
+    """Reference: compare each extent with every column created so far."""
+    spans, assignment = [], []
+    for x0, x1 in extents:
+        for idx, span in enumerate(spans):
+            if _ratio((x0, x1), span) >= threshold:
+                spans[idx] = (min(span[0], x0), max(span[1], x1))
+                assignment.append(idx)
+                break
+        else:
+            assignment.append(len(spans))
+            spans.append((x0, x1))
+    return assignment
+
+
+def _random_bboxes(rng, count, page_width=600.0, page_height=800.0):
+    bboxes = []
+    for _ in range(count):
+        width = rng.choice([0.0, 5.0, 40.0, 120.0, 300.0, rng.uniform(1, page_width)])
+        x0 = float(rng.randrange(0, int(page_width), 10))
+        y0 = rng.uniform(0, page_height)
+        bboxes.append([x0, y0, x0 + width, y0 + rng.uniform(0, 60)])
+    return bboxes
+
+
+def test_sweep_matches_greedy_column_assignment():
+    rng = random.Random(11)
+    for trial in range(200):
+        bboxes = sorted(_random_bboxes(rng, rng.randint(0, 120)), key=lambda b: (b[0], b[1]))
+        extents = [(b[0], b[2]) for b in bboxes]
+        for threshold in (0.6, 0.3, 1.0, 0.0):
+            assert sweep_columns(extents, threshold) == _greedy_columns(extents, threshold), (trial, threshold)
+
+
+def test_sweep_retires_columns_left_behind():
+    # Word boxes in three columns; a box right of a column's edge never joins it
+    extents = sorted([(x + dx, x + dx + 20.0) for x in (0.0, 200.0, 400.0) for dx in (0.0, 4.0, 8.0)])
+    assert sweep_columns(extents) == [0, 0, 0, 1, 1, 1, 2, 2, 2]
+    assert sweep_columns([(0.0, 10.0), (10.0, 20.0)], 0.0) == [0, 0]
+
+
+def test_band_index_returns_tops_in_range():
+    index = BandIndex([50.0, 10.0, 30.0, 30.0, 90.0])
+    assert index.between(30.0, 50.0) == [2, 3, 0]
+    assert index.between(51.0, 89.0) == []
+
+
+def test_column_detection_unchanged_for_word_boxes():
+    rng = random.Random(5)
+    bboxes = _random_bboxes(rng, 400)
+    blocks = [{'text': f'w{i}', 'bbox': bbox} for i, bbox in enumerate(bboxes)]
+
+    columns = LayoutAnalyzer()._assign_columns([dict(block) for block in blocks])
+    ordered = sorted(bboxes, key=lambda b: (b[0], b[1]))
+    expected = _greedy_columns([(b[0], b[2]) for b in ordered], 0.6)
+    assert len(columns) == max(expected) + 1
+    assert sum(len(col_blocks) for _, col_blocks in columns) == len(blocks)
+    assert [x for x, _ in columns] == sorted(x for x, _ in columns)
+
+    service = ReadingOrderService()
+    reading = service._detect_columns(blocks)
+    assert [[b['text'] for b in col] for _, col in reading] == [[b['text'] for b in col] for _, col in columns]
+
+
+def _legacy_column_lefts(bboxes, threshold=0.6):
+    """Reference: grow each column's box one block at a time, then sort columns by their left edge."""
+    ordered = sorted(bboxes, key=lambda b: (b[0], b[1]))
+    col_boxes = []
+    for bbox, idx in zip(ordered, _greedy_columns([(b[0], b[2]) for b in ordered], threshold), strict=True):
+        if idx == len(col_boxes):
+            col_boxes.append(list(bbox))
+        else:
+            box = col_boxes[idx]
+            col_boxes[idx] = [min(box[0], bbox[0]), min(box[1], bbox[1]), max(box[2], bbox[2]), max(box[3], bbox[3])]
+    return sorted(box[0] for box in col_boxes)
+
+
+def test_column_positions_match_incremental_union():
+    rng = random.Random(9)
+    analyzer = LayoutAnalyzer()
+    service = ReadingOrderService()
+    for trial in range(50):
+        bboxes = _random_bboxes(rng, rng.randint(1, 150))
+        blocks = [{'text': f'w{i}', 'bbox': bbox} for i, bbox in enumerate(bboxes)]
+        expected = _legacy_column_lefts(bboxes)
+
+        columns = analyzer._assign_columns([dict(block) for block in blocks])
+        assert [x for x, _ in columns] == expected, trial
+        assert [x for x, _ in service._detect_columns(blocks)] == expected, trial
+    assert analyzer._assign_columns([]) == []
+
+
+def _legacy_continuation(assembler, start_block, all_blocks, used_blocks):
+    continuation = []
+    current_bbox = start_block.bbox
+    for block in all_blocks:
+        if block.id in used_blocks or block.id == start_block.id:
+            continue
+        if block.type not in ["BODY", "TEXT"]:
+            continue
+        vertical_distance = block.bbox[1] - current_bbox[3]
+        if 0 <= vertical_distance <= assembler.proximity_threshold:
+            if assembler._has_horizontal_overlap(current_bbox, block.bbox):
+                continuation.append(block)
+                current_bbox = block.bbox
+    return continuation
+
+
+def test_continuation_lookup_matches_linear_scan():
+    rng = random.Random(3)
+    assembler = LayoutAssembler()
+    for _ in range(50):
+        blocks = []
+        for block_id in range(rng.randint(1, 80)):
+            x0 = rng.choice([0.0, 0.25, 0.5, 0.55])
+            y0 = round(rng.uniform(0, 1), 2)
+            blocks.append(
+                DetectedBlock(
+                    id=block_id,
+                    type=rng.choice(["BODY", "TEXT", "HEADLINE", "AD"]),
+                    bbox=[x0, y0, x0 + rng.choice([0.2, 0.25, 0.45]), min(1.0, y0 + rng.choice([0.0, 0.02, 0.05]))],
+                    confidence=0.9,
+                )
+            )
+        used = {block.id for block in blocks if rng.random() < 0.2}
+        index = BandIndex([block.bbox[1] for block in blocks])
+        for start in blocks:
+            assert assembler._find_continuation_blocks(start, blocks, used, index) == _legacy_continuation(
+                assembler, start, blocks, used
+            )
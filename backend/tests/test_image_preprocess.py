@@ -0,0 +1,114 @@
+import numpy as np
+from PIL import Image, ImageDraw, ImageOps
+
+from app.services import image_preprocess
+from app.services.image_preprocess import PROFILES, PreprocessProfile
+from app.services.ocr_service import OCRService
+from app.settings import settings
+
+
+def _text_lines(width: int = 800, height: int = 600) -> np.ndarray:
+    image = Image.new("L", (width, height), 255)
+    draw = ImageDraw.Draw(image)
+    for y in range(60, height - 60, 40):
+        draw.rectangle((60, y, width - 60, y + 8), fill=0)
+    return np.asarray(image)
+
+
+def test_global_threshold_matches_pil_chain():
+    rng = np.random.default_rng(1)
+    pixels = rng.integers(40, 220, size=(64, 96, 3), dtype=np.uint8)
+    profile = PreprocessProfile(sharpen=None, binarize="global", global_threshold=128)
+
+    result = image_preprocess.preprocess(pixels, profile)
+
+    expected = ImageOps.autocontrast(ImageOps.grayscale(Image.fromarray(pixels)))
+    expected = np.asarray(expected.point(lambda p: 255 if p > 128 else 0))
+    assert result.dtype == np.uint8
+    assert result.shape == (64, 96)
+    assert np.mean(result == expected) > 0.99
+
+
+def test_preprocess_does_not_modify_input():
+    pixels = _text_lines()
+    before = pixels.copy()
+    result = image_preprocess.preprocess(pixels, PROFILES["none"])
+    assert result is not pixels
+    assert np.array_equal(pixels, before)
+
+
+def test_despeckle_removes_isolated_pixels():
+    gray = np.full((50, 50), 255, dtype=np.uint8)
+    gray[10, 10] = 0
+    gray[30:34, 20:40] = 0
+
+    cleaned = image_preprocess.despeckle(gray)
+    assert cleaned[10, 10] == 255
+    assert (cleaned[31:33, 22:38] == 0).all()
+
+
+def test_deskew_recovers_known_rotation():
+    page = _text_lines()
+    rotated = np.asarray(Image.fromarray(page).rotate(2.0, fillcolor=255))
+
+    assert abs(image_preprocess.estimate_skew(page)) < 0.3
+    assert abs(image_preprocess.estimate_skew(rotated) + 2.0) < 0.3
+    straightened = image_preprocess.deskew(rotated)
+    assert abs(image_preprocess.estimate_skew(straightened)) < 0.3
+
+
+def test_profile_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "ocr_preprocess_profile", "default")
+    monkeypatch.setattr(settings, "ocr_preprocess_adaptive", False)
+    monkeypatch.setattr(settings, "ocr_preprocess_deskew", True)
+    profile = image_preprocess.profile_from_settings()
+    assert profile.binarize == "global"
+    assert profile.deskew is True
+
+    assert image_preprocess.profile_from_settings("newsprint") == PROFILES["newsprint"]
+    assert image_preprocess.profile_from_settings("missing").binarize == "global"
+
+
+def test_ocr_service_preprocess_returns_binary_image(monkeypatch):
+    monkeypatch.setattr(settings, "ocr_preprocess_adaptive", False)
+    service = OCRService("eng")
+    image = service._preprocess_image(Image.fromarray(_text_lines()).convert("RGB"))
+    assert image.mode == "L"
+    assert set(np.unique(np.asarray(image))) <= {0, 255}
+
+
+def test_deskewed_word_boxes_map_back_to_the_input_image():
+    rotated = np.asarray(Image.fromarray(_text_lines()).rotate(2.0, fillcolor=255))
+    profile = PreprocessProfile(autocontrast=False, sharpen=None, binarize=None, deskew=True)
+    _deskewed, angle = image_preprocess.preprocess_with_skew(rotated, profile)
+    assert abs(angle + 2.0) < 0.3
+
+    # A word found at (500, 300)-(540, 340) on the straightened page...
+    marker = Image.new("L", (800, 600), 255)
+    ImageDraw.Draw(marker).rectangle((500, 300, 539, 339), fill=0)
+    ys, xs = np.nonzero(np.asarray(marker.rotate(2.0, fillcolor=255)) < 128)
+    data = {"text": ["word"], "conf": [90], "left": [500], "top": [300], "width": [40], "height": [40]}
+
+    # ...is reported where it sits in the skewed input
+    mapped = image_preprocess.unrotate_word_data(data, angle, 800, 600)
+    box = [mapped["left"][0], mapped["top"][0], mapped["left"][0] + mapped["width"][0], mapped["top"][0] + mapped["height"][0]]
+    assert np.allclose(box, [xs.min(), ys.min(), xs.max() + 1, ys.max() + 1], atol=5)
+    assert mapped["text"] == ["word"]
+    assert image_preprocess.unrotate_word_data(data, 0.0, 800, 600) is data
+
+
+def test_ocr_service_reports_boxes_in_the_unrotated_frame(monkeypatch):
+    monkeypatch.setattr(settings, "ocr_preprocess_profile", "newsprint")
+    monkeypatch.setattr(settings, "ocr_cache_enabled", False)
+    monkeypatch.setattr(image_preprocess, "estimate_skew", lambda gray, max_degrees=5.0: 3.0)
+    service = OCRService("eng")
+    service.available = True
+    raw = {"text": ["word"], "conf": [90], "left": [500], "top": [300], "width": [40], "height": [40]}
+    monkeypatch.setattr(service, "_image_to_data", lambda image, psm: dict(raw))
+
+    result = service.extract_text_with_boxes(
+        Image.fromarray(_text_lines()).convert("RGB"), include_words=True
+    )
+    expected = image_preprocess.unrotate_word_data(raw, 3.0, 800, 600)
+    assert result["words"]["left"] == expected["left"] != raw["left"]
+    assert result["text_blocks"][0]["bbox"][:2] == [expected["left"][0], expected["top"][0]]
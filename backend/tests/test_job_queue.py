@@ -0,0 +1,349 @@
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import fitz
+from sqlalchemy import event, update
+
+from app.api.auth import get_admin_user
+from app.main import app
+from app.models import Edition, Item, Page, ProcessingJob
+from app.services import job_queue
+from app.services.pipeline_version import pipeline_fingerprint
+from app.services.processing_service import get_processing_service
+from app.settings import settings
+from tests.conftest import TestingSessionLocal
+
+
+def _create_pdf(path: Path, pages: int) -> None:
+    doc = fitz.open()
+    for page_index in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {page_index + 1}")
+    doc.save(str(path))
+    doc.close()
+
+
+def _create_edition(db, tmp_path: Path, name: str, pages: int = 2) -> Edition:
+    pdf_path = tmp_path / f"{name}.pdf"
+    _create_pdf(pdf_path, pages=pages)
+    edition = Edition(
+        newspaper_name=name,
+        edition_date=datetime(2024, 2, 1),
+        file_hash=f"hash_{name}",
+        file_path=str(pdf_path),
+        pdf_local_path=str(pdf_path),
+        storage_backend="local",
+        storage_key=str(pdf_path),
+        total_pages=pages,
+        processed_pages=0,
+        status="UPLOADED",
+        current_stage="QUEUED",
+        archive_status="SCHEDULED",
+    )
+    db.add(edition)
+    db.commit()
+    db.refresh(edition)
+    db.add_all([
+        Page(edition_id=edition.id, page_number=number, status="PENDING")
+        for number in range(1, pages + 1)
+    ])
+    db.commit()
+    return edition
+
+
+def test_enqueue_is_idempotent_and_claims_by_priority(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ocr_enabled", False)
+    monkeypatch.setattr(settings, "storage_path", str(tmp_path))
+
+    low = _create_edition(db, tmp_path, "Queue Low")
+    high = _create_edition(db, tmp_path, "Queue High")
+
+    low_job = job_queue.enqueue_processing_job(db, low.id, priority=job_queue.PRIORITY_REPROCESS)
+    assert job_queue.enqueue_processing_job(db, low.id).id == low_job.id
+    high_job = job_queue.enqueue_processing_job(db, high.id, priority=job_queue.PRIORITY_UPLOAD)
+
+    claimed = job_queue.claim_next_job(db, "worker-a")
+    assert claimed.id == high_job.id
+    assert claimed.status == job_queue.JOB_RUNNING
+    assert claimed.lease_owner == "worker-a"
+    assert claimed.attempts == 1
+
+    assert job_queue.run_job(db, claimed, "worker-a", heartbeat=False) is True
+    db.refresh(claimed)
+    db.refresh(high)
+    assert claimed.status == job_queue.JOB_SUCCEEDED
+    assert claimed.last_completed_page == 2
+    assert high.status == "READY"
+
+
+def test_concurrency_limit_blocks_claims(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "processing_queue_concurrency", 1)
+
+    first = _create_edition(db, tmp_path, "Limit One")
+    second = _create_edition(db, tmp_path, "Limit Two")
+    job_queue.enqueue_processing_job(db, first.id)
+    job_queue.enqueue_processing_job(db, second.id)
+
+    assert job_queue.claim_next_job(db, "worker-a") is not None
+    assert job_queue.claim_next_job(db, "worker-b") is None
+
+
+def _before_claim_update(db, action):
+    """Run ``action(connection)`` once, just before claim_next_job's conditional UPDATE."""
+    done = []
+
+    def hook(orm_execute_state):
+        if orm_execute_state.is_update and not done:
+            done.append(True)
+            action(orm_execute_state.session.connection())
+
+    event.listen(db, "do_orm_execute", hook)
+    return hook
+
+
+def test_claim_does_not_take_over_a_renewed_lease(db, tmp_path):
+    edition = _create_edition(db, tmp_path, "Renewed Lease")
+    job = ProcessingJob(
+        edition_id=edition.id,
+        status=job_queue.JOB_RUNNING,
+        attempts=1,
+        max_attempts=3,
+        lease_owner="slow-worker",
+        lease_expires_at=datetime.now(UTC) - timedelta(seconds=1),
+    )
+    db.add(job)
+    db.commit()
+
+    # The owner's heartbeat lands between the candidate SELECT and the UPDATE
+    hook = _before_claim_update(db, lambda connection: connection.execute(
+        update(ProcessingJob)
+        .where(ProcessingJob.id == job.id)
+        .values(lease_expires_at=datetime.now(UTC) + timedelta(minutes=5))
+    ))
+    try:
+        assert job_queue.claim_next_job(db, "worker-b") is None
+    finally:
+        event.remove(db, "do_orm_execute", hook)
+
+    db.refresh(job)
+    assert job.lease_owner == "slow-worker"
+    assert job.attempts == 1
+
+
+def test_concurrent_claim_cannot_exceed_concurrency_limit(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "processing_queue_concurrency", 1)
+
+    first = _create_edition(db, tmp_path, "Race One")
+    second = _create_edition(db, tmp_path, "Race Two")
+    first_job = job_queue.enqueue_processing_job(db, first.id, priority=job_queue.PRIORITY_UPLOAD)
+    second_job = job_queue.enqueue_processing_job(db, second.id)
+
+    # Another worker claims the second job after this one passed the running count
+    hook = _before_claim_update(db, lambda connection: connection.execute(
+        update(ProcessingJob)
+        .where(ProcessingJob.id == second_job.id)
+        .values(
+            status=job_queue.JOB_RUNNING,
+            lease_owner="worker-a",
+            lease_expires_at=datetime.now(UTC) + timedelta(minutes=5),
+        )
+    ))
+    try:
+        assert job_queue.claim_next_job(db, "worker-b") is None
+    finally:
+        event.remove(db, "do_orm_execute", hook)
+
+    db.refresh(first_job)
+    assert first_job.status == job_queue.JOB_QUEUED
+
+
+def test_expired_lease_is_reclaimed_and_resumes(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ocr_enabled", False)
+    monkeypatch.setattr(settings, "storage_path", str(tmp_path))
+
+    edition = _create_edition(db, tmp_path, "Resume Gazette", pages=3)
+    first_page = db.query(Page).filter(Page.edition_id == edition.id, Page.page_number == 1).first()
+    first_page.status = "DONE"
+    first_page.pipeline_fingerprint = pipeline_fingerprint()
+    kept_item = Item(
+        edition_id=edition.id, page_id=first_page.id, page_number=1, item_type="STORY", text="Page 1"
+    )
+    db.add(kept_item)
+    edition.status = "PROCESSING"
+    db.add(ProcessingJob(
+        edition_id=edition.id,
+        status=job_queue.JOB_RUNNING,
+        attempts=1,
+        max_attempts=3,
+        lease_owner="crashed-worker",
+        lease_expires_at=datetime.now(UTC) - timedelta(minutes=1),
+    ))
+    db.commit()
+
+    job = job_queue.claim_next_job(db, "worker-b")
+    assert job is not None
+    assert job.attempts == 2
+    assert job.lease_owner == "worker-b"
+
+    assert job_queue.run_job(db, job, "worker-b", heartbeat=False) is True
+
+    db.refresh(edition)
+    assert edition.status == "READY"
+    assert edition.processed_pages == 3
+    items = db.query(Item).filter(Item.edition_id == edition.id).order_by(Item.page_number).all()
+    assert [item.page_number for item in items] == [1, 2, 3]
+    assert items[0].id == kept_item.id
+    assert edition.extraction_runs[-1].stats_json["resumed_pages"] == 1
+
+
+def test_worker_stops_writing_once_another_worker_takes_over(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ocr_enabled", False)
+    monkeypatch.setattr(settings, "storage_path", str(tmp_path))
+    monkeypatch.setattr(settings, "processing_db_commit_interval", 1)
+
+    edition = _create_edition(db, tmp_path, "Lost Lease", pages=3)
+    job_queue.enqueue_processing_job(db, edition.id)
+    # The worker's own session rolls back to a savepoint, not the test's transaction
+    worker_db = TestingSessionLocal(bind=db.get_bind(), join_transaction_mode="create_savepoint")
+    job = job_queue.claim_next_job(worker_db, "worker-a")
+
+    leases = []
+
+    class _SyncLease(job_queue.LeaseHeartbeat):
+        """Renews only when told to, on a session sharing the test connection."""
+
+        def __init__(self, job_id, worker_id):
+            super().__init__(job_id, worker_id, session_factory=lambda: TestingSessionLocal(
+                bind=db.get_bind(), join_transaction_mode="create_savepoint"
+            ))
+            leases.append(self)
+
+        def start(self):
+            pass
+
+        def stop(self):
+            pass
+
+    monkeypatch.setattr(job_queue, "LeaseHeartbeat", _SyncLease)
+    service = get_processing_service()
+    write_page_result = service._write_page_result
+    written = []
+
+    def write_then_lose_lease(coalescer, edition_id, page, *args):
+        written.append(page.page_number)
+        count = write_page_result(coalescer, edition_id, page, *args)
+        if len(written) == 1:
+            # The lease ran out and worker-b claimed the job; worker-a's heartbeat then ticks
+            db.get_bind().execute(
+                update(ProcessingJob)
+                .where(ProcessingJob.id == job.id)
+                .values(
+                    lease_owner="worker-b",
+                    attempts=ProcessingJob.attempts + 1,
+                    lease_expires_at=datetime.now(UTC) + timedelta(minutes=5),
+                )
+            )
+            assert leases[0].renew() is False
+        return count
+
+    monkeypatch.setattr(service, "_write_page_result", write_then_lose_lease)
+
+    assert job_queue.run_job(worker_db, job, "worker-a") is False
+
+    assert written == [1]
+    items = db.query(Item).filter(Item.edition_id == edition.id).all()
+    assert [item.page_number for item in items] == [1]
+    job = db.get(ProcessingJob, job.id)
+    assert job.lease_owner == "worker-b"
+    assert job.status == job_queue.JOB_RUNNING
+    db.refresh(edition)
+    assert edition.processed_pages == 1
+    assert edition.status == "PROCESSING"
+
+
+def test_lease_is_lost_when_renewals_fail_for_longer_than_the_lease(monkeypatch):
+    monkeypatch.setattr(settings, "processing_job_lease_seconds", 30)
+
+    def broken_session():
+        raise RuntimeError("database unavailable")
+
+    lease = job_queue.LeaseHeartbeat(1, "worker-a", session_factory=broken_session)
+    assert lease.renew() is True
+    assert lease.is_lost() is False
+
+    lease._last_renewed -= 31
+    assert lease.is_lost() is True
+    assert lease.renew() is False
+    assert lease.lost is True
+
+
+def test_resume_reprocesses_pages_from_other_settings(db, client, mock_admin_user, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ocr_enabled", False)
+    monkeypatch.setattr(settings, "storage_path", str(tmp_path))
+    monkeypatch.setattr(settings, "processing_inline_worker", False)
+
+    edition = _create_edition(db, tmp_path, "Checkpoint Gazette", pages=3)
+    pages = db.query(Page).filter(Page.edition_id == edition.id).order_by(Page.page_number).all()
+    pages[0].status = "DONE"
+    pages[0].pipeline_fingerprint = pipeline_fingerprint()
+    pages[1].status = "DONE"
+    pages[1].pipeline_fingerprint = "stale"
+    kept_item = Item(
+        edition_id=edition.id, page_id=pages[0].id, page_number=1, item_type="STORY", text="Page 1"
+    )
+    stale_item = Item(
+        edition_id=edition.id, page_id=pages[1].id, page_number=2, item_type="STORY", text="Old"
+    )
+    db.add_all([kept_item, stale_item])
+    db.commit()
+
+    app.dependency_overrides[get_admin_user] = lambda: mock_admin_user
+    try:
+        response = client.post(f"/api/editions/{edition.id}/process", params={"resume": "true"})
+    finally:
+        del app.dependency_overrides[get_admin_user]
+    assert response.status_code == 200
+
+    job = job_queue.claim_next_job(db, "worker-a")
+    assert job.payload == {"resume": True}
+    assert job_queue.run_job(db, job, "worker-a", heartbeat=False) is True
+
+    db.refresh(edition)
+    items = db.query(Item).filter(Item.edition_id == edition.id).order_by(Item.page_number).all()
+    assert [item.page_number for item in items] == [1, 2, 3]
+    assert items[0].id == kept_item.id
+    assert items[1].text != "Old"
+    assert {page.pipeline_fingerprint for page in edition.pages} == {pipeline_fingerprint()}
+    assert edition.extraction_runs[-1].stats_json["resumed_pages"] == 1
+
+
+def test_inline_worker_keeps_polling_until_stopped(monkeypatch):
+    import threading
+
+    from app import worker
+
+    polls = []
+    polled_twice = threading.Event()
+
+    class _Session:
+        def close(self):
+            pass
+
+    def fake_run_next_job(db, worker_id):
+        polls.append(worker_id)
+        if len(polls) >= 2:
+            polled_twice.set()
+        return False
+
+    monkeypatch.setattr(worker, "SessionLocal", _Session)
+    monkeypatch.setattr(worker, "run_next_job", fake_run_next_job)
+
+    inline_worker = worker.InlineWorker(worker_id="inline-test", poll_seconds=0.01)
+    inline_worker.start()
+    try:
+        # Jobs that become runnable later (backoff, leases) are still picked up
+        assert polled_twice.wait(timeout=5)
+    finally:
+        inline_worker.stop()
+    assert not inline_worker._thread.is_alive()
+    assert set(polls) == {"inline-test"}
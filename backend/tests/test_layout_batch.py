@@ -0,0 +1,100 @@
+from datetime import datetime
+
+import fitz
+import numpy as np
+
+from app.models import Edition, Page
+from app.services import layout_detection_service
+from app.services.layout_detection_service import LayoutDetectionService, LayoutResult
+from app.services.layout_onnx import LayoutElement
+from app.services.processing_service import ProcessingService
+from app.settings import settings
+
+
+class _FakeModel:
+    """Per-image model (no Detectron2 predictor); fails on all-black pages."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def load(self):
+        return self
+
+    def detect(self, image):
+        self.calls += 1
+        if not image.any():
+            raise RuntimeError("blank page")
+        return [LayoutElement((0, 0, image.shape[1], 10), "Title", 0.9)]
+
+
+def test_detect_layout_batch_matches_per_page(monkeypatch):
+    monkeypatch.setattr(layout_detection_service, "LAYOUTPARSER_AVAILABLE", True)
+    service = LayoutDetectionService(model_type="heuristic")
+    service._model = _FakeModel()
+    pages = [(np.full((100, 50, 3), 255, dtype=np.uint8), 612, 792) for _ in range(5)]
+    pages.insert(2, (np.zeros((100, 50, 3), dtype=np.uint8), 612, 792))
+    pages.append((b"not an image", 612, 792))
+
+    results = service.detect_layout_batch(pages, batch_size=3)
+
+    assert [result.method for result in results] == ["ml", "ml", "heuristic", "ml", "ml", "ml", "fallback"]
+    assert results[0].blocks[0].type == "HEADLINE"
+    assert results[0].blocks[0].bbox == [0.0, 0.0, 1.0, 0.1]
+    # The failing batch is retried page by page
+    assert service._model.calls == 6 + 3
+
+
+class _BatchDetector:
+    def __init__(self):
+        self.batches = []
+
+    def detect_layout_batch(self, pages, batch_size=4):
+        self.batches.append(len(pages))
+        return [LayoutResult(blocks=[], method="ml", model_name="fake", avg_confidence=0.0) for _ in pages]
+
+    def detect_layout(self, image, page_width, page_height):
+        raise AssertionError("pages should be detected in batches")
+
+
+def test_process_edition_feeds_layout_batches(db, tmp_path, monkeypatch):
+    pdf_path = tmp_path / "edition_batch.pdf"
+    doc = fitz.open()
+    for page_index in range(5):
+        doc.new_page().insert_text((72, 72), f"Page {page_index + 1}")
+    doc.save(str(pdf_path))
+    doc.close()
+
+    monkeypatch.setattr(settings, "ocr_enabled", False)
+    monkeypatch.setattr(settings, "storage_path", str(tmp_path))
+    monkeypatch.setattr(settings, "advanced_layout_enabled", True)
+    monkeypatch.setattr(settings, "block_ocr_enabled", False)
+    monkeypatch.setattr(settings, "layout_detection_method", "heuristic")
+    monkeypatch.setattr(settings, "layout_batch_size", 3)
+
+    edition = Edition(
+        newspaper_name="Batch Times",
+        edition_date=datetime(2024, 1, 5),
+        file_hash="hash_layout_batch",
+        file_path=str(pdf_path),
+        pdf_local_path=str(pdf_path),
+        storage_backend="local",
+        storage_key=str(pdf_path),
+        total_pages=0,
+        processed_pages=0,
+        status="UPLOADED",
+        current_stage="QUEUED",
+        archive_status="SCHEDULED",
+    )
+    db.add(edition)
+    db.commit()
+    db.refresh(edition)
+
+    service = ProcessingService()
+    service.layout_detector = _BatchDetector()
+    assert service.process_edition(edition.id, db) is True
+
+    assert service.layout_detector.batches == [3, 2]
+    pages = db.query(Page).filter(Page.edition_id == edition.id).order_by(Page.page_number).all()
+    assert [page.status for page in pages] == ["DONE"] * 5
+    assert [page.layout_method for page in pages] == ["ml"] * 5
+    assert "Page 4" in (pages[3].extracted_text or "")
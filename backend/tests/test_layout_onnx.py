@@ -0,0 +1,77 @@
+import json
+
+import numpy as np
+
+from app.services import layout_onnx
+from app.services.layout_detection_service import LayoutDetectionService
+
+
+class _FakeSession:
+    """Returns fixed detections in the coordinates of the tensor it receives."""
+
+    def __init__(self):
+        self.inputs = []
+
+    def run(self, output_names, feeds):
+        tensor = feeds["image"]
+        self.inputs.append(tensor)
+        _, height, width = tensor.shape
+        boxes = np.array([[0, 0, width, height / 4], [0, height / 4, width / 2, height]], dtype=np.float32)
+        return [boxes, np.array([1, 0]), np.array([0.95, 0.6], dtype=np.float32)]
+
+
+def test_resize_follows_detectron2_shortest_edge():
+    assert layout_onnx.resized_shape(1600, 1200, 800, 1333) == (1067, 800)
+    assert layout_onnx.resized_shape(4000, 1000, 800, 1333) == (1333, 333)
+    assert layout_onnx.resized_shape(800, 600, 800, 1333) == (1067, 800)
+
+
+def test_detect_rescales_boxes_and_maps_labels(tmp_path):
+    model_path = tmp_path / "layout.onnx"
+    (tmp_path / "layout.json").write_text(json.dumps({"label_map": {"0": "body", "1": "headline"}}))
+    session = _FakeSession()
+    model = layout_onnx.OnnxLayoutModel(str(model_path), session=session)
+
+    page = np.zeros((1600, 1200, 3), dtype=np.uint8)
+    page[..., 0] = 200  # Red channel
+    elements = model.detect(page)
+
+    tensor = session.inputs[0]
+    assert tensor.shape == (3, 1067, 800)
+    assert tensor.dtype == np.float32
+    assert tensor[2].max() == 200 and tensor[0].max() == 0  # RGB page fed as BGR
+    assert [element.type for element in elements] == ["headline", "body"]
+    np.testing.assert_allclose(elements[0].coordinates, (0, 0, 1200, 400), atol=1)
+    np.testing.assert_allclose(elements[1].coordinates, (0, 400, 600, 1600), atol=1)
+    assert layout_onnx.quantized_path(str(model_path)) == str(tmp_path / "layout.int8.onnx")
+    assert layout_onnx.metadata_path(str(tmp_path / "layout.int8.onnx")) == str(tmp_path / "layout.json")
+
+
+def test_service_uses_onnx_backend(monkeypatch, tmp_path):
+    model_path = str(tmp_path / "publaynet.onnx")
+    monkeypatch.setattr(layout_onnx, "ONNXRUNTIME_AVAILABLE", True)
+    real_model = layout_onnx.OnnxLayoutModel
+    monkeypatch.setattr(
+        layout_onnx, "OnnxLayoutModel", lambda path, threads=0: real_model(path, session=_FakeSession())
+    )
+
+    service = LayoutDetectionService(model_type="onnx", confidence_threshold=0.7, onnx_model_path=model_path)
+    result = service.detect_layout(np.zeros((400, 300, 3), dtype=np.uint8), 612, 792)
+
+    assert result.method == "ml"
+    assert result.model_name == "onnx:publaynet.onnx"
+    assert [(block.type, round(block.confidence, 2)) for block in result.blocks] == [("HEADLINE", 0.95)]
+    np.testing.assert_allclose(result.blocks[0].bbox, [0, 0, 1, 0.25], atol=0.01)
+
+
+def test_map_scores_missed_and_misplaced_boxes():
+    reference = [{"boxes": [[0, 0, 10, 10], [20, 20, 30, 30]], "labels": ["Text", "Title"]}]
+    exact = [{"boxes": [[0, 0, 10, 10], [20, 20, 30, 30]], "labels": ["Text", "Title"], "scores": [0.9, 0.8]}]
+    assert layout_onnx.mean_average_precision(exact, reference) == 1.0
+
+    shifted = [{"boxes": [[0, 0, 10, 10], [22, 20, 32, 30]], "labels": ["Text", "Title"], "scores": [0.9, 0.8]}]
+    assert layout_onnx.mean_average_precision(shifted, reference, (0.5,)) == 1.0
+    assert layout_onnx.mean_average_precision(shifted, reference, (0.5, 0.75)) == 0.75
+
+    missing = [{"boxes": [[0, 0, 10, 10]], "labels": ["Text"], "scores": [0.9]}]
+    assert layout_onnx.mean_average_precision(missing, reference) == 0.5
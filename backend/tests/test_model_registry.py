@@ -0,0 +1,107 @@
+import threading
+import time
+
+from app.api.auth import get_admin_user
+from app.main import app
+from app.services.model_registry import ModelRegistry, get_model_registry, model_lock
+
+
+class _Model:
+    def __init__(self, label):
+        self.label = label
+
+    def predict(self, value):
+        return f"{self.label}:{value}"
+
+
+def test_handles_share_one_load_per_params():
+    registry = ModelRegistry()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        time.sleep(0.05)
+        return _Model("ocr")
+
+    handles = [registry.handle("paddleocr", {"lang": "en"}, loader) for _ in range(4)]
+    threads = [threading.Thread(target=handle.load) for handle in handles]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert handles[0].predict("x") == "ocr:x"
+    assert handles[0].load() is handles[3].load()
+
+    registry.handle("paddleocr", {"lang": "fr"}, lambda: _Model("fr")).load()
+    stats = {entry["params"]["lang"]: entry for entry in registry.stats()}
+    assert set(stats) == {"en", "fr"}
+    assert stats["en"]["loads"] == 1
+    assert stats["en"]["uses"] == 7
+    assert stats["en"]["load_seconds"] >= 0.05
+
+
+def test_idle_models_are_evicted_and_reloaded_on_use():
+    registry = ModelRegistry(idle_timeout=10)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return _Model("layout")
+
+    handle = registry.handle("layoutparser", {"device": "cpu"}, loader)
+    handle.load()
+    assert registry.evict_idle(now=time.monotonic() + 5) == []
+    assert registry.evict_idle(now=time.monotonic() + 20) == ["layoutparser"]
+    assert registry.stats()[0]["loaded"] is False
+
+    assert handle.predict(1) == "layout:1"
+    assert len(loads) == 2
+    registry.stop()
+
+
+def test_failed_load_is_not_cached():
+    registry = ModelRegistry()
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("download failed")
+        return _Model("emb")
+
+    handle = registry.handle("sentence-transformer", {"model_name": "bge"}, flaky)
+    try:
+        handle.load()
+    except RuntimeError:
+        pass
+    assert handle.predict("a") == "emb:a"
+    assert len(attempts) == 2
+
+
+def test_admin_model_endpoints(client, mock_admin_user):
+    registry = get_model_registry()
+    registry.handle("test-model", {"n": 1}, lambda: _Model("t")).load()
+
+    app.dependency_overrides[get_admin_user] = lambda: mock_admin_user
+    try:
+        names = [entry["name"] for entry in client.get("/api/admin/models").json()]
+        assert "test-model" in names
+        assert "test-model" in client.delete("/api/admin/models").json()["evicted"]
+    finally:
+        del app.dependency_overrides[get_admin_user]
+
+
+def test_handles_to_one_model_share_an_inference_lock():
+    registry = ModelRegistry()
+    first = registry.handle("paddleocr", {"lang": "en"}, object)
+    second = registry.handle("paddleocr", {"lang": "en"}, object)
+    other = registry.handle("paddleocr", {"lang": "fr"}, object)
+
+    assert first.exclusive() is second.exclusive()
+    assert first.exclusive() is not other.exclusive()
+    with model_lock(first), model_lock(second):  # Reentrant within one thread
+        pass
+    with model_lock(object()):  # Stand-in models are not locked
+        pass
@@ -0,0 +1,89 @@
+import os
+
+import numpy as np
+from PIL import Image
+
+from app.api.auth import get_admin_user
+from app.main import app
+from app.services.ocr_cache import OCRResultCache, get_ocr_cache, image_digest
+from app.services.ocr_service import OCRService
+from app.settings import settings
+
+
+def test_digest_depends_on_pixels_and_shape():
+    pixels = np.zeros((10, 20), dtype=np.uint8)
+    assert image_digest(pixels) == image_digest(pixels.copy())
+    assert image_digest(pixels) != image_digest(pixels.reshape(20, 10))
+    changed = pixels.copy()
+    changed[5, 5] = 1
+    assert image_digest(pixels) != image_digest(changed)
+    assert image_digest(pixels[:, ::2]) == image_digest(np.ascontiguousarray(pixels[:, ::2]))
+
+
+def test_cache_counts_hits_and_evicts_least_recently_used(tmp_path):
+    cache = OCRResultCache(root=str(tmp_path / "ocr"), max_bytes=2500)
+    keys = [cache.key(np.full((4, 4), value, dtype=np.uint8), {"psm": 3}) for value in range(3)]
+    assert len(set(keys)) == 3
+
+    assert cache.get(keys[0]) is None
+    cache.put(keys[0], {"words": "a" * 1000})
+    cache.put(keys[1], {"words": "b" * 1000})
+    os.utime(cache.path_for(keys[0]), (1, 1))
+    os.utime(cache.path_for(keys[1]), (2, 2))
+    assert cache.get(keys[0]) == {"words": "a" * 1000}  # Refreshes keys[0]
+
+    cache.put(keys[2], {"words": "c" * 1000})
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+    assert stats["hit_rate"] == 0.5
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+    assert stats["size_bytes"] <= 2500
+
+
+def test_ocr_service_reads_through_cache(monkeypatch):
+    service = OCRService("eng")
+    service.available = True
+    calls = []
+
+    def fake_image_to_data(image, psm):
+        calls.append(psm)
+        return {"text": ["", "Herald"], "conf": [-1, 91], "left": [0, 5],
+                "top": [0, 5], "width": [0, 40], "height": [0, 12]}
+
+    monkeypatch.setattr(service, "_image_to_data", fake_image_to_data)
+    image = Image.new("L", (60, 20), 255)
+
+    first = service.extract_text_with_boxes(image, preprocess=False, psm=6)
+    second = service.extract_text_with_boxes(image, preprocess=False, psm=6, include_words=True)
+    assert calls == [6]
+    assert first["text"] == second["text"] == "Herald"
+    assert second["words"]["text"] == ["", "Herald"]
+
+    service.extract_text_with_boxes(image, preprocess=False, psm=4)
+    assert calls == [6, 4]
+    assert get_ocr_cache().stats()["hits"] == 1
+
+    monkeypatch.setattr(settings, "ocr_cache_enabled", False)
+    service.extract_text_with_boxes(image, preprocess=False, psm=6)
+    assert calls == [6, 4, 6]
+
+
+def test_admin_ocr_cache_endpoints(client, mock_admin_user):
+    cache = get_ocr_cache()
+    cache.put("ab" * 16, {"words": []})
+    cache.get("ab" * 16)
+
+    app.dependency_overrides[get_admin_user] = lambda: mock_admin_user
+    try:
+        stats = client.get("/api/admin/ocr-cache").json()
+        assert stats["entries"] == 1
+        assert stats["hits"] == 1
+        assert client.delete("/api/admin/ocr-cache").status_code == 200
+        assert client.get("/api/admin/ocr-cache").json()["entries"] == 0
+    finally:
+        del app.dependency_overrides[get_admin_user]
@@ -0,0 +1,33 @@
+import pytest
+from PIL import Image, ImageDraw
+
+from app.services import ocr_service
+from app.services.ocr_service import OCRService
+from app.settings import settings
+
+
+def test_tesserocr_engine_falls_back_when_not_installed(monkeypatch):
+    monkeypatch.setattr(ocr_service, "TESSEROCR_AVAILABLE", False)
+    monkeypatch.setattr(settings, "ocr_engine", "tesserocr")
+    assert OCRService._select_engine(settings.ocr_engine) == "pytesseract"
+    assert OCRService._select_engine("auto") == "pytesseract"
+
+    monkeypatch.setattr(ocr_service, "TESSEROCR_AVAILABLE", True)
+    assert OCRService._select_engine("auto") == "tesserocr"
+    assert OCRService._select_engine("pytesseract") == "pytesseract"
+
+
+def test_tesserocr_engine_matches_result_shape(monkeypatch):
+    pytest.importorskip("tesserocr")
+    monkeypatch.setattr(settings, "ocr_engine", "tesserocr")
+
+    image = Image.new("L", (600, 120), 255)
+    ImageDraw.Draw(image).text((20, 40), "Daily Herald news", fill=0)
+    service = OCRService("eng")
+    assert service.engine == "tesserocr"
+
+    result = service.extract_text_with_boxes(image, preprocess=False, psm=6)
+    assert set(result) == {"text", "text_blocks", "avg_confidence", "word_count", "psm", "preprocess", "engine"}
+    assert result["engine"] == "tesseract"
+    for block in result["text_blocks"]:
+        assert len(block["bbox"]) == 4
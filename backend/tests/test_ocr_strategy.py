@@ -0,0 +1,136 @@
+import fitz
+
+from app.services import ocr_strategy
+from app.services.ocr_service import result_from_data
+from app.services.pdf_processor import PageRenderCache
+from app.services.processing_service import ProcessingService
+from app.services.stage_timer import StageTimer
+from app.settings import settings
+
+
+def _data(rows):
+    fields = ("text", "conf", "left", "top", "width", "height")
+    return {field: [row[index] for row in rows] for index, field in enumerate(fields)}
+
+
+PAGE_WORDS = _data([
+    ("", -1, 0, 0, 0, 0),
+    ("Council", 92, 100, 100, 80, 20),
+    ("approves", 90, 190, 100, 90, 20),
+    ("budqet", 20, 290, 100, 70, 20),
+    ("", -1, 0, 0, 0, 0),
+    ("Rains", 91, 100, 600, 60, 20),
+    ("expected", 89, 170, 600, 90, 20),
+])
+
+
+def test_weak_words_are_grouped_into_padded_regions():
+    data = _data([
+        ("bad", 10, 100, 100, 40, 20),
+        ("worse", 15, 150, 100, 40, 20),
+        ("far", 5, 800, 900, 40, 20),
+        ("good", 95, 300, 300, 40, 20),
+    ])
+    regions = ocr_strategy.plan_region_retry(
+        data, 1000, 1000, threshold=55, pad=10, max_coverage=0.5
+    )
+    assert sorted(regions) == [[90, 90, 200, 130], [790, 890, 850, 930]]
+
+    assert ocr_strategy.plan_region_retry(data, 100, 100, threshold=55, pad=40, max_coverage=0.5) is None
+
+
+def test_splice_replaces_region_words_in_place():
+    region = [280, 90, 370, 130]
+    replacement = _data([("budget", 88, 292, 101, 68, 19)])
+
+    spliced = ocr_strategy.splice_region(PAGE_WORDS, region, replacement)
+    result = result_from_data(spliced, psm=3, preprocess=True)
+    assert result["text"] == "Council approves budget Rains expected"
+    assert ocr_strategy.region_confidence(spliced, region) == 88
+
+
+class _RegionOCR:
+    """Page pass returns one weak word; any smaller crop reads it cleanly."""
+
+    def __init__(self, page_size):
+        self.page_size = page_size
+        self.calls = []
+
+    def extract_text_with_boxes(self, image, preprocess=True, psm=3, tiled=False, include_words=False):
+        if (image.width, image.height) == self.page_size:
+            self.calls.append(("page", psm))
+            data = PAGE_WORDS
+        else:
+            self.calls.append(("region", psm))
+            # Crop is rendered at retry DPI: twice the page-pass scale here
+            data = _data([("", -1, 0, 0, 0, 0), ("budget", 90, 40, 22, 136, 38)])
+        result = result_from_data(data, psm=psm, preprocess=preprocess)
+        if include_words:
+            result["words"] = data
+        return result
+
+
+def test_run_page_ocr_retries_only_weak_regions(monkeypatch):
+    monkeypatch.setattr(settings, "ocr_image_dpi", 72)
+    monkeypatch.setattr(settings, "ocr_retry_dpi", 144)
+    monkeypatch.setattr(settings, "ocr_confidence_threshold", 85)
+    monkeypatch.setattr(settings, "ocr_retry_strategy", "regions")
+    monkeypatch.setattr(settings, "ocr_fallback_enabled", False)
+
+    doc = fitz.open()
+    doc.new_page(width=612, height=792)
+    render_cache = PageRenderCache(doc, 0)
+    service = ProcessingService()
+    service.ocr_service = _RegionOCR((612, 792))
+
+    ocr_result, ocr_dpi, complete = service._run_page_ocr(render_cache, 1, {}, StageTimer())
+
+    assert complete is True
+    assert ocr_dpi == 72
+    assert service.ocr_service.calls == [("page", settings.ocr_psm), ("region", settings.ocr_region_retry_psm)]
+    assert ocr_result["text"] == "Council approves budget Rains expected"
+    assert ocr_result["retry"] == {"strategy": "regions", "regions": 1, "replaced": 1}
+    assert "words" not in ocr_result
+
+
+class _CropOCR:
+    """Reads one line at the top-left of every crop it is given."""
+
+    def __init__(self):
+        self.sizes = []
+
+    def is_available(self):
+        return True
+
+    def extract_text_with_boxes(self, image, preprocess=True, psm=3, tiled=False, include_words=False):
+        self.sizes.append((image.width, image.height))
+        data = _data([("", -1, 0, 0, 0, 0), ("Classified", 93, 10, 20, 200, 40), ("ad", 91, 220, 20, 60, 40)])
+        return result_from_data(data, psm=psm, preprocess=preprocess)
+
+
+def test_hybrid_page_ocrs_only_image_regions(monkeypatch):
+    monkeypatch.setattr(settings, "ocr_hybrid_enabled", True)
+    monkeypatch.setattr(settings, "ocr_image_dpi", 144)
+    monkeypatch.setattr(settings, "min_chars_for_native_text", 5000)
+
+    doc = fitz.open()
+    page = doc.new_page(width=600, height=800)
+    page.insert_text((72, 72), "Native headline over vector story text")
+    ad = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 200, 100), False)
+    page.insert_image(fitz.Rect(300, 500, 500, 600), pixmap=ad)
+
+    service = ProcessingService()
+    service.ocr_service = _CropOCR()
+    result = service.process_page(doc, 1, 0)
+
+    assert result["status"] == "DONE"
+    assert result["used_ocr"] is True
+    # Only the 204x104pt ad region (with merge padding) was rendered for OCR, at 2x
+    assert service.ocr_service.sizes == [(408, 208)]
+    fields = result["fields"]
+    assert fields["extracted_text"].startswith("Native headline")
+    assert fields["extracted_text"].endswith("Classified ad")
+    assert fields["bbox_json"]["ocr_meta"]["mode"] == "regions"
+    assert fields["bbox_json"]["ocr_meta"]["pixel_fraction"] < 0.05
+    ocr_block = next(block for block in fields["bbox_json"]["text_blocks"] if block["type"] == "ocr_text")
+    assert ocr_block["bbox"] == [303.0, 508.0, 438.0, 528.0]
@@ -0,0 +1,89 @@
+import numpy as np
+
+from app.services import ocr_tiling
+from app.services.ocr_service import OCRService
+from app.services.ocr_tiling import Strip
+from app.settings import settings
+
+
+def _column_page() -> np.ndarray:
+    """Three text columns separated by white gutters, each word a dark box of unique height."""
+    page = np.full((400, 1500), 255, dtype=np.uint8)
+    for column, x0 in enumerate((40, 540, 1040)):
+        for row in range(6):
+            height = 10 + column * 6 + row
+            page[10 + row * 50:10 + row * 50 + height, x0:x0 + 420] = 0
+    return page
+
+
+def _fake_image_to_data(image, psm):
+    """Stand-in recogniser: one word per dark run of columns, named by its box height."""
+    pixels = np.asarray(image)
+    data = {field: [] for field in ocr_tiling.DATA_FIELDS}
+    for top in range(0, pixels.shape[0], 50):
+        band = pixels[top:top + 50] < 128
+        dark_columns = np.flatnonzero(band.any(axis=0))
+        if dark_columns.size == 0:
+            continue
+        runs = np.split(dark_columns, np.flatnonzero(np.diff(dark_columns) > 1) + 1)
+        data["text"].append("")
+        for field in ("conf", "left", "top", "width", "height"):
+            data[field].append(-1 if field == "conf" else 0)
+        for run in runs:
+            rows = np.flatnonzero(band[:, run].any(axis=1))
+            data["text"].append(f"h{rows.size}")
+            data["conf"].append(90)
+            data["left"].append(int(run[0]))
+            data["top"].append(top + int(rows[0]))
+            data["width"].append(int(run.size))
+            data["height"].append(int(rows.size))
+    return data
+
+
+def test_cuts_land_in_gutters():
+    page = _column_page()
+    strips = ocr_tiling.plan_column_strips(page, max_strips=3, overlap=30, min_strip_width=300)
+    assert len(strips) == 3
+    for strip in strips[1:]:
+        assert 460 <= strip.own_x0 <= 540 or 960 <= strip.own_x0 <= 1040
+    assert strips[0].own_x0 == 0 and strips[-1].own_x1 == page.shape[1]
+    assert all(a.own_x1 == b.own_x0 for a, b in zip(strips, strips[1:], strict=False))
+
+
+def test_narrow_page_is_not_tiled():
+    strips = ocr_tiling.plan_column_strips(_column_page(), max_strips=4, overlap=30, min_strip_width=1000)
+    assert strips == [Strip(0, 1500, 0, 1500)]
+
+
+def test_stitch_keeps_overlap_words_once():
+    strips = ocr_tiling.plan_strips(200, [100], overlap=40)
+    left = {"text": ["a", "edge", "dup"], "conf": [90, 90, 90], "left": [10, 130, 85],
+            "top": [0, 0, 0], "width": [20, 10, 10], "height": [5, 5, 5]}
+    right = {"text": ["dup", "b"], "conf": [90, 90], "left": [25, 80],
+             "top": [0, 0], "width": [10, 20], "height": [5, 5]}
+
+    merged = ocr_tiling.stitch_strip_data(strips, [left, right])
+    words = [(text, left) for text, left in zip(merged["text"], merged["left"], strict=True) if text]
+    assert words == [("a", 10), ("dup", 85), ("b", 140)]
+
+
+def test_tiled_ocr_matches_untiled_words(monkeypatch):
+    monkeypatch.setattr(settings, "ocr_tile_max_strips", 3)
+    monkeypatch.setattr(settings, "ocr_tile_min_width", 300)
+    monkeypatch.setattr(settings, "ocr_tile_overlap_px", 40)
+    monkeypatch.setattr(settings, "ocr_tile_workers", 3)
+    service = OCRService("eng")
+    monkeypatch.setattr(service, "_image_to_data", _fake_image_to_data)
+    page = _column_page()
+
+    tiled = service._image_to_data_tiled(page, psm=3)
+    whole = _fake_image_to_data(page, psm=3)
+
+    def words(data):
+        return sorted(
+            (text, left, top) for text, left, top in zip(data["text"], data["left"], data["top"], strict=True) if text
+        )
+
+    assert words(tiled) == words(whole)
+    blocks, _ = OCRService._blocks_from_data(tiled, conf_threshold=30)
+    assert len(blocks) == 18
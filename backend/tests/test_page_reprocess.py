@@ -0,0 +1,113 @@
+from datetime import datetime
+from pathlib import Path
+
+import fitz
+
+from app.models import Edition, Item, Page
+from app.services.embedding_store import EmbeddingStore
+from app.services.pipeline_version import pipeline_fingerprint
+from app.services.processing_service import (
+    get_processing_service,
+    reprocess_single_page,
+)
+from app.services.story_grouping import embedding_text
+from app.settings import settings
+
+
+def _create_edition(db, tmp_path: Path) -> Edition:
+    pdf_path = tmp_path / "reocr.pdf"
+    doc = fitz.open()
+    for page_index in range(2):
+        doc.new_page().insert_text((72, 72), f"Reprocess page {page_index + 1}")
+    doc.save(str(pdf_path))
+    doc.close()
+
+    edition = Edition(
+        newspaper_name="Reprocess Review",
+        edition_date=datetime(2024, 5, 1),
+        file_hash="hash_reocr",
+        file_path=str(pdf_path),
+        pdf_local_path=str(pdf_path),
+        storage_backend="local",
+        storage_key=str(pdf_path),
+        total_pages=2,
+        processed_pages=0,
+        status="UPLOADED",
+        current_stage="QUEUED",
+        archive_status="SCHEDULED",
+    )
+    db.add(edition)
+    db.commit()
+    db.refresh(edition)
+    return edition
+
+
+def test_shared_service_is_reused_until_settings_change(monkeypatch):
+    monkeypatch.setattr(settings, "ocr_enabled", False)
+    service = get_processing_service()
+    assert get_processing_service() is service
+
+    monkeypatch.setattr(settings, "ocr_psm", settings.ocr_psm + 1)
+    assert get_processing_service() is not service
+
+
+def test_reprocess_single_page_uses_shared_pipeline(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ocr_enabled", False)
+    monkeypatch.setattr(settings, "storage_path", str(tmp_path))
+    edition = _create_edition(db, tmp_path)
+
+    service = get_processing_service()
+    assert service.process_edition(edition.id, db) is True
+    before = db.query(Item).filter(Item.edition_id == edition.id, Item.page_number == 2).count()
+    assert before > 0
+
+    calls = []
+    process_page = service.process_page
+
+    def record_process_page(*args, **kwargs):
+        calls.append(kwargs.get("use_cache"))
+        return process_page(*args, **kwargs)
+
+    monkeypatch.setattr(service, "process_page", record_process_page)
+    assert reprocess_single_page(edition.id, 2, db) is True
+    assert reprocess_single_page(edition.id, 2, db) is True
+
+    # Same warm instance each time, and re-OCR never serves cached output
+    assert calls == [False, False]
+    page = db.query(Page).filter(Page.edition_id == edition.id, Page.page_number == 2).one()
+    assert page.status == "DONE"
+    assert page.content_hash
+    assert page.pipeline_fingerprint == pipeline_fingerprint()
+    items = db.query(Item).filter(Item.edition_id == edition.id, Item.page_number == 2).all()
+    assert len(items) == before
+    assert "Reprocess page 2" in " ".join(item.text or "" for item in items)
+
+
+def test_reprocess_single_page_rejects_out_of_range_page(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ocr_enabled", False)
+    edition = _create_edition(db, tmp_path)
+    assert reprocess_single_page(edition.id, 5, db) is False
+
+
+def test_reprocessing_carries_embeddings_over_to_unchanged_items(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ocr_enabled", False)
+    monkeypatch.setattr(settings, "storage_path", str(tmp_path))
+    edition = _create_edition(db, tmp_path)
+    service = get_processing_service()
+    assert service.process_edition(edition.id, db) is True
+
+    store = EmbeddingStore("bge-small")
+    items = db.query(Item).filter(Item.edition_id == edition.id).all()
+    for item in items:
+        store.put(item, embedding_text(item), [float(item.page_number), 1.0])
+    db.commit()
+    vectors = {item.text: item.embedding for item in items}
+
+    assert reprocess_single_page(edition.id, 2, db) is True
+    assert service.process_edition(edition.id, db) is True
+
+    # Items are re-created, not duplicated, and keep the vectors of their unchanged text
+    items = db.query(Item).filter(Item.edition_id == edition.id).all()
+    assert sorted(item.text for item in items) == sorted(vectors)
+    assert all(store.get(item, embedding_text(item)) is not None for item in items)
+    assert {item.text: item.embedding for item in items} == vectors
@@ -0,0 +1,86 @@
+import fitz
+
+from app.services.pdf_processor import PageRenderCache, PDFProcessor
+
+
+def _create_doc() -> fitz.Document:
+    doc = fitz.open()
+    page = doc.new_page(width=600, height=800)
+    page.insert_text((72, 72), "Render once")
+    return doc
+
+
+def test_render_cache_downsamples_from_single_raster():
+    doc = _create_doc()
+    cache = PageRenderCache(doc, 0)
+
+    cache.reserve(dpi=288)
+    hires = cache.get_pixmap(dpi=288)
+    lowres = cache.get_pixmap(dpi=144)
+    by_width = cache.get_pixmap(target_width=1200)
+
+    assert cache.render_count == 1
+    assert (hires.width, hires.height) == (2400, 3200)
+    assert (lowres.width, lowres.height) == (1200, 1600)
+    assert by_width.width == 1200
+
+    image = cache.get_image(dpi=144)
+    assert image.shape == (1600, 1200, 3)
+
+    # A higher resolution than cached forces one more render
+    cache.get_pixmap(dpi=300)
+    assert cache.render_count == 2
+
+    cache.release()
+    doc.close()
+
+
+def test_page_image_shares_pixmap_buffer():
+    doc = _create_doc()
+    cache = PageRenderCache(doc, 0)
+
+    page_image = cache.get_image(dpi=72)
+    array = page_image.array
+
+    assert array.shape == (800, 600, 3)
+    assert not array.flags.writeable
+    assert not array.flags.owndata
+    assert page_image.to_pil().size == (600, 800)
+
+    doc.close()
+
+
+def _mixed_doc(image_rect, image_size=(200, 100)) -> fitz.Document:
+    """Vector story text plus one raster "ad" placed at image_rect."""
+    doc = fitz.open()
+    page = doc.new_page(width=600, height=800)
+    for line in range(12):
+        page.insert_text((72, 72 + line * 14), f"Native story line {line} with plenty of vector text")
+    ad = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, *image_size), False)
+    ad.set_rect(ad.irect, (255, 255, 255))
+    page.insert_image(fitz.Rect(*image_rect), pixmap=ad)
+    return doc
+
+
+def test_hybrid_mode_keeps_native_text_and_marks_image_regions():
+    doc = _mixed_doc((300, 500, 500, 600))
+    # Tiny decorations are not worth OCR
+    doc[0].insert_image(fitz.Rect(50, 700, 70, 720), pixmap=fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 4, 4), False))
+
+    page_data = PDFProcessor(min_chars_for_native_text=2000, hybrid_ocr=True).get_page_data(doc, 0)
+    assert page_data["needs_ocr"] is False
+    assert [[round(value) for value in region] for region in page_data["ocr_regions"]] == [[298, 498, 502, 602]]
+    assert "Native story line 11" in page_data["extracted_text"]
+    assert len(page_data["text_blocks"]) >= 1
+
+    # Without hybrid mode the whole page goes to OCR
+    assert PDFProcessor(min_chars_for_native_text=2000).get_page_data(doc, 0)["needs_ocr"] is True
+    doc.close()
+
+
+def test_hybrid_mode_ocrs_scanned_pages_whole():
+    doc = _mixed_doc((0, 0, 600, 800), image_size=(300, 400))
+    page_data = PDFProcessor(min_chars_for_native_text=2000, hybrid_ocr=True).get_page_data(doc, 0)
+    assert page_data["needs_ocr"] is True
+    assert "ocr_regions" not in page_data
+    doc.close()
@@ -1,3 +1,5 @@
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -60,6 +62,150 @@ def test_processing_updates_progress(db, tmp_path, monkeypatch):
     assert db.query(Page).filter(Page.edition_id == edition.id).count() == 2
 
 
+def test_processing_with_worker_pool_keeps_page_order(db, tmp_path, monkeypatch):
+    pdf_path = tmp_path / "edition_pool.pdf"
+    _create_pdf(pdf_path, pages=3)
+
+    monkeypatch.setattr(settings, "ocr_enabled", False)
+    monkeypatch.setattr(settings, "processing_max_workers", 2)
+
+    edition = Edition(
+        newspaper_name="Pool Times",
+        edition_date=datetime(2024, 1, 2),
+        file_hash="hash_pool",
+        file_path=str(pdf_path),
+        pdf_local_path=str(pdf_path),
+        storage_backend="local",
+        storage_key=str(pdf_path),
+        total_pages=0,
+        processed_pages=0,
+        status="UPLOADED",
+        current_stage="QUEUED",
+        archive_status="SCHEDULED",
+    )
+    db.add(edition)
+    db.commit()
+    db.refresh(edition)
+
+    service = ProcessingService()
+    assert service.process_edition(edition.id, db) is True
+
+    db.refresh(edition)
+    assert edition.status == "READY"
+    assert edition.processed_pages == 3
+    pages = (
+        db.query(Page)
+        .filter(Page.edition_id == edition.id)
+        .order_by(Page.page_number)
+        .all()
+    )
+    assert [page.status for page in pages] == ["DONE", "DONE", "DONE"]
+    for page in pages:
+        assert f"Page {page.page_number}" in (page.extracted_text or "")
+
+
+def test_processing_with_pipeline_threads_keeps_page_order(db, tmp_path, monkeypatch):
+    pdf_path = tmp_path / "edition_pipeline.pdf"
+    _create_pdf(pdf_path, pages=5)
+
+    monkeypatch.setattr(settings, "ocr_enabled", False)
+    monkeypatch.setattr(settings, "storage_path", str(tmp_path))
+    monkeypatch.setattr(settings, "processing_pipeline_threads", 3)
+    monkeypatch.setattr(settings, "processing_render_ahead", 1)
+
+    edition = Edition(
+        newspaper_name="Pipeline Times",
+        edition_date=datetime(2024, 1, 4),
+        file_hash="hash_pipeline",
+        file_path=str(pdf_path),
+        pdf_local_path=str(pdf_path),
+        storage_backend="local",
+        storage_key=str(pdf_path),
+        total_pages=0,
+        processed_pages=0,
+        status="UPLOADED",
+        current_stage="QUEUED",
+        archive_status="SCHEDULED",
+    )
+    db.add(edition)
+    db.commit()
+    db.refresh(edition)
+
+    service = ProcessingService()
+    analyze_page = service.layout_analyzer.analyze_page
+    analysis_threads = set()
+
+    def slow_analyze(page_data):
+        # Earlier pages finish last, so results arrive out of order
+        analysis_threads.add(threading.current_thread().name)
+        time.sleep(0.05 * (6 - page_data["page_number"]))
+        return analyze_page(page_data)
+
+    service.layout_analyzer.analyze_page = slow_analyze
+    assert service.process_edition(edition.id, db) is True
+
+    db.refresh(edition)
+    assert edition.status == "READY"
+    assert edition.processed_pages == 5
+    assert edition.extraction_runs[-1].stats_json["pipeline_threads"] == 3
+    assert len(analysis_threads) > 1
+    pages = (
+        db.query(Page)
+        .filter(Page.edition_id == edition.id)
+        .order_by(Page.page_number)
+        .all()
+    )
+    assert [page.status for page in pages] == ["DONE"] * 5
+    for page in pages:
+        assert f"Page {page.page_number}" in (page.extracted_text or "")
+    item_pages = [item.page_number for item in sorted(edition.items, key=lambda item: item.id)]
+    assert item_pages == sorted(item_pages)
+
+
+def test_pipeline_thread_crash_fails_edition_instead_of_hanging(db, tmp_path, monkeypatch):
+    pdf_path = tmp_path / "edition_pipeline_crash.pdf"
+    _create_pdf(pdf_path, pages=3)
+
+    monkeypatch.setattr(settings, "ocr_enabled", False)
+    monkeypatch.setattr(settings, "storage_path", str(tmp_path))
+    monkeypatch.setattr(settings, "processing_pipeline_threads", 2)
+
+    edition = Edition(
+        newspaper_name="Crash Times",
+        edition_date=datetime(2024, 1, 5),
+        file_hash="hash_pipeline_crash",
+        file_path=str(pdf_path),
+        pdf_local_path=str(pdf_path),
+        storage_backend="local",
+        storage_key=str(pdf_path),
+        total_pages=0,
+        processed_pages=0,
+        status="UPLOADED",
+        current_stage="QUEUED",
+        archive_status="SCHEDULED",
+    )
+    db.add(edition)
+    db.commit()
+
+    service = ProcessingService()
+
+    def broken_layout_batch(prepared_pages):
+        # Outside the per-page error handling, so it kills the renderer thread
+        raise MemoryError("renderer crashed")
+
+    service._detect_layout_batch = broken_layout_batch
+    outcome = []
+    runner = threading.Thread(target=lambda: outcome.append(service.process_edition(edition.id, db)), daemon=True)
+    runner.start()
+    runner.join(timeout=30)
+    assert not runner.is_alive(), "edition processing hung after a pipeline thread died"
+
+    assert outcome == [False]
+    db.refresh(edition)
+    assert edition.status == "FAILED"
+    assert "renderer crashed" in edition.last_error
+
+
 def test_create_edition_creates_pages(client, db, mock_admin_user, monkeypatch, tmp_path):
     from app.api import editions as editions_api
     from app.api.auth import get_admin_user
@@ -89,3 +235,118 @@ def test_create_edition_creates_pages(client, db, mock_admin_user, monkeypatch,
     assert page_count == 3
 
     app.dependency_overrides.pop(get_admin_user, None)
+
+
+def test_processing_batches_commits_and_publishes_progress(client, db, tmp_path, monkeypatch):
+    from app.services import commit_coalescer
+
+    pdf_path = tmp_path / "edition_batched.pdf"
+    _create_pdf(pdf_path, pages=4)
+
+    monkeypatch.setattr(settings, "ocr_enabled", False)
+    monkeypatch.setattr(settings, "storage_path", str(tmp_path))
+    monkeypatch.setattr(settings, "processing_db_commit_interval", 2)
+    monkeypatch.setattr(settings, "processing_db_commit_seconds", 3600.0)
+
+    edition = Edition(
+        newspaper_name="Batch Times",
+        edition_date=datetime(2024, 1, 3),
+        file_hash="hash_batched",
+        file_path=str(pdf_path),
+        pdf_local_path=str(pdf_path),
+        storage_backend="local",
+        storage_key=str(pdf_path),
+        total_pages=0,
+        processed_pages=0,
+        status="UPLOADED",
+        current_stage="QUEUED",
+        archive_status="SCHEDULED",
+    )
+    db.add(edition)
+    db.commit()
+    db.refresh(edition)
+
+    published = []
+    original_write = commit_coalescer.write_progress
+
+    def record_progress(edition_id, progress):
+        published.append(progress["processed_pages"])
+        original_write(edition_id, progress)
+
+    monkeypatch.setattr(commit_coalescer, "write_progress", record_progress)
+
+    service = ProcessingService()
+    assert service.process_edition(edition.id, db) is True
+
+    db.refresh(edition)
+    assert edition.processed_pages == 4
+    assert edition.extraction_runs[-1].stats_json["db_commit_batches"] == 2
+    assert set(published) >= {1, 2, 3, 4}
+    # Side channel is removed once the final state is committed
+    assert commit_coalescer.read_progress(edition.id) is None
+
+    # While processing, the status endpoint prefers the live side channel
+    edition.status = "PROCESSING"
+    db.commit()
+    commit_coalescer.write_progress(
+        edition.id, {"current_stage": "OCR", "processed_pages": 3, "total_pages": 4}
+    )
+    response = client.get(f"/api/editions/{edition.id}/status")
+    assert response.status_code == 200
+    assert response.json()["edition"]["current_stage"] == "OCR"
+
+
+def test_processing_does_not_flush_between_batch_commits(db, tmp_path, monkeypatch):
+    from sqlalchemy import event
+
+    from app.services.commit_coalescer import CommitCoalescer
+
+    pdf_path = tmp_path / "edition_no_autoflush.pdf"
+    _create_pdf(pdf_path, pages=4)
+
+    monkeypatch.setattr(settings, "ocr_enabled", False)
+    monkeypatch.setattr(settings, "storage_path", str(tmp_path))
+    monkeypatch.setattr(settings, "processing_db_commit_interval", 4)
+    monkeypatch.setattr(settings, "processing_db_commit_seconds", 3600.0)
+
+    edition = Edition(
+        newspaper_name="Lock Times",
+        edition_date=datetime(2024, 1, 4),
+        file_hash="hash_no_autoflush",
+        file_path=str(pdf_path),
+        pdf_local_path=str(pdf_path),
+        storage_backend="local",
+        storage_key=str(pdf_path),
+        total_pages=0,
+        processed_pages=0,
+        status="UPLOADED",
+        current_stage="QUEUED",
+        archive_status="SCHEDULED",
+    )
+    db.add(edition)
+    db.commit()
+
+    events = []
+    original_page_done = CommitCoalescer.page_done
+
+    def record_page_done(self, processed_pages):
+        events.append("page")
+        original_page_done(self, processed_pages)
+
+    monkeypatch.setattr(CommitCoalescer, "page_done", record_page_done)
+
+    def record_flush(session, context):
+        events.append("flush")
+
+    event.listen(db, "after_flush", record_flush)
+    db.autoflush = True  # The check must hold whatever session the worker passes in
+    try:
+        assert ProcessingService().process_edition(edition.id, db) is True
+    finally:
+        event.remove(db, "after_flush", record_flush)
+
+    # Nothing is flushed between pages of one batch: the per-page cancel
+    # check must not autoflush and open the write transaction early
+    first_page = events.index("page")
+    last_page = len(events) - 1 - events[::-1].index("page")
+    assert events[first_page:last_page + 1] == ["page"] * 4
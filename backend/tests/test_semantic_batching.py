@@ -0,0 +1,75 @@
+import numpy as np
+
+from app.models import Item
+from app.services.semantic_grouping_service import SemanticGroupingService
+from app.services.story_grouping import build_story_groups
+
+
+class _FakeEncoder:
+    """Stands in for SentenceTransformer: embeds text as (length, 1), normalized."""
+
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=False):
+        self.calls.append(texts)
+        if isinstance(texts, str):
+            return self._vector(texts)
+        if self.fail_on and self.fail_on in texts:
+            raise RuntimeError("bad batch")
+        return np.stack([self._vector(text) for text in texts])
+
+    @staticmethod
+    def _vector(text):
+        vector = np.array([len(text), 1.0])
+        return vector / np.linalg.norm(vector)
+
+
+def _service(encoder, batch_size=2):
+    service = SemanticGroupingService(batch_size=batch_size)
+    service._model = encoder
+    return service
+
+
+def test_generate_embeddings_batches_by_length_in_input_order():
+    encoder = _FakeEncoder()
+    service = _service(encoder)
+    texts = ["bb", "", "dddd", "a", "   ", "ccc"]
+
+    embeddings = service.generate_embeddings(texts)
+
+    assert encoder.calls == [["dddd", "ccc"], ["bb", "a"]]
+    assert embeddings[1] is None and embeddings[4] is None
+    for text, embedding in zip(texts, embeddings, strict=True):
+        if text.strip():
+            np.testing.assert_allclose(embedding, service.generate_embedding(text))
+
+
+def test_failed_batch_falls_back_to_single_texts():
+    encoder = _FakeEncoder(fail_on="boom")
+    service = _service(encoder, batch_size=3)
+
+    embeddings = service.generate_embeddings(["boom", "ok", "fine"], batch_size=3)
+
+    assert all(embedding is not None for embedding in embeddings)
+    assert encoder.calls[1:] == ["boom", "fine", "ok"]
+
+
+def test_generate_embeddings_without_model():
+    assert SemanticGroupingService().generate_embeddings(["text", "more"]) == [None, None]
+
+
+def test_story_grouping_embeds_edition_in_batches():
+    encoder = _FakeEncoder()
+    service = _service(encoder, batch_size=16)
+    items = [
+        Item(id=index + 1, edition_id=1, page_number=index // 10 + 1, item_type="STORY",
+             title=f"Story {index}", text=("county budget roads " * (index % 7 + 1)) if index % 5 else "")
+        for index in range(40)
+    ]
+
+    build_story_groups(items, semantic_service=service)
+
+    # 32 stories with text -> two model calls, no per-pair encoding afterwards
+    assert [len(call) for call in encoder.calls] == [16, 16]
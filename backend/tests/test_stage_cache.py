@@ -0,0 +1,159 @@
+from datetime import datetime
+from pathlib import Path
+
+import fitz
+
+from app.models import Edition, Item, Page
+from app.services.processing_service import ProcessingService
+from app.settings import settings
+
+
+def _create_pdf(path: Path, pages: int) -> None:
+    doc = fitz.open()
+    for page_index in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Stage cache page {page_index + 1}")
+    doc.save(str(path))
+    doc.close()
+
+
+def _create_edition(db, pdf_path: Path, pages: int) -> Edition:
+    edition = Edition(
+        newspaper_name="Cache Courier",
+        edition_date=datetime(2024, 3, 1),
+        file_hash=f"hash_{pdf_path.stem}",
+        file_path=str(pdf_path),
+        pdf_local_path=str(pdf_path),
+        storage_backend="local",
+        storage_key=str(pdf_path),
+        total_pages=pages,
+        processed_pages=0,
+        status="UPLOADED",
+        current_stage="QUEUED",
+        archive_status="SCHEDULED",
+    )
+    db.add(edition)
+    db.commit()
+    db.refresh(edition)
+    return edition
+
+
+def _reset_edition(db, edition: Edition) -> None:
+    db.query(Item).filter(Item.edition_id == edition.id).delete()
+    db.query(Page).filter(Page.edition_id == edition.id).delete()
+    edition.status = "UPLOADED"
+    edition.processed_pages = 0
+    db.commit()
+
+
+class _CountingOCR:
+    """Stands in for the tesseract service so the OCR stage runs on every test host."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def is_available(self) -> bool:
+        return True
+
+    def extract_text_with_boxes(self, image, preprocess=True, psm=3, tiled=False, include_words=False):
+        self.calls += 1
+        return {
+            "text": "Scanned words",
+            "text_blocks": [],
+            "avg_confidence": 90.0,
+            "word_count": 2,
+            "psm": psm,
+            "preprocess": preprocess,
+            "engine": "tesseract",
+        }
+
+
+def test_reprocess_reuses_cached_page_stages(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ocr_enabled", False)
+    monkeypatch.setattr(settings, "storage_path", str(tmp_path))
+    pdf_path = tmp_path / "cache.pdf"
+    _create_pdf(pdf_path, pages=2)
+    edition = _create_edition(db, pdf_path, pages=2)
+
+    assert ProcessingService().process_edition(edition.id, db) is True
+    first_items = [
+        (item.page_number, item.text)
+        for item in db.query(Item).filter(Item.edition_id == edition.id).order_by(Item.id)
+    ]
+    first_hashes = {page.page_number: page.content_hash for page in edition.pages}
+    assert all(first_hashes.values())
+    assert first_hashes[1] != first_hashes[2]
+    assert edition.extraction_runs[-1].stats_json["stage_cache_hits"]["analysis"] == 0
+
+    _reset_edition(db, edition)
+    assert ProcessingService().process_edition(edition.id, db) is True
+
+    db.refresh(edition)
+    assert edition.extraction_runs[-1].stats_json["stage_cache_hits"]["analysis"] == 2
+    assert {page.page_number: page.content_hash for page in edition.pages} == first_hashes
+    assert [
+        (item.page_number, item.text)
+        for item in db.query(Item).filter(Item.edition_id == edition.id).order_by(Item.id)
+    ] == first_items
+
+
+def test_analysis_setting_change_reuses_ocr_only(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "storage_path", str(tmp_path))
+    monkeypatch.setattr(settings, "min_chars_for_native_text", 10_000)  # force page OCR
+    pdf_path = tmp_path / "scanned.pdf"
+    _create_pdf(pdf_path, pages=2)
+    edition = _create_edition(db, pdf_path, pages=2)
+
+    ocr = _CountingOCR()
+    service = ProcessingService()
+    service.ocr_service = ocr
+    assert service.process_edition(edition.id, db) is True
+    assert ocr.calls == 2
+
+    # Reading order only affects analysis, so the OCR output is still valid
+    monkeypatch.setattr(settings, "reading_order_enabled", not settings.reading_order_enabled)
+    _reset_edition(db, edition)
+    assert service.process_edition(edition.id, db) is True
+
+    db.refresh(edition)
+    hits = edition.extraction_runs[-1].stats_json["stage_cache_hits"]
+    assert ocr.calls == 2
+    assert hits["ocr"] == 2
+    assert hits["analysis"] == 0
+    assert all(page.ocr_used for page in edition.pages)
+
+    # An OCR setting change invalidates the OCR stage too
+    monkeypatch.setattr(settings, "ocr_psm", settings.ocr_psm + 1)
+    _reset_edition(db, edition)
+    assert service.process_edition(edition.id, db) is True
+    assert ocr.calls == 4
+
+
+def test_stage_cache_evicts_least_recently_used_and_expired_entries(tmp_path):
+    import os
+    import time
+
+    from app.services.stage_cache import StageCache
+
+    entry = {"text": "x" * 200}
+    cache = StageCache(root=str(tmp_path / "stage_cache"), max_bytes=900)
+    for index in range(4):
+        cache.put("ocr", f"{index:02d}key", entry)
+        old = time.time() - 100 + index
+        os.utime(cache.path_for("ocr", f"{index:02d}key"), (old, old))
+    assert cache.get("ocr", "00key") == entry  # Refreshes the oldest entry
+
+    cache.put("ocr", "04key", entry)  # Over the limit: evicts down to 90%
+    assert cache.evictions == 2
+    assert cache.get("ocr", "00key") == entry
+    assert cache.get("ocr", "01key") is None
+    assert cache.get("ocr", "02key") is None
+    assert cache.get("ocr", "03key") == entry
+
+    # Entries unused past the age limit are dropped on the next scan
+    stale = time.time() - 3600
+    os.utime(cache.path_for("ocr", "03key"), (stale, stale))
+    aged = StageCache(root=cache.root, max_bytes=900, max_age_seconds=60)
+    aged.put("layout", "05key", entry)
+    assert aged.get("ocr", "03key") is None
+    assert aged.get("ocr", "00key") == entry
@@ -0,0 +1,104 @@
+from datetime import datetime
+from pathlib import Path
+
+import fitz
+
+from app.models import Edition
+from app.services.processing_service import ProcessingService
+from app.services.stage_timer import StageTimer
+from app.settings import settings
+
+
+def test_stage_timer_accumulates_and_merges():
+    timer = StageTimer()
+    timer.start("OCR")
+    sum(range(10_000))
+    timer.start("OCR")  # already running: no new interval
+    timer.start("LAYOUT")
+    timer.stop()
+    with timer.measure("OCR"):
+        pass
+
+    timings = timer.to_dict()
+    assert timings["stages"]["OCR"]["count"] == 2
+    assert timings["stages"]["LAYOUT"]["count"] == 1
+    assert timings["wall_s"] >= timings["stages"]["OCR"]["wall_s"]
+
+    edition_timer = StageTimer()
+    edition_timer.merge(timings)
+    edition_timer.merge(timings)
+    merged = edition_timer.to_dict()
+    assert merged["stages"]["OCR"]["count"] == 4
+    assert merged["stages"]["OCR"]["max_wall_s"] == timings["stages"]["OCR"]["max_wall_s"]
+
+
+def test_stage_timer_samples_rss_per_stage(monkeypatch):
+    from app.services import stage_timer
+
+    samples = iter([100.0, 180.0, 150.0, 120.0])
+    monkeypatch.setattr(stage_timer, "current_rss_mb", lambda: next(samples))
+
+    timer = StageTimer()
+    with timer.measure("OCR"):  # 100 -> 180 MB
+        pass
+    with timer.measure("ANALYZE"):  # 150 -> 120 MB
+        pass
+    timings = timer.to_dict()
+
+    assert timings["stages"]["OCR"]["peak_rss_mb"] == 180.0
+    assert timings["stages"]["OCR"]["max_rss_delta_mb"] == 80.0
+    assert timings["stages"]["ANALYZE"]["peak_rss_mb"] == 150.0
+    assert timings["stages"]["ANALYZE"]["max_rss_delta_mb"] == -30.0
+    assert timings["peak_rss_mb"] == 180.0
+
+    # Merging keeps the highest sample and largest growth per stage
+    edition_timer = StageTimer()
+    edition_timer.merge(timings)
+    edition_timer.add("OCR", 0.1, 0.1, rss_mb=160.0, rss_delta_mb=10.0)
+    merged = edition_timer.to_dict()
+    assert merged["stages"]["OCR"]["peak_rss_mb"] == 180.0
+    assert merged["stages"]["OCR"]["max_rss_delta_mb"] == 80.0
+
+
+def test_processing_records_stage_timings(client, db, tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "ocr_enabled", False)
+    monkeypatch.setattr(settings, "storage_path", str(tmp_path))
+
+    pdf_path = tmp_path / "timed.pdf"
+    doc = fitz.open()
+    for page_index in range(2):
+        doc.new_page().insert_text((72, 72), f"Timed page {page_index + 1}")
+    doc.save(str(pdf_path))
+    doc.close()
+
+    edition = Edition(
+        newspaper_name="Timing Tribune",
+        edition_date=datetime(2024, 4, 1),
+        file_hash="hash_timed",
+        file_path=str(pdf_path),
+        pdf_local_path=str(pdf_path),
+        storage_backend="local",
+        storage_key=str(pdf_path),
+        total_pages=2,
+        processed_pages=0,
+        status="UPLOADED",
+        current_stage="QUEUED",
+        archive_status="SCHEDULED",
+    )
+    db.add(edition)
+    db.commit()
+    db.refresh(edition)
+
+    assert ProcessingService().process_edition(edition.id, db) is True
+
+    timings = edition.extraction_runs[-1].stats_json["timings"]
+    assert timings["stages"]["EXTRACT"]["count"] == 2
+    assert timings["stages"]["INDEX"]["count"] == 2
+    assert "CLASSIFY" in timings["stages"]
+    assert [page["page_number"] for page in timings["pages"]] == [1, 2]
+    assert all(page["wall_s"] >= 0 for page in timings["pages"])
+    assert timings["stages"]["EXTRACT"]["peak_rss_mb"] > 0
+
+    response = client.get(f"/api/editions/{edition.id}/status")
+    assert response.status_code == 200
+    assert response.json()["timings"]["stages"]["EXTRACT"]["count"] == 2
@@ -0,0 +1,115 @@
+import random
+import re
+
+from app.services.layout_analyzer import (
+    ACTION_RE,
+    AD_INDICATORS,
+    CONTACT_RE,
+    EMAIL_RE,
+    PRICE_RE,
+    URL_RE,
+    LayoutAnalyzer,
+)
+from app.services.text_rules import Rule, RuleSet
+
+
+def _legacy_classify(analyzer, text):
+    """The per-pattern classifier the rule engine replaced (reference semantics)."""
+    text_upper = text.upper()
+    word_count = len(text.split())
+    has_contact = bool(CONTACT_RE.search(text) or EMAIL_RE.search(text) or URL_RE.search(text))
+    has_price = bool(PRICE_RE.search(text))
+    has_action = bool(ACTION_RE.search(text))
+    sentence_count = len(re.findall(r"[.!?]", text))
+    story = word_count >= 80 and sentence_count >= 3 and not (has_contact or has_price or has_action)
+
+    for subtype, patterns in analyzer.classified_patterns.items():
+        if any(re.search(pattern, text_upper, re.IGNORECASE) for pattern in patterns):
+            if story:
+                return 'STORY', None
+            if subtype == 'PROPERTY' and not (has_contact or has_price or has_action or word_count <= 40):
+                return 'STORY', None
+            if subtype == 'JOB' and not (has_contact or has_action or word_count <= 60):
+                return 'STORY', None
+            if subtype == 'NOTICE' and not (has_contact or word_count <= 60):
+                return 'STORY', None
+            if subtype in {'TENDER', 'AUCTION'} and not (has_contact or has_action or word_count <= 80):
+                return 'STORY', None
+            if word_count > 120 and not (has_contact or has_price or has_action):
+                return 'STORY', None
+            return 'CLASSIFIED', subtype
+
+    if sum(1 for pattern in AD_INDICATORS if re.search(pattern, text_upper)) >= 2:
+        if story:
+            return 'STORY', None
+        if word_count > 120 and not (has_contact or has_price):
+            return 'STORY', None
+        return 'AD', 'ADVERTISEMENT'
+    return 'STORY', None
+
+
+_FRAGMENTS = [
+    "TENDER NOTICE", "tender", "Vacancy", "we are HIRING", "auction sale", "public notice", "obituary",
+    "house for sale", "Land", "rent", "Call us NOW", "call", "now", "offer", "Special discount",
+    "limited", "www.example.com", "KSH@x.com", "jane.doe@mail.co.ke", "http://news.ke", ".COM",
+    "0722 123 456", "+254 20 123-4567", "KSh 5,000", "$ 40", "€5", "apply", "WhatsApp", "sms",
+    "The minister said.", "Reports indicate!", "Why?", "café", "ÉMAIL", "straße", "advertisement",
+    "AD", "ads", "promotion", "website", "phone", "contact", "the", "county", "and", "of", "budget",
+    "HIR\u0130NG", "\u017fale", "real  estate", "REAL ESTATE", "tender_notice", "AD2", "WWW.COM",
+]
+
+
+def _corpus(count=600, seed=7):
+    rng = random.Random(seed)
+    texts = ["", " ", "TENDER", "SALE AD", "KSH@x.com", "call me now", "a. b. c."]
+    for _ in range(count):
+        words = [rng.choice(_FRAGMENTS) for _ in range(rng.choice([1, 3, 8, 30, 90, 140]))]
+        texts.append(rng.choice([" ", "\n", "  "]).join(words))
+    return texts
+
+
+def test_classification_matches_legacy_rules():
+    analyzer = LayoutAnalyzer()
+    for text in _corpus():
+        assert analyzer.classify_text_block(text) == _legacy_classify(analyzer, text), text
+
+
+def test_scan_reports_every_matching_rule():
+    rules = [
+        Rule("price", r"\bKSH\b"),
+        Rule("contact", r"[A-Z]+@[A-Z]+\.[A-Z]{2,}", re.IGNORECASE),
+        Rule("contact", r"\bcall\b.*\bnow\b", re.IGNORECASE),
+        Rule("word", r"\bsale\b"),
+    ]
+    rule_set = RuleSet(rules)
+
+    for text in ["KSH@x.com", "ksh@x.com CALL me NOW", "Sale", "sale", "", "KSH KSH"] + _corpus(200):
+        expected = {}
+        for rule in rules:
+            if re.search(rule.pattern, text, rule.flags):
+                expected[rule.name] = expected.get(rule.name, 0) + 1
+        assert rule_set.scan(text) == expected, text
+
+    # Rules overlapping at the same position are each counted
+    assert rule_set.scan("KSH@x.com") == {"price": 1, "contact": 1}
+
+
+def test_keyword_rules_follow_regex_word_and_case_semantics():
+    rule_set = RuleSet([
+        Rule("sale", r"\bFOR SALE\b", re.IGNORECASE),
+        Rule("sale", r"\bSALE\b"),
+        Rule("park", r"\bPARK\b", re.IGNORECASE),
+    ])
+    assert rule_set.scan("for sale") == {"sale": 1}
+    assert rule_set.scan("FOR  SALE") == {"sale": 1}  # Phrase needs a single space
+    assert rule_set.scan("SALE FOR") == {"sale": 1}
+    assert rule_set.scan("FORSALE SALE_") == {}
+    assert rule_set.scan("PAR\u212a") == {"park": 1}  # Kelvin sign folds to K, as in re
+
+
+def test_rules_can_be_recompiled_after_edits():
+    analyzer = LayoutAnalyzer()
+    assert analyzer.classify_text_block("Matatu fleet disposal") == ('STORY', None)
+    analyzer.classified_patterns['AUCTION'].append(r'\bDISPOSAL\b')
+    analyzer._compile_rules()
+    assert analyzer.classify_text_block("Matatu fleet disposal") == ('CLASSIFIED', 'AUCTION')
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Iterable, Tuple
+import heapq
+from typing import Iterable, List, Sequence, Tuple
 
 from .schemas import BBox
 
@@ -49,3 +50,46 @@ def bbox_from_blocks(blocks: Iterable[Tuple[float, float, float, float]]) -> BBo
         xs2.append(x2)
         ys2.append(y2)
     return BBox(min(xs1), min(ys1), max(xs2), max(ys2))
+
+
+def sweep_columns(extents: Sequence[Tuple[float, float]], x_overlap_threshold: float = 0.6) -> List[int]:
+    """Greedy column number per (x1, x2) extent, extents sorted by x1.
+
+    Each extent joins the earliest-created column it overlaps by at least the
+    threshold (x_overlap_ratio), else starts a new one. Columns whose right
+    edge the sweep has passed can no longer match and are retired, so this is
+    O(n log n) for typical pages. Same algorithm as the backend's
+    app/services/geometry_index.py.
+    """
+    assignment: List[int] = []
+    spans: List[List[float]] = []
+    active: List[int] = []
+    right_edges: List[Tuple[float, int]] = []
+    retire = x_overlap_threshold > 0
+    for x1, x2 in extents:
+        while retire and right_edges and right_edges[0][0] <= x1:
+            right, column = heapq.heappop(right_edges)
+            if right == spans[column][1]:
+                active.remove(column)
+        placed = None
+        for column in active:
+            col_x1, col_x2 = spans[column]
+            inter = min(x2, col_x2) - max(x1, col_x1)
+            width = min(x2 - x1, col_x2 - col_x1)
+            ratio = inter / width if inter > 0 and width else 0.0
+            if ratio >= x_overlap_threshold:
+                placed = column
+                break
+        if placed is None:
+            placed = len(spans)
+            spans.append([x1, x2])
+            active.append(placed)
+            heapq.heappush(right_edges, (x2, placed))
+        else:
+            span = spans[placed]
+            span[0] = min(span[0], x1)
+            if x2 > span[1]:
+                span[1] = x2
+                heapq.heappush(right_edges, (x2, placed))
+        assignment.append(placed)
+    return assignment
@@ -3,8 +3,8 @@ from __future__ import annotations
 from dataclasses import replace
 from typing import Dict, Iterable, List, Tuple
 
-from .geom import bbox_union, x_overlap_ratio
-from .schemas import Block, BBox
+from .geom import bbox_union, sweep_columns, x_overlap_ratio
+from .schemas import Block
 
 
 TOP_TYPES = {
@@ -29,19 +29,13 @@ def estimate_line_height(block: Block) -> float:
 
 
 def group_columns(blocks: Iterable[Block], x_overlap_threshold: float = 0.6) -> List[List[Block]]:
+    ordered = sorted(blocks, key=lambda b: (b.bbox.x1, b.bbox.y1))
+    assignment = sweep_columns([(b.bbox.x1, b.bbox.x2) for b in ordered], x_overlap_threshold)
     columns: List[List[Block]] = []
-    col_boxes: List[BBox] = []
-    for block in sorted(blocks, key=lambda b: (b.bbox.x1, b.bbox.y1)):
-        placed = False
-        for idx, col_box in enumerate(col_boxes):
-            if x_overlap_ratio(block.bbox, col_box) >= x_overlap_threshold:
-                columns[idx].append(block)
-                col_boxes[idx] = bbox_union(col_box, block.bbox)
-                placed = True
-                break
-        if not placed:
-            columns.append([block])
-            col_boxes.append(block.bbox)
+    for block, idx in zip(ordered, assignment):
+        if idx == len(columns):
+            columns.append([])
+        columns[idx].append(block)
     return columns
 
 
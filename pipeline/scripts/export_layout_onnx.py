@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+PUBLAYNET_LABELS = {"0": "Text", "1": "Title", "2": "List", "3": "Table", "4": "Figure"}
+
+
+def model_stem(path: Path) -> Path:
+    name = path.name
+    for suffix in (".int8.onnx", ".onnx"):
+        if name.endswith(suffix):
+            return path.with_name(name[: -len(suffix)])
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Export a Detectron2 layout model to ONNX (optionally int8-quantized) for CPU inference."
+    )
+    parser.add_argument("--config", required=True, help="Detectron2 config yaml (training or PubLayNet config)")
+    parser.add_argument("--weights", required=True, help="Model weights (.pth / .pkl)")
+    parser.add_argument("--sample-image", required=True, help="A representative page image used for tracing")
+    parser.add_argument("--out", required=True, help="Output .onnx path")
+    parser.add_argument("--label-map", default=None, help="JSON mapping id->label (default: PubLayNet labels)")
+    parser.add_argument("--num-classes", type=int, default=None)
+    parser.add_argument("--score-thresh", type=float, default=0.3, help="Scores below this are dropped in-graph")
+    parser.add_argument("--opset", type=int, default=None, help="ONNX opset (default: detectron2's stable opset)")
+    parser.add_argument("--quantize", action="store_true", help="Also write a dynamic int8 model (<name>.int8.onnx)")
+    parser.add_argument("--quantize-ops", default="Conv,MatMul,Gemm", help="Op types to quantize")
+    parser.add_argument("--per-channel", action="store_true", help="Per-channel weight quantization")
+    args = parser.parse_args()
+
+    try:
+        import torch
+        from detectron2.checkpoint import DetectionCheckpointer
+        from detectron2.config import get_cfg
+        from detectron2.export import STABLE_ONNX_OPSET, TracingAdapter
+        from detectron2.modeling import build_model
+    except Exception as exc:
+        raise SystemExit(
+            "Detectron2 and PyTorch are required for export. Install detectron2 first, then re-run.\n"
+            "Example: pip install 'git+https://github.com/facebookresearch/detectron2.git' onnx"
+        ) from exc
+
+    label_map = PUBLAYNET_LABELS
+    if args.label_map:
+        label_map = {str(key): str(value) for key, value in json.loads(Path(args.label_map).read_text()).items()}
+
+    cfg = get_cfg()
+    cfg.merge_from_file(args.config)
+    cfg.MODEL.WEIGHTS = args.weights
+    cfg.MODEL.DEVICE = "cpu"
+    cfg.MODEL.ROI_HEADS.SCORE_THRESH_TEST = args.score_thresh
+    cfg.MODEL.ROI_HEADS.NUM_CLASSES = args.num_classes or len(label_map)
+    cfg.freeze()
+
+    model = build_model(cfg)
+    DetectionCheckpointer(model).load(cfg.MODEL.WEIGHTS)
+    model.eval()
+
+    # Same resize as the runtime (ResizeShortestEdge at test sizes)
+    image = Image.open(args.sample_image).convert("RGB")
+    width, height = image.size
+    scale = cfg.INPUT.MIN_SIZE_TEST / min(height, width)
+    if max(height, width) * scale > cfg.INPUT.MAX_SIZE_TEST:
+        scale = cfg.INPUT.MAX_SIZE_TEST / max(height, width)
+    image = image.resize((int(width * scale + 0.5), int(height * scale + 0.5)), Image.BILINEAR)
+    pixels = np.asarray(image)
+    if cfg.INPUT.FORMAT == "BGR":
+        pixels = pixels[:, :, ::-1]
+    tensor = torch.as_tensor(np.ascontiguousarray(pixels.transpose(2, 0, 1)).astype("float32"))
+
+    def inference(model, inputs):
+        # No postprocess: boxes stay in input-tensor coordinates, rescaled at runtime
+        instances = model.inference(inputs, do_postprocess=False)[0]
+        return [{"instances": instances}]
+
+    adapter = TracingAdapter(model, [{"image": tensor}], inference)
+    out_path = Path(args.out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    output_names = ["boxes", "classes", "scores"]
+    with torch.no_grad():
+        torch.onnx.export(
+            adapter,
+            adapter.flattened_inputs,
+            str(out_path),
+            input_names=["image"],
+            output_names=output_names,
+            dynamic_axes={
+                "image": {1: "height", 2: "width"},
+                "boxes": {0: "detections"},
+                "classes": {0: "detections"},
+                "scores": {0: "detections"},
+            },
+            opset_version=args.opset or STABLE_ONNX_OPSET,
+        )
+    print(f"Wrote {out_path}")
+
+    sidecar = model_stem(out_path).with_suffix(".json")
+    sidecar.write_text(
+        json.dumps(
+            {
+                "label_map": label_map,
+                "input_format": cfg.INPUT.FORMAT,
+                "min_size": cfg.INPUT.MIN_SIZE_TEST,
+                "max_size": cfg.INPUT.MAX_SIZE_TEST,
+                "input_name": "image",
+                "output_names": output_names,
+                "score_thresh": args.score_thresh,
+                "source_config": args.config,
+                "source_weights": args.weights,
+            },
+            indent=2,
+        )
+    )
+    print(f"Wrote {sidecar}")
+
+    if args.quantize:
+        try:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+        except Exception as exc:
+            raise SystemExit("onnxruntime is required for quantization: pip install onnxruntime") from exc
+
+        int8_path = model_stem(out_path).with_name(f"{model_stem(out_path).name}.int8.onnx")
+        quantize_dynamic(
+            str(out_path),
+            str(int8_path),
+            weight_type=QuantType.QInt8,
+            per_channel=args.per_channel,
+            op_types_to_quantize=[op for op in args.quantize_ops.split(",") if op],
+        )
+        print(f"Wrote {int8_path} (check accuracy with scripts/benchmark_layout.py)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Sequence
 
 import numpy as np
 from PIL import Image
@@ -12,6 +12,29 @@ from pipeline.core.io import load_pages
 from pipeline.core.schemas import BBox, Block
 
 
+def detect_batch(model, images: Sequence[np.ndarray]) -> list:
+    """
+    Run a Detectron2LayoutModel on several pages in one forward pass.
+
+    Mirrors detectron2's DefaultPredictor per image (input format, test-time
+    resize), then batches the tensors so the backbone runs them together.
+    """
+    import torch
+
+    predictor = model.model
+    inputs = []
+    for image in images:
+        if predictor.input_format == "RGB":
+            image = image[:, :, ::-1]
+        height, width = image.shape[:2]
+        resized = predictor.aug.get_transform(image).apply_image(image)
+        tensor = torch.as_tensor(resized.astype("float32").transpose(2, 0, 1))
+        inputs.append({"image": tensor, "height": height, "width": width})
+    with torch.no_grad():
+        outputs = predictor.model(inputs)
+    return [model.gather_output(output) for output in outputs]
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--pages", required=True, help="Path to pages.json")
@@ -21,6 +44,7 @@ def main() -> None:
     parser.add_argument("--label-map", required=True, help="JSON mapping id->label")
     parser.add_argument("--score-thresh", type=float, default=0.5)
     parser.add_argument("--device", default="cpu", choices=["cpu", "cuda"])
+    parser.add_argument("--batch-size", type=int, default=4, help="Pages per forward pass (2-8 suits CPU)")
     parser.add_argument("--overwrite", action="store_true")
     args = parser.parse_args()
 
@@ -45,11 +69,17 @@ def main() -> None:
     )
 
     pages = load_pages(args.pages)
-    for page in pages:
-        if not page.image_path:
-            continue
-        image = np.array(Image.open(page.image_path).convert("RGB"))
-        layout = model.detect(image)
+    to_detect = [page for page in pages if page.image_path]
+    batch_size = max(1, args.batch_size)
+    layouts = []
+    for start in range(0, len(to_detect), batch_size):
+        images = [np.array(Image.open(page.image_path).convert("RGB")) for page in to_detect[start:start + batch_size]]
+        if len(images) > 1:
+            layouts.extend(detect_batch(model, images))
+        else:
+            layouts.extend(model.detect(image) for image in images)
+
+    for page, layout in zip(to_detect, layouts):
         blocks: List[Block] = []
         for idx, region in enumerate(layout):
             x1, y1, x2, y2 = region.block.coordinates
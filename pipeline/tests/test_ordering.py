@@ -0,0 +1,61 @@
+import random
+
+from pipeline.core.geom import bbox_union, sweep_columns, x_overlap_ratio
+from pipeline.core.ordering import group_columns
+from pipeline.core.schemas import BBox, Block
+
+
+def _greedy_columns(bboxes, threshold):
+    """Reference: the old loop, comparing each box with every column created so far."""
+    col_boxes, assignment = [], []
+    for bbox in bboxes:
+        for idx, col_box in enumerate(col_boxes):
+            if x_overlap_ratio(bbox, col_box) >= threshold:
+                col_boxes[idx] = bbox_union(col_box, bbox)
+                assignment.append(idx)
+                break
+        else:
+            assignment.append(len(col_boxes))
+            col_boxes.append(bbox)
+    return assignment
+
+
+def _greedy_group_columns(blocks, threshold):
+    """Reference: group_columns as it was before the sweep."""
+    ordered = sorted(blocks, key=lambda b: (b.bbox.x1, b.bbox.y1))
+    columns = []
+    for block, idx in zip(ordered, _greedy_columns([b.bbox for b in ordered], threshold)):
+        if idx == len(columns):
+            columns.append([])
+        columns[idx].append(block)
+    return columns
+
+
+def _random_blocks(rng, count, page_width=2550.0, page_height=3300.0):
+    blocks = []
+    for index in range(count):
+        width = rng.choice([0.0, 20.0, 160.0, 500.0, 1200.0, rng.uniform(1, page_width)])
+        x1 = float(rng.randrange(0, int(page_width), 40))
+        y1 = rng.uniform(0, page_height)
+        bbox = BBox(x1, y1, x1 + width, y1 + rng.uniform(0, 200))
+        blocks.append(Block(id=f"b{index}", type=rng.choice(["headline", "body", "byline"]), bbox=bbox))
+    return blocks
+
+
+def test_sweep_matches_greedy_column_assignment():
+    rng = random.Random(11)
+    for trial in range(200):
+        bboxes = sorted((b.bbox for b in _random_blocks(rng, rng.randint(0, 120))), key=lambda b: (b.x1, b.y1))
+        extents = [(b.x1, b.x2) for b in bboxes]
+        for threshold in (0.6, 0.3, 1.0, 0.0):
+            assert sweep_columns(extents, threshold) == _greedy_columns(bboxes, threshold), (trial, threshold)
+
+
+def test_group_columns_matches_greedy_loop():
+    rng = random.Random(7)
+    for trial in range(200):
+        blocks = _random_blocks(rng, rng.randint(0, 120))
+        for threshold in (0.6, 0.3, 1.0):
+            expected = [[b.id for b in col] for col in _greedy_group_columns(blocks, threshold)]
+            actual = [[b.id for b in col] for col in group_columns(blocks, threshold)]
+            assert actual == expected, (trial, threshold)
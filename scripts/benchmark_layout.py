@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Compare layout detection backends: PyTorch (LayoutParser/Detectron2) against
+the exported ONNX model and its int8 variant.
+
+Reports load time, per-page latency and box mAP. Without --coco, the PyTorch
+detections are the reference, so mAP measures how closely each ONNX model
+reproduces them; with --coco, every backend is scored against the labels.
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "backend"))
+
+from app.services import layout_onnx
+
+
+def detections(layout) -> dict:
+    boxes, labels, scores = [], [], []
+    for element in layout:
+        coordinates = getattr(element, "block", element).coordinates
+        boxes.append([float(value) for value in coordinates])
+        labels.append(str(element.type))
+        scores.append(float(element.score) if element.score is not None else 1.0)
+    return {"boxes": np.array(boxes).reshape(-1, 4), "labels": labels, "scores": scores}
+
+
+def load_coco(path: Path, images: list[Path]) -> list[dict]:
+    coco = json.loads(path.read_text())
+    categories = {category["id"]: category["name"] for category in coco["categories"]}
+    ids = {os.path.basename(image["file_name"]): image["id"] for image in coco["images"]}
+    references = []
+    for image in images:
+        image_id = ids.get(image.name)
+        if image_id is None:
+            raise SystemExit(f"{image.name} is not in {path}")
+        annotations = [a for a in coco["annotations"] if a["image_id"] == image_id]
+        references.append({
+            "boxes": np.array(
+                [[a["bbox"][0], a["bbox"][1], a["bbox"][0] + a["bbox"][2], a["bbox"][1] + a["bbox"][3]]
+                 for a in annotations]
+            ).reshape(-1, 4),
+            "labels": [categories[a["category_id"]] for a in annotations],
+        })
+    return references
+
+
+def run_backend(name: str, model, pages: list[np.ndarray], repeat: int) -> tuple[dict, list[dict]]:
+    model.detect(pages[0])  # Warm-up (allocations, lazy kernels)
+    latencies, outputs = [], []
+    for _ in range(repeat):
+        outputs = []
+        for page in pages:
+            started = time.perf_counter()
+            layout = model.detect(page)
+            latencies.append((time.perf_counter() - started) * 1000)
+            outputs.append(detections(layout))
+    latencies.sort()
+    return {
+        "backend": name,
+        "median_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1),
+        "mean_ms": round(statistics.fmean(latencies), 1),
+    }, outputs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark PyTorch vs ONNX layout detection.")
+    parser.add_argument("--images", required=True, help="Glob of page images, e.g. 'data/pages/*.png'")
+    parser.add_argument("--onnx", required=True, help="Exported fp32 .onnx (the .int8.onnx sibling is used if present)")
+    parser.add_argument("--config", default="lp://PubLayNet/faster_rcnn_R_50_FPN_3x/config", help="Detectron2 config")
+    parser.add_argument("--weights", default=None, help="PyTorch weights (default: from the lp:// config)")
+    parser.add_argument("--coco", default=None, help="COCO annotations to score against instead of PyTorch output")
+    parser.add_argument("--score-thresh", type=float, default=0.3, help="PyTorch score threshold (match the export)")
+    parser.add_argument("--threads", type=int, default=0, help="ONNX Runtime intra-op threads")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-pytorch", action="store_true", help="Skip the PyTorch backend (requires --coco)")
+    parser.add_argument("--json", default=None, help="Write results as JSON here")
+    args = parser.parse_args()
+
+    image_paths = [Path(path) for path in sorted(glob.glob(args.images))]
+    if not image_paths:
+        raise SystemExit(f"No images match {args.images}")
+    if args.no_pytorch and not args.coco:
+        raise SystemExit("--no-pytorch needs --coco as the reference")
+    pages = [np.asarray(Image.open(path).convert("RGB")) for path in image_paths]
+    label_map = layout_onnx.load_metadata(args.onnx)["label_map"]
+
+    backends = []
+    if not args.no_pytorch:
+        try:
+            import layoutparser as lp
+        except Exception as exc:
+            raise SystemExit("layoutparser is not installed. Install with: pip install -r backend/requirements-ml.txt") from exc
+        started = time.perf_counter()
+        model = lp.Detectron2LayoutModel(
+            config_path=args.config,
+            model_path=args.weights,
+            label_map={int(key): value for key, value in label_map.items()},
+            extra_config=["MODEL.ROI_HEADS.SCORE_THRESH_TEST", args.score_thresh],
+            device="cpu",
+        )
+        backends.append(("pytorch", model, time.perf_counter() - started))
+
+    for name, path in (("onnx-fp32", args.onnx), ("onnx-int8", layout_onnx.quantized_path(args.onnx))):
+        if not os.path.exists(path):
+            continue
+        started = time.perf_counter()
+        model = layout_onnx.OnnxLayoutModel(path, threads=args.threads)
+        backends.append((name, model, time.perf_counter() - started))
+
+    references = load_coco(Path(args.coco), image_paths) if args.coco else None
+    results = []
+    for name, model, load_seconds in backends:
+        row, outputs = run_backend(name, model, pages, args.repeat)
+        row["load_s"] = round(load_seconds, 2)
+        if references is None:
+            references = outputs  # PyTorch runs first and becomes the reference
+        row["map50"] = round(layout_onnx.mean_average_precision(outputs, references, (0.5,)), 4)
+        row["map50_95"] = round(
+            layout_onnx.mean_average_precision(outputs, references, np.arange(0.5, 0.96, 0.05)), 4
+        )
+        row["boxes"] = sum(len(output["labels"]) for output in outputs)
+        results.append(row)
+
+    print(f"{len(pages)} pages x {args.repeat} runs; mAP vs {'COCO labels' if args.coco else 'PyTorch output'}")
+    header = ["backend", "load_s", "median_ms", "p95_ms", "mean_ms", "map50", "map50_95", "boxes"]
+    print("  ".join(f"{column:>10}" for column in header))
+    for row in results:
+        print("  ".join(f"{row[column]!s:>10}" for column in header))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()